@@ -0,0 +1,36 @@
+"""
+Migration: reminder_profile table and columns
+
+Previously checked with PRAGMA table_info on the first SQLite connection of
+every process (connection._ensure_sqlite_reminder_schema). Older local
+databases may have the table without the later columns, so SQLite adds any
+that are missing.
+"""
+
+COLUMNS = (
+    ('weight_enabled', "INTEGER DEFAULT 1", "TINYINT(1) DEFAULT 1"),
+    ('weight_time', "TEXT DEFAULT '06:00'", "VARCHAR(5) DEFAULT '06:00'"),
+    ('water_enabled', "INTEGER DEFAULT 1", "TINYINT(1) DEFAULT 1"),
+    ('water_interval_minutes', "INTEGER DEFAULT 60", "INT DEFAULT 60"),
+    ('lunch_enabled', "INTEGER DEFAULT 0", "TINYINT(1) DEFAULT 0"),
+    ('lunch_time', "TEXT DEFAULT '13:00'", "VARCHAR(5) DEFAULT '13:00'"),
+    ('dinner_enabled', "INTEGER DEFAULT 0", "TINYINT(1) DEFAULT 0"),
+    ('dinner_time', "TEXT DEFAULT '20:00'", "VARCHAR(5) DEFAULT '20:00'"),
+    ('updated_at', "TEXT DEFAULT CURRENT_TIMESTAMP", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+)
+
+
+def upgrade(cursor, dialect):
+    if dialect == 'sqlite':
+        cursor.execute("PRAGMA table_info(reminder_profile)")
+        existing = {row[1] for row in cursor.fetchall()}
+        if not existing:
+            columns = ",\n    ".join(f"{name} {sqlite}" for name, sqlite, _ in COLUMNS)
+            cursor.execute(f"CREATE TABLE reminder_profile (\n    user_id INTEGER PRIMARY KEY,\n    {columns}\n)")
+            return
+        for name, sqlite, _ in COLUMNS:
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE reminder_profile ADD COLUMN {name} {sqlite}")
+    else:
+        columns = ",\n    ".join(f"{name} {mysql}" for name, _, mysql in COLUMNS)
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS reminder_profile (\n    user_id BIGINT PRIMARY KEY,\n    {columns}\n)")
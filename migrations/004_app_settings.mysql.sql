@@ -0,0 +1,8 @@
+-- Migration: app_settings key/value table (admin-editable welcome message)
+-- Previously created by app_settings_operations on every read/write;
+-- the TEXT primary key it used is not valid in MySQL.
+CREATE TABLE IF NOT EXISTS app_settings (
+    `key` VARCHAR(191) PRIMARY KEY,
+    value TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
@@ -0,0 +1,7 @@
+-- Migration: app_settings key/value table (admin-editable welcome message)
+-- Previously created by app_settings_operations on every read/write.
+CREATE TABLE IF NOT EXISTS app_settings (
+    `key` TEXT PRIMARY KEY,
+    value TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
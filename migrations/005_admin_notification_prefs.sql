@@ -0,0 +1,8 @@
+-- Migration: per-admin notification preferences (mute, digest/instant)
+-- Previously created by notification_preferences on first use.
+CREATE TABLE IF NOT EXISTS admin_notification_prefs (
+    admin_id BIGINT PRIMARY KEY,
+    muted BOOLEAN NOT NULL DEFAULT FALSE,
+    priority VARCHAR(10) NOT NULL DEFAULT 'digest',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,14 @@
+-- Migration: materialised admin dashboard metrics
+-- Previously created by dashboard_metrics on first use.
+CREATE TABLE IF NOT EXISTS metric_counters (
+    metric_date DATE NOT NULL,
+    metric_key VARCHAR(64) NOT NULL,
+    event_count BIGINT NOT NULL DEFAULT 0,
+    amount_total DOUBLE NOT NULL DEFAULT 0,
+    PRIMARY KEY (metric_date, metric_key)
+);
+CREATE TABLE IF NOT EXISTS metric_snapshots (
+    section VARCHAR(32) PRIMARY KEY,
+    payload TEXT NOT NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,34 @@
+-- Migration: daily and weekly/monthly member activity rollups
+-- Previously created by rollup_operations on first use.
+CREATE TABLE IF NOT EXISTS user_daily_rollups (
+    rollup_date DATE NOT NULL,
+    user_id BIGINT NOT NULL,
+    attendance_count INT NOT NULL DEFAULT 0,
+    weight_logs INT NOT NULL DEFAULT 0,
+    water_cups INT NOT NULL DEFAULT 0,
+    meal_logs INT NOT NULL DEFAULT 0,
+    habits_completed INT NOT NULL DEFAULT 0,
+    shake_orders INT NOT NULL DEFAULT 0,
+    points_earned INT NOT NULL DEFAULT 0,
+    activity_score INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (rollup_date, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_user_daily_rollups_user ON user_daily_rollups (user_id, rollup_date);
+CREATE TABLE IF NOT EXISTS user_period_rollups (
+    period_type VARCHAR(8) NOT NULL,
+    period_start DATE NOT NULL,
+    user_id BIGINT NOT NULL,
+    active_days INT NOT NULL DEFAULT 0,
+    attendance_days INT NOT NULL DEFAULT 0,
+    weight_log_days INT NOT NULL DEFAULT 0,
+    water_log_days INT NOT NULL DEFAULT 0,
+    meal_log_days INT NOT NULL DEFAULT 0,
+    habit_log_days INT NOT NULL DEFAULT 0,
+    shake_orders INT NOT NULL DEFAULT 0,
+    points_earned INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (period_type, period_start, user_id)
+);
+CREATE TABLE IF NOT EXISTS rollup_runs (
+    rollup_date DATE PRIMARY KEY,
+    built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
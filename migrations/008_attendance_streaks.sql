@@ -0,0 +1,12 @@
+-- Migration: per-member attendance streak state
+-- Previously created by streak_operations on first use.
+CREATE TABLE IF NOT EXISTS attendance_streaks (
+    user_id BIGINT PRIMARY KEY,
+    last_checkin_date DATE,
+    current_streak INT NOT NULL DEFAULT 0,
+    longest_streak INT NOT NULL DEFAULT 0,
+    week_start DATE,
+    week_count INT NOT NULL DEFAULT 0,
+    week_weekday_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -1,7 +1,5 @@
 from datetime import time as dt_time
 import logging
-from logging.handlers import RotatingFileHandler
-import sys
 import os
 import asyncio
 from telegram import BotCommand, MenuButtonCommands, Update
@@ -15,25 +13,18 @@ from telegram.ext import (
     filters,
 )
 from src.config import TELEGRAM_BOT_TOKEN, USE_LOCAL_DB
-file_handler = RotatingFileHandler(
-    'logs/fitness_bot.log',
-    maxBytes=10*1024*1024,  # 10MB
-    backupCount=5,
-    encoding='utf-8'
-)
-file_handler.setLevel(logging.INFO)
-
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(logging.INFO)
+from src.utils.logging_setup import configure_logging
 
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO,
-    handlers=[file_handler, console_handler]
-)
+# Queued writes to logs/fitness_bot.log and stdout; LOG_* settings in src/config.py
+configure_logging('logs/fitness_bot.log')
 
 logger = logging.getLogger(__name__)
 
+# Handler modules loaded on first use (see src/utils/lazy_handlers.py)
+REPORTS = 'src.handlers.report_handlers'
+ANALYTICS = 'src.handlers.analytics_handlers'
+NOTIFICATIONS = 'src.handlers.notification_handlers'
+
 
 def _get_commands_for_role(role: str) -> list:
     """Get bot commands list based on user role.
@@ -86,6 +77,7 @@ def _get_commands_for_role(role: str) -> list:
         BotCommand("followup_settings", "Follow-up settings"),
         BotCommand("pending_requests", "Review payment requests"),
         BotCommand("reports", "Admin reports & analytics"),
+        BotCommand("perf", "Latency & startup metrics"),
             BotCommand("store_admin", "Manage store orders"),
             BotCommand("store_excel", "Bulk upload products"),
     ]
@@ -166,9 +158,12 @@ async def set_commands_for_user(user_id: int, bot) -> None:
 
 def main(start: bool = False):
 
+    # Time every src.* / heavy-library import until polling starts
+    from src.utils.lazy_handlers import start_import_timing, stop_import_timing, import_report, lazy_callback
+    start_import_timing()
+
     # Import application-specific modules here to avoid import-time side-effects
     # when other tools import `src.bot` for diagnostics.
-    from src.database.connection import test_connection
     from src.handlers.store_user_handlers import get_store_conversation_handler
     from src.handlers.store_admin_handlers import get_store_admin_conversation_handler
     from src.handlers.store_excel_handlers import get_store_excel_conversation_handler
@@ -182,7 +177,7 @@ def main(start: bool = False):
     from src.handlers.role_keyboard_handlers import (
         show_role_menu
     )
-    from src.handlers.callback_handlers import handle_callback_query
+    from src.handlers.callback_handlers import callback_router
     from src.features.debug import debug_handler
     from src.features.activity import activity_handler
     from src.features.admin import (
@@ -194,17 +189,12 @@ def main(start: bool = False):
         cmd_add_admin, cmd_remove_admin, cmd_list_admins,
         callback_approve_user, callback_reject_user, cmd_pending_users,
         cmd_manual_shake_deduction, get_manual_shake_deduction_handler,
-        cmd_qr_attendance_link, cmd_override_attendance, cmd_download_qr_code
-    )
-    from src.handlers.analytics_handlers import (
-        cmd_admin_dashboard, handle_analytics_callback,
-        callback_revenue_stats, callback_member_stats, 
-        callback_engagement_stats, callback_challenge_stats,
-        callback_top_activities, callback_admin_dashboard
+        cmd_qr_attendance_link, cmd_override_attendance, cmd_download_qr_code,
+        cmd_admin_notifications
     )
     from src.handlers.admin_dashboard_handlers import (
         cmd_admin_panel, cmd_member_list, cmd_manage_users, cmd_export_excel,
-        callback_back_to_admin_panel, get_manage_users_conversation_handler, get_template_conversation_handler, get_followup_conversation_handler
+        get_manage_users_conversation_handler, get_template_conversation_handler, get_followup_conversation_handler
     )
     from src.handlers.payment_handlers import (
         cmd_challenges, callback_pay_fee,
@@ -213,11 +203,6 @@ def main(start: bool = False):
         callback_close, cancel_payment, PAYMENT_AMOUNT, PAYMENT_METHOD, 
         PAYMENT_CONFIRM
     )
-    from src.handlers.notification_handlers import (
-        cmd_notifications, callback_view_notification, callback_delete_notification,
-        callback_mark_all_read, callback_notification_back, callback_close_notifications,
-        callback_admin_pending_subs, callback_admin_pending_payments, callback_admin_my_notifs
-    )
     from src.handlers.challenge_handlers import (
         cmd_challenges, cmd_my_challenges, callback_challenge_view,
         callback_challenge_join, callback_challenge_progress, 
@@ -241,13 +226,6 @@ def main(start: bool = False):
         payment_request_conversation, approval_conversation,
         cmd_pending_requests, callback_review_request, callback_reject_request
     )
-    from src.handlers.report_handlers import (
-        cmd_reports_menu, callback_report_overview, callback_report_active,
-        callback_report_inactive, callback_report_expiring, callback_report_today,
-        callback_report_top_performers, callback_report_inactive_users,
-        callback_report_eod, callback_export_active, callback_export_inactive,
-        callback_report_export, callback_move_expired
-    )
     from src.features.subscription import (
         cmd_subscribe, cmd_my_subscription, cmd_admin_subscriptions,
         callback_admin_approve_sub, callback_approve_sub_standard,
@@ -283,24 +261,19 @@ def main(start: bool = False):
         send_followup_reminders, lock_expired_subscriptions
     )
 
-    # Skip DB test when running in local-only mode
+    # The DB connection test runs as a deferred startup stage once polling is up
+    # (see src.utils.startup); local mode and SKIP_DB_TEST=1 skip it.
+    skip_db_test = USE_LOCAL_DB or os.environ.get('SKIP_DB_TEST') == '1'
     if USE_LOCAL_DB:
         logger.info("USE_LOCAL_DB=true - skipping DB connection test and remote DB usage")
         logger.info("[BOT] started in LOCAL MODE")
-    else:
-        logger.info("Testing database connection...")
-        if os.environ.get('SKIP_DB_TEST') != '1':
-            if not test_connection():
-                logger.error("Database connection failed!")
-                sys.exit(1)
-        else:
-            logger.info("SKIP_DB_TEST=1 set - skipping DB connection test")
-
-    logger.info("Database OK! Starting bot...")
+    elif skip_db_test:
+        logger.info("SKIP_DB_TEST=1 set - skipping DB connection test")
 
     # If no token is available (e.g., local/test mode), skip building the bot entirely
     if not TELEGRAM_BOT_TOKEN:
         logger.info("[APP] TELEGRAM_BOT_TOKEN missing or disabled - skipping Application build (local/test mode)")
+        stop_import_timing()
         return None
 
     # Reduce socket timeout for faster initialization
@@ -317,12 +290,18 @@ def main(start: bool = False):
 
     # Build application with explicit job queue configuration for Python 3.13 compatibility
     from telegram.ext import JobQueue
-    application = (
+    from src.config import TELEGRAM_API_BASE_URL
+    from src.utils.timed_request import TimedHTTPXRequest
+    builder = (
         Application.builder()
         .token(TELEGRAM_BOT_TOKEN)
+        .request(TimedHTTPXRequest())
         .job_queue(JobQueue())
-        .build()
     )
+    if TELEGRAM_API_BASE_URL:
+        logger.info(f"[APP] Using Bot API server at {TELEGRAM_API_BASE_URL}")
+        builder = builder.base_url(f"{TELEGRAM_API_BASE_URL}/bot").base_file_url(f"{TELEGRAM_API_BASE_URL}/file/bot")
+    application = builder.build()
     logger.info("[APP] Telegram Application built successfully")
 
     # Register global command menu so Telegram shows command buttons.
@@ -536,8 +515,10 @@ def main(start: bool = False):
     application.add_handler(get_manual_shake_deduction_handler())
     application.add_handler(CommandHandler('qr_attendance_link', cmd_qr_attendance_link))
     application.add_handler(CommandHandler('override_attendance', cmd_override_attendance))
+    application.add_handler(CommandHandler('admin_notifications', cmd_admin_notifications))
     application.add_handler(CommandHandler('download_qr_code', cmd_download_qr_code))
     application.add_handler(CommandHandler('admin_panel', cmd_admin_panel))
+    application.add_handler(CommandHandler('perf', lazy_callback('src.handlers.perf_handlers:cmd_perf')))
     application.add_handler(CommandHandler('my_subscription', cmd_my_subscription))
     application.add_handler(CommandHandler('admin_subscriptions', cmd_admin_subscriptions))
     application.add_handler(get_admin_settings_handler())
@@ -549,115 +530,108 @@ def main(start: bool = False):
     
     # ==================== SUBSCRIPTION & PAYMENT CALLBACKS ====================
 
-    application.add_handler(CallbackQueryHandler(callback_admin_approve_sub, pattern="^admin_sub_approve$"))
-    application.add_handler(CallbackQueryHandler(callback_approve_sub_standard, pattern="^sub_approve_"))
-    application.add_handler(CallbackQueryHandler(callback_reject_sub, pattern="^sub_reject_"))
-    application.add_handler(CallbackQueryHandler(callback_custom_amount, pattern="^sub_custom_"))
-    application.add_handler(CallbackQueryHandler(callback_select_end_date, pattern="^date_"))
+    callback_router.add(callback_admin_approve_sub, exact="admin_sub_approve")
+    callback_router.add(callback_approve_sub_standard, prefix="sub_approve_")
+    callback_router.add(callback_reject_sub, prefix="sub_reject_")
+    callback_router.add(callback_custom_amount, prefix="sub_custom_")
+    callback_router.add(callback_select_end_date, prefix="date_")
     
     # UPI/Cash rejection handlers (approval is now in conversation handler)
-    application.add_handler(CallbackQueryHandler(callback_admin_reject_upi, pattern="^admin_reject_upi_"))
-    application.add_handler(CallbackQueryHandler(callback_admin_reject_cash, pattern="^admin_reject_cash_"))
+    callback_router.add(callback_admin_reject_upi, prefix="admin_reject_upi_")
+    callback_router.add(callback_admin_reject_cash, prefix="admin_reject_cash_")
     
     # Numeric messages for staff ID assignment/removal (AFTER ConversationHandler)
     application.add_handler(MessageHandler(filters.Regex('^\\d{6,}$'), handle_staff_id_input))
     # User approval callbacks
-    application.add_handler(CallbackQueryHandler(callback_approve_user, pattern=r'^approve_user_\d+$'))
-    application.add_handler(CallbackQueryHandler(callback_reject_user, pattern=r'^reject_user_\d+$'))
-    application.add_handler(CallbackQueryHandler(cmd_admin_panel, pattern="^admin_dashboard_menu$"))
-    application.add_handler(CallbackQueryHandler(cmd_member_list, pattern="^admin_members_list"))
-    application.add_handler(CallbackQueryHandler(cmd_export_excel, pattern="^admin_export_excel$"))
-    application.add_handler(CallbackQueryHandler(callback_back_to_admin_panel, pattern="^admin_dashboard_menu$"))
+    callback_router.add(callback_approve_user, prefix="approve_user_")
+    callback_router.add(callback_reject_user, prefix="reject_user_")
+    callback_router.add(cmd_admin_panel, exact="admin_dashboard_menu")
+    callback_router.add(cmd_member_list, prefix="admin_members_list")
+    callback_router.add(cmd_export_excel, exact="admin_export_excel")
     
     # Phase 3 handlers
     application.add_handler(CommandHandler('challenges', cmd_challenges))
     application.add_handler(CommandHandler('my_challenges', cmd_my_challenges))
-    application.add_handler(CommandHandler('notifications', cmd_notifications))
-    application.add_handler(CommandHandler('admin_dashboard', cmd_admin_dashboard))
+    application.add_handler(CommandHandler('notifications', lazy_callback(f'{NOTIFICATIONS}:cmd_notifications')))
+    application.add_handler(CommandHandler('admin_dashboard', lazy_callback(f'{ANALYTICS}:cmd_admin_dashboard')))
     
     # Followup settings
     application.add_handler(CommandHandler('followup_settings', cmd_followup_settings))
-    application.add_handler(CallbackQueryHandler(cmd_followup_settings, pattern="^cmd_followup_settings$"))
-    application.add_handler(CallbackQueryHandler(cmd_tune_followup_settings, pattern="^tune_followup_settings$"))
-    application.add_handler(CallbackQueryHandler(callback_tune_followup_interval, pattern="^tune_(7day|14day|30day)$"))
-    application.add_handler(CallbackQueryHandler(view_broadcast_history, pattern="^view_followup_log$"))
+    callback_router.add(cmd_followup_settings, exact="cmd_followup_settings")
+    callback_router.add(cmd_tune_followup_settings, exact="tune_followup_settings")
+    callback_router.add(callback_tune_followup_interval, exact=("tune_7day", "tune_14day", "tune_30day"))
+    callback_router.add(view_broadcast_history, exact="view_followup_log")
     
     # Payment request command handlers
     application.add_handler(CommandHandler('pending_requests', cmd_pending_requests))
-    application.add_handler(CallbackQueryHandler(callback_review_request, pattern=r'^review_request_\d+$'))
-    application.add_handler(CallbackQueryHandler(callback_reject_request, pattern=r'^reject_req_\d+$'))
+    callback_router.add(callback_review_request, prefix="review_request_")
+    callback_router.add(callback_reject_request, prefix="reject_req_")
     
     # Report handlers
-    application.add_handler(CommandHandler('reports', cmd_reports_menu))
-    application.add_handler(CallbackQueryHandler(cmd_reports_menu, pattern="^cmd_reports_menu$"))
-    application.add_handler(CallbackQueryHandler(callback_report_overview, pattern="^report_overview$"))
-    application.add_handler(CallbackQueryHandler(callback_report_active, pattern="^report_active$"))
-    application.add_handler(CallbackQueryHandler(callback_report_inactive, pattern="^report_inactive$"))
-    application.add_handler(CallbackQueryHandler(callback_report_expiring, pattern="^report_expiring$"))
-    application.add_handler(CallbackQueryHandler(callback_report_today, pattern="^report_today$"))
-    application.add_handler(CallbackQueryHandler(callback_report_top_performers, pattern="^report_top_performers$"))
-    application.add_handler(CallbackQueryHandler(callback_report_inactive_users, pattern="^report_inactive_users$"))
+    application.add_handler(CommandHandler('reports', lazy_callback(f'{REPORTS}:cmd_reports_menu')))
+    callback_router.add(f'{REPORTS}:cmd_reports_menu', exact="cmd_reports_menu")
+    callback_router.add(f'{REPORTS}:callback_report_overview', exact="report_overview")
+    callback_router.add(f'{REPORTS}:callback_report_active', exact="report_active")
+    callback_router.add(f'{REPORTS}:callback_report_inactive', exact="report_inactive")
+    callback_router.add(f'{REPORTS}:callback_report_expiring', exact="report_expiring")
+    callback_router.add(f'{REPORTS}:callback_report_today', exact="report_today")
+    callback_router.add(f'{REPORTS}:callback_report_top_performers', exact="report_top_performers")
+    callback_router.add(f'{REPORTS}:callback_report_inactive_users', exact="report_inactive_users")
     
     # Invoice Report handlers (AFTER general reports)
     logger.info("[BOT] Registering Invoice Report handlers")
     application.add_handler(get_invoice_report_conversation_handler())
     for handler in get_invoice_report_callbacks():
         application.add_handler(handler)
-    application.add_handler(CallbackQueryHandler(callback_report_eod, pattern="^report_eod$"))
-    application.add_handler(CallbackQueryHandler(callback_export_active, pattern="^export_active$"))
-    application.add_handler(CallbackQueryHandler(callback_export_inactive, pattern="^export_inactive$"))
-    application.add_handler(CallbackQueryHandler(callback_report_export, pattern="^report_export$"))
-    application.add_handler(CallbackQueryHandler(callback_move_expired, pattern="^report_move_expired$"))
+    callback_router.add(f'{REPORTS}:callback_report_eod', exact="report_eod")
+    callback_router.add(f'{REPORTS}:callback_export_active', exact="export_active")
+    callback_router.add(f'{REPORTS}:callback_export_inactive', exact="export_inactive")
+    callback_router.add(f'{REPORTS}:callback_report_export', exact="report_export")
+    callback_router.add(f'{REPORTS}:callback_move_expired', exact="report_move_expired")
     
     # Analytics dashboard handlers (FIXED: Register all callbacks directly)
-    application.add_handler(CallbackQueryHandler(callback_revenue_stats, pattern="^dashboard_revenue$"))
-    application.add_handler(CallbackQueryHandler(callback_member_stats, pattern="^dashboard_members$"))
-    application.add_handler(CallbackQueryHandler(callback_engagement_stats, pattern="^dashboard_engagement$"))
-    application.add_handler(CallbackQueryHandler(callback_challenge_stats, pattern="^dashboard_challenges$"))
-    application.add_handler(CallbackQueryHandler(callback_top_activities, pattern="^dashboard_activities$"))
-    application.add_handler(CallbackQueryHandler(callback_admin_dashboard, pattern="^admin_dashboard$"))
-    
-    # ==================== GENERIC CALLBACK HANDLER (LAST PRIORITY) ====================
-    # Exclude ALL conversation-managed callbacks to prevent interception:
-    # - manage_* (User Management: toggle_ban, delete_user, etc.)
-    # - admin_invoice (Invoice v2 creation)
-    # - cmd_invoices, inv2_*, inv_* (Invoice callbacks)
-    # - sub_*, admin_sub_* (Subscriptions)
-    # - pay_method, admin_approve, admin_reject (Payments)
-    application.add_handler(CallbackQueryHandler(
-        handle_callback_query, 
-        pattern="^(?!pay_method|admin_approve|admin_reject|sub_|admin_sub_|edit_weight|cancel|cmd_invoices|inv_|inv2_|manage_|admin_invoice)"
-    ))
-    logger.info("[BOT] ✅ Generic callback handler registered (LAST - with exclusions)")
-    application.add_handler(CallbackQueryHandler(handle_analytics_callback))
-    application.add_handler(CallbackQueryHandler(callback_view_notification, pattern="^notif_"))
-    application.add_handler(CallbackQueryHandler(callback_delete_notification, pattern="^delete_notif_"))
-    application.add_handler(CallbackQueryHandler(callback_mark_all_read, pattern="^mark_all_read$"))
-    application.add_handler(CallbackQueryHandler(callback_notification_back, pattern="^notif_back$"))
-    application.add_handler(CallbackQueryHandler(callback_close_notifications, pattern="^close_notif$"))
-    application.add_handler(CallbackQueryHandler(callback_admin_pending_subs, pattern="^admin_pending_subs$"))
-    application.add_handler(CallbackQueryHandler(callback_admin_pending_payments, pattern="^admin_pending_payments$"))
+    callback_router.add(f'{ANALYTICS}:callback_revenue_stats', exact="dashboard_revenue")
+    callback_router.add(f'{ANALYTICS}:callback_member_stats', exact="dashboard_members")
+    callback_router.add(f'{ANALYTICS}:callback_engagement_stats', exact="dashboard_engagement")
+    callback_router.add(callback_challenge_stats, exact="dashboard_challenges")
+    callback_router.add(f'{ANALYTICS}:callback_top_activities', exact="dashboard_activities")
+    callback_router.add(f'{ANALYTICS}:callback_admin_dashboard', exact="admin_dashboard")
+    
+    # Keyset-paginated admin lists (Prev/Next buttons: kp:<list>:...)
+    from src.utils.keyset_pagination import handle_keyset_callback, KEYSET_CALLBACK_PATTERN
+    application.add_handler(CallbackQueryHandler(handle_keyset_callback, pattern=KEYSET_CALLBACK_PATTERN))
+    # Storefront catalogue pages (Prev/Next buttons: catpage_<section>_<page>[_<key>])
+    callback_router.add('src.handlers.storefront_handlers:browse_catalogue_page', prefix="catpage_")
+    
+    # Notifications, AR and challenge buttons
+    callback_router.add(f'{NOTIFICATIONS}:callback_view_notification', prefix="notif_")
+    callback_router.add(f'{NOTIFICATIONS}:callback_delete_notification', prefix="delete_notif_")
+    callback_router.add(f'{NOTIFICATIONS}:callback_mark_all_read', exact="mark_all_read")
+    callback_router.add(f'{NOTIFICATIONS}:callback_notification_back', exact="notif_back")
+    callback_router.add(f'{NOTIFICATIONS}:callback_close_notifications', exact="close_notif")
+    callback_router.add(f'{NOTIFICATIONS}:callback_admin_pending_subs', exact="admin_pending_subs")
+    callback_router.add(f'{NOTIFICATIONS}:callback_admin_pending_payments', exact="admin_pending_payments")
     # AR export overdue list
-    application.add_handler(CallbackQueryHandler(ar_export_overdue, pattern="^ar_export_overdue$"))
-    application.add_handler(CallbackQueryHandler(ar_credit_summary, pattern="^ar_credit_summary$"))
-    application.add_handler(CallbackQueryHandler(callback_admin_my_notifs, pattern="^admin_my_notifs$"))
-    application.add_handler(CallbackQueryHandler(callback_challenge_view, pattern="^challenge_view_"))
-    application.add_handler(CallbackQueryHandler(callback_challenge_join, pattern="^challenge_join_"))
-    application.add_handler(CallbackQueryHandler(callback_challenge_progress, pattern="^challenge_progress_"))
-    application.add_handler(CallbackQueryHandler(callback_challenge_leaderboard, pattern="^challenge_board_"))
-    application.add_handler(CallbackQueryHandler(callback_challenge_back, pattern="^challenge_back$"))
-    application.add_handler(CallbackQueryHandler(callback_challenge_close, pattern="^challenge_close$"))
-    application.add_handler(CallbackQueryHandler(callback_close, pattern="^close$"))
+    callback_router.add(ar_export_overdue, exact="ar_export_overdue")
+    callback_router.add(ar_credit_summary, exact="ar_credit_summary")
+    callback_router.add(f'{NOTIFICATIONS}:callback_admin_my_notifs', exact="admin_my_notifs")
+    callback_router.add(callback_challenge_view, prefix="challenge_view_")
+    callback_router.add(callback_challenge_join, prefix="challenge_join_")
+    callback_router.add(callback_challenge_progress, prefix="challenge_progress_")
+    callback_router.add(callback_challenge_leaderboard, prefix="challenge_board_")
+    callback_router.add(callback_challenge_back, exact="challenge_back")
+    callback_router.add(callback_challenge_close, exact="challenge_close")
+    callback_router.add(callback_close, exact="close")
     
     # Phase 6: Admin Challenge Creation Handlers
     application.add_handler(CommandHandler('admin_challenges', cmd_admin_challenges))
     application.add_handler(get_admin_challenge_handler())
-    application.add_handler(CallbackQueryHandler(callback_create_challenge, pattern="^admin_create_challenge$"))
-    application.add_handler(CallbackQueryHandler(callback_view_active_challenges, pattern="^admin_view_active_challenges$"))
-    application.add_handler(CallbackQueryHandler(callback_payment_status, pattern="^admin_payment_status$"))
-    application.add_handler(CallbackQueryHandler(callback_challenge_stats, pattern="^admin_challenge_stats$"))
-    application.add_handler(CallbackQueryHandler(callback_confirm_create, pattern="^confirm_create_challenge$"))
-    application.add_handler(CallbackQueryHandler(callback_cancel_create, pattern="^cancel_create_challenge$"))
+    callback_router.add(callback_create_challenge, exact="admin_create_challenge")
+    callback_router.add(callback_view_active_challenges, exact="admin_view_active_challenges")
+    callback_router.add(callback_payment_status, exact="admin_payment_status")
+    callback_router.add(callback_challenge_stats, exact="admin_challenge_stats")
+    callback_router.add(callback_confirm_create, exact="confirm_create_challenge")
+    callback_router.add(callback_cancel_create, exact="cancel_create_challenge")
     
     # Phase 7: Challenge callbacks from challenge_handlers.py
     register_challenge_callbacks(application)
@@ -668,11 +642,18 @@ def main(start: bool = False):
         callback_quick_turn_off_water_reminder, callback_quick_water_interval,
         callback_quick_water_interval_custom, handle_custom_water_interval_input
     )
-    application.add_handler(CallbackQueryHandler(callback_quick_log_water, pattern="^quick_log_water$"))
-    application.add_handler(CallbackQueryHandler(callback_quick_set_water_timer, pattern="^quick_set_water_timer$"))
-    application.add_handler(CallbackQueryHandler(callback_quick_turn_off_water_reminder, pattern="^quick_turn_off_water_reminder$"))
-    application.add_handler(CallbackQueryHandler(callback_quick_water_interval, pattern="^quick_water_interval_"))
-    application.add_handler(CallbackQueryHandler(callback_quick_water_interval_custom, pattern="^quick_water_interval_custom$"))
+    callback_router.add(callback_quick_log_water, exact="quick_log_water")
+    callback_router.add(callback_quick_set_water_timer, exact="quick_set_water_timer")
+    callback_router.add(callback_quick_turn_off_water_reminder, exact="quick_turn_off_water_reminder")
+    callback_router.add(callback_quick_water_interval, prefix="quick_water_interval_")
+    callback_router.add(callback_quick_water_interval_custom, exact="quick_water_interval_custom")
+
+    # ==================== CALLBACK ROUTER ====================
+    # One handler for every callback_data routed above and in callback_handlers:
+    # exact dict + longest-prefix trie. It only claims routed data, so
+    # conversation-managed callbacks (inv2_*, manage_*, pay_method_* ...) are
+    # never intercepted.
+    callback_router.mount(application)
     
     # Global text handler moved to group=1 to allow conversation handlers (group=0) to process first
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_custom_water_interval_input), group=1)
@@ -707,17 +688,59 @@ def main(start: bool = False):
     )
     logger.info("Scheduled expiry check at 00:01")
     
-    # Per-user water & weight reminders (bootstrap)
-    try:
-        from src.utils.scheduled_jobs import schedule_all_user_reminders
-        # During local debugging we may skip scheduling user reminders which
-        # execute DB queries at startup. Honor SKIP_DB_TEST, SKIP_DB_MIGRATIONS, or SKIP_SCHEDULING.
-        if os.environ.get('SKIP_DB_TEST') == '1' or os.environ.get('SKIP_DB_MIGRATIONS') == '1' or os.environ.get('SKIP_SCHEDULING') == '1':
-            logger.info("Skipping scheduling of user reminders (SKIP_DB_TEST/SKIP_DB_MIGRATIONS/SKIP_SCHEDULING set)")
-        else:
-            schedule_all_user_reminders(application)
-    except Exception as e:
-        logger.warning(f"Per-user reminder bootstrap failed: {e}")
+    # Check-in fast path: new day's registry at midnight (rush alerts go through flush_admin_digests)
+    from src.utils.checkin_fastpath import reset_checkin_registry
+    job_queue.run_daily(
+        reset_checkin_registry,
+        time=dt_time(hour=0, minute=0),
+        name="reset_checkin_registry"
+    )
+    logger.info("Scheduled check-in registry reset at 00:00")
+    
+    # Eligibility snapshot: full rebuild after midnight (grace counts roll over)
+    from src.utils.eligibility_snapshot import rebuild_eligibility_snapshot
+    job_queue.run_daily(
+        rebuild_eligibility_snapshot,
+        time=dt_time(hour=0, minute=2),
+        name="rebuild_eligibility_snapshot"
+    )
+    logger.info("Scheduled eligibility snapshot rebuild at 00:02")
+    
+    # Admin dashboard metrics: periodic snapshot rebuild (the 30-day counter backfill is a startup stage)
+    from src.config import DASHBOARD_REFRESH_SECONDS
+    from src.database.dashboard_metrics import refresh_dashboard_metrics_job
+    job_queue.run_repeating(
+        refresh_dashboard_metrics_job,
+        interval=DASHBOARD_REFRESH_SECONDS,
+        first=DASHBOARD_REFRESH_SECONDS,
+        name="refresh_dashboard_metrics"
+    )
+    logger.info(f"Scheduled dashboard metrics refresh every {DASHBOARD_REFRESH_SECONDS}s")
+    
+    # Member activity rollups for /reports and the EOD report (missing days are backfilled at startup)
+    from src.database.rollup_operations import build_daily_rollups_job
+    job_queue.run_daily(
+        build_daily_rollups_job,
+        time=dt_time(hour=0, minute=10),
+        name="build_activity_rollups"
+    )
+    logger.info("Scheduled activity rollups at 00:10")
+    
+    # Deferred startup: DB check, schema migrations, per-user reminder bootstrap,
+    # cache warm-up and the dashboard/rollup/streak backfills run in the background
+    # once polling has started.
+    # During local debugging the reminder bootstrap, cache warm-up and backfills (DB queries)
+    # can be skipped via SKIP_DB_TEST, SKIP_DB_MIGRATIONS, or SKIP_SCHEDULING.
+    from src.utils.startup import schedule_startup_stages
+    skip_bootstrap = any(os.environ.get(flag) == '1' for flag in ('SKIP_DB_TEST', 'SKIP_DB_MIGRATIONS', 'SKIP_SCHEDULING'))
+    if skip_bootstrap:
+        logger.info("Skipping scheduling of user reminders (SKIP_DB_TEST/SKIP_DB_MIGRATIONS/SKIP_SCHEDULING set)")
+    schedule_startup_stages(
+        application,
+        skip_db=skip_db_test,
+        skip_migrations=os.environ.get('SKIP_DB_MIGRATIONS') == '1',
+        skip_bootstrap=skip_bootstrap,
+    )
     
     # Habits reminder every evening at 8 PM
     job_queue.run_daily(
@@ -847,17 +870,43 @@ def main(start: bool = False):
     # ================================================================
     # Start Flask web server on main thread (waitress WSGI server)
     # This allows QR attendance endpoints while polling continues
-    if os.environ.get('SKIP_FLASK') != '1':
+    # With WEB_SERVER_MODE=external the web tier runs as its own service
+    # (python -m src.web.server); either way its admin notifications arrive
+    # through the shared event queue drained below.
+    from src.config import WEB_SERVER_MODE, WEB_PORT, WEB_EVENT_POLL_SECONDS, ADMIN_DIGEST_WINDOW_SECONDS
+    from src.utils.admin_notifications import drain_admin_notifications
+    from src.utils.notification_digest import flush_admin_digests
+    application.job_queue.run_repeating(
+        drain_admin_notifications,
+        interval=WEB_EVENT_POLL_SECONDS,
+        first=WEB_EVENT_POLL_SECONDS,
+        name="drain_admin_notifications"
+    )
+    application.job_queue.run_repeating(
+        flush_admin_digests,
+        interval=ADMIN_DIGEST_WINDOW_SECONDS,
+        first=ADMIN_DIGEST_WINDOW_SECONDS,
+        name="flush_admin_digests"
+    )
+    
+    if os.environ.get('SKIP_FLASK') == '1':
+        logger.info("Skipping Flask web server (SKIP_FLASK=1)")
+    elif WEB_SERVER_MODE == 'external':
+        from src.config import METRICS_PUBLISH_SECONDS
+        from src.utils.metrics import publish_metrics_snapshot
+        # The web workers' /metrics can only see this process's series through the shared state
+        application.job_queue.run_repeating(
+            publish_metrics_snapshot,
+            interval=METRICS_PUBLISH_SECONDS,
+            first=METRICS_PUBLISH_SECONDS,
+            name="publish_metrics_snapshot"
+        )
+        logger.info("QR web tier runs externally (WEB_SERVER_MODE=external)")
+    else:
         try:
             import threading
-            import time
             from src.web.app import create_app
             from waitress import serve
-            from src.utils.admin_notifications import set_telegram_app
-            
-            # Set telegram app reference for admin notifications
-            set_telegram_app(application)
-            logger.info("Telegram app reference set for admin notifications")
             
             # Create Flask app
             flask_app = create_app()
@@ -865,9 +914,9 @@ def main(start: bool = False):
             
             # Start Flask on separate thread using waitress
             def run_flask():
-                logger.info("Starting Flask web server on :5000...")
+                logger.info(f"Starting Flask web server on :{WEB_PORT}...")
                 try:
-                    serve(flask_app, host='0.0.0.0', port=5000, _quiet=True)
+                    serve(flask_app, host='0.0.0.0', port=WEB_PORT, _quiet=True)
                 except Exception as e:
                     logger.error(f"Flask server error: {e}", exc_info=True)
             
@@ -875,20 +924,24 @@ def main(start: bool = False):
             flask_thread.start()
             logger.info("Flask thread started (daemon)")
             
-            # Give Flask 1 second to start before polling
-            try:
-                time.sleep(1)
-            except KeyboardInterrupt:
-                logger.info("Flask startup interrupted")
-            
         except ImportError:
             logger.warning("Flask or waitress not installed - QR attendance disabled")
         except Exception as e:
             logger.error(f"Error starting Flask: {e}", exc_info=True)
             logger.warning("Continuing bot without Flask web server")
-    else:
-        logger.info("Skipping Flask web server (SKIP_FLASK=1)")
     
+    # Per-handler/job latency (src.utils.metrics); registered last so every handler is covered
+    from src.config import QUERY_PROFILE
+    from src.utils.metrics import instrument_handlers, instrument_jobs
+    instrument_handlers(application)
+    instrument_jobs(application)
+    if QUERY_PROFILE:
+        from src.utils.query_profiler import set_query_profiling
+        set_query_profiling(True)
+
+    stop_import_timing()
+    logger.info(f"[STARTUP] {import_report()}")
+
     # Only start the polling/long-running loop when explicitly requested
     if start:
         logger.info("Bot starting...")
@@ -937,6 +990,8 @@ def main(start: bool = False):
         finally:
             logger.info("[BOT] Bot shutdown complete")
 
+    return application
+
 if __name__ == '__main__':
     # When executed as a script we start the full bot loop
     main(start=True)
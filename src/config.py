@@ -17,6 +17,8 @@ if USE_LOCAL_DB and USE_REMOTE_DB:
     raise RuntimeError("Config error: USE_LOCAL_DB and USE_REMOTE_DB cannot both be true")
 
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN') or ''
+# Bot API server root, e.g. http://127.0.0.1:8081 for the load-test stand-in (tools/loadtest); empty = Telegram
+TELEGRAM_API_BASE_URL = os.getenv('TELEGRAM_API_BASE_URL', '').rstrip('/')
 
 # In local/test mode, we still need the bot token to run polling
 # Commented out to allow bot to run with local DB
@@ -51,6 +53,73 @@ def _to_float(val: str, default: float) -> float:
 GEOFENCE_LAT = _to_float(os.getenv('GEOFENCE_LAT', '0'), 0.0)
 GEOFENCE_LNG = _to_float(os.getenv('GEOFENCE_LNG', '0'), 0.0)
 GEOFENCE_RADIUS_M = int(os.getenv('GEOFENCE_RADIUS_M', '10'))
+# Several studios: JSON list of {"name", "lat", "lng", "radius_m"}; overrides GEOFENCE_LAT/LNG
+STUDIO_LOCATIONS = os.getenv('STUDIO_LOCATIONS', '')
+
+# Morning check-in rush: moderator alerts go into the ADMIN_DIGEST_WINDOW_SECONDS digest in this window
+CHECKIN_RUSH_START_HOUR = int(os.getenv('CHECKIN_RUSH_START_HOUR', '6'))
+CHECKIN_RUSH_END_HOUR = int(os.getenv('CHECKIN_RUSH_END_HOUR', '8'))
+
+# QR web tier: 'embedded' (waitress thread inside the bot) or 'external' (python -m src.web.server)
+WEB_SERVER_MODE = os.getenv('WEB_SERVER_MODE', 'embedded').lower()
+WEB_PORT = int(os.getenv('WEB_PORT', '5000'))
+WEB_WORKERS = int(os.getenv('WEB_WORKERS', '2'))
+WEB_THREADS = int(os.getenv('WEB_THREADS', '4'))
+# Events (attendance marked, overrides) handed from web workers to the bot process
+WEB_SHARED_STATE_DB = os.getenv('WEB_SHARED_STATE_DB', str(DATA_DIR / 'web_shared_state.db'))
+WEB_EVENT_POLL_SECONDS = int(os.getenv('WEB_EVENT_POLL_SECONDS', '2'))
+# With WEB_SERVER_MODE=external, how often each process applies the others' eligibility changes
+ELIGIBILITY_SYNC_SECONDS = float(os.getenv('ELIGIBILITY_SYNC_SECONDS', '2'))
+# Admin notifications are coalesced per admin into one digest per window
+ADMIN_DIGEST_WINDOW_SECONDS = int(os.getenv('ADMIN_DIGEST_WINDOW_SECONDS', '60'))
+# Admin dashboard snapshots (member counts, revenue, challenges) are rebuilt on this interval
+DASHBOARD_REFRESH_SECONDS = int(os.getenv('DASHBOARD_REFRESH_SECONDS', '600'))
+# Member activity rollups: days rebuilt at startup if missing (reports only read rolled-up days)
+ROLLUP_BACKFILL_DAYS = int(os.getenv('ROLLUP_BACKFILL_DAYS', '90'))
+# Per-user My Stats figures are cached this long (writers invalidate on change)
+USER_STATS_TTL_SECONDS = int(os.getenv('USER_STATS_TTL_SECONDS', '120'))
+# Background startup stages: DB check retry interval, reminder profiles scheduled per event-loop slice
+STARTUP_DB_RETRY_SECONDS = int(os.getenv('STARTUP_DB_RETRY_SECONDS', '60'))
+REMINDER_BOOTSTRAP_BATCH = int(os.getenv('REMINDER_BOOTSTRAP_BATCH', '200'))
+# Latency metrics: recent samples kept per series for percentiles
+METRICS_WINDOW = int(os.getenv('METRICS_WINDOW', '1024'))
+# Token for the web app's /metrics (X-Metrics-Token header or ?token=); the endpoint returns 404 while unset
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+# With WEB_SERVER_MODE=external, how often the bot publishes its series for the web tier's /metrics
+METRICS_PUBLISH_SECONDS = int(os.getenv('METRICS_PUBLISH_SECONDS', '15'))
+# Opt-in query profiler (src/utils/query_profiler.py, report: tools/query_report.py)
+QUERY_PROFILE = os.getenv('QUERY_PROFILE', '0') == '1'
+QUERY_PROFILE_LOG = os.getenv('QUERY_PROFILE_LOG', str(BASE_DIR / 'logs' / 'query_profile.jsonl'))
+SLOW_QUERY_LOG = os.getenv('SLOW_QUERY_LOG', str(BASE_DIR / 'logs' / 'slow_queries.log'))
+SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', '200'))
+# Outgoing email (src/services/email_service.py); SMTP_SECURITY: 'starttls', 'ssl' or 'none' (local test servers)
+SMTP_SERVER = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
+SMTP_PORT = int(os.getenv('SMTP_PORT', '587'))
+SMTP_SECURITY = os.getenv('SMTP_SECURITY', 'starttls').lower()
+SENDER_EMAIL = os.getenv('SENDER_EMAIL', '')
+SENDER_PASSWORD = os.getenv('SENDER_PASSWORD', '')
+SENDER_NAME = os.getenv('SENDER_NAME', 'Fitness Club')
+# Email dispatcher: pooled SMTP sessions (= sender threads), messages per session before it is recycled,
+# messages sent per session checkout, retries for transient failures with exponential backoff
+SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', '2'))
+SMTP_MESSAGES_PER_SESSION = int(os.getenv('SMTP_MESSAGES_PER_SESSION', '100'))
+SMTP_TIMEOUT_SECONDS = int(os.getenv('SMTP_TIMEOUT_SECONDS', '20'))
+EMAIL_BATCH_SIZE = int(os.getenv('EMAIL_BATCH_SIZE', '20'))
+EMAIL_MAX_RETRIES = int(os.getenv('EMAIL_MAX_RETRIES', '3'))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv('EMAIL_RETRY_BASE_SECONDS', '2'))
+# Logging (src/utils/logging_setup.py): 'text' or 'json' lines, root level, per-logger levels,
+# and 1-in-N sampling of DEBUG/INFO records per [TAG]
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_LEVELS = os.getenv('LOG_LEVELS', 'httpx=WARNING,apscheduler=WARNING')
+LOG_SAMPLE = os.getenv('LOG_SAMPLE', 'ACCESS=10,USER_REGISTRY=10,REMINDER_SENT=10')
+
+# QR attendance tokens: 'memory' (per process) or 'sqlite' (survives restarts, shared by web workers)
+ATTENDANCE_TOKEN_BACKEND = os.getenv(
+    'ATTENDANCE_TOKEN_BACKEND', 'sqlite' if WEB_SERVER_MODE == 'external' else 'memory'
+).lower()
+ATTENDANCE_TOKEN_DB = os.getenv('ATTENDANCE_TOKEN_DB', str(DATA_DIR / 'attendance_tokens.db'))
+ATTENDANCE_TOKEN_SHARDS = int(os.getenv('ATTENDANCE_TOKEN_SHARDS', '16'))
 
 # Minimal feature flags and defaults
 POINTS_CONFIG = {
@@ -5,6 +5,10 @@ from src.config import POINTS_CONFIG
 
 logger = logging.getLogger(__name__)
 
+def _invalidate_stats(user_id: int):
+    from src.utils.user_stats_cache import invalidate_user_stats
+    invalidate_user_stats(user_id)
+
 def log_daily_activity(user_id: int, weight: float = None, water_cups: int = 0, 
                        meals_logged: int = 0, habits_completed: bool = False, 
                        attendance: bool = False):
@@ -23,6 +27,7 @@ def log_daily_activity(user_id: int, weight: float = None, water_cups: int = 0,
                 attendance = %s
         """
         execute_query(query1, (user_id, weight, water_cups, meals_logged, habits_completed, attendance, weight, weight, water_cups, meals_logged, habits_completed, attendance))
+        _invalidate_stats(user_id)
         
         # Get the result
         query2 = "SELECT * FROM daily_logs WHERE user_id = %s AND log_date = CURRENT_DATE"
@@ -75,6 +80,7 @@ def log_weight(user_id: int, weight: float):
         ON DUPLICATE KEY UPDATE weight = %s
     """
     execute_query(query1, (user_id, weight, weight))
+    _invalidate_stats(user_id)
     
     # Get the result
     query2 = "SELECT * FROM daily_logs WHERE user_id = %s AND log_date = CURRENT_DATE"
@@ -92,6 +98,7 @@ def log_water(user_id: int, cups: int = 1):
         ON DUPLICATE KEY UPDATE water_cups = water_cups + %s
     """
     execute_query(query1, (user_id, cups, cups))
+    _invalidate_stats(user_id)
     
     # Get the result
     query2 = "SELECT * FROM daily_logs WHERE user_id = %s AND log_date = CURRENT_DATE"
@@ -110,6 +117,7 @@ def log_meal(user_id: int):
         ON DUPLICATE KEY UPDATE meals_logged = IF(meals_logged < 4, meals_logged + 1, meals_logged)
     """
     execute_query(query1, (user_id,))
+    _invalidate_stats(user_id)
     
     # Get the result
     query2 = "SELECT * FROM daily_logs WHERE user_id = %s AND log_date = CURRENT_DATE"
@@ -127,6 +135,7 @@ def log_habits(user_id: int):
         ON DUPLICATE KEY UPDATE habits_completed = true
     """
     execute_query(query1, (user_id,))
+    _invalidate_stats(user_id)
     
     # Get the result
     query2 = "SELECT * FROM daily_logs WHERE user_id = %s AND log_date = CURRENT_DATE"
@@ -149,6 +158,10 @@ def add_points(user_id: int, points: int, activity: str, description: str = ""):
         # Update user total_points
         query2 = "UPDATE users SET total_points = total_points + %s WHERE user_id = %s"
         execute_query(query2, (points, user_id))
+        _invalidate_stats(user_id)
+        
+        from src.database.dashboard_metrics import record_points_metric
+        record_points_metric(activity, points)
         
         logger.info(f"Added {points} points to user {user_id} for {activity}")
         return True
@@ -1,36 +1,22 @@
 """Database operations for application-wide settings.
 
 Stores arbitrary key/value pairs in the `app_settings` table. Used for
-admin-editable welcome message.
+admin-editable welcome message. The table is created by
+migrations/004_app_settings.*.sql.
 """
 
 import logging
 from src.database.connection import execute_query
+from src.config import USE_LOCAL_DB, USE_REMOTE_DB
 
 logger = logging.getLogger(__name__)
 
-TABLE_SQL = """
-CREATE TABLE IF NOT EXISTS app_settings (
-    key TEXT PRIMARY KEY,
-    value TEXT,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-)
-"""
-
-
-def _ensure_table():
-    try:
-        execute_query(TABLE_SQL)
-    except Exception as e:
-        logger.warning(f"[SETTINGS] Failed to ensure app_settings table: {e}")
-
 
 def get_app_setting(key: str, default: str = None) -> str:
     """Fetch a setting by key with optional default."""
-    _ensure_table()
     try:
         row = execute_query(
-            "SELECT value FROM app_settings WHERE key = %s",
+            "SELECT value FROM app_settings WHERE `key` = %s",
             (key,),
             fetch_one=True,
         )
@@ -43,17 +29,14 @@ def get_app_setting(key: str, default: str = None) -> str:
 
 def set_app_setting(key: str, value: str) -> None:
     """Upsert a setting value."""
-    _ensure_table()
+    if USE_LOCAL_DB and not USE_REMOTE_DB:
+        conflict = "ON CONFLICT(`key`) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP"
+    else:
+        conflict = "ON DUPLICATE KEY UPDATE value = VALUES(value), updated_at = CURRENT_TIMESTAMP"
     try:
         execute_query(
-            """
-            INSERT INTO app_settings (key, value, updated_at)
-            VALUES (%s, %s, CURRENT_TIMESTAMP)
-            ON DUPLICATE KEY UPDATE
-                value = VALUES(value),
-                updated_at = CURRENT_TIMESTAMP
-            """,
+            f"INSERT INTO app_settings (`key`, value, updated_at) VALUES (%s, %s, CURRENT_TIMESTAMP) {conflict}",
             (key, value),
         )
     except Exception as e:
-        logger.warning(f"[SETTINGS] set_app_setting failed for {key}: {e}")
\ No newline at end of file
+        logger.warning(f"[SETTINGS] set_app_setting failed for {key}: {e}")
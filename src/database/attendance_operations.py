@@ -1,7 +1,8 @@
 import logging
 from datetime import datetime
-from src.database.connection import execute_query
-from src.config import POINTS_CONFIG
+from src.database.connection import execute_query, get_db_cursor
+from src.database.pagination import KEYSET_PAGE_SIZE, KeysetPage, fetch_keyset_page
+from src.config import POINTS_CONFIG, USE_LOCAL_DB, USE_REMOTE_DB
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +39,8 @@ def create_attendance_request(user_id: int, source: str = 'manual', details: str
         if result:
             queue_id = result.get('queue_id')
             logger.info(f"Attendance request created for user {user_id} from {source}: queue_id={queue_id}")
+            from src.database.dashboard_metrics import record_attendance_metric
+            record_attendance_metric()
             return queue_id
         else:
             logger.error(f"Failed to create attendance for user {user_id}")
@@ -59,6 +62,17 @@ def get_pending_attendance_requests(limit: int = 20):
     """
     return execute_query(query, (limit,))
 
+def get_pending_attendance_page(after: int = None, before: int = None, limit: int = KEYSET_PAGE_SIZE) -> KeysetPage:
+    """Keyset page of today's pending attendance requests (oldest first)"""
+    query = """
+        SELECT a.*, u.full_name, u.telegram_id, u.telegram_username
+        FROM attendance_queue a
+        JOIN users u ON a.user_id = u.user_id
+        WHERE a.status = 'pending'
+        AND a.request_date = CURRENT_DATE
+    """
+    return fetch_keyset_page(query, (), 'a.attendance_id', limit=limit, after=after, before=before)
+
 def approve_attendance(attendance_id: int, admin_user_id: int):
     """Approve an attendance request"""
     try:
@@ -92,7 +106,7 @@ def approve_attendance(attendance_id: int, admin_user_id: int):
         
         # Fetch updated record with user details
         result = execute_query(
-            """SELECT user_id FROM attendance_queue WHERE attendance_id = %s AND status = 'approved'""",
+            """SELECT user_id, queue_date FROM attendance_queue WHERE attendance_id = %s AND status = 'approved'""",
             (attendance_id,),
             fetch_one=True
         )
@@ -111,6 +125,14 @@ def approve_attendance(attendance_id: int, admin_user_id: int):
             execute_query(query3, (POINTS_CONFIG['attendance'], user_id))
             
             logger.info(f"Attendance approved for user {user_id}, awarded {POINTS_CONFIG['attendance']} points")
+            from src.database.dashboard_metrics import record_points_metric
+            record_points_metric('attendance', POINTS_CONFIG['attendance'])
+            from src.utils.eligibility_snapshot import record_grace_attendance
+            record_grace_attendance(user_id)
+            from src.database.streak_operations import record_attendance_streak
+            record_attendance_streak(user_id, result.get('queue_date'))
+            from src.utils.user_stats_cache import invalidate_user_stats
+            invalidate_user_stats(user_id)
             result['already_processed'] = False
             return result
         return None
@@ -151,6 +173,9 @@ def reject_attendance(attendance_id: int, admin_user_id: int, reason: str = ""):
         if result:
             result['already_processed'] = False
             logger.info(f"Attendance rejected for user {result['user_id']}, reason: {reason}")
+            # A rejected member may check in again today
+            from src.utils.checkin_fastpath import forget_checkin
+            forget_checkin(result['user_id'])
         return result
     except Exception as e:
         logger.error(f"Failed to reject attendance: {e}")
@@ -184,6 +209,113 @@ def check_duplicate_attendance(user_id: int) -> bool:
         return True
 
 
+def record_checkin_fast(user_id: int, approver_id: int) -> dict:
+    """
+    Check-in fast path: one transaction per check-in
+    
+    Reads the member, then upserts today's row against UNIQUE(user_id, queue_date):
+    a new row (or a retry after rejection) is written, an existing pending/approved
+    row is left alone. Paid members are approved and awarded points in the same
+    transaction.
+    
+    Returns:
+        dict with created, approved, attendance_id, full_name, phone, request_date;
+        None if the user does not exist. Raises on database errors.
+    """
+    local = USE_LOCAL_DB and not USE_REMOTE_DB
+    ph = '?' if local else '%s'
+    if local:
+        upsert = f"""
+            INSERT INTO attendance_queue (user_id, queue_date, status, approved_by, approved_at)
+            VALUES ({ph}, CURRENT_DATE, {ph}, {ph}, {ph})
+            ON CONFLICT(user_id, queue_date) DO UPDATE SET
+                status = excluded.status, approved_by = excluded.approved_by, approved_at = excluded.approved_at
+            WHERE attendance_queue.status = 'rejected'
+        """
+    else:
+        upsert = f"""
+            INSERT INTO attendance_queue (user_id, queue_date, status, approved_by, approved_at)
+            VALUES ({ph}, CURRENT_DATE, {ph}, {ph}, {ph})
+            ON DUPLICATE KEY UPDATE
+                approved_by = IF(status = 'rejected', VALUES(approved_by), approved_by),
+                approved_at = IF(status = 'rejected', VALUES(approved_at), approved_at),
+                status = IF(status = 'rejected', VALUES(status), status)
+        """
+    
+    with get_db_cursor() as cursor:
+        cursor.execute(f"SELECT full_name, phone, fee_status FROM users WHERE user_id = {ph}", (user_id,))
+        user = cursor.fetchone()
+        if not user:
+            return None
+        user = dict(user)
+        
+        approved = (user.get('fee_status') or '').lower() in ('paid', 'active')
+        status = 'approved' if approved else 'pending'
+        approved_by = approver_id if approved else None
+        approved_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S') if approved else None
+        cursor.execute(upsert, (user_id, status, approved_by, approved_at))
+        created = cursor.rowcount > 0
+        
+        result = {
+            'created': created,
+            'approved': approved and created,
+            'attendance_id': None,
+            'full_name': user.get('full_name'),
+            'phone': user.get('phone'),
+            'request_date': datetime.now().date(),
+        }
+        if not created:
+            return result
+        
+        cursor.execute(
+            f"SELECT * FROM attendance_queue WHERE user_id = {ph} AND queue_date = CURRENT_DATE",
+            (user_id,)
+        )
+        row = cursor.fetchone()
+        if row:
+            row = dict(row)
+            result['attendance_id'] = row.get('attendance_id') or row.get('queue_id')
+        
+        if approved:
+            points = POINTS_CONFIG.get('attendance', 0)
+            cursor.execute(
+                f"INSERT INTO points_transactions (user_id, points, activity, description) "
+                f"VALUES ({ph}, {ph}, 'attendance', 'Gym attendance approved')",
+                (user_id, points)
+            )
+            cursor.execute(
+                f"UPDATE users SET total_points = total_points + {ph} WHERE user_id = {ph}",
+                (points, user_id)
+            )
+    
+    if result['created']:
+        from src.database.dashboard_metrics import record_attendance_metric, record_points_metric
+        record_attendance_metric()
+        if result['approved']:
+            record_points_metric('attendance', POINTS_CONFIG.get('attendance', 0))
+    if result['approved']:
+        from src.utils.eligibility_snapshot import record_grace_attendance
+        from src.database.streak_operations import record_attendance_streak
+        from src.utils.user_stats_cache import invalidate_user_stats
+        record_grace_attendance(user_id)
+        record_attendance_streak(user_id, result['request_date'])
+        invalidate_user_stats(user_id)
+    logger.info(f"[CHECKIN] user={user_id} created={created} approved={result['approved']}")
+    return result
+
+
+def get_checked_in_user_ids_today() -> list:
+    """User IDs with a pending or approved attendance row today"""
+    try:
+        rows = execute_query(
+            "SELECT user_id FROM attendance_queue WHERE queue_date = CURRENT_DATE AND status IN ('pending', 'approved')"
+        )
+        return [row['user_id'] for row in rows or []]
+    except Exception as e:
+        logger.error(f"Error loading today's check-ins: {e}")
+        return []
+
+
 def get_user_attendance_today(user_id: int):
     """Check if user already requested attendance today"""
     query = """
@@ -223,19 +355,10 @@ def get_monthly_attendance(user_id: int, month: int = None, year: int = None):
 def get_weekly_attendance_count(user_id: int):
     """
     Get user's attendance count for current week (Monday-Saturday).
-    Excludes Sundays (holiday).
-    """
-    query = """
-        SELECT COUNT(*) as days_attended
-        FROM attendance_queue
-        WHERE user_id = %s
-        AND status = 'approved'
-        AND queue_date >= CURRENT_DATE - INTERVAL '7 days'
-        AND EXTRACT(DOW FROM queue_date) != 0
-        AND queue_date <= CURRENT_DATE
+    Excludes Sundays (holiday). Read from the streak tracker.
     """
-    result = execute_query(query, (user_id,), fetch_one=True)
-    return result['days_attended'] if result else 0
+    from src.database.streak_operations import get_streak_summary
+    return get_streak_summary(user_id)['week_weekday_count']
 
 def award_weekly_bonus(user_id: int, admin_user_id: int):
     """
@@ -273,6 +396,10 @@ def award_weekly_bonus(user_id: int, admin_user_id: int):
             # Update user points
             query_update = "UPDATE users SET total_points = total_points + %s WHERE user_id = %s"
             execute_query(query_update, (bonus_points, user_id))
+            from src.database.dashboard_metrics import record_points_metric
+            record_points_metric('weekly_bonus', bonus_points)
+            from src.utils.user_stats_cache import invalidate_user_stats
+            invalidate_user_stats(user_id)
             
             logger.info(f"Weekly bonus awarded to user {user_id}: {attendance_count} days attended, +{bonus_points} points")
             return {'user_id': user_id, 'days_attended': attendance_count, 'bonus_points': bonus_points}
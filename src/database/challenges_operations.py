@@ -223,6 +223,10 @@ def award_challenge_reward(user_id: int, challenge_id: int, reward_points: int =
         
         query2 = "UPDATE users SET total_points = total_points + %s WHERE user_id = %s"
         execute_query(query2, (reward_points, user_id))
+        from src.database.dashboard_metrics import record_points_metric
+        record_points_metric('challenge_completion', reward_points)
+        from src.utils.user_stats_cache import invalidate_user_stats
+        invalidate_user_stats(user_id)
         
         query3 = """
             UPDATE challenge_participants
@@ -238,18 +242,9 @@ def award_challenge_reward(user_id: int, challenge_id: int, reward_points: int =
         return False
 
 def get_challenge_stats():
-    """Get overall challenge statistics"""
-    query = """
-        SELECT 
-            COUNT(*) as total_challenges,
-            COUNT(CASE WHEN status = 'active' THEN 1 END) as active_challenges,
-            COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_challenges,
-            (SELECT COUNT(*) FROM challenge_participants WHERE status = 'active') as active_participants,
-            (SELECT COUNT(DISTINCT user_id) FROM challenge_participants 
-             WHERE status = 'completed') as users_completed
-        FROM challenges
-    """
-    return execute_query(query, fetch_one=True)
+    """Get overall challenge statistics (from materialised metrics)"""
+    from src.database.dashboard_metrics import get_section, SECTION_CHALLENGES
+    return get_section(SECTION_CHALLENGES)
 
 def update_challenge_progress(user_id: int, challenge_id: int, progress_value: int):
     """Update user's progress on a challenge"""
@@ -1,12 +1,15 @@
 import pymysql
 from pymysql import InterfaceError, OperationalError
-from pymysql.cursors import DictCursor
+from pymysql.cursors import DictCursor, SSDictCursor
 from contextlib import contextmanager
 import logging
 import sqlite3
 from pathlib import Path
 from src.config import DATABASE_CONFIG, USE_REMOTE_DB, USE_LOCAL_DB
 import threading
+import time
+from src.utils import query_profiler
+from src.utils.metrics import fingerprint, record
 
 logger = logging.getLogger(__name__)
 
@@ -17,66 +20,6 @@ logger = logging.getLogger(__name__)
 # .parent.parent.parent = fitness-club-telegram-bot/ (project root)
 LOCAL_DB_PATH = Path(__file__).resolve().parent.parent.parent / 'fitness_club.db'
 
-# Guard to run SQLite schema check once per process
-_sqlite_schema_checked = False
-
-
-def _ensure_sqlite_reminder_schema(conn: sqlite3.Connection) -> None:
-    """Ensure reminder_profile exists with required columns in local SQLite mode."""
-    try:
-        cursor = conn.cursor()
-        cursor.execute("PRAGMA table_info(reminder_profile)")
-        cols = [row[1] for row in cursor.fetchall()]  # row[1] is column name
-
-        # Create table if missing
-        if not cols:
-            try:
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS reminder_profile (
-                        user_id INTEGER PRIMARY KEY,
-                        weight_enabled INTEGER DEFAULT 1,
-                        weight_time TEXT DEFAULT '06:00',
-                        water_enabled INTEGER DEFAULT 1,
-                        water_interval_minutes INTEGER DEFAULT 60,
-                        lunch_enabled INTEGER DEFAULT 0,
-                        lunch_time TEXT DEFAULT '13:00',
-                        dinner_enabled INTEGER DEFAULT 0,
-                        dinner_time TEXT DEFAULT '20:00',
-                        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-                    )
-                    """
-                )
-                conn.commit()
-                cursor.execute("PRAGMA table_info(reminder_profile)")
-                cols = [row[1] for row in cursor.fetchall()]
-                logger.info("[DB] created reminder_profile table with default columns for local mode")
-            except Exception as create_err:
-                logger.error(f"[DB] Failed to create reminder_preferences table: {create_err}")
-                return
-
-        desired = {
-            'weight_enabled': "ALTER TABLE reminder_profile ADD COLUMN weight_enabled INTEGER DEFAULT 1",
-            'weight_time': "ALTER TABLE reminder_profile ADD COLUMN weight_time TEXT DEFAULT '06:00'",
-            'water_enabled': "ALTER TABLE reminder_profile ADD COLUMN water_enabled INTEGER DEFAULT 1",
-            'water_interval_minutes': "ALTER TABLE reminder_profile ADD COLUMN water_interval_minutes INTEGER DEFAULT 60",
-            'lunch_enabled': "ALTER TABLE reminder_profile ADD COLUMN lunch_enabled INTEGER DEFAULT 0",
-            'lunch_time': "ALTER TABLE reminder_profile ADD COLUMN lunch_time TEXT DEFAULT '13:00'",
-            'dinner_enabled': "ALTER TABLE reminder_profile ADD COLUMN dinner_enabled INTEGER DEFAULT 0",
-            'dinner_time': "ALTER TABLE reminder_profile ADD COLUMN dinner_time TEXT DEFAULT '20:00'",
-            'updated_at': "ALTER TABLE reminder_profile ADD COLUMN updated_at TEXT DEFAULT CURRENT_TIMESTAMP",
-        }
-
-        for col_name, alter_sql in desired.items():
-            if col_name not in cols:
-                try:
-                    cursor.execute(alter_sql)
-                    logger.info(f"[DB] Added missing column {col_name} to reminder_profile")
-                except Exception as add_err:
-                    logger.error(f"[DB] Failed to add column {col_name}: {add_err}")
-        conn.commit()
-    except Exception as e:
-        logger.error(f"[DB] Failed reminder_profile schema check: {e}")
 
 class DatabaseConnectionPool:
     """Thread-safe connection pool for concurrent user access"""
@@ -139,15 +82,10 @@ def get_db_cursor(commit=True):
     cursor = None
 
     # If running in local-mode, use SQLite
-    global _sqlite_schema_checked
-
     if pool is None and USE_LOCAL_DB:
         try:
             conn = sqlite3.connect(LOCAL_DB_PATH)
             conn.row_factory = sqlite3.Row  # Return rows as dict-like objects
-            if not _sqlite_schema_checked:
-                _ensure_sqlite_reminder_schema(conn)
-                _sqlite_schema_checked = True
             cursor = conn.cursor()
             yield cursor
             if commit:
@@ -216,7 +154,27 @@ def execute_query(query: str, params: tuple = None, fetch_one: bool = False, ret
     """Execute a query using connection pool - supports concurrent users with auto-retry on connection errors
     
     Automatically converts PostgreSQL syntax (%s) to SQLite syntax (?) when in local mode.
+    Latency is recorded per SQL fingerprint (src.utils.metrics), retries included,
+    and passed to the query profiler when it is enabled.
     """
+    start = time.perf_counter()
+    result = None
+    error = False
+    try:
+        result = _execute_query(query, params, fetch_one, retry_count)
+        return result
+    except Exception:
+        error = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        fp = fingerprint(query)
+        record('query', fp, elapsed, error)
+        if query_profiler.ENABLED:
+            query_profiler.observe(fp, elapsed, result, params, error)
+
+
+def _execute_query(query: str, params: tuple = None, fetch_one: bool = False, retry_count: int = 0):
     max_retries = 2
     
     # Convert PostgreSQL %s placeholders to SQLite ? placeholders in local mode
@@ -261,13 +219,53 @@ def execute_query(query: str, params: tuple = None, fetch_one: bool = False, ret
                 pool_manager._pool = None
             
             # Retry the query
-            return execute_query(query, params, fetch_one, retry_count + 1)
+            return _execute_query(query, params, fetch_one, retry_count + 1)
         
         raise
     except Exception as e:
         logger.error(f"Unexpected database error: {e}")
         raise
 
+def stream_query(query: str, params: tuple = None, batch_size: int = 500):
+    """Yield SELECT rows as dicts without buffering the whole result set.
+
+    MySQL uses an unbuffered server-side cursor (SSDictCursor); SQLite cursors
+    are already lazy. The connection stays open until the generator is
+    exhausted or closed, so consume it promptly and off the event loop.
+    """
+    pool = DatabaseConnectionPool().get_pool()
+    if pool is None:
+        conn = sqlite3.connect(LOCAL_DB_PATH)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        query = query.replace('%s', '?')
+    else:
+        conn_config = dict(pool['config'])
+        conn_config['cursorclass'] = SSDictCursor
+        # Large exports can sit between fetches while the consumer writes rows
+        conn_config['read_timeout'] = 300
+        conn = pymysql.connect(**conn_config)
+        cursor = conn.cursor()
+
+    try:
+        cursor.execute(query, params or ())
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+    finally:
+        try:
+            cursor.close()
+        except Exception as cur_exc:
+            logger.debug(f"Error closing streaming cursor: {cur_exc}")
+        try:
+            conn.close()
+        except Exception as conn_exc:
+            logger.debug(f"Error closing streaming connection: {conn_exc}")
+
+
 def get_connection():
     """Get database connection from pool (for backward compatibility)
     
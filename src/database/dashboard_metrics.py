@@ -0,0 +1,326 @@
+"""
+Materialised metrics for the admin dashboard.
+
+Two stores back the dashboard so opening it never scans whole tables:
+
+- metric_counters: per-day counters ('points', 'points:<activity>',
+  'attendance') bumped by the writers right after their own insert
+  (add_points, attendance approval/check-in, challenge rewards,
+  create_attendance_request). Range reads are at most ~30 rows per key.
+- metric_snapshots: one JSON row per dashboard section for figures that
+  need a whole-table or DISTINCT aggregate (member counts, revenue,
+  challenges). Rebuilt by the `refresh_dashboard_metrics_job`; payment
+  approvals apply their amount to the revenue snapshot immediately.
+
+The refresh job also re-derives the last few days of counters from
+points_transactions / attendance_queue, so a missed bump heals itself.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from src.database.connection import execute_query
+from src.config import USE_LOCAL_DB, USE_REMOTE_DB
+
+logger = logging.getLogger(__name__)
+
+METRIC_POINTS = 'points'
+METRIC_ATTENDANCE = 'attendance'
+ENGAGEMENT_WINDOW_DAYS = 30
+RECONCILE_DAYS = 2
+
+SECTION_PLATFORM = 'platform'
+SECTION_ENGAGEMENT = 'engagement'
+SECTION_REVENUE = 'revenue'
+SECTION_CHALLENGES = 'challenges'
+
+
+def _upsert_counter_sql(accumulate: bool) -> str:
+    if USE_LOCAL_DB and not USE_REMOTE_DB:
+        op = "{col} = {col} + excluded.{col}" if accumulate else "{col} = excluded.{col}"
+        conflict = "ON CONFLICT(metric_date, metric_key) DO UPDATE SET "
+    else:
+        op = "{col} = {col} + VALUES({col})" if accumulate else "{col} = VALUES({col})"
+        conflict = "ON DUPLICATE KEY UPDATE "
+    sets = ", ".join(op.format(col=col) for col in ('event_count', 'amount_total'))
+    return (
+        "INSERT INTO metric_counters (metric_date, metric_key, event_count, amount_total) "
+        f"VALUES (%s, %s, %s, %s) {conflict}{sets}"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+def bump_metric(metric_key: str, amount: float = 0, count: int = 1, metric_date: date = None) -> None:
+    """Add to today's counter; never raises (the caller's write already succeeded)"""
+    try:
+        execute_query(_upsert_counter_sql(True), (metric_date or date.today(), metric_key, count, amount))
+    except Exception as e:
+        logger.error(f"[METRICS] bump {metric_key} failed: {e}")
+
+
+def record_points_metric(activity: str, points: int) -> None:
+    """Count one points_transactions row"""
+    bump_metric(METRIC_POINTS, points)
+    bump_metric(f"{METRIC_POINTS}:{activity}", points)
+
+
+def record_attendance_metric() -> None:
+    bump_metric(METRIC_ATTENDANCE)
+
+
+def record_payment_metric(amount: float) -> None:
+    """Apply a completed fee payment to the revenue snapshot (payers refresh with the next rebuild)"""
+    try:
+        snapshot = get_dashboard_snapshot(SECTION_REVENUE)
+        if not snapshot:
+            return
+        amount = float(amount or 0)
+        month = date.today().strftime('%Y-%m')
+        snapshot['total_payments'] = int(snapshot.get('total_payments') or 0) + 1
+        snapshot['total_revenue'] = float(snapshot.get('total_revenue') or 0) + amount
+        snapshot['avg_payment'] = snapshot['total_revenue'] / snapshot['total_payments']
+        snapshot['last_payment_date'] = datetime.now().isoformat(sep=' ', timespec='seconds')
+        if snapshot.get('month') == month:
+            snapshot['monthly_revenue'] = float(snapshot.get('monthly_revenue') or 0) + amount
+            snapshot['transaction_count'] = int(snapshot.get('transaction_count') or 0) + 1
+        _save_snapshot(SECTION_REVENUE, snapshot)
+    except Exception as e:
+        logger.error(f"[METRICS] revenue update failed: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Readers (constant-size reads)
+# ---------------------------------------------------------------------------
+
+def get_metric_totals(metric_key: str, start: date, end: date = None) -> Dict:
+    """{'count', 'amount'} summed over [start, end] for one key"""
+    row = execute_query(
+        "SELECT SUM(event_count) AS event_count, SUM(amount_total) AS amount_total FROM metric_counters "
+        "WHERE metric_key = %s AND metric_date BETWEEN %s AND %s",
+        (metric_key, start, end or date.today()),
+        fetch_one=True,
+    ) or {}
+    return {'count': int(row.get('event_count') or 0), 'amount': float(row.get('amount_total') or 0)}
+
+
+def get_activity_totals(start: date, end: date = None) -> List[Dict]:
+    """Per-activity {'activity', 'frequency', 'total_points'} over [start, end], most frequent first"""
+    rows = execute_query(
+        "SELECT metric_key, SUM(event_count) AS frequency, SUM(amount_total) AS total_points FROM metric_counters "
+        "WHERE metric_key LIKE %s AND metric_date BETWEEN %s AND %s GROUP BY metric_key",
+        (f"{METRIC_POINTS}:%", start, end or date.today()),
+    ) or []
+    activities = [
+        {
+            'activity': row['metric_key'].split(':', 1)[1],
+            'frequency': int(row['frequency'] or 0),
+            'total_points': float(row['total_points'] or 0),
+        }
+        for row in rows
+    ]
+    for activity in activities:
+        activity['avg_points'] = activity['total_points'] / activity['frequency'] if activity['frequency'] else 0
+    activities.sort(key=lambda a: a['frequency'], reverse=True)
+    return activities
+
+
+def get_dashboard_snapshot(section: str) -> Optional[Dict]:
+    row = execute_query("SELECT payload, refreshed_at FROM metric_snapshots WHERE section = %s", (section,), fetch_one=True)
+    if not row:
+        return None
+    snapshot = json.loads(row['payload'])
+    snapshot['refreshed_at'] = row['refreshed_at']
+    return snapshot
+
+
+def _save_snapshot(section: str, payload: Dict) -> None:
+    payload = {k: v for k, v in payload.items() if k != 'refreshed_at'}
+    body = json.dumps(payload, default=str)
+    if USE_LOCAL_DB and not USE_REMOTE_DB:
+        sql = ("INSERT INTO metric_snapshots (section, payload, refreshed_at) VALUES (%s, %s, CURRENT_TIMESTAMP) "
+               "ON CONFLICT(section) DO UPDATE SET payload = excluded.payload, refreshed_at = CURRENT_TIMESTAMP")
+    else:
+        sql = ("INSERT INTO metric_snapshots (section, payload, refreshed_at) VALUES (%s, %s, CURRENT_TIMESTAMP) "
+               "ON DUPLICATE KEY UPDATE payload = VALUES(payload), refreshed_at = CURRENT_TIMESTAMP")
+    execute_query(sql, (section, body))
+
+
+# ---------------------------------------------------------------------------
+# Refresh
+# ---------------------------------------------------------------------------
+
+def _compute_platform() -> Dict:
+    users = execute_query(
+        """
+        SELECT
+            COUNT(*) AS total_users,
+            SUM(CASE WHEN fee_status = 'paid' THEN 1 ELSE 0 END) AS active_members,
+            SUM(total_points) AS total_points,
+            AVG(CASE WHEN total_points > 0 THEN total_points END) AS avg_points
+        FROM users
+        """,
+        fetch_one=True,
+    ) or {}
+    today = execute_query(
+        "SELECT COUNT(DISTINCT user_id) AS today_users FROM daily_logs WHERE log_date = %s",
+        (date.today(),),
+        fetch_one=True,
+    ) or {}
+    return {
+        'total_users': int(users.get('total_users') or 0),
+        'active_members': int(users.get('active_members') or 0),
+        'total_points': int(users.get('total_points') or 0),
+        'avg_points': float(users.get('avg_points') or 0),
+        'today_users': int(today.get('today_users') or 0),
+    }
+
+
+def _compute_engagement() -> Dict:
+    since = date.today() - timedelta(days=ENGAGEMENT_WINDOW_DAYS)
+    row = execute_query(
+        """
+        SELECT
+            COUNT(DISTINCT pt.user_id) AS active_users,
+            COUNT(DISTINCT CASE WHEN u.fee_status = 'paid' THEN u.user_id END) AS paid_members
+        FROM points_transactions pt
+        LEFT JOIN users u ON pt.user_id = u.user_id
+        WHERE pt.created_at >= %s
+        """,
+        (since,),
+        fetch_one=True,
+    ) or {}
+    return {'active_users': int(row.get('active_users') or 0), 'paid_members': int(row.get('paid_members') or 0)}
+
+
+def _compute_revenue() -> Dict:
+    totals = execute_query(
+        """
+        SELECT COUNT(*) AS total_payments, SUM(amount) AS total_revenue, AVG(amount) AS avg_payment,
+               COUNT(DISTINCT user_id) AS unique_payers, MAX(created_at) AS last_payment_date
+        FROM fee_payments WHERE status = 'completed'
+        """,
+        fetch_one=True,
+    ) or {}
+    month_start = date.today().replace(day=1)
+    monthly = execute_query(
+        """
+        SELECT SUM(amount) AS monthly_revenue, COUNT(*) AS transaction_count, COUNT(DISTINCT user_id) AS payers
+        FROM fee_payments WHERE status = 'completed' AND created_at >= %s
+        """,
+        (month_start,),
+        fetch_one=True,
+    ) or {}
+    return {
+        'total_payments': int(totals.get('total_payments') or 0),
+        'total_revenue': float(totals.get('total_revenue') or 0),
+        'avg_payment': float(totals.get('avg_payment') or 0),
+        'unique_payers': int(totals.get('unique_payers') or 0),
+        'last_payment_date': totals.get('last_payment_date'),
+        'month': month_start.strftime('%Y-%m'),
+        'monthly_revenue': float(monthly.get('monthly_revenue') or 0),
+        'transaction_count': int(monthly.get('transaction_count') or 0),
+        'payers': int(monthly.get('payers') or 0),
+    }
+
+
+def _compute_challenges() -> Dict:
+    challenges = execute_query(
+        """
+        SELECT COUNT(*) AS total_challenges,
+               SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) AS active_challenges,
+               SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS completed_challenges
+        FROM challenges
+        """,
+        fetch_one=True,
+    ) or {}
+    participants = execute_query(
+        """
+        SELECT SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) AS active_participants,
+               COUNT(DISTINCT CASE WHEN status = 'completed' THEN user_id END) AS users_completed
+        FROM challenge_participants
+        """,
+        fetch_one=True,
+    ) or {}
+    return {
+        'total_challenges': int(challenges.get('total_challenges') or 0),
+        'active_challenges': int(challenges.get('active_challenges') or 0),
+        'completed_challenges': int(challenges.get('completed_challenges') or 0),
+        'active_participants': int(participants.get('active_participants') or 0),
+        'users_completed': int(participants.get('users_completed') or 0),
+    }
+
+
+SECTION_BUILDERS = {
+    SECTION_PLATFORM: _compute_platform,
+    SECTION_ENGAGEMENT: _compute_engagement,
+    SECTION_REVENUE: _compute_revenue,
+    SECTION_CHALLENGES: _compute_challenges,
+}
+
+
+def reconcile_counters(days: int = RECONCILE_DAYS) -> int:
+    """Re-derive the last `days` days of counters from the source tables; returns rows written"""
+    start = date.today() - timedelta(days=days - 1)
+    points = execute_query(
+        "SELECT DATE(created_at) AS metric_date, activity, COUNT(*) AS event_count, SUM(points) AS amount_total "
+        "FROM points_transactions WHERE created_at >= %s GROUP BY DATE(created_at), activity",
+        (start,),
+    ) or []
+    attendance = execute_query(
+        "SELECT queue_date AS metric_date, COUNT(*) AS event_count FROM attendance_queue "
+        "WHERE queue_date >= %s GROUP BY queue_date",
+        (start,),
+    ) or []
+
+    totals: Dict[tuple, List[float]] = {}
+    for row in points:
+        day = str(row['metric_date'])
+        for key in (METRIC_POINTS, f"{METRIC_POINTS}:{row['activity']}"):
+            acc = totals.setdefault((day, key), [0, 0.0])
+            acc[0] += int(row['event_count'] or 0)
+            acc[1] += float(row['amount_total'] or 0)
+    for row in attendance:
+        totals[(str(row['metric_date']), METRIC_ATTENDANCE)] = [int(row['event_count'] or 0), 0.0]
+
+    execute_query(
+        "DELETE FROM metric_counters WHERE metric_date >= %s AND (metric_key = %s OR metric_key LIKE %s OR metric_key = %s)",
+        (start, METRIC_POINTS, f"{METRIC_POINTS}:%", METRIC_ATTENDANCE),
+    )
+    sql = _upsert_counter_sql(False)
+    for (day, key), (count, amount) in totals.items():
+        execute_query(sql, (day, key, count, amount))
+    return len(totals)
+
+
+def refresh_dashboard_metrics(reconcile_days: int = RECONCILE_DAYS) -> None:
+    """Rebuild every snapshot section and reconcile recent counters"""
+    for section, builder in SECTION_BUILDERS.items():
+        try:
+            _save_snapshot(section, builder())
+        except Exception as e:
+            logger.error(f"[METRICS] refresh {section} failed: {e}")
+    try:
+        rows = reconcile_counters(reconcile_days)
+        logger.info(f"[METRICS] dashboard refreshed, counters reconciled days={reconcile_days} rows={rows}")
+    except Exception as e:
+        logger.error(f"[METRICS] counter reconcile failed: {e}")
+
+
+async def refresh_dashboard_metrics_job(context) -> None:
+    """Job callback (the wider startup backfill is the `dashboard` startup stage)"""
+    await asyncio.to_thread(refresh_dashboard_metrics)
+
+
+def get_section(section: str) -> Dict:
+    """Snapshot for `section`, computing it once if it has never been built"""
+    snapshot = get_dashboard_snapshot(section)
+    if snapshot is None:
+        snapshot = SECTION_BUILDERS[section]()
+        _save_snapshot(section, snapshot)
+    return snapshot
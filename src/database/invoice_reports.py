@@ -4,21 +4,10 @@ Provides database operations for generating invoice reports by date range
 """
 
 from datetime import datetime, timedelta
-from src.database.connection import execute_query
+from src.database.connection import execute_query, stream_query
 
 
-def get_invoices_by_date_range(start_date, end_date):
-    """
-    Fetch all invoices within a date range with full details
-    
-    Args:
-        start_date: datetime object for start of range
-        end_date: datetime object for end of range
-        
-    Returns:
-        List of invoice dicts with customer details and totals
-    """
-    query = """
+_INVOICES_BY_DATE_RANGE_QUERY = """
     SELECT 
         i.invoice_id,
         i.user_id,
@@ -38,7 +27,21 @@ def get_invoices_by_date_range(start_date, end_date):
     WHERE DATE(i.created_at) BETWEEN %s AND %s
     GROUP BY i.invoice_id
     ORDER BY i.created_at DESC
+"""
+
+
+def get_invoices_by_date_range(start_date, end_date):
+    """
+    Fetch all invoices within a date range with full details
+    
+    Args:
+        start_date: datetime object for start of range
+        end_date: datetime object for end of range
+        
+    Returns:
+        List of invoice dicts with customer details and totals
     """
+    query = _INVOICES_BY_DATE_RANGE_QUERY
     
     invoices = execute_query(
         query,
@@ -49,6 +52,53 @@ def get_invoices_by_date_range(start_date, end_date):
     return invoices or []
 
 
+def iter_invoices_by_date_range(start_date, end_date, batch_size=500):
+    """
+    Stream invoices within a date range (same rows as get_invoices_by_date_range)
+    
+    Rows come from a server-side cursor, so memory stays flat for yearly
+    exports. Iterate in a worker thread, not on the event loop.
+    """
+    return stream_query(
+        _INVOICES_BY_DATE_RANGE_QUERY,
+        (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')),
+        batch_size=batch_size
+    )
+
+
+def get_month_range(year, month):
+    """First and last day of a month"""
+    start = datetime(year, month, 1)
+    if month == 12:
+        end = datetime(year + 1, 1, 1) - timedelta(days=1)
+    else:
+        end = datetime(year, month + 1, 1) - timedelta(days=1)
+    return start, end
+
+
+def get_quarter_range(year, quarter):
+    """First and last day of a quarter (1-4)"""
+    start_month = (quarter - 1) * 3 + 1
+    start = datetime(year, start_month, 1)
+    if quarter == 4:
+        end = datetime(year + 1, 1, 1) - timedelta(days=1)
+    else:
+        end = datetime(year, start_month + 3, 1) - timedelta(days=1)
+    return start, end
+
+
+def get_half_year_range(year, half):
+    """First and last day of the first or second half of a year (1 or 2)"""
+    if half == 1:
+        return datetime(year, 1, 1), datetime(year, 6, 30)
+    return datetime(year, 7, 1), datetime(year, 12, 31)
+
+
+def get_year_range(year):
+    """First and last day of a year"""
+    return datetime(year, 1, 1), datetime(year, 12, 31)
+
+
 def get_invoice_summary(start_date, end_date):
     """
     Get summary statistics for invoices in date range
@@ -100,90 +150,42 @@ def get_invoice_summary(start_date, end_date):
 
 def get_monthly_invoices(year, month):
     """Get invoices for a specific month"""
-    start = datetime(year, month, 1)
-    if month == 12:
-        end = datetime(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        end = datetime(year, month + 1, 1) - timedelta(days=1)
-    
-    return get_invoices_by_date_range(start, end)
+    return get_invoices_by_date_range(*get_month_range(year, month))
 
 
 def get_monthly_summary(year, month):
     """Get summary for a specific month"""
-    start = datetime(year, month, 1)
-    if month == 12:
-        end = datetime(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        end = datetime(year, month + 1, 1) - timedelta(days=1)
-    
-    return get_invoice_summary(start, end)
+    return get_invoice_summary(*get_month_range(year, month))
 
 
 def get_quarterly_invoices(year, quarter):
     """Get invoices for a specific quarter (1-4)"""
-    start_month = (quarter - 1) * 3 + 1
-    start = datetime(year, start_month, 1)
-    
-    if quarter == 4:
-        end = datetime(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        end = datetime(year, start_month + 3, 1) - timedelta(days=1)
-    
-    return get_invoices_by_date_range(start, end)
+    return get_invoices_by_date_range(*get_quarter_range(year, quarter))
 
 
 def get_quarterly_summary(year, quarter):
     """Get summary for a specific quarter"""
-    start_month = (quarter - 1) * 3 + 1
-    start = datetime(year, start_month, 1)
-    
-    if quarter == 4:
-        end = datetime(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        end = datetime(year, start_month + 3, 1) - timedelta(days=1)
-    
-    return get_invoice_summary(start, end)
+    return get_invoice_summary(*get_quarter_range(year, quarter))
 
 
 def get_six_month_invoices(year, half):
     """Get invoices for first or second half of year (1 or 2)"""
-    if half == 1:
-        start = datetime(year, 1, 1)
-        end = datetime(year, 6, 30)
-    else:
-        start = datetime(year, 7, 1)
-        end = datetime(year, 12, 31)
-    
-    return get_invoices_by_date_range(start, end)
+    return get_invoices_by_date_range(*get_half_year_range(year, half))
 
 
 def get_six_month_summary(year, half):
     """Get summary for first or second half of year"""
-    if half == 1:
-        start = datetime(year, 1, 1)
-        end = datetime(year, 6, 30)
-    else:
-        start = datetime(year, 7, 1)
-        end = datetime(year, 12, 31)
-    
-    return get_invoice_summary(start, end)
+    return get_invoice_summary(*get_half_year_range(year, half))
 
 
 def get_yearly_invoices(year):
     """Get invoices for entire year"""
-    start = datetime(year, 1, 1)
-    end = datetime(year, 12, 31)
-    
-    return get_invoices_by_date_range(start, end)
+    return get_invoices_by_date_range(*get_year_range(year))
 
 
 def get_yearly_summary(year):
     """Get summary for entire year"""
-    start = datetime(year, 1, 1)
-    end = datetime(year, 12, 31)
-    
-    return get_invoice_summary(start, end)
+    return get_invoice_summary(*get_year_range(year))
 
 
 def get_custom_date_range_invoices(start_date, end_date):
@@ -0,0 +1,160 @@
+"""
+Versioned schema migrations.
+
+Files in `migrations/` are applied once, in version order, and recorded in
+the `schema_migrations` table:
+
+    003_reminder_profile.py          upgrade(cursor, dialect) for both databases
+    004_app_settings.sqlite.sql      SQLite only
+    004_app_settings.mysql.sql       MySQL only
+    005_admin_notification_prefs.sql both
+
+`.sql` files are split on `;` at end of line (no procedures/triggers);
+`--` comment lines are dropped. Each migration runs in its own transaction
+together with its schema_migrations row (MySQL DDL commits implicitly, so
+keep statements idempotent there).
+
+Versions up to BASELINE_VERSION were applied by hand before the runner
+existed (001/002 drop and recreate tables). They are recorded as applied
+without being executed.
+
+The bot applies pending migrations in the background `schema` startup
+stage; `python -m src.database.migrations [status]` does the same from a
+shell. Hot-path code assumes the schema is in place and does no DDL.
+"""
+
+import importlib.util
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from src.database import connection
+from src.database.connection import get_db_cursor
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent.parent / 'migrations'
+BASELINE_VERSION = 2
+
+_FILENAME = re.compile(r'^(\d+)_(\w+?)(?:\.(sqlite|mysql))?\.(sql|py)$')
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    path: Path
+
+
+def current_dialect() -> str:
+    return 'sqlite' if connection.USE_LOCAL_DB and not connection.USE_REMOTE_DB else 'mysql'
+
+
+def discover_migrations(directory: Path = None, dialect: str = None) -> List[Migration]:
+    """Migrations that apply to `dialect`, by version; two files for one version raise ValueError"""
+    directory = Path(directory or MIGRATIONS_DIR)
+    dialect = dialect or current_dialect()
+    found: Dict[int, Migration] = {}
+    for path in sorted(directory.iterdir()) if directory.is_dir() else ():
+        match = _FILENAME.match(path.name)
+        if not match:
+            continue
+        version, name, only = int(match.group(1)), match.group(2), match.group(3)
+        if only and only != dialect:
+            continue
+        if version in found:
+            raise ValueError(f"duplicate migration version {version}: {found[version].path.name}, {path.name}")
+        found[version] = Migration(version, f"{version:03d}_{name}", path)
+    return [found[v] for v in sorted(found)]
+
+
+def split_sql(text: str) -> List[str]:
+    lines = [line for line in text.splitlines() if not line.strip().startswith('--')]
+    statements = re.split(r';\s*$', "\n".join(lines), flags=re.MULTILINE)
+    return [s.strip() for s in statements if s.strip()]
+
+
+def _placeholder(dialect: str) -> str:
+    return '?' if dialect == 'sqlite' else '%s'
+
+
+def _ensure_migrations_table(cursor) -> None:
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+
+def applied_versions() -> Dict[int, str]:
+    with get_db_cursor() as cursor:
+        _ensure_migrations_table(cursor)
+        cursor.execute("SELECT version, name FROM schema_migrations")
+        rows = cursor.fetchall()
+    return {int(row['version']): row['name'] for row in rows}
+
+
+def _load_upgrade(path: Path):
+    spec = importlib.util.spec_from_file_location(f"migrations.{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.upgrade
+
+
+def _apply(migration: Migration, dialect: str, execute: bool) -> None:
+    with get_db_cursor() as cursor:
+        if execute:
+            if migration.path.suffix == '.py':
+                _load_upgrade(migration.path)(cursor, dialect)
+            else:
+                for statement in split_sql(migration.path.read_text(encoding='utf-8')):
+                    cursor.execute(statement)
+        ph = _placeholder(dialect)
+        cursor.execute(
+            f"INSERT INTO schema_migrations (version, name) VALUES ({ph}, {ph})",
+            (migration.version, migration.name),
+        )
+
+
+def pending_migrations(directory: Path = None) -> List[Migration]:
+    applied = applied_versions()
+    return [m for m in discover_migrations(directory) if m.version not in applied]
+
+
+def run_migrations(directory: Path = None, baseline: Optional[int] = BASELINE_VERSION) -> List[str]:
+    """Apply pending migrations in order; stops at (and re-raises) the first failure"""
+    dialect = current_dialect()
+    done = []
+    for migration in pending_migrations(directory):
+        execute = baseline is None or migration.version > baseline
+        try:
+            _apply(migration, dialect, execute)
+        except Exception as e:
+            logger.error(f"[MIGRATE] {migration.name} failed: {e}")
+            raise
+        logger.info(f"[MIGRATE] {'applied' if execute else 'baselined'} {migration.name} ({dialect})")
+        done.append(migration.name)
+    return done
+
+
+def migration_status(directory: Path = None) -> List[Dict]:
+    applied = applied_versions()
+    return [
+        {'version': m.version, 'name': m.name, 'applied': m.version in applied}
+        for m in discover_migrations(directory)
+    ]
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    if sys.argv[1:] == ['status']:
+        for row in migration_status():
+            print(f"{'x' if row['applied'] else ' '} {row['name']}")
+    else:
+        applied = run_migrations()
+        print(f"Applied {len(applied)} migration(s): {', '.join(applied) or 'none pending'}")
@@ -1,5 +1,8 @@
+import json
 import logging
-from src.database.connection import get_db_connection
+from datetime import datetime, timedelta
+
+from src.database.connection import execute_query
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +13,8 @@ CHANNEL_TYPES = {
     'sms': 'SMS'
 }
 
+CHANNEL_COLUMNS = "channel_id, user_id, channel_type, channel_address, is_active, verified, created_at"
+
 def add_notification_channel(user_id, channel_type, channel_address):
     """Add a notification channel for user"""
     try:
@@ -21,26 +26,21 @@ def add_notification_channel(user_id, channel_type, channel_address):
             logger.warning(f"Invalid user_id or address")
             return False
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # Check if channel already exists
-        cursor.execute(
+        existing = execute_query(
             """
             SELECT channel_id FROM notification_channels 
             WHERE user_id = %s AND channel_type = %s AND channel_address = %s
             """,
-            (user_id, channel_type, channel_address)
+            (user_id, channel_type, channel_address),
+            fetch_one=True
         )
         
-        if cursor.fetchone():
+        if existing:
             logger.info(f"Channel already exists for user {user_id}")
-            cursor.close()
-            conn.close()
             return False
         
-        # Insert new channel
-        cursor.execute(
+        execute_query(
             """
             INSERT INTO notification_channels 
             (user_id, channel_type, channel_address, is_active, verified)
@@ -49,10 +49,7 @@ def add_notification_channel(user_id, channel_type, channel_address):
             (user_id, channel_type, channel_address, True, False)
         )
         
-        conn.commit()
         logger.info(f"Channel added for user {user_id}: {channel_type}")
-        cursor.close()
-        conn.close()
         return True
         
     except Exception as e:
@@ -65,28 +62,15 @@ def get_user_channels(user_id):
         if not user_id:
             return []
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            """
-            SELECT channel_id, user_id, channel_type, channel_address, is_active, verified, created_at
+        return execute_query(
+            f"""
+            SELECT {CHANNEL_COLUMNS}
             FROM notification_channels
             WHERE user_id = %s
             ORDER BY created_at DESC
             """,
             (user_id,)
-        )
-        
-        columns = ['channel_id', 'user_id', 'channel_type', 'channel_address', 'is_active', 'verified', 'created_at']
-        channels = []
-        
-        for row in cursor.fetchall():
-            channels.append(dict(zip(columns, row)))
-        
-        cursor.close()
-        conn.close()
-        return channels
+        ) or []
         
     except Exception as e:
         logger.error(f"Error fetching channels: {str(e)}")
@@ -98,44 +82,58 @@ def get_active_channels(user_id, channel_type=None):
         if not user_id:
             return []
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         if channel_type:
-            cursor.execute(
-                """
-                SELECT channel_id, user_id, channel_type, channel_address, is_active, verified, created_at
+            return execute_query(
+                f"""
+                SELECT {CHANNEL_COLUMNS}
                 FROM notification_channels
                 WHERE user_id = %s AND channel_type = %s AND is_active = TRUE
                 ORDER BY created_at DESC
                 """,
                 (user_id, channel_type)
-            )
-        else:
-            cursor.execute(
-                """
-                SELECT channel_id, user_id, channel_type, channel_address, is_active, verified, created_at
-                FROM notification_channels
-                WHERE user_id = %s AND is_active = TRUE
-                ORDER BY created_at DESC
-                """,
-                (user_id,)
-            )
-        
-        columns = ['channel_id', 'user_id', 'channel_type', 'channel_address', 'is_active', 'verified', 'created_at']
-        channels = []
+            ) or []
         
-        for row in cursor.fetchall():
-            channels.append(dict(zip(columns, row)))
-        
-        cursor.close()
-        conn.close()
-        return channels
+        return execute_query(
+            f"""
+            SELECT {CHANNEL_COLUMNS}
+            FROM notification_channels
+            WHERE user_id = %s AND is_active = TRUE
+            ORDER BY created_at DESC
+            """,
+            (user_id,)
+        ) or []
         
     except Exception as e:
         logger.error(f"Error fetching active channels: {str(e)}")
         return []
 
+def get_active_channel_addresses(user_ids, channel_type='email'):
+    """{user_id: [address, ...]} of active channels for many users in one query (bulk email sends)"""
+    try:
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return {}
+        
+        placeholders = ', '.join(['%s'] * len(user_ids))
+        rows = execute_query(
+            f"""
+            SELECT user_id, channel_address
+            FROM notification_channels
+            WHERE channel_type = %s AND is_active = TRUE AND user_id IN ({placeholders})
+            ORDER BY created_at DESC
+            """,
+            (channel_type, *user_ids)
+        ) or []
+        
+        addresses = {}
+        for row in rows:
+            addresses.setdefault(row['user_id'], []).append(row['channel_address'])
+        return addresses
+        
+    except Exception as e:
+        logger.error(f"Error fetching channel addresses: {str(e)}")
+        return {}
+
 def verify_channel(channel_id, verification_code):
     """Verify a notification channel with verification code"""
     try:
@@ -143,13 +141,10 @@ def verify_channel(channel_id, verification_code):
             logger.warning("Invalid channel_id or verification_code")
             return False
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # In production, compare with actual verification code sent to channel
         # For now, mark as verified if code matches simple pattern
         if verification_code == "verify":  # Simplified for demo
-            cursor.execute(
+            execute_query(
                 """
                 UPDATE notification_channels
                 SET verified = TRUE
@@ -158,14 +153,9 @@ def verify_channel(channel_id, verification_code):
                 (channel_id,)
             )
             
-            conn.commit()
             logger.info(f"Channel {channel_id} verified")
-            cursor.close()
-            conn.close()
             return True
         
-        cursor.close()
-        conn.close()
         return False
         
     except Exception as e:
@@ -179,10 +169,7 @@ def toggle_channel(channel_id, is_active):
             logger.warning("Invalid channel_id or is_active")
             return False
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
+        execute_query(
             """
             UPDATE notification_channels
             SET is_active = %s
@@ -191,10 +178,7 @@ def toggle_channel(channel_id, is_active):
             (is_active, channel_id)
         )
         
-        conn.commit()
         logger.info(f"Channel {channel_id} toggled to {is_active}")
-        cursor.close()
-        conn.close()
         return True
         
     except Exception as e:
@@ -208,10 +192,7 @@ def delete_channel(channel_id):
             logger.warning("Invalid channel_id")
             return False
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
+        execute_query(
             """
             DELETE FROM notification_channels
             WHERE channel_id = %s
@@ -219,10 +200,7 @@ def delete_channel(channel_id):
             (channel_id,)
         )
         
-        conn.commit()
         logger.info(f"Channel {channel_id} deleted")
-        cursor.close()
-        conn.close()
         return True
         
     except Exception as e:
@@ -235,24 +213,18 @@ def get_notification_preferences(user_id):
         if not user_id:
             return None
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
+        result = execute_query(
             """
             SELECT notification_preferences
             FROM users
             WHERE user_id = %s
             """,
-            (user_id,)
+            (user_id,),
+            fetch_one=True
         )
         
-        result = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        
-        if result and result[0]:
-            return result[0]  # Should be JSON
+        if result and result['notification_preferences']:
+            return result['notification_preferences']  # Should be JSON
         
         # Return default preferences
         return {
@@ -277,12 +249,7 @@ def update_notification_preferences(user_id, preferences):
             logger.warning("Invalid user_id or preferences")
             return False
         
-        import json
-        
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
+        execute_query(
             """
             UPDATE users
             SET notification_preferences = %s
@@ -291,10 +258,7 @@ def update_notification_preferences(user_id, preferences):
             (json.dumps(preferences), user_id)
         )
         
-        conn.commit()
         logger.info(f"Preferences updated for user {user_id}")
-        cursor.close()
-        conn.close()
         return True
         
     except Exception as e:
@@ -304,10 +268,7 @@ def update_notification_preferences(user_id, preferences):
 def get_channel_statistics():
     """Get statistics about notification channels"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
+        rows = execute_query(
             """
             SELECT 
                 channel_type,
@@ -317,21 +278,16 @@ def get_channel_statistics():
             FROM notification_channels
             GROUP BY channel_type
             """
-        )
+        ) or []
         
-        columns = ['channel_type', 'total_channels', 'active_channels', 'verified_channels']
         stats = {}
-        
-        for row in cursor.fetchall():
-            data = dict(zip(columns, row))
+        for data in rows:
             stats[data['channel_type']] = {
                 'total': data['total_channels'],
                 'active': data['active_channels'],
                 'verified': data['verified_channels']
             }
         
-        cursor.close()
-        conn.close()
         return stats
         
     except Exception as e:
@@ -341,24 +297,17 @@ def get_channel_statistics():
 def cleanup_inactive_channels(days=30):
     """Delete channels inactive for X days (optional maintenance)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
+        cutoff = datetime.now() - timedelta(days=days)
+        deleted_count = execute_query(
             """
             DELETE FROM notification_channels
             WHERE is_active = FALSE 
-            AND created_at < CURRENT_TIMESTAMP - INTERVAL '%s days'
+            AND created_at < %s
             """,
-            (days,)
-        )
-        
-        deleted_count = cursor.rowcount
-        conn.commit()
+            (cutoff,)
+        ) or 0
         
         logger.info(f"Deleted {deleted_count} inactive channels older than {days} days")
-        cursor.close()
-        conn.close()
         return deleted_count
         
     except Exception as e:
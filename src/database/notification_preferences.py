@@ -0,0 +1,52 @@
+import logging
+from typing import Dict, Optional
+from src.database.connection import execute_query
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_PRIORITY_DIGEST = 'digest'    # coalesced into one message per ADMIN_DIGEST_WINDOW_SECONDS
+NOTIFY_PRIORITY_INSTANT = 'instant'  # one message per event, as soon as it arrives
+NOTIFY_PRIORITIES = (NOTIFY_PRIORITY_DIGEST, NOTIFY_PRIORITY_INSTANT)
+
+
+def get_admin_notification_prefs() -> Dict[int, Dict]:
+    """All stored preferences as {admin_id: {'muted', 'priority'}}; admins without a row use the defaults"""
+    try:
+        rows = execute_query("SELECT admin_id, muted, priority FROM admin_notification_prefs") or []
+        return {
+            int(row['admin_id']): {'muted': bool(row['muted']), 'priority': row['priority'] or NOTIFY_PRIORITY_DIGEST}
+            for row in rows
+        }
+    except Exception as e:
+        logger.error(f"get_admin_notification_prefs failed: {e}")
+        return {}
+
+
+def set_admin_notification_pref(admin_id: int, muted: Optional[bool] = None, priority: Optional[str] = None) -> bool:
+    """Update one admin's mute flag and/or priority"""
+    if priority is not None and priority not in NOTIFY_PRIORITIES:
+        raise ValueError(f"priority must be one of {NOTIFY_PRIORITIES}")
+    try:
+        current = execute_query(
+            "SELECT muted, priority FROM admin_notification_prefs WHERE admin_id = %s",
+            (admin_id,),
+            fetch_one=True,
+        )
+        new_muted = bool(current['muted']) if current and muted is None else bool(muted)
+        new_priority = priority or (current['priority'] if current else NOTIFY_PRIORITY_DIGEST)
+        if current:
+            execute_query(
+                "UPDATE admin_notification_prefs SET muted = %s, priority = %s, updated_at = CURRENT_TIMESTAMP "
+                "WHERE admin_id = %s",
+                (new_muted, new_priority, admin_id),
+            )
+        else:
+            execute_query(
+                "INSERT INTO admin_notification_prefs (admin_id, muted, priority) VALUES (%s, %s, %s)",
+                (admin_id, new_muted, new_priority),
+            )
+        logger.info(f"[NOTIFY_PREFS] admin={admin_id} muted={new_muted} priority={new_priority}")
+        return True
+    except Exception as e:
+        logger.error(f"set_admin_notification_pref failed: {e}")
+        return False
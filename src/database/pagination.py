@@ -0,0 +1,54 @@
+"""
+Keyset (seek) pagination helper for list queries.
+
+    ... WHERE <filters> AND id > %s ORDER BY id LIMIT n + 1
+
+Each page is one indexed range scan no matter how deep the admin pages,
+unlike OFFSET which re-reads every skipped row. The extra row tells the
+caller whether another page exists.
+"""
+
+import logging
+from typing import Dict, List, NamedTuple, Optional
+
+from src.database.connection import execute_query
+
+logger = logging.getLogger(__name__)
+
+KEYSET_PAGE_SIZE = 10
+
+
+class KeysetPage(NamedTuple):
+    rows: List[Dict]
+    has_prev: bool
+    has_next: bool
+
+
+def fetch_keyset_page(base_query: str, params: tuple, key_column: str, limit: int = KEYSET_PAGE_SIZE,
+                      after: Optional[int] = None, before: Optional[int] = None,
+                      descending: bool = False) -> KeysetPage:
+    """Run one keyset page query.
+
+    `base_query` must be a SELECT ending in a WHERE clause (use WHERE 1=1 when
+    there are no filters); the key predicate, ORDER BY and LIMIT are appended.
+    `after`/`before` are exclusive bounds in display order.
+    """
+    params = tuple(params or ())
+    backwards = before is not None
+    bound = before if backwards else after
+    # Display order asc: next page is key > bound; desc flips the comparison.
+    walk_desc = descending != backwards
+    sql = base_query
+    if bound is not None:
+        sql += f" AND {key_column} {'<' if walk_desc else '>'} %s"
+        params += (bound,)
+    sql += f" ORDER BY {key_column} {'DESC' if walk_desc else 'ASC'} LIMIT %s"
+    params += (limit + 1,)
+
+    rows = execute_query(sql, params) or []
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+        return KeysetPage(rows, has_prev=more, has_next=True)
+    return KeysetPage(rows, has_prev=after is not None, has_next=more)
@@ -49,6 +49,8 @@ def record_fee_payment(user_id: int, amount: float, payment_method: str = 'manua
         execute_query(query2, (fee_paid_date, fee_expiry_date, user_id))
         
         logger.info(f"Fee payment recorded for user {user_id}: {amount} for {duration_days} days")
+        from src.database.dashboard_metrics import record_payment_metric
+        record_payment_metric(amount)
         return True
     except Exception as e:
         logger.error(f"Failed to record fee payment: {e}")
@@ -76,18 +78,9 @@ def get_payment_history(user_id: int, limit: int = 10):
     return execute_query(query, (user_id, limit))
 
 def get_revenue_stats():
-    """Get total revenue and payment statistics"""
-    query = """
-        SELECT 
-            COUNT(*) as total_payments,
-            SUM(amount) as total_revenue,
-            AVG(amount) as avg_payment,
-            COUNT(DISTINCT user_id) as unique_payers,
-            MAX(created_at) as last_payment_date
-        FROM fee_payments
-        WHERE status = 'completed'
-    """
-    return execute_query(query, fetch_one=True)
+    """Get total revenue and payment statistics (from materialised metrics)"""
+    from src.database.dashboard_metrics import get_section, SECTION_REVENUE
+    return get_section(SECTION_REVENUE)
 
 def get_monthly_revenue(month: int = None, year: int = None):
     """Get revenue for specific month"""
@@ -96,6 +89,13 @@ def get_monthly_revenue(month: int = None, year: int = None):
     if not year:
         year = datetime.now().year
     
+    from src.database.dashboard_metrics import get_section, SECTION_REVENUE
+    snapshot = get_section(SECTION_REVENUE)
+    if snapshot.get('month') == f"{year:04d}-{month:02d}":
+        return snapshot
+    
+    start = datetime(year, month, 1)
+    end = datetime(year + (month == 12), month % 12 + 1, 1)
     query = """
         SELECT 
             SUM(amount) as monthly_revenue,
@@ -103,10 +103,9 @@ def get_monthly_revenue(month: int = None, year: int = None):
             COUNT(DISTINCT user_id) as payers
         FROM fee_payments
         WHERE status = 'completed'
-        AND EXTRACT(MONTH FROM created_at) = %s
-        AND EXTRACT(YEAR FROM created_at) = %s
+        AND created_at >= %s AND created_at < %s
     """
-    return execute_query(query, (month, year), fetch_one=True)
+    return execute_query(query, (start, end), fetch_one=True)
 
 def get_active_members_count():
     """Get count of active (paid) members"""
@@ -110,6 +110,8 @@ def approve_payment_request(request_id: int, admin_id: int, amount: float, durat
         execute_query(query3, (fee_paid_date, fee_expiry_date, user_id))
         
         logger.info(f"Payment request {request_id} approved by admin {admin_id}")
+        from src.database.dashboard_metrics import record_payment_metric
+        record_payment_metric(amount)
         logger.info(f"User {user_id} subscription activated until {fee_expiry_date}")
         request['already_processed'] = False
         request['fee_paid_date'] = fee_paid_date
@@ -168,6 +170,8 @@ def approve_payment_request_with_dates(request_id: int, admin_id: int, amount: f
         execute_query(query3, (start_date, end_date, user_id))
         
         logger.info(f"Payment request {request_id} approved by admin {admin_id}")
+        from src.database.dashboard_metrics import record_payment_metric
+        record_payment_metric(amount)
         logger.info(f"User {user_id} subscription activated: {start_date} to {end_date} ({duration_days} days)")
         request['already_processed'] = False
         request['fee_paid_date'] = start_date
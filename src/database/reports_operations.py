@@ -4,7 +4,7 @@ Database operations for admin reports and analytics
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-from src.database.connection import get_connection
+from src.database.connection import execute_query, get_connection
 
 logger = logging.getLogger(__name__)
 
@@ -195,259 +195,96 @@ def get_expiring_soon_members(days: int = 7) -> List[Dict[str, Any]]:
 def get_member_daily_activity(date: Optional[datetime] = None) -> List[Dict[str, Any]]:
     """
     Get all member activities for a specific date
-    Returns: List of members with their daily activities
+    Returns: List of members with their daily activities (from user_daily_rollups)
     """
     if not date:
         date = datetime.now()
     
-    target_date = date.date()
-    
-    conn = get_connection()
-    if not conn:
-        return []
+    target_date = date.date() if isinstance(date, datetime) else date
     
     try:
-        cur = conn.cursor()
-        
-        # Get all users with their activity data for the day
-        # FIX: Removed non-existent telegram_id column
-        query = """
-            SELECT 
-                u.user_id,
-                u.full_name,
-                u.telegram_username,
-                u.fee_status,
-                
-                -- Attendance
-                (SELECT COUNT(*) FROM attendance_queue 
-                 WHERE user_id = u.user_id 
-                   AND DATE(check_in_time) = %s 
-                   AND status = 'approved') as attendance_count,
-                
-                -- Weight logs
-                (SELECT COUNT(*) FROM weight_logs 
-                 WHERE user_id = u.user_id 
-                   AND DATE(logged_at) = %s) as weight_logs,
-                
-                -- Water logs
-                (SELECT COALESCE(SUM(cups), 0) FROM water_logs 
-                 WHERE user_id = u.user_id 
-                   AND DATE(logged_at) = %s) as water_cups,
-                
-                -- Meal logs
-                (SELECT COUNT(*) FROM meal_logs 
-                 WHERE user_id = u.user_id 
-                   AND DATE(logged_at) = %s) as meal_logs,
-                
-                -- Habits
-                (SELECT COUNT(*) FROM habit_logs 
-                 WHERE user_id = u.user_id 
-                   AND DATE(logged_at) = %s 
-                   AND completed = true) as habits_completed,
-                
-                -- Shake orders
-                (SELECT COUNT(*) FROM shake_queue 
-                 WHERE user_id = u.user_id 
-                   AND DATE(requested_at) = %s) as shake_orders,
-                
-                -- Points earned today
-                u.total_points
-                
-            FROM users u
-            ORDER BY u.full_name ASC
-        """
-        
-        cur.execute(query, (target_date, target_date, target_date, target_date, target_date, target_date))
-        rows = cur.fetchall()
-        
+        from src.database.rollup_operations import get_daily_rollups
         activities = []
-        for row in rows:
-            activity = {
-                'user_id': row[0],
-                'full_name': row[1],
-                'telegram_username': row[2],
-                'fee_status': row[3],
-                'attendance_count': row[4],
-                'weight_logs': row[5],
-                'water_cups': row[6],
-                'meal_logs': row[7],
-                'habits_completed': row[8],
-                'shake_orders': row[9],
-                'total_points': row[10],
-                'activity_score': row[4] + row[5] + (1 if row[6] > 0 else 0) + row[7] + row[8]
-            }
-            activities.append(activity)
-        
-        cur.close()
+        for row in get_daily_rollups(target_date):
+            activities.append({
+                'user_id': row['user_id'],
+                'full_name': row['full_name'],
+                'telegram_username': row['telegram_username'],
+                'fee_status': row['fee_status'],
+                'attendance_count': int(row['attendance_count']),
+                'weight_logs': int(row['weight_logs']),
+                'water_cups': int(row['water_cups']),
+                'meal_logs': int(row['meal_logs']),
+                'habits_completed': int(row['habits_completed']),
+                'shake_orders': int(row['shake_orders']),
+                'points_earned': int(row['points_earned']),
+                'total_points': row['total_points'],
+                'activity_score': int(row['activity_score'])
+            })
         return activities
         
     except Exception as e:
         logger.error(f"Error fetching member daily activity: {e}")
         return []
-    finally:
-        # Ensure connection is returned to the pool safely (no-op in local mode)
-        if conn:
-            from src.database.connection import release_connection
-            release_connection(conn)
 
 
 def get_top_performers(days: int = 7, limit: int = 20) -> List[Dict[str, Any]]:
     """
     Get top performing members based on activity in last X days
     """
-    conn = get_connection()
-    if not conn:
-        return []
-    
     try:
-        cur = conn.cursor()
-        
-        start_date = datetime.now().date() - timedelta(days=days)
-        
-        # FIX: Removed non-existent telegram_id column
-        query = """
-            SELECT 
-                u.user_id,
-                u.full_name,
-                u.telegram_username,
-                u.total_points,
-                
-                COUNT(DISTINCT DATE(aq.check_in_time)) as attendance_days,
-                COUNT(DISTINCT DATE(wl.logged_at)) as weight_log_days,
-                COUNT(DISTINCT DATE(wat.logged_at)) as water_log_days,
-                COUNT(DISTINCT DATE(ml.logged_at)) as meal_log_days,
-                COUNT(DISTINCT DATE(hl.logged_at)) as habit_log_days,
-                
-                (COUNT(DISTINCT DATE(aq.check_in_time)) + 
-                 COUNT(DISTINCT DATE(wl.logged_at)) + 
-                 COUNT(DISTINCT DATE(wat.logged_at)) + 
-                 COUNT(DISTINCT DATE(ml.logged_at)) + 
-                 COUNT(DISTINCT DATE(hl.logged_at))) as total_activity_days
-                
-            FROM users u
-            LEFT JOIN attendance_queue aq ON u.user_id = aq.user_id 
-                AND DATE(aq.check_in_time) >= %s 
-                AND aq.status = 'approved'
-            LEFT JOIN weight_logs wl ON u.user_id = wl.user_id 
-                AND DATE(wl.logged_at) >= %s
-            LEFT JOIN water_logs wat ON u.user_id = wat.user_id 
-                AND DATE(wat.logged_at) >= %s
-            LEFT JOIN meal_logs ml ON u.user_id = ml.user_id 
-                AND DATE(ml.logged_at) >= %s
-            LEFT JOIN habit_logs hl ON u.user_id = hl.user_id 
-                AND DATE(hl.logged_at) >= %s 
-                AND hl.completed = true
-            
-            GROUP BY u.user_id, u.full_name, u.telegram_username, u.total_points
-            ORDER BY total_activity_days DESC, u.total_points DESC
-            LIMIT %s
-        """
-        
-        cur.execute(query, (start_date, start_date, start_date, start_date, start_date, limit))
-        rows = cur.fetchall()
+        from src.database.rollup_operations import get_rollup_totals
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=days)
         
         performers = []
-        for row in rows:
+        for row in get_rollup_totals(start_date, end_date, limit=limit):
             performers.append({
-                'user_id': row[0],
-                'full_name': row[1],
-                'telegram_username': row[2],
-                'total_points': row[3],
-                'attendance_days': row[4],
-                'weight_log_days': row[5],
-                'water_log_days': row[6],
-                'meal_log_days': row[7],
-                'habit_log_days': row[8],
-                'total_activity_days': row[9]
+                'user_id': row['user_id'],
+                'full_name': row['full_name'],
+                'telegram_username': row['telegram_username'],
+                'total_points': row['total_points'],
+                'attendance_days': row['attendance_days'],
+                'weight_log_days': row['weight_log_days'],
+                'water_log_days': row['water_log_days'],
+                'meal_log_days': row['meal_log_days'],
+                'habit_log_days': row['habit_log_days'],
+                'total_activity_days': row['total_activity_days']
             })
-        
-        cur.close()
         return performers
         
     except Exception as e:
         logger.error(f"Error fetching top performers: {e}")
         return []
-    finally:
-        # Ensure connection is returned to the pool safely (no-op in local mode)
-        if conn:
-            from src.database.connection import release_connection
-            release_connection(conn)
 
 
 def get_inactive_users(days: int = 7, limit: int = 20) -> List[Dict[str, Any]]:
     """
     Get members with no activity in last X days
     """
-    conn = get_connection()
-    if not conn:
-        return []
-    
     try:
-        cur = conn.cursor()
-        
-        start_date = datetime.now().date() - timedelta(days=days)
-        
-        # FIX: Removed non-existent telegram_id column
-        query = """
-            SELECT 
-                u.user_id,
-                u.full_name,
-                u.telegram_username,
-                u.fee_status,
-                u.total_points,
-                
-                COALESCE(MAX(aq.check_in_time), u.created_at) as last_activity
-                
-            FROM users u
-            LEFT JOIN attendance_queue aq ON u.user_id = aq.user_id 
-                AND aq.status = 'approved'
-            LEFT JOIN weight_logs wl ON u.user_id = wl.user_id
-            LEFT JOIN water_logs wat ON u.user_id = wat.user_id
-            LEFT JOIN meal_logs ml ON u.user_id = ml.user_id
-            LEFT JOIN habit_logs hl ON u.user_id = hl.user_id
-            
-            GROUP BY u.user_id, u.full_name, u.telegram_username, 
-                     u.fee_status, u.total_points, u.created_at
-            
-            HAVING COALESCE(MAX(GREATEST(
-                COALESCE(aq.check_in_time, '1900-01-01'::timestamp),
-                COALESCE(wl.logged_at, '1900-01-01'::timestamp),
-                COALESCE(wat.logged_at, '1900-01-01'::timestamp),
-                COALESCE(ml.logged_at, '1900-01-01'::timestamp),
-                COALESCE(hl.logged_at, '1900-01-01'::timestamp)
-            )), u.created_at) < %s
-            
-            ORDER BY last_activity ASC
-            LIMIT %s
-        """
-        
-        cur.execute(query, (datetime.now() - timedelta(days=days), limit))
-        rows = cur.fetchall()
+        from src.database.rollup_operations import get_inactive_rollups, as_date
+        today = datetime.now().date()
         
         inactive = []
-        for row in rows:
-            days_inactive = (datetime.now() - row[5]).days if row[5] else 0
+        for row in get_inactive_rollups(today - timedelta(days=days)):
+            last_activity = as_date(row['last_active'] or row['created_at'])
             inactive.append({
-                'user_id': row[0],
-                'full_name': row[1],
-                'telegram_username': row[2],
-                'fee_status': row[3],
-                'total_points': row[4],
-                'last_activity': row[5],
-                'days_inactive': days_inactive
+                'user_id': row['user_id'],
+                'full_name': row['full_name'],
+                'telegram_username': row['telegram_username'],
+                'fee_status': row['fee_status'],
+                'total_points': row['total_points'],
+                'last_activity': last_activity,
+                'days_inactive': (today - last_activity).days if last_activity else 0
             })
         
-        cur.close()
-        return inactive
+        inactive.sort(key=lambda m: m['last_activity'] or today)
+        return inactive[:limit] if limit else inactive
         
     except Exception as e:
         logger.error(f"Error fetching inactive users: {e}")
         return []
-    finally:
-        # Ensure connection is returned to the pool safely (no-op in local mode)
-        if conn:
-            from src.database.connection import release_connection
-            release_connection(conn)
 
 
 def move_expired_to_inactive() -> int:
@@ -505,41 +342,32 @@ def get_membership_stats() -> Dict[str, Any]:
     """
     Get overall membership statistics
     """
-    conn = get_connection()
-    if not conn:
-        return {}
-    
+    today = datetime.now().date()
     try:
-        cur = conn.cursor()
-        
-        query = """
-            SELECT 
+        # Portable aggregates (no FILTER / INTERVAL) so local SQLite mode works too
+        row = execute_query(
+            """
+            SELECT
                 COUNT(*) as total_members,
-                COUNT(*) FILTER (WHERE fee_status IN ('paid', 'active') 
-                    AND (fee_expiry_date IS NULL OR fee_expiry_date >= CURRENT_DATE)) as active_members,
-                COUNT(*) FILTER (WHERE fee_status NOT IN ('paid', 'active') 
-                    OR (fee_expiry_date IS NOT NULL AND fee_expiry_date < CURRENT_DATE)) as inactive_members,
-                COUNT(*) FILTER (WHERE fee_expiry_date BETWEEN CURRENT_DATE AND CURRENT_DATE + INTERVAL '7 days') as expiring_soon,
-                COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '30 days') as new_this_month,
+                SUM(CASE WHEN fee_status IN ('paid', 'active')
+                    AND (fee_expiry_date IS NULL OR fee_expiry_date >= %s) THEN 1 ELSE 0 END) as active_members,
+                SUM(CASE WHEN fee_status NOT IN ('paid', 'active')
+                    OR (fee_expiry_date IS NOT NULL AND fee_expiry_date < %s) THEN 1 ELSE 0 END) as inactive_members,
+                SUM(CASE WHEN fee_expiry_date BETWEEN %s AND %s THEN 1 ELSE 0 END) as expiring_soon,
+                SUM(CASE WHEN created_at >= %s THEN 1 ELSE 0 END) as new_this_month,
                 COALESCE(SUM(total_points), 0) as total_points_all
             FROM users
-        """
-        
-        cur.execute(query)
-        row = cur.fetchone()
-        
-        stats = {
-            'total_members': row[0],
-            'active_members': row[1],
-            'inactive_members': row[2],
-            'expiring_soon': row[3],
-            'new_this_month': row[4],
-            'total_points_all': row[5]
-        }
-        
-        cur.close()
-        return stats
-        
+            """,
+            (today, today, today, today + timedelta(days=7), today - timedelta(days=30)),
+            fetch_one=True,
+        )
     except Exception as e:
         logger.error(f"Error fetching membership stats: {e}")
         return {}
+
+    row = row or {}
+    return {
+        key: int(row.get(key) or 0)
+        for key in ('total_members', 'active_members', 'inactive_members', 'expiring_soon',
+                    'new_this_month', 'total_points_all')
+    }
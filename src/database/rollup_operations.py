@@ -0,0 +1,276 @@
+"""
+End-of-day activity rollups for member reports.
+
+user_daily_rollups holds one row per member per day with any activity
+(attendance, daily_logs entries, shake orders, points). user_period_rollups
+holds the same figures summed per ISO week and calendar month. Building a
+day deletes and rewrites that day and its week/month in one transaction,
+so any date can be rebuilt at will.
+
+Reports read the rollups instead of joining the raw tables, so their cost
+depends on the window asked for, not on how much history exists. Today's
+rollup is rebuilt on every read; past days are built once on demand (or by
+the nightly job) and then only read.
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from src.database.connection import execute_query, get_db_cursor
+from src.config import USE_LOCAL_DB, USE_REMOTE_DB
+
+logger = logging.getLogger(__name__)
+
+PERIOD_WEEK = 'week'
+PERIOD_MONTH = 'month'
+
+DAILY_FIELDS = (
+    'attendance_count', 'weight_logs', 'water_cups', 'meal_logs',
+    'habits_completed', 'shake_orders', 'points_earned',
+)
+
+
+def _is_sqlite() -> bool:
+    return bool(USE_LOCAL_DB and not USE_REMOTE_DB)
+
+
+def as_date(value) -> Optional[date]:
+    """date from a DATE column (date object on MySQL, ISO string on SQLite)"""
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(str(value)[:10])
+
+
+def period_bounds(period_type: str, day: date):
+    """(first, last) day of the ISO week or calendar month containing `day`"""
+    if period_type == PERIOD_WEEK:
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    start = day.replace(day=1)
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    return start, next_month - timedelta(days=1)
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def _read_source(label: str, query: str, params: tuple) -> List[Dict]:
+    try:
+        return execute_query(query, params) or []
+    except Exception as e:
+        logger.warning(f"[ROLLUP] {label} unavailable, counted as zero: {e}")
+        return []
+
+
+def _collect_day(day: date) -> Dict[int, Dict[str, int]]:
+    """Per-user figures for one day, read with date-range predicates on the source tables"""
+    start = datetime.combine(day, datetime.min.time())
+    end = start + timedelta(days=1)
+    rows: Dict[int, Dict[str, int]] = {}
+
+    def add(user_id, field, value):
+        acc = rows.setdefault(int(user_id), dict.fromkeys(DAILY_FIELDS, 0))
+        acc[field] += int(value or 0)
+
+    for row in _read_source(
+        'daily_logs',
+        "SELECT user_id, weight, water_cups, meals_logged, habits_completed FROM daily_logs WHERE log_date = %s",
+        (day,),
+    ):
+        add(row['user_id'], 'weight_logs', 1 if row.get('weight') is not None else 0)
+        add(row['user_id'], 'water_cups', row.get('water_cups'))
+        add(row['user_id'], 'meal_logs', row.get('meals_logged'))
+        add(row['user_id'], 'habits_completed', 1 if row.get('habits_completed') else 0)
+
+    for field, label, query, params in (
+        ('attendance_count', 'attendance_queue',
+         "SELECT user_id, COUNT(*) AS n FROM attendance_queue WHERE queue_date = %s AND status = 'approved' GROUP BY user_id",
+         (day,)),
+        ('shake_orders', 'shake_requests',
+         "SELECT user_id, COUNT(*) AS n FROM shake_requests WHERE requested_at >= %s AND requested_at < %s GROUP BY user_id",
+         (start, end)),
+        ('points_earned', 'points_transactions',
+         "SELECT user_id, SUM(points) AS n FROM points_transactions WHERE created_at >= %s AND created_at < %s GROUP BY user_id",
+         (start, end)),
+    ):
+        for row in _read_source(label, query, params):
+            add(row['user_id'], field, row['n'])
+
+    for acc in rows.values():
+        acc['activity_score'] = (acc['attendance_count'] + acc['weight_logs'] + (1 if acc['water_cups'] > 0 else 0)
+                                 + acc['meal_logs'] + acc['habits_completed'])
+    return {uid: acc for uid, acc in rows.items() if any(acc.values())}
+
+
+def build_daily_rollup(day: date = None) -> int:
+    """(Re)build one day's rollup and its week/month aggregates; returns member rows written"""
+    day = as_date(day) or date.today()
+    rows = _collect_day(day)
+    ph = '?' if _is_sqlite() else '%s'
+    columns = ('rollup_date', 'user_id') + DAILY_FIELDS + ('activity_score',)
+
+    with get_db_cursor() as cursor:
+        cursor.execute(f"DELETE FROM user_daily_rollups WHERE rollup_date = {ph}", (day,))
+        if rows:
+            cursor.executemany(
+                f"INSERT INTO user_daily_rollups ({', '.join(columns)}) VALUES ({', '.join([ph] * len(columns))})",
+                [(day, uid) + tuple(acc[c] for c in DAILY_FIELDS + ('activity_score',)) for uid, acc in rows.items()],
+            )
+        for period_type in (PERIOD_WEEK, PERIOD_MONTH):
+            first, last = period_bounds(period_type, day)
+            cursor.execute(
+                f"DELETE FROM user_period_rollups WHERE period_type = {ph} AND period_start = {ph}",
+                (period_type, first),
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO user_period_rollups (period_type, period_start, user_id, active_days, attendance_days,
+                    weight_log_days, water_log_days, meal_log_days, habit_log_days, shake_orders, points_earned)
+                SELECT {ph}, {ph}, user_id,
+                    SUM(CASE WHEN activity_score > 0 THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN attendance_count > 0 THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN weight_logs > 0 THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN water_cups > 0 THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN meal_logs > 0 THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN habits_completed > 0 THEN 1 ELSE 0 END),
+                    SUM(shake_orders), SUM(points_earned)
+                FROM user_daily_rollups
+                WHERE rollup_date BETWEEN {ph} AND {ph}
+                GROUP BY user_id
+                """,
+                (period_type, first, first, last),
+            )
+        if _is_sqlite():
+            cursor.execute("INSERT INTO rollup_runs (rollup_date, built_at) VALUES (?, CURRENT_TIMESTAMP) "
+                           "ON CONFLICT(rollup_date) DO UPDATE SET built_at = CURRENT_TIMESTAMP", (day,))
+        else:
+            cursor.execute("INSERT INTO rollup_runs (rollup_date, built_at) VALUES (%s, CURRENT_TIMESTAMP) "
+                           "ON DUPLICATE KEY UPDATE built_at = CURRENT_TIMESTAMP", (day,))
+
+    logger.info(f"[ROLLUP] built {day} members={len(rows)}")
+    return len(rows)
+
+
+def ensure_rollups(start: date, end: date = None) -> None:
+    """Build any day in [start, end] that has never been rolled up; today is always rebuilt"""
+    today = date.today()
+    end = min(as_date(end) or today, today)
+    start = as_date(start)
+    built = {
+        as_date(row['rollup_date'])
+        for row in execute_query(
+            "SELECT rollup_date FROM rollup_runs WHERE rollup_date BETWEEN %s AND %s", (start, end)
+        ) or []
+    }
+    day = start
+    while day <= end:
+        if day == today or day not in built:
+            build_daily_rollup(day)
+        day += timedelta(days=1)
+
+
+async def build_daily_rollups_job(context) -> None:
+    """Nightly job: re-run yesterday (late approvals/logs) and roll up today so far"""
+    today = date.today()
+    for day in (today - timedelta(days=1), today):
+        try:
+            await asyncio.to_thread(build_daily_rollup, day)
+        except Exception as e:
+            logger.error(f"[ROLLUP] build {day} failed: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+def get_daily_rollups(day: date) -> List[Dict]:
+    """Every member joined with their rollup row for `day` (zeros when inactive)"""
+    ensure_rollups(day, day)
+    rows = execute_query(
+        """
+        SELECT u.user_id, u.full_name, u.telegram_username, u.fee_status, u.total_points,
+               COALESCE(r.attendance_count, 0) AS attendance_count, COALESCE(r.weight_logs, 0) AS weight_logs,
+               COALESCE(r.water_cups, 0) AS water_cups, COALESCE(r.meal_logs, 0) AS meal_logs,
+               COALESCE(r.habits_completed, 0) AS habits_completed, COALESCE(r.shake_orders, 0) AS shake_orders,
+               COALESCE(r.points_earned, 0) AS points_earned, COALESCE(r.activity_score, 0) AS activity_score
+        FROM users u
+        LEFT JOIN user_daily_rollups r ON r.user_id = u.user_id AND r.rollup_date = %s
+        ORDER BY u.full_name ASC
+        """,
+        (day,),
+    ) or []
+    return rows
+
+
+def get_rollup_totals(start: date, end: date, limit: int = None) -> List[Dict]:
+    """Per-member activity-day counts over [start, end], most active first"""
+    ensure_rollups(start, end)
+    query = """
+        SELECT u.user_id, u.full_name, u.telegram_username, u.total_points,
+               SUM(CASE WHEN r.attendance_count > 0 THEN 1 ELSE 0 END) AS attendance_days,
+               SUM(CASE WHEN r.weight_logs > 0 THEN 1 ELSE 0 END) AS weight_log_days,
+               SUM(CASE WHEN r.water_cups > 0 THEN 1 ELSE 0 END) AS water_log_days,
+               SUM(CASE WHEN r.meal_logs > 0 THEN 1 ELSE 0 END) AS meal_log_days,
+               SUM(CASE WHEN r.habits_completed > 0 THEN 1 ELSE 0 END) AS habit_log_days,
+               SUM(r.points_earned) AS points_earned
+        FROM user_daily_rollups r
+        JOIN users u ON u.user_id = r.user_id
+        WHERE r.rollup_date BETWEEN %s AND %s
+        GROUP BY u.user_id, u.full_name, u.telegram_username, u.total_points
+    """
+    rows = execute_query(query, (start, end)) or []
+    for row in rows:
+        for key in ('attendance_days', 'weight_log_days', 'water_log_days', 'meal_log_days', 'habit_log_days',
+                    'points_earned'):
+            row[key] = int(row.get(key) or 0)
+        row['total_activity_days'] = (row['attendance_days'] + row['weight_log_days'] + row['water_log_days']
+                                      + row['meal_log_days'] + row['habit_log_days'])
+    rows.sort(key=lambda r: (r['total_activity_days'], r.get('total_points') or 0), reverse=True)
+    return rows[:limit] if limit else rows
+
+
+def get_period_summary(period_type: str, day: date = None) -> Dict:
+    """Totals for the week/month containing `day` as of its last daily build"""
+    day = as_date(day) or date.today()
+    first, _ = period_bounds(period_type, day)
+    summary = {'period_start': first, 'active_members': 0, 'attendance_days': 0, 'points_earned': 0}
+    try:
+        row = execute_query(
+            """
+            SELECT SUM(CASE WHEN active_days > 0 THEN 1 ELSE 0 END) AS active_members,
+                   SUM(attendance_days) AS attendance_days, SUM(points_earned) AS points_earned
+            FROM user_period_rollups WHERE period_type = %s AND period_start = %s
+            """,
+            (period_type, first),
+            fetch_one=True,
+        ) or {}
+    except Exception as e:
+        logger.error(f"[ROLLUP] {period_type} summary failed: {e}")
+        return summary
+    for key in ('active_members', 'attendance_days', 'points_earned'):
+        summary[key] = int(row.get(key) or 0)
+    return summary
+
+
+def get_inactive_rollups(since: date) -> List[Dict]:
+    """Members with no activity on or after `since`, with their last active day (None if never)"""
+    ensure_rollups(since)
+    return execute_query(
+        """
+        SELECT u.user_id, u.full_name, u.telegram_username, u.fee_status, u.total_points, u.created_at,
+               (SELECT MAX(r.rollup_date) FROM user_daily_rollups r
+                WHERE r.user_id = u.user_id AND r.activity_score > 0) AS last_active
+        FROM users u
+        WHERE NOT EXISTS (
+            SELECT 1 FROM user_daily_rollups r
+            WHERE r.user_id = u.user_id AND r.rollup_date >= %s AND r.activity_score > 0
+        )
+        """,
+        (since,),
+    ) or []
+
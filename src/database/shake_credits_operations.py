@@ -6,6 +6,7 @@ Handles all shake credit transactions, purchases, and consumption
 import logging
 from datetime import datetime, date
 from src.database.connection import execute_query, get_db_cursor
+from src.database.pagination import KEYSET_PAGE_SIZE, KeysetPage, fetch_keyset_page
 from src.database.ar_operations import (
     create_receivable, create_transactions, update_receivable_status, get_receivable_by_source
 )
@@ -261,6 +262,22 @@ def get_pending_purchase_requests(limit: int = 20) -> list:
         return []
 
 
+def get_pending_purchase_page(after: int = None, before: int = None, limit: int = KEYSET_PAGE_SIZE) -> KeysetPage:
+    """Keyset page of pending shake credit purchase requests (oldest first)"""
+    try:
+        query = """
+            SELECT sp.purchase_id, sp.user_id, u.full_name, u.telegram_username,
+                   sp.credits_requested, sp.amount, sp.payment_method, sp.status, sp.created_at
+            FROM shake_purchases sp
+            JOIN users u ON sp.user_id = u.user_id
+            WHERE sp.status = 'pending'
+        """
+        return fetch_keyset_page(query, (), 'sp.purchase_id', limit=limit, after=after, before=before)
+    except Exception as e:
+        logger.error(f"Failed to get pending purchase page: {e}")
+        return KeysetPage([], False, False)
+
+
 def approve_purchase(purchase_id: int, admin_user_id: int, amount_paid: float = None) -> dict:
     """
     Approve a shake credit purchase request
@@ -4,68 +4,105 @@ from src.database.connection import execute_query
 
 logger = logging.getLogger(__name__)
 
-def get_user_statistics(user_id: int):
-    """Get comprehensive statistics for a user"""
-    stats = {}
-    
-    # Total points
-    query1 = "SELECT total_points FROM users WHERE user_id = %s"
-    result = execute_query(query1, (user_id,), fetch_one=True)
-    stats['total_points'] = result['total_points'] if result else 0
-    
-    # Today's activity
-    query2 = "SELECT * FROM daily_logs WHERE user_id = %s AND log_date = CURRENT_DATE"
-    result = execute_query(query2, (user_id,), fetch_one=True)
-    stats['today_activity'] = result if result else None
-    
-    # This week stats
-    query3 = """
-        SELECT 
-            COUNT(*) as days_logged,
-            SUM(CASE WHEN weight IS NOT NULL THEN 1 ELSE 0 END) as weight_logs,
-            SUM(water_cups) as total_water,
-            SUM(meals_logged) as total_meals,
-            COUNT(CASE WHEN habits_completed THEN 1 END) as habits_completed,
-            COUNT(CASE WHEN attendance THEN 1 END) as attendance_count
-        FROM daily_logs
-        WHERE user_id = %s 
-        AND log_date >= CURRENT_DATE - INTERVAL '7 days'
-    """
-    result = execute_query(query3, (user_id,), fetch_one=True)
-    stats['weekly'] = result if result else None
+_LOG_METRICS = {
+    'days_logged': "1",
+    'weight_logs': "CASE WHEN dl.weight IS NOT NULL THEN 1 ELSE 0 END",
+    'total_water': "COALESCE(dl.water_cups, 0)",
+    'total_meals': "COALESCE(dl.meals_logged, 0)",
+    'water_days': "CASE WHEN dl.water_cups > 0 THEN 1 ELSE 0 END",
+    'meal_days': "CASE WHEN dl.meals_logged > 0 THEN 1 ELSE 0 END",
+    'habit_days': "CASE WHEN dl.habits_completed THEN 1 ELSE 0 END",
+    'gym_days': "CASE WHEN dl.attendance THEN 1 ELSE 0 END",
+}
+
+
+def compute_user_stats(user_id: int):
+    """All per-user figures behind My Stats in one query; None for an unknown user"""
+    today = datetime.now().date()
+    tomorrow = today + timedelta(days=1)
+    windows = {
+        'today': (today, tomorrow),
+        'week': (today - timedelta(days=7), tomorrow),
+        'previous_week': (today - timedelta(days=14), today - timedelta(days=7)),
+        'month': (today.replace(day=1), tomorrow),
+        'last_30': (today - timedelta(days=30), tomorrow),
+    }
+    since = min(start for start, _ in windows.values())
     
-    # Monthly stats
-    query4 = """
+    columns, params = [], []
+    for window, (start, end) in windows.items():
+        for metric, expr in _LOG_METRICS.items():
+            columns.append(f"SUM(CASE WHEN dl.log_date >= %s AND dl.log_date < %s THEN {expr} ELSE 0 END) AS {window}_{metric}")
+            params.extend((start, end))
+    query = f"""
         SELECT 
-            COUNT(*) as days_logged,
-            SUM(CASE WHEN weight IS NOT NULL THEN 1 ELSE 0 END) as weight_logs,
-            SUM(water_cups) as total_water,
-            SUM(meals_logged) as total_meals,
-            COUNT(CASE WHEN habits_completed THEN 1 END) as habits_completed
-        FROM daily_logs
-        WHERE user_id = %s 
-        AND log_date >= DATE_TRUNC('month', CURRENT_DATE)
+            u.total_points,
+            MAX(CASE WHEN dl.log_date = %s THEN dl.weight END) as today_weight,
+            {', '.join(columns)},
+            (SELECT weight FROM daily_logs WHERE user_id = u.user_id AND weight IS NOT NULL
+             ORDER BY log_date DESC LIMIT 1) as current_weight,
+            (SELECT weight FROM daily_logs WHERE user_id = u.user_id AND weight IS NOT NULL
+             ORDER BY log_date DESC LIMIT 1 OFFSET 1) as previous_weight,
+            s.last_checkin_date, s.current_streak, s.longest_streak,
+            s.week_start, s.week_count, s.week_weekday_count
+        FROM users u
+        LEFT JOIN daily_logs dl ON dl.user_id = u.user_id AND dl.log_date >= %s
+        LEFT JOIN attendance_streaks s ON s.user_id = u.user_id
+        WHERE u.user_id = %s
+        GROUP BY u.user_id, u.total_points, s.last_checkin_date, s.current_streak, s.longest_streak,
+                 s.week_start, s.week_count, s.week_weekday_count
     """
-    result = execute_query(query4, (user_id,), fetch_one=True)
-    stats['monthly'] = result if result else None
+    from src.database.streak_operations import summarize_streak
+    row = execute_query(query, (today, *params, since, user_id), fetch_one=True)
+    if not row:
+        return None
     
-    # Weight progress
-    query5 = """
-        SELECT weight, log_date 
-        FROM daily_logs
-        WHERE user_id = %s AND weight IS NOT NULL
-        ORDER BY log_date DESC
-        LIMIT 2
-    """
-    results = execute_query(query5, (user_id,))
-    if results and len(results) >= 2:
-        current_weight = results[0]['weight']
-        initial_weight = results[-1]['weight']
-        stats['weight_change'] = initial_weight - current_weight
-        stats['current_weight'] = current_weight
+    def window(name, metrics):
+        return {metric: int(row.get(f"{name}_{metric}") or 0) for metric in metrics}
     
+    today_log = window('today', ('days_logged', 'total_water', 'total_meals', 'habit_days', 'gym_days'))
+    streak = summarize_streak(row, today)
+    stats = {
+        'total_points': row['total_points'] or 0,
+        'today_activity': {
+            'weight': row.get('today_weight'),
+            'water_cups': today_log['total_water'],
+            'meals_logged': today_log['total_meals'],
+            'habits_completed': bool(today_log['habit_days']),
+            'attendance': bool(today_log['gym_days']),
+        } if today_log['days_logged'] else None,
+        'weekly': dict(window('week', ('days_logged', 'weight_logs', 'total_water', 'total_meals')),
+                       habits_completed=int(row.get('week_habit_days') or 0),
+                       attendance_count=int(row.get('week_gym_days') or 0)),
+        'monthly': dict(window('month', ('days_logged', 'weight_logs', 'total_water', 'total_meals')),
+                        habits_completed=int(row.get('month_habit_days') or 0)),
+        'consistency': {
+            'total_days': int(row.get('last_30_days_logged') or 0),
+            'weight_log_days': int(row.get('last_30_weight_logs') or 0),
+            'water_log_days': int(row.get('last_30_water_days') or 0),
+            'meal_log_days': int(row.get('last_30_meal_days') or 0),
+            'habit_days': int(row.get('last_30_habit_days') or 0),
+            'gym_days': int(row.get('last_30_gym_days') or 0),
+        },
+        'weekly_comparison': [
+            dict(window(name, ('days_logged', 'weight_logs', 'total_water', 'total_meals')), week=label)
+            for name, label in (('week', 'Current'), ('previous_week', 'Previous'))
+            if row.get(f"{name}_days_logged")
+        ],
+        'attendance_streak': streak['current_streak'],
+        'longest_streak': streak['longest_streak'],
+        'week_checkins': streak['week_count'],
+    }
+    if row.get('previous_weight') is not None:
+        stats['current_weight'] = row['current_weight']
+        stats['weight_change'] = row['previous_weight'] - row['current_weight']
     return stats
 
+def get_user_statistics(user_id: int):
+    """Get comprehensive statistics for a user (cached, see src.utils.user_stats_cache)"""
+    from src.utils.user_stats_cache import get_user_stats
+    return get_user_stats(user_id) or {'total_points': 0, 'today_activity': None, 'weekly': None, 'monthly': None}
+
 def get_leaderboard_with_stats(limit: int = 10):
     """Get leaderboard with detailed statistics"""
     query = """
@@ -101,114 +138,49 @@ def get_weight_progress(user_id: int, days: int = 30):
     return execute_query(query, (user_id, days))
 
 def get_consistency_stats(user_id: int):
-    """Get user's consistency metrics"""
-    query = """
-        SELECT 
-            COUNT(*) as total_days,
-            COUNT(CASE WHEN weight IS NOT NULL THEN 1 END) as weight_log_days,
-            COUNT(CASE WHEN water_cups > 0 THEN 1 END) as water_log_days,
-            COUNT(CASE WHEN meals_logged > 0 THEN 1 END) as meal_log_days,
-            COUNT(CASE WHEN habits_completed THEN 1 END) as habit_days,
-            COUNT(CASE WHEN attendance THEN 1 END) as gym_days
-        FROM daily_logs
-        WHERE user_id = %s
-        AND log_date >= CURRENT_DATE - INTERVAL '30 days'
-    """
-    return execute_query(query, (user_id,), fetch_one=True)
+    """Get user's consistency metrics (last 30 days)"""
+    from src.utils.user_stats_cache import get_user_stats
+    stats = get_user_stats(user_id)
+    return stats['consistency'] if stats else None
 
 def get_top_activities():
-    """Get most common activities among all users"""
-    query = """
-        SELECT 
-            activity,
-            COUNT(*) as frequency,
-            SUM(points) as total_points,
-            AVG(points) as avg_points
-        FROM points_transactions
-        WHERE created_at >= CURRENT_DATE - INTERVAL '30 days'
-        GROUP BY activity
-        ORDER BY frequency DESC
-    """
-    return execute_query(query)
+    """Get most common activities among all users (last 30 days, from metric counters)"""
+    from src.database.dashboard_metrics import get_activity_totals, ENGAGEMENT_WINDOW_DAYS
+    return get_activity_totals(datetime.now().date() - timedelta(days=ENGAGEMENT_WINDOW_DAYS))
 
 def get_engagement_metrics():
-    """Get overall platform engagement"""
-    query = """
-        SELECT 
-            COUNT(DISTINCT pt.user_id) as active_users,
-            COUNT(DISTINCT CASE WHEN u.fee_status = 'paid' THEN u.user_id END) as paid_members,
-            SUM(pt.points) as total_points_awarded,
-            AVG(pt.points) as avg_points_per_activity,
-            COUNT(*) as total_transactions
-        FROM points_transactions pt
-        LEFT JOIN users u ON pt.user_id = u.user_id
-        WHERE pt.created_at >= CURRENT_DATE - INTERVAL '30 days'
-    """
-    return execute_query(query, fetch_one=True)
+    """Get overall platform engagement (last 30 days, from materialised metrics)"""
+    from src.database.dashboard_metrics import (
+        get_section, get_metric_totals, SECTION_ENGAGEMENT, METRIC_POINTS, ENGAGEMENT_WINDOW_DAYS
+    )
+    snapshot = get_section(SECTION_ENGAGEMENT)
+    points = get_metric_totals(METRIC_POINTS, datetime.now().date() - timedelta(days=ENGAGEMENT_WINDOW_DAYS))
+    return {
+        'active_users': snapshot.get('active_users', 0),
+        'paid_members': snapshot.get('paid_members', 0),
+        'total_points_awarded': points['amount'],
+        'avg_points_per_activity': points['amount'] / points['count'] if points['count'] else 0,
+        'total_transactions': points['count'],
+    }
 
 def get_weekly_comparison(user_id: int):
     """Compare user's current week vs previous week"""
-    query = """
-        SELECT 
-            CASE 
-                WHEN log_date >= CURRENT_DATE - INTERVAL '7 days' THEN 'Current'
-                ELSE 'Previous'
-            END as week,
-            COUNT(*) as days_logged,
-            SUM(CASE WHEN weight IS NOT NULL THEN 1 ELSE 0 END) as weight_logs,
-            SUM(water_cups) as total_water,
-            SUM(meals_logged) as total_meals
-        FROM daily_logs
-        WHERE user_id = %s
-        AND log_date >= CURRENT_DATE - INTERVAL '14 days'
-        GROUP BY week
-    """
-    return execute_query(query, (user_id,))
+    from src.utils.user_stats_cache import get_user_stats
+    stats = get_user_stats(user_id)
+    return stats['weekly_comparison'] if stats else []
 
 def get_attendance_streak(user_id: int):
     """Get user's current gym attendance streak"""
-    query = """
-        WITH RECURSIVE streak AS (
-            SELECT 
-                request_date,
-                1 as streak_count,
-                request_date as streak_start
-            FROM attendance_queue
-            WHERE user_id = %s 
-            AND status = 'approved'
-            AND request_date >= CURRENT_DATE - INTERVAL '100 days'
-            
-            UNION ALL
-            
-            SELECT 
-                aq.request_date,
-                s.streak_count + 1,
-                s.streak_start
-            FROM streak s
-            JOIN attendance_queue aq ON aq.request_date = s.request_date + INTERVAL '1 day'
-            WHERE aq.user_id = %s
-            AND aq.status = 'approved'
-        )
-        SELECT MAX(streak_count) as current_streak
-        FROM streak
-        WHERE streak_start = (SELECT MAX(request_date) FROM attendance_queue 
-                            WHERE user_id = %s AND status = 'approved') 
-                            - (SELECT COUNT(*) - 1 FROM streak)
-    """
-    result = execute_query(query, (user_id, user_id, user_id), fetch_one=True)
-    return result['current_streak'] if result else 0
+    from src.database.streak_operations import get_streak_summary
+    return get_streak_summary(user_id)['current_streak']
 
 def get_platform_statistics():
-    """Get overall platform statistics"""
-    query = """
-        SELECT 
-            (SELECT COUNT(*) FROM users) as total_users,
-            (SELECT COUNT(*) FROM users WHERE fee_status = 'paid') as active_members,
-            (SELECT SUM(total_points) FROM users) as total_points,
-            (SELECT COUNT(*) FROM points_transactions 
-             WHERE created_at >= CURRENT_DATE) as today_activities,
-            (SELECT AVG(total_points) FROM users WHERE total_points > 0) as avg_points,
-            (SELECT COUNT(DISTINCT user_id) FROM daily_logs 
-             WHERE log_date = CURRENT_DATE) as today_users
-    """
-    return execute_query(query, fetch_one=True)
+    """Get overall platform statistics (from materialised metrics)"""
+    from src.database.dashboard_metrics import (
+        get_section, get_metric_totals, SECTION_PLATFORM, METRIC_POINTS, METRIC_ATTENDANCE
+    )
+    stats = dict(get_section(SECTION_PLATFORM))
+    today = datetime.now().date()
+    stats['today_activities'] = get_metric_totals(METRIC_POINTS, today)['count']
+    stats['today_checkins'] = get_metric_totals(METRIC_ATTENDANCE, today)['count']
+    return stats
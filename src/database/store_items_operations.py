@@ -6,6 +6,9 @@ Handles store catalog CRUD operations
 import logging
 from typing import List, Dict, Optional
 from src.database.connection import execute_query
+from src.utils.product_search import (
+    SOURCE_STORE_ITEMS, invalidate_product_index, search_products,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +82,7 @@ def add_or_update_item_in_db(item: Dict) -> Dict:
                 result = execute_query(query2, (serial,), fetch_one=True)
                 if result:
                     result['is_new'] = False
+                    invalidate_product_index(SOURCE_STORE_ITEMS)
                     return result
             else:
                 # Serial not found
@@ -100,6 +104,7 @@ def add_or_update_item_in_db(item: Dict) -> Dict:
             result = execute_query(query2, (dup['serial'],), fetch_one=True)
             if result:
                 result['is_new'] = False
+                invalidate_product_index(SOURCE_STORE_ITEMS)
                 return result
         
         # Create new item
@@ -114,6 +119,7 @@ def add_or_update_item_in_db(item: Dict) -> Dict:
         result = execute_query(query2, (name_raw, hsn_raw), fetch_one=True)
         if result:
             result['is_new'] = True
+            invalidate_product_index(SOURCE_STORE_ITEMS)
             return result
         
         raise Exception("Failed to create item")
@@ -124,17 +130,9 @@ def add_or_update_item_in_db(item: Dict) -> Dict:
 
 
 def find_items_from_db(term: str, limit: int = 10) -> List[Dict]:
-    """Search items by name or HSN"""
+    """Search items by name or HSN (ranked, typo-tolerant)"""
     try:
-        term_lower = term.strip().lower()
-        query = """
-        SELECT * FROM store_items
-        WHERE LOWER(name) LIKE %s OR LOWER(hsn) LIKE %s
-        ORDER BY name
-        LIMIT %s
-        """
-        search_term = f"%{term_lower}%"
-        return execute_query(query, (search_term, search_term, limit))
+        return search_products(term, SOURCE_STORE_ITEMS, limit=limit)
     except Exception as e:
         logger.error(f"Error finding items in DB: {e}")
         return []
@@ -145,6 +143,7 @@ def delete_item_from_db(serial: int) -> bool:
     try:
         query = "DELETE FROM store_items WHERE serial = %s"
         execute_query(query, (serial,))
+        invalidate_product_index(SOURCE_STORE_ITEMS)
         logger.info(f"Deleted item with serial {serial}")
         return True
     except Exception as e:
@@ -153,15 +152,9 @@ def delete_item_from_db(serial: int) -> bool:
 
 
 def search_items_by_name_from_db(name: str) -> List[Dict]:
-    """Search items by name (partial match)"""
+    """Search items by name (ranked, typo-tolerant)"""
     try:
-        query = """
-        SELECT * FROM store_items
-        WHERE LOWER(name) LIKE %s
-        ORDER BY name
-        LIMIT 20
-        """
-        return execute_query(query, (f"%{name.lower()}%",))
+        return search_products(name, SOURCE_STORE_ITEMS, limit=20)
     except Exception as e:
         logger.error(f"Error searching items by name: {e}")
         return []
@@ -5,8 +5,11 @@ Reuses existing payment logic from subscriptions
 
 import logging
 from datetime import datetime
-from src.database.connection import execute_query
+from src.config import USE_LOCAL_DB, USE_REMOTE_DB
+from src.database.connection import execute_query, get_db_cursor
+from src.database.pagination import KEYSET_PAGE_SIZE, KeysetPage, fetch_keyset_page
 from src.database.ar_operations import create_receivable, update_receivable_status
+from src.utils.product_search import SOURCE_STORE_PRODUCTS, invalidate_product_index
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +52,7 @@ def create_or_update_product(product_code: str, category: str, name: str, descri
                 updated_at = CURRENT_TIMESTAMP
         """
         execute_query(query1, (product_code, category, name, description, price, discount_percent, stock, status))
+        invalidate_product_index(SOURCE_STORE_PRODUCTS)
         
         # Get the result
         query2 = "SELECT * FROM store_products WHERE product_code = %s"
@@ -63,6 +67,59 @@ def create_or_update_product(product_code: str, category: str, name: str, descri
         return None
 
 
+PRODUCT_IMPORT_FIELDS = ('product_code', 'category', 'name', 'description', 'price', 'discount_percent', 'stock', 'status')
+
+
+def get_product_snapshot() -> dict:
+    """All products keyed by product_code, read in one query (bulk import diffing)"""
+    try:
+        rows = execute_query(f"SELECT {', '.join(PRODUCT_IMPORT_FIELDS)} FROM store_products")
+        return {str(row['product_code']): row for row in rows or []}
+    except Exception as e:
+        logger.error(f"Error loading product snapshot: {e}")
+        return {}
+
+
+def bulk_upsert_products(products: list, batch_size: int = 200) -> int:
+    """
+    Upsert many products by product_code in a single transaction
+    
+    Rows are sent with executemany in batches of `batch_size`; any failure
+    rolls back the whole import. Raises on error.
+    
+    Args:
+        products: List of dicts with PRODUCT_IMPORT_FIELDS keys
+    
+    Returns:
+        Number of rows written
+    """
+    if not products:
+        return 0
+    
+    local = USE_LOCAL_DB and not USE_REMOTE_DB
+    placeholder = '?' if local else '%s'
+    columns = ', '.join(PRODUCT_IMPORT_FIELDS)
+    values = ', '.join([placeholder] * len(PRODUCT_IMPORT_FIELDS))
+    updated = [f for f in PRODUCT_IMPORT_FIELDS if f != 'product_code']
+    if local:
+        assignments = ', '.join(f"{f} = excluded.{f}" for f in updated)
+        sql = (f"INSERT INTO store_products ({columns}) VALUES ({values}) "
+               f"ON CONFLICT(product_code) DO UPDATE SET {assignments}, updated_at = CURRENT_TIMESTAMP")
+    else:
+        assignments = ', '.join(f"{f} = VALUES({f})" for f in updated)
+        sql = (f"INSERT INTO store_products ({columns}) VALUES ({values}) "
+               f"ON DUPLICATE KEY UPDATE {assignments}, updated_at = CURRENT_TIMESTAMP")
+    
+    with get_db_cursor() as cursor:
+        for start in range(0, len(products), batch_size):
+            batch = products[start:start + batch_size]
+            cursor.executemany(sql, [tuple(p[f] for f in PRODUCT_IMPORT_FIELDS) for p in batch])
+    
+    invalidate_product_index(SOURCE_STORE_PRODUCTS)
+    logger.info(f"Bulk upserted {len(products)} products")
+    return len(products)
+
+
 def get_products_by_category(category: str) -> list:
     """Get all active products in a category"""
     try:
@@ -293,6 +350,35 @@ def get_all_orders(status_filter: str = None) -> list:
         return []
 
 
+def get_orders_page(status_filter: str = None, after: int = None, before: int = None,
+                    limit: int = KEYSET_PAGE_SIZE) -> KeysetPage:
+    """Keyset page of orders, newest first, optionally filtered by status"""
+    try:
+        if status_filter:
+            query = "SELECT * FROM store_orders WHERE payment_status = %s"
+            params = (status_filter,)
+        else:
+            query = "SELECT * FROM store_orders WHERE 1=1"
+            params = ()
+        return fetch_keyset_page(query, params, 'order_id', limit=limit,
+                                 after=after, before=before, descending=True)
+    except Exception as e:
+        logger.error(f"Error getting orders page: {e}")
+        return KeysetPage([], False, False)
+
+
+def count_orders_by_status() -> dict:
+    """Order counts per payment_status in one grouped query"""
+    try:
+        rows = execute_query(
+            "SELECT payment_status, COUNT(*) AS total FROM store_orders GROUP BY payment_status"
+        )
+        return {row['payment_status']: int(row['total']) for row in rows or []}
+    except Exception as e:
+        logger.error(f"Error counting orders: {e}")
+        return {}
+
+
 def apply_order_payment(order_id: int, amount: float, payment_method: str, 
                         admin_id: int = None, reference: str = None) -> dict:
     """
@@ -474,6 +560,7 @@ def reduce_stock(product_id: int, quantity: int, order_id: int = None) -> bool:
             WHERE product_id = %s AND stock >= %s
         """
         execute_query(query1, (quantity, product_id, quantity))
+        invalidate_product_index(SOURCE_STORE_PRODUCTS)
         
         # Get the updated stock value
         query2 = "SELECT stock FROM store_products WHERE product_id = %s"
@@ -499,6 +586,7 @@ def increase_stock(product_id: int, quantity: int, reason: str = "") -> bool:
             WHERE product_id = %s
         """
         execute_query(query1, (quantity, product_id))
+        invalidate_product_index(SOURCE_STORE_PRODUCTS)
         
         # Get the updated stock value
         query2 = "SELECT stock FROM store_products WHERE product_id = %s"
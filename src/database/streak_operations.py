@@ -0,0 +1,201 @@
+"""
+Attendance streak and weekly check-in counters.
+
+attendance_streaks keeps one row per member: last approved check-in date,
+current and longest streak, and this week's counts. Approving an
+attendance updates the row in O(1) (`record_attendance_streak`); readers
+get current streak, longest streak and this week's count without scanning
+attendance_queue.
+
+Sundays are the studio's rest day: a gap made only of Sundays does not
+break a streak, and `week_weekday_count` (used by the 6-day weekly bonus)
+leaves them out. Weeks run Monday-Sunday.
+
+An approval for a day before the member's last check-in (a late approval)
+cannot be applied incrementally, so that member's row is rebuilt from
+history. `seed_attendance_streaks` builds every row; the `streaks`
+startup stage runs it once and records STREAK_SEED_SETTING in
+app_settings when done, so rows written by check-ins before the seed
+never stop it.
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
+
+from src.database.connection import execute_query
+from src.config import USE_LOCAL_DB, USE_REMOTE_DB
+
+logger = logging.getLogger(__name__)
+
+REST_WEEKDAYS = frozenset({6})  # Sunday
+
+# app_settings key holding the date the table was seeded from attendance_queue
+STREAK_SEED_SETTING = 'attendance_streaks_seeded'
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def continues_streak(previous: Optional[date], day: date) -> bool:
+    """True if `day` follows `previous` with only rest days in between"""
+    if previous is None or day <= previous:
+        return False
+    gap = previous + timedelta(days=1)
+    while gap < day:
+        if gap.weekday() not in REST_WEEKDAYS:
+            return False
+        gap += timedelta(days=1)
+    return True
+
+
+def _advance(state: Dict, day: date) -> Dict:
+    """State after one more approved check-in on `day` (day > last_checkin_date)"""
+    streak = state['current_streak'] + 1 if continues_streak(state['last_checkin_date'], day) else 1
+    monday = week_start(day)
+    if state['week_start'] != monday:
+        state['week_start'], state['week_count'], state['week_weekday_count'] = monday, 0, 0
+    state['week_count'] += 1
+    state['week_weekday_count'] += 0 if day.weekday() in REST_WEEKDAYS else 1
+    state['last_checkin_date'] = day
+    state['current_streak'] = streak
+    state['longest_streak'] = max(state['longest_streak'], streak)
+    return state
+
+
+def _empty_state() -> Dict:
+    return {'last_checkin_date': None, 'current_streak': 0, 'longest_streak': 0,
+            'week_start': None, 'week_count': 0, 'week_weekday_count': 0}
+
+
+def build_streak_state(dates: Iterable[date]) -> Dict:
+    state = _empty_state()
+    for day in sorted(set(dates)):
+        _advance(state, day)
+    return state
+
+
+def _load_state(user_id: int) -> Optional[Dict]:
+    row = execute_query(
+        "SELECT last_checkin_date, current_streak, longest_streak, week_start, week_count, week_weekday_count "
+        "FROM attendance_streaks WHERE user_id = %s",
+        (user_id,),
+        fetch_one=True,
+    )
+    if not row:
+        return None
+    row['last_checkin_date'] = _as_date(row['last_checkin_date'])
+    row['week_start'] = _as_date(row['week_start'])
+    return row
+
+
+def _save_state(user_id: int, state: Dict) -> None:
+    columns = ('last_checkin_date', 'current_streak', 'longest_streak', 'week_start', 'week_count', 'week_weekday_count')
+    if USE_LOCAL_DB and not USE_REMOTE_DB:
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns)
+        conflict = f"ON CONFLICT(user_id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP"
+    else:
+        updates = ", ".join(f"{c} = VALUES({c})" for c in columns)
+        conflict = f"ON DUPLICATE KEY UPDATE {updates}, updated_at = CURRENT_TIMESTAMP"
+    execute_query(
+        f"INSERT INTO attendance_streaks (user_id, {', '.join(columns)}) "
+        f"VALUES (%s, {', '.join(['%s'] * len(columns))}) {conflict}",
+        (user_id, *(state[c] for c in columns)),
+    )
+
+
+def _approved_dates(user_id: int):
+    rows = execute_query(
+        "SELECT queue_date FROM attendance_queue WHERE user_id = %s AND status = 'approved'", (user_id,)
+    ) or []
+    return [_as_date(row['queue_date']) for row in rows]
+
+
+def rebuild_attendance_streak(user_id: int) -> Dict:
+    """Recompute one member's row from attendance_queue"""
+    state = build_streak_state(_approved_dates(user_id))
+    _save_state(user_id, state)
+    return state
+
+
+def record_attendance_streak(user_id: int, day: date = None) -> None:
+    """Apply one approved check-in; never raises (the approval already succeeded)"""
+    day = _as_date(day) or date.today()
+    try:
+        state = _load_state(user_id)
+        if state is None:
+            # Unseeded member (first check-in, or table created after history): build from history once
+            rebuild_attendance_streak(user_id)
+            return
+        last = state['last_checkin_date']
+        if last == day:
+            return
+        if last is not None and day < last:
+            rebuild_attendance_streak(user_id)
+            return
+        _save_state(user_id, _advance(state, day))
+    except Exception as e:
+        logger.error(f"[STREAK] update failed user_id={user_id}: {e}")
+
+
+def summarize_streak(state: Optional[Dict], today: date = None) -> Dict:
+    """{'current_streak', 'longest_streak', 'week_count', 'week_weekday_count'} of a stored row as of `today`"""
+    today = today or date.today()
+    summary = {'current_streak': 0, 'longest_streak': 0, 'week_count': 0, 'week_weekday_count': 0}
+    if not state or state.get('last_checkin_date') is None:
+        return summary
+    summary['longest_streak'] = int(state['longest_streak'] or 0)
+    last = _as_date(state['last_checkin_date'])
+    # Still current if the next check-in (today at the earliest) would continue it
+    if last == today or continues_streak(last, today) or continues_streak(last, today + timedelta(days=1)):
+        summary['current_streak'] = int(state['current_streak'] or 0)
+    if _as_date(state['week_start']) == week_start(today):
+        summary['week_count'] = int(state['week_count'] or 0)
+        summary['week_weekday_count'] = int(state['week_weekday_count'] or 0)
+    return summary
+
+
+def get_streak_summary(user_id: int, today: date = None) -> Dict:
+    """Current/longest streak and this week's counts for one member (single row read)"""
+    try:
+        state = _load_state(user_id)
+    except Exception as e:
+        logger.error(f"[STREAK] read failed user_id={user_id}: {e}")
+        state = None
+    return summarize_streak(state, today)
+
+
+def seed_attendance_streaks() -> int:
+    """Build every member's row from attendance_queue; returns members seeded"""
+    rows = execute_query(
+        "SELECT user_id, queue_date FROM attendance_queue WHERE status = 'approved' ORDER BY user_id"
+    ) or []
+    dates: Dict[int, list] = {}
+    for row in rows:
+        dates.setdefault(int(row['user_id']), []).append(_as_date(row['queue_date']))
+    for user_id, user_dates in dates.items():
+        _save_state(user_id, build_streak_state(user_dates))
+    logger.info(f"[STREAK] seeded members={len(dates)}")
+    return len(dates)
+
+
+def seed_attendance_streaks_once() -> bool:
+    """Seed unless STREAK_SEED_SETTING is recorded; True if it seeded now.
+
+    The marker is written only after a successful seed, so a failed run is
+    retried on the next startup.
+    """
+    from src.database.app_settings_operations import get_app_setting, set_app_setting
+    if get_app_setting(STREAK_SEED_SETTING):
+        return False
+    seed_attendance_streaks()
+    set_app_setting(STREAK_SEED_SETTING, date.today().isoformat())
+    return True
+
@@ -7,12 +7,17 @@ Subscription Management Operations
 import logging
 from datetime import datetime, timedelta
 from src.database.connection import execute_query
+from src.database.pagination import KEYSET_PAGE_SIZE, KeysetPage, fetch_keyset_page
 from src.database.ar_operations import (
     create_receivable,
     create_transactions,
     get_receivable_by_source,
     update_receivable_status,
 )
+from src.utils.eligibility_snapshot import (
+    ELIGIBILITY_ACTIVE, ELIGIBILITY_GRACE, ELIGIBILITY_EXPIRED, ELIGIBILITY_NO_SUBSCRIPTION,
+    get_eligibility, refresh_eligibility,
+)
 
 def create_pending_payment(user_id: int, request_id: int, amount: float, payment_method: str, reference: str = None, screenshot_file_id: str = None) -> dict:
     """Create a pending payment record (evidence) without mirroring to AR ledger."""
@@ -190,6 +195,22 @@ def get_pending_subscription_requests() -> list:
     return []
 
 
+def get_pending_subscription_page(after: int = None, before: int = None, limit: int = KEYSET_PAGE_SIZE) -> KeysetPage:
+    """Keyset page of pending subscription requests, newest first"""
+    try:
+        query = """
+            SELECT sr.id, sr.user_id, sr.plan_id, sr.amount, sr.status, sr.requested_at,
+                   u.full_name, u.phone
+            FROM subscription_requests sr
+            JOIN users u ON sr.user_id = u.user_id
+            WHERE sr.status = 'pending'
+        """
+        return fetch_keyset_page(query, (), 'sr.id', limit=limit, after=after, before=before, descending=True)
+    except Exception as e:
+        logger.error(f"Error fetching pending subscription page: {e}")
+        return KeysetPage([], False, False)
+
+
 def get_user_pending_subscription_request(user_id: int) -> dict:
     """Get pending subscription request for a specific user"""
     try:
@@ -365,6 +386,10 @@ def approve_subscription(
                 )
         
         logger.info(f"Subscription approved for user {user_id}: Amount {amount}, End Date {end_date}")
+        try:
+            refresh_eligibility(user_id)
+        except Exception as snap_err:
+            logger.warning(f"Eligibility snapshot refresh failed for user {user_id}: {snap_err}")
         return True
         
     except Exception as e:
@@ -414,27 +439,20 @@ def get_user_subscription(user_id: int) -> dict:
 
 
 def is_subscription_active(user_id: int) -> bool:
-    """Check if user has an active subscription"""
-    sub = get_user_subscription(user_id)
-    if not sub:
+    """Check if user has an active subscription (served from the eligibility snapshot)"""
+    try:
+        eligibility = get_eligibility(user_id)
+    except Exception as e:
+        logger.error(f"Error checking subscription: {e}")
         return False
-    
-    now = datetime.now()
-    return sub["status"] == "active" and now <= sub["end_date"]
+    return bool(eligibility) and eligibility['state'] == ELIGIBILITY_ACTIVE
 
 
 def is_in_grace_period(user_id: int) -> bool:
     """Check if user is in grace period (subscription expired but within 7 days)"""
     try:
-        sub = get_user_subscription(user_id)
-        if not sub:
-            return False
-        
-        now = datetime.now()
-        end_date = sub["end_date"]
-        grace_period_end = sub["grace_period_end"]
-        
-        return end_date < now <= grace_period_end
+        eligibility = get_eligibility(user_id)
+        return bool(eligibility) and eligibility['state'] == ELIGIBILITY_GRACE
     except Exception as e:
         logger.error(f"Error checking grace period: {e}")
     
@@ -444,14 +462,11 @@ def is_in_grace_period(user_id: int) -> bool:
 def is_subscription_expired(user_id: int) -> bool:
     """Check if subscription is completely expired (past grace period)"""
     try:
-        sub = get_user_subscription(user_id)
-        if not sub:
+        eligibility = get_eligibility(user_id)
+        if not eligibility:
             return True  # No subscription = expired
         
-        now = datetime.now()
-        grace_period_end = sub["grace_period_end"]
-        
-        return now > grace_period_end
+        return eligibility['state'] in (ELIGIBILITY_EXPIRED, ELIGIBILITY_NO_SUBSCRIPTION)
     except Exception as e:
         logger.error(f"Error checking subscription expiry: {e}")
     
@@ -554,8 +569,12 @@ def get_expired_subscriptions() -> list:
     return []
 
 
-def mark_subscription_locked(user_id: int) -> bool:
-    """Mark subscription as locked (expired past grace period)"""
+def mark_subscription_locked(user_id: int, refresh_snapshot: bool = True) -> bool:
+    """Mark subscription as locked (expired past grace period)
+
+    Bulk callers pass refresh_snapshot=False and invalidate the eligibility
+    snapshot once at the end.
+    """
     try:
         execute_query(
             """
@@ -566,6 +585,8 @@ def mark_subscription_locked(user_id: int) -> bool:
             (user_id,),
         )
         logger.info(f"Subscription locked for user {user_id}")
+        if refresh_snapshot:
+            refresh_eligibility(user_id)
         return True
     except Exception as e:
         logger.error(f"Error locking subscription: {e}")
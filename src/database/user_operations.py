@@ -1,6 +1,7 @@
 import logging
 import secrets
 from src.database.connection import execute_query
+from src.database.pagination import KEYSET_PAGE_SIZE, KeysetPage, fetch_keyset_page
 
 logger = logging.getLogger(__name__)
 
@@ -162,6 +163,8 @@ def delete_user(user_id: int):
                 cursor.execute("DELETE FROM users WHERE user_id = %s", (user_id,))
                 conn.commit()
                 logger.info(f"[DELETE_USER] User deleted: {user_id} - {result[0]} (cleaned {sum(deleted_counts.values())} related records)")
+                from src.utils.eligibility_snapshot import drop_eligibility
+                drop_eligibility(user_id)
                 return {'full_name': result[0]}
             else:
                 logger.warning(f"[DELETE_USER] User {user_id} not found in database")
@@ -335,6 +338,17 @@ def get_pending_users():
     return execute_query(query)
 
 
+def get_pending_users_page(after: int = None, before: int = None, limit: int = KEYSET_PAGE_SIZE) -> KeysetPage:
+    """Keyset page of users pending approval, keyed by user_id"""
+    query = """
+        SELECT user_id, telegram_username, full_name, phone, age, 
+               initial_weight, created_at, profile_pic_url
+        FROM users 
+        WHERE approval_status = 'pending'
+    """
+    return fetch_keyset_page(query, (), 'user_id', limit=limit, after=after, before=before)
+
+
 def search_users(term: str, limit: int = 10, offset: int = 0):
     """Search users by full_name, telegram_username, or user_id using LIKE for partial matches.
     
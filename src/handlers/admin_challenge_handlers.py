@@ -475,10 +475,10 @@ def get_admin_challenge_handler():
         entry_points=[CommandHandler("admin_challenges", cmd_admin_challenges)],
         states={
             CREATE_NAME: [MessageHandler(filters.TEXT & ~filters.COMMAND, process_challenge_name)],
-            CREATE_TYPE: [CallbackQueryHandler(callback_challenge_type)],
+            CREATE_TYPE: [CallbackQueryHandler(callback_challenge_type, pattern="^chal_type_")],
             CREATE_START: [MessageHandler(filters.TEXT & ~filters.COMMAND, process_start_date)],
             CREATE_END: [MessageHandler(filters.TEXT & ~filters.COMMAND, process_end_date)],
-            CREATE_PRICING: [CallbackQueryHandler(callback_challenge_pricing)],
+            CREATE_PRICING: [CallbackQueryHandler(callback_challenge_pricing, pattern="^chal_pricing_")],
             CREATE_AMOUNT: [MessageHandler(filters.TEXT & ~filters.COMMAND, process_entry_amount)],
             CREATE_DESC: [MessageHandler(filters.TEXT, process_challenge_desc)],
             CREATE_CONFIRM: [
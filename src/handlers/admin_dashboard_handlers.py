@@ -21,8 +21,6 @@ from src.utils.flow_manager import (
     set_active_flow, clear_active_flow, check_flow_ownership,
     FLOW_DELETE_USER, FLOW_BAN_USER
 )
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -775,6 +773,10 @@ async def cmd_export_excel(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.edit_message_text("📭 No members to export.")
             return
         
+        # Imported on use: openpyxl is slow to load and only the export needs it
+        import openpyxl
+        from openpyxl.styles import Font, PatternFill, Alignment
+
         # Create Excel workbook
         workbook = openpyxl.Workbook()
         worksheet = workbook.active
@@ -3,7 +3,8 @@ from datetime import datetime
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler, CommandHandler, CallbackQueryHandler, MessageHandler, filters
 from src.database.attendance_operations import (
-    get_pending_attendance_requests, approve_attendance, reject_attendance, award_weekly_bonus
+    get_pending_attendance_requests, get_pending_attendance_page, approve_attendance, reject_attendance,
+    award_weekly_bonus
 )
 from src.database.shake_operations import (
     get_pending_shakes, approve_shake, complete_shake, cancel_shake
@@ -12,12 +13,53 @@ from src.utils.auth import is_admin_id
 from src.database.staff_operations import add_staff, remove_staff, list_staff
 from src.database.admin_operations import add_admin, remove_admin
 from src.database.role_operations import list_admins
-from src.database.user_operations import approve_user, reject_user, get_pending_users, get_user
+from src.database.user_operations import approve_user, reject_user, get_pending_users_page, get_user
 from src.handlers.user_handlers import cancel_registration
+from src.utils.keyset_pagination import KeysetList, register_keyset_list, show_keyset_list, invalidate_keyset_list
 
 logger = logging.getLogger(__name__)
 
 
+def _render_pending_attendance_row(req: dict) -> str:
+    text = f"👤 {req['full_name']}\n"
+    text += f"📅 {req['request_date']}\n"
+    if req.get('photo_url'):
+        text += f"📸 Photo attached\n"
+    text += f"─────────────────\n"
+    return text
+
+
+def _render_pending_user_row(user: dict) -> str:
+    created = user['created_at']
+    text = f"👤 {user['full_name']}\n"
+    text += f"🆔 ID: `{user['user_id']}`\n"
+    text += f"📞 {user['phone']}\n"
+    text += f"📅 Registered: {created.strftime('%d %b %Y') if hasattr(created, 'strftime') else created}\n"
+    text += f"─────────────────\n"
+    return text
+
+
+PENDING_ATTENDANCE_LIST = register_keyset_list(KeysetList(
+    name='pa',
+    key='attendance_id',
+    fetch=lambda scope, after, before, limit: get_pending_attendance_page(after=after, before=before, limit=limit),
+    render_row=_render_pending_attendance_row,
+    title=lambda scope: "📋 *Pending Attendance Requests*",
+    empty_text="✅ No pending attendance requests!",
+    extra_buttons=lambda scope: [[InlineKeyboardButton("✅ Review Requests", callback_data="review_attendance_1")]],
+    page_size=5,
+))
+
+PENDING_USERS_LIST = register_keyset_list(KeysetList(
+    name='pu',
+    key='user_id',
+    fetch=lambda scope, after, before, limit: get_pending_users_page(after=after, before=before, limit=limit),
+    render_row=_render_pending_user_row,
+    title=lambda scope: "👥 *Pending User Registrations*\nUse the buttons on registration notifications to approve/reject.",
+    empty_text="✅ No pending user registrations!",
+))
+
+
 def get_admin_ids() -> list:
     """Get list of all admin user IDs"""
     try:
@@ -48,41 +90,11 @@ async def cmd_pending_attendance(update: Update, context: ContextTypes.DEFAULT_T
         await update.message.reply_text("❌ Admin access only.")
         return
     
-    # Handle both command and callback contexts
     if update.callback_query:
         await update.callback_query.answer()
-        message = update.callback_query.message
-    else:
-        message = update.message
-    
-    pending = get_pending_attendance_requests()
-    
-    if not pending:
-        await message.reply_text("✅ No pending attendance requests!")
-        return
-    
-    text = "📋 *Pending Attendance Requests*\n\n"
-    
-    for req in pending[:5]:  # Show first 5
-        text += f"👤 {req['full_name']}\n"
-        text += f"📅 {req['request_date']}\n"
-        if req['photo_url']:
-            text += f"📸 Photo attached\n"
-        text += f"─────────────────\n"
-    
-    if len(pending) > 5:
-        text += f"\n...and {len(pending) - 5} more"
-    
-    keyboard = [
-        [InlineKeyboardButton("✅ Review Requests", callback_data="review_attendance_1")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
     
-    await message.reply_text(
-        text,
-        reply_markup=reply_markup,
-        parse_mode="Markdown"
-    )
+    invalidate_keyset_list(PENDING_ATTENDANCE_LIST.name)
+    await show_keyset_list(update, PENDING_ATTENDANCE_LIST.name)
 
 async def cmd_pending_shakes(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show pending shake requests for admin"""
@@ -977,34 +989,11 @@ async def cmd_pending_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ Admin access only.")
         return
     
-    # Handle both command and callback contexts
     if update.callback_query:
         await update.callback_query.answer()
-        message = update.callback_query.message
-    else:
-        message = update.message
-    
-    pending = get_pending_users()
     
-    if not pending:
-        await message.reply_text("✅ No pending user registrations!")
-        return
-    
-    text = "👥 *Pending User Registrations*\n\n"
-    
-    for user in pending[:10]:  # Show first 10
-        text += f"👤 {user['full_name']}\n"
-        text += f"🆔 ID: `{user['user_id']}`\n"
-        text += f"📞 {user['phone']}\n"
-        text += f"📅 Registered: {user['created_at'].strftime('%d %b %Y')}\n"
-        text += f"─────────────────\n"
-    
-    if len(pending) > 10:
-        text += f"\n...and {len(pending) - 10} more\n"
-    
-    text += "\nUse the buttons on registration notifications to approve/reject."
-    
-    await message.reply_text(text, parse_mode='Markdown')
+    invalidate_keyset_list(PENDING_USERS_LIST.name)
+    await show_keyset_list(update, PENDING_USERS_LIST.name)
 
 # ==================== MANUAL SHAKE DEDUCTION ====================
 
@@ -1268,6 +1257,47 @@ async def cmd_override_attendance(update: Update, context: ContextTypes.DEFAULT_
         await update.message.reply_text(f"❌ Error: {str(e)}")
 
 
+async def cmd_admin_notifications(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show or change how this admin receives attendance notifications
+    Usage: /admin_notifications [mute|unmute|instant|digest]
+    """
+    if not is_admin_id(update.effective_user.id):
+        await update.message.reply_text("❌ Admin access only.")
+        return
+    
+    from src.config import ADMIN_DIGEST_WINDOW_SECONDS
+    from src.database.notification_preferences import (
+        get_admin_notification_prefs, set_admin_notification_pref,
+        NOTIFY_PRIORITY_DIGEST, NOTIFY_PRIORITY_INSTANT
+    )
+    
+    admin_id = update.effective_user.id
+    action = context.args[0].lower() if context.args else ''
+    changes = {
+        'mute': {'muted': True},
+        'unmute': {'muted': False},
+        'instant': {'priority': NOTIFY_PRIORITY_INSTANT},
+        'digest': {'priority': NOTIFY_PRIORITY_DIGEST},
+    }
+    if action and action not in changes:
+        await update.message.reply_text("❌ Usage: /admin_notifications [mute|unmute|instant|digest]")
+        return
+    if action and not set_admin_notification_pref(admin_id, **changes[action]):
+        await update.message.reply_text("❌ Could not save notification settings.")
+        return
+    
+    pref = get_admin_notification_prefs().get(admin_id) or {}
+    priority = pref.get('priority') or NOTIFY_PRIORITY_DIGEST
+    delivery = "every event immediately" if priority == NOTIFY_PRIORITY_INSTANT else f"one digest every {ADMIN_DIGEST_WINDOW_SECONDS}s"
+    await update.message.reply_text(
+        f"🔔 <b>Admin Notifications</b>\n\n"
+        f"Status: {'🔕 Muted' if pref.get('muted') else '🔔 On'}\n"
+        f"Delivery: {delivery}\n\n"
+        f"Change with /admin_notifications mute | unmute | instant | digest",
+        parse_mode='HTML'
+    )
+
+
 async def cmd_download_qr_code(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Download QR code as A4 PDF for gym location
     Usage: /download_qr_code
@@ -1,7 +1,8 @@
 import logging
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
-from src.database.activity_operations import get_leaderboard, get_user_points, get_today_log
+from src.database.activity_operations import get_leaderboard
+from src.utils.user_stats_cache import get_user_stats
 from src.database.attendance_operations import get_user_attendance_today
 from src.database.shake_operations import get_shake_flavors, request_shake
 from src.database.user_operations import get_user
@@ -10,9 +11,10 @@ from src.utils.auth import is_admin_id, is_staff, check_user_approved
 from src.utils.role_notifications import get_moderator_chat_ids
 from src.database.user_operations import get_user
 from src.database.shake_credits_operations import (
-    approve_purchase, reject_purchase, get_pending_purchase_requests, get_user_credits
+    approve_purchase, reject_purchase, get_pending_purchase_page
 )
 from src.utils.access_gate import check_app_feature_access
+from src.utils.callback_router import CallbackRouter
 
 logger = logging.getLogger(__name__)
 
@@ -96,8 +98,9 @@ async def callback_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
     
     user_id = update.effective_user.id
-    points = get_user_points(user_id)
-    today_log = get_today_log(user_id)
+    stats = get_user_stats(user_id) or {}
+    points = stats.get('total_points', 0)
+    today_log = stats.get('today_activity')
     
     stats_text = f"""
 📊 *Your Stats Today*
@@ -319,609 +322,452 @@ async def callback_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     await show_main_menu(update, context)
 
-# Callback handler router
-async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Route callback queries to appropriate handlers"""
-    from src.handlers.user_handlers import cmd_qrcode, cmd_points_chart, cmd_studio_rules
-    from src.features.misc import misc_handler
-    from src.features.activity import activity_handler
-    from src.features.admin import (
-        cmd_pending_attendance, cmd_pending_shakes, cmd_add_staff, cmd_remove_staff, 
-        cmd_list_staff, cmd_add_admin, cmd_remove_admin, cmd_list_admins,
-        cmd_list_users, cmd_delete_user, cmd_ban_user, cmd_unban_user
-    )
-    from src.handlers.payment_handlers import cmd_challenges
-    from src.handlers.challenge_handlers import cmd_my_challenges
-    from src.handlers.analytics_handlers import cmd_admin_dashboard
-    from src.handlers.notification_handlers import cmd_notifications
-    from src.handlers.broadcast_handlers import cmd_broadcast, cmd_followup_settings
-    from src.handlers.payment_request_handlers import cmd_pending_requests
-    from src.handlers.shake_credit_handlers import (
-        cmd_buy_shake_credits, cmd_check_shake_credits, cmd_shake_report,
-        cmd_admin_pending_purchases, process_shake_order,
-        callback_confirm_buy_credits, callback_select_shake_payment,
-        callback_approve_shake_purchase, callback_reject_shake_purchase
-    )
-    from src.handlers.shake_order_handlers import (
-        cmd_order_shake_enhanced, process_shake_flavor_selection, confirm_shake_order,
-        admin_approve_shake, admin_complete_shake
-    )
-    from src.handlers.commerce_hub_handlers import (
-        cmd_manage_subscriptions, cmd_manage_store, cmd_manage_pt_plans, cmd_manage_events,
-        handle_commerce_callbacks, cmd_user_store
-    )
-    from src.handlers.role_keyboard_handlers import show_role_menu
-    from src.handlers.role_keyboard_handlers import show_manage_staff_submenu, show_manage_admins_submenu
-    from src.handlers.admin_gst_store_handlers import (
-        cmd_gst_settings, gst_toggle, gst_change_mode, gst_edit_percent_prompt,
-        cmd_create_store_items, store_create_item_prompt, store_bulk_upload_prompt,
-        store_item_select_callback, search_store_items
-    )
-    
+
+async def callback_cancel_delete(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await update.callback_query.edit_message_text("❌ Deletion cancelled.")
+
+
+async def callback_request_credit_purchase(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """confirm_buy_<credits>: create a shake credit purchase request and notify admins"""
     query = update.callback_query
-    logger.info(f"[CALLBACK_DEBUG] received callback_data={query.data} from user={query.from_user.id}")
-    logger.info(f"[CALLBACK] handle_callback_query received: {query.data} from user {query.from_user.id} - Chat ID: {query.message.chat_id if query.message else 'NO MESSAGE'}")
-    
-    # Try to answer callback, but handle old/expired queries gracefully
-    try:
-        await query.answer()
-    except Exception as e:
-        logger.debug(f"Could not answer callback query (likely expired): {e}")
-        # Continue processing even if answer fails - query might be too old
-    
-    # Habit callbacks (habit toggling and submission)
-    if query.data.startswith("habit_toggle_") or query.data == "habit_submit":
-        await get_habits_confirm(update, context)
-    # Menu button callbacks (cmd_* prefix)
-    elif query.data == "cmd_notifications":
-        await cmd_notifications(update, context)
-    elif query.data == "cmd_challenges":
-        await cmd_challenges(update, context)
-    elif query.data == "cmd_my_challenges":
-        await cmd_my_challenges(update, context)
-    elif query.data == "cmd_weight":
-        await cmd_weight(update, context)
-    elif query.data == "cmd_water":
-        await cmd_water(update, context)
-    elif query.data == "cmd_meal":
-        await cmd_meal(update, context)
-    elif query.data == "cmd_habits":
-        await cmd_habits(update, context)
-    elif query.data == "cmd_checkin":
-        await cmd_checkin(update, context)
-    elif query.data == "cmd_qrcode":
-        await cmd_qrcode(update, context)
-    elif query.data == "cmd_points_chart":
-        await cmd_points_chart(update, context)
-    elif query.data == "cmd_studio_rules":
-        await cmd_studio_rules(update, context)
-    elif query.data == "cmd_user_store":
-        # Legacy static store, keep for backward compatibility (if needed)
-        await cmd_user_store(update, context)
-    elif query.data == "cmd_store":
-        # New cart-based store
-        from src.handlers.store_user_handlers import cmd_store
-        await cmd_store(update, context)
-    elif query.data == "cmd_check_shake_credits":
-        await cmd_check_shake_credits(update, context)
-    elif query.data == "cmd_order_shake":
-        await cmd_order_shake_enhanced(update, context)
-    elif query.data.startswith("order_flavor_"):
-        await process_shake_flavor_selection(update, context)
-    elif query.data.startswith("confirm_shake_"):
-        await confirm_shake_order(update, context)
-    elif query.data.startswith("approve_shake_"):
-        await admin_approve_shake(update, context)
-    elif query.data.startswith("complete_shake_"):
-        await admin_complete_shake(update, context)
-    elif query.data == "cmd_buy_shake_credits":
-        await cmd_buy_shake_credits(update, context)
-    elif query.data == "confirm_buy_25":
-        await callback_confirm_buy_credits(update, context)
-    elif query.data.startswith("shake_pay_"):
-        await callback_select_shake_payment(update, context)
-    elif query.data.startswith("approve_shake_purchase_"):
-        await callback_approve_shake_purchase(update, context)
-    elif query.data.startswith("reject_shake_purchase_"):
-        await callback_reject_shake_purchase(update, context)
-    elif query.data == "cmd_shake_report":
-        await cmd_shake_report(update, context)
-    elif query.data == "cmd_pending_shake_purchases":
-        await cmd_admin_pending_purchases(update, context)
-    elif query.data == "cmd_get_telegram_id":
-        await misc_handler.cmd_get_telegram_id(update, context)
-    elif query.data == "cmd_whoami":
-        await misc_handler.cmd_whoami(update, context)
-    elif query.data == "cmd_pending_attendance":
-        if not await verify_admin_access(update, context):
-            return
-        await cmd_pending_attendance(update, context)
-    elif query.data == "cmd_pending_shakes":
-        if not await verify_admin_access(update, context):
-            return
-        await cmd_pending_shakes(update, context)
-    elif query.data == "cmd_reports_menu":
-        # Route to analytics dashboard
-        if not await verify_admin_access(update, context):
-            return
-        await cmd_admin_dashboard(update, context)
-    # NOTE: cmd_invoices is handled by Invoice v2 ConversationHandler (not here)
-    # CRITICAL FALLBACK: If invoice callback reaches here, log error for diagnosis
-    elif query.data.startswith("cmd_invoices") or query.data.startswith("inv2_"):
-        logger.error(f"[CALLBACK_FALLBACK] Invoice callback reached generic handler! callback_data={query.data} user={query.from_user.id}")
-        logger.error(f"[CALLBACK_FALLBACK] This indicates ConversationHandler failed to catch it - check handler registration order!")
-        await query.answer("⚠️ Processing invoice request...")
+    credits = int(query.data.split("_")[-1])
+    from src.database.shake_credits_operations import create_purchase_request
+    user_id = query.from_user.id
+    if not check_user_approved(user_id):
+        await query.answer("Registration pending approval. Contact admin.", show_alert=True)
         return
-    elif query.data == "cmd_manage_store":
-        await cmd_manage_store(update, context)
-    elif query.data == "ar_record_payment":
-        # Accounts receivable - record payment
-        from src.handlers.ar_handlers import ar_start_record
-        await ar_start_record(update, context)
-    elif query.data == "ar_credit_summary":
-        # Accounts receivable - credit summary
-        await query.answer()
+    purchase = create_purchase_request(user_id, credits)
+    if purchase:
+        await query.answer("✅ Purchase request created! Awaiting admin approval.", show_alert=True)
         await query.message.reply_text(
-            "📊 *Credit Summary Report*\n\n"
-            "Feature coming soon. Check AR handlers.",
-            parse_mode="Markdown"
+            f"✅ *Purchase Request Created*\n\n"
+            f"🥤 Credits: {credits}\n"
+            f"💵 Amount: Rs {purchase['amount']}\n"
+            f"⏳ Status: Pending Admin Approval\n\n"
+            f"Our admin will verify your payment and transfer credits soon.",
+            parse_mode='Markdown'
+        )
+
+        # Notify all admins immediately with approve/reject buttons
+        admin_ids = get_moderator_chat_ids(include_staff=False)
+        user_info = get_user(user_id) or {}
+        notif_text = (
+            f"💳 *Shake Credit Purchase Request*\n\n"
+            f"👤 User: {user_info.get('full_name', 'Unknown')}\n"
+            f"📱 @{user_info.get('telegram_username') or 'unknown'}\n"
+            f"🥤 Credits: {credits}\n"
+            f"💵 Amount: Rs {purchase['amount']}\n"
+            f"📅 Requested: {purchase['created_at'].strftime('%d-%m-%Y %H:%M')}\n"
         )
-    elif query.data == "ar_export_overdue":
-        # Accounts receivable - export overdue
-        await query.answer()
+        keyboard = InlineKeyboardMarkup([
+            [InlineKeyboardButton("✅ Approve", callback_data=f"approve_purchase_{purchase['purchase_id']}")],
+            [InlineKeyboardButton("❌ Reject", callback_data=f"reject_purchase_{purchase['purchase_id']}")],
+        ])
+        for admin_id in admin_ids:
+            try:
+                await context.bot.send_message(
+                    chat_id=admin_id,
+                    text=notif_text,
+                    reply_markup=keyboard,
+                    parse_mode='Markdown'
+                )
+            except Exception as e:
+                logger.error(f"Failed to notify admin {admin_id} about purchase {purchase['purchase_id']}: {e}")
+    else:
+        await query.answer("❌ Failed to create purchase request", show_alert=True)
+
+
+async def callback_approve_purchase(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.callback_query
+    purchase_id = int(query.data.split("_")[-1])
+    if not is_admin_id(query.from_user.id):
+        await query.answer("❌ Admin access only.", show_alert=True)
+        return
+    result = approve_purchase(purchase_id, query.from_user.id)
+    if result and result.get('already_processed'):
+        await query.answer(f"Already {result.get('status', 'processed')}", show_alert=True)
+        return
+
+    if result:
+        await query.answer("✅ Purchase approved!", show_alert=False)
         await query.message.reply_text(
-            "📤 *Export Overdue*\n\n"
-            "Feature coming soon. Check AR handlers.",
-            parse_mode="Markdown"
+            f"✅ *Purchase Approved!*\n\n"
+            f"👤 User: {result['full_name']}\n"
+            f"🥤 Credits: {result['credits_requested']}\n"
+            f"✅ Status: Completed\n\n"
+            f"{result['credits_requested']} shake credits have been transferred to the user."
         )
-    elif query.data == "cmd_admin_dashboard":
-        if not await verify_admin_access(update, context):
-            return
-        await cmd_admin_dashboard(update, context)
-    elif query.data == "cmd_gst_settings":
-        if not await verify_admin_access(update, context):
-            return
-        await cmd_gst_settings(update, context)
-    elif query.data in ("gst_toggle_on","gst_toggle_off"):
-        if not await verify_admin_access(update, context):
-            return
-        await gst_toggle(update, context)
-    elif query.data == "gst_change_mode":
-        if not await verify_admin_access(update, context):
-            return
-        await gst_change_mode(update, context)
-    elif query.data == "gst_edit_percent":
-        if not await verify_admin_access(update, context):
-            return
-        await gst_edit_percent_prompt(update, context)
-    elif query.data == "cmd_create_store_items":
-        if not await verify_admin_access(update, context):
-            return
-        await cmd_create_store_items(update, context)
-    elif query.data == "store_create_item":
-        if not await verify_admin_access(update, context):
-            return
-        await store_create_item_prompt(update, context)
-    elif query.data == "store_bulk_upload":
-        if not await verify_admin_access(update, context):
-            return
-        await store_bulk_upload_prompt(update, context)
-    elif query.data == "store_download_sample":
-        if not await verify_admin_access(update, context):
-            return
-        await store_bulk_upload_prompt(update, context)
-    elif query.data == "store_download_existing":
-        from src.handlers.admin_gst_store_handlers import store_download_existing
-        if not await verify_admin_access(update, context):
-            return
-        await store_download_existing(update, context)
-    elif query.data.startswith("confirm_delete_"):
-        from src.handlers.admin_gst_store_handlers import confirm_delete_item
-        if not await verify_admin_access(update, context):
-            return
-        await confirm_delete_item(update, context)
-    elif query.data.startswith("edit_field_"):
-        from src.handlers.admin_gst_store_handlers import prompt_edit_value
-        if not await verify_admin_access(update, context):
-            return
-        await prompt_edit_value(update, context)
-    elif query.data.startswith("store_select_"):
-        if not await verify_admin_access(update, context):
-            return
-        await store_item_select_callback(update, context)
-    elif query.data == "admin_manage_staff":
-        if not await verify_admin_access(update, context):
-            return
-        await show_manage_staff_submenu(update, context)
-    elif query.data == "admin_manage_admins":
-        if not await verify_admin_access(update, context):
-            return
-        await show_manage_admins_submenu(update, context)
-    elif query.data == "cmd_add_staff":
-        if not await verify_admin_access(update, context):
-            return
-        await cmd_add_staff(update, context)
-    elif query.data == "cmd_remove_staff":
-        if not await verify_admin_access(update, context):
-            return
-        await cmd_remove_staff(update, context)
-    elif query.data == "cmd_list_staff":
-        if not await verify_admin_access(update, context):
-            return
-        await cmd_list_staff(update, context)
-    elif query.data == "cmd_add_admin":
-        await cmd_add_admin(update, context)
-    elif query.data == "cmd_remove_admin":
-        await cmd_remove_admin(update, context)
-    elif query.data == "cmd_list_admins":
-        await cmd_list_admins(update, context)
-    elif query.data == "cmd_list_users":
-        await cmd_list_users(update, context)
-    elif query.data == "cmd_admin_back":
-        # Back to admin main menu
-        await show_role_menu(update, context)
-    elif query.data == "admin_delete_user":
-        await cmd_delete_user(update, context)
-    elif query.data == "admin_ban_user":
-        await cmd_ban_user(update, context)
-    elif query.data == "admin_unban_user":
-        await cmd_unban_user(update, context)
-    elif query.data.startswith("confirm_delete_"):
-        user_id_to_delete = int(query.data.split("_")[2])
-        from src.database.user_operations import delete_user
-        result = delete_user(user_id_to_delete)
-        if result:
-            await query.edit_message_text(f"✅ User {result['full_name']} (ID: {user_id_to_delete}) deleted successfully.")
-        else:
-            await query.edit_message_text("❌ Failed to delete user.")
-    elif query.data == "cancel_delete":
-        await query.edit_message_text("❌ Deletion cancelled.")
-    elif query.data == "cmd_broadcast":
-        await cmd_broadcast(update, context)
-    elif query.data == "cmd_followup_settings":
-        await cmd_followup_settings(update, context)
-    elif query.data.startswith("confirm_buy_"):
-        # Confirm shake credit purchase
-        credits = int(query.data.split("_")[-1])
-        from src.handlers.shake_credit_handlers import cmd_check_shake_credits as confirm_purchase_handler
-        from src.database.shake_credits_operations import create_purchase_request
-        user_id = query.from_user.id
-        if not check_user_approved(user_id):
-            await query.answer("Registration pending approval. Contact admin.", show_alert=True)
-            return
-        purchase = create_purchase_request(user_id, credits)
-        if purchase:
-            await query.answer("✅ Purchase request created! Awaiting admin approval.", show_alert=True)
-            await query.message.reply_text(
-                f"✅ *Purchase Request Created*\n\n"
-                f"🥤 Credits: {credits}\n"
-                f"💵 Amount: Rs {purchase['amount']}\n"
-                f"⏳ Status: Pending Admin Approval\n\n"
-                f"Our admin will verify your payment and transfer credits soon.",
+        # Notify user
+        try:
+            await context.bot.send_message(
+                chat_id=result['user_id'],
+                text=f"✅ *Your Shake Credit Purchase is Approved!*\n\n"
+                     f"🥤 {result['credits_requested']} credits added to your account\n"
+                     f"✅ Available to use now!\n\n"
+                     f"Tap 'Order Shake' from menu to order your shake.",
                 parse_mode='Markdown'
             )
-
-            # Notify all admins immediately with approve/reject buttons
-            admin_ids = get_moderator_chat_ids(include_staff=False)
-            user_info = get_user(user_id) or {}
-            notif_text = (
-                f"💳 *Shake Credit Purchase Request*\n\n"
-                f"👤 User: {user_info.get('full_name', 'Unknown')}\n"
-                f"📱 @{user_info.get('telegram_username') or 'unknown'}\n"
-                f"🥤 Credits: {credits}\n"
+        except Exception as e:
+            logger.error(f"Failed to notify user {result['user_id']}: {e}")
+        # Show next purchase request
+        purchases = get_pending_purchase_page(limit=1).rows
+        if purchases:
+            purchase = purchases[0]
+            purchase_text = (
+                f"💳 *Next Shake Credit Purchase Request*\n\n"
+                f"👤 User: {purchase['full_name']}\n"
+                f"🥤 Credits: {purchase['credits_requested']}\n"
                 f"💵 Amount: Rs {purchase['amount']}\n"
-                f"📅 Requested: {purchase['created_at'].strftime('%d-%m-%Y %H:%M')}\n"
             )
-            keyboard = InlineKeyboardMarkup([
-                [InlineKeyboardButton("✅ Approve", callback_data=f"approve_purchase_{purchase['purchase_id']}")],
-                [InlineKeyboardButton("❌ Reject", callback_data=f"reject_purchase_{purchase['purchase_id']}")],
-            ])
-            for admin_id in admin_ids:
-                try:
-                    await context.bot.send_message(
-                        chat_id=admin_id,
-                        text=notif_text,
-                        reply_markup=keyboard,
-                        parse_mode='Markdown'
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to notify admin {admin_id} about purchase {purchase['purchase_id']}: {e}")
-        else:
-            await query.answer("❌ Failed to create purchase request", show_alert=True)
-    elif query.data.startswith("approve_purchase_"):
-        purchase_id = int(query.data.split("_")[-1])
-        if not is_admin_id(query.from_user.id):
-            await query.answer("❌ Admin access only.", show_alert=True)
-            return
-        result = approve_purchase(purchase_id, query.from_user.id)
-        if result and result.get('already_processed'):
-            await query.answer(f"Already {result.get('status', 'processed')}", show_alert=True)
-            return
-
-        if result:
-            await query.answer("✅ Purchase approved!", show_alert=False)
+            keyboard = [
+                [InlineKeyboardButton("✅ Approve", callback_data=f"approve_purchase_{purchase['purchase_id']}"),
+                 InlineKeyboardButton("❌ Reject", callback_data=f"reject_purchase_{purchase['purchase_id']}")],
+            ]
             await query.message.reply_text(
-                f"✅ *Purchase Approved!*\n\n"
-                f"👤 User: {result['full_name']}\n"
-                f"🥤 Credits: {result['credits_requested']}\n"
-                f"✅ Status: Completed\n\n"
-                f"{result['credits_requested']} shake credits have been transferred to the user."
+                purchase_text,
+                reply_markup=InlineKeyboardMarkup(keyboard),
+                parse_mode='Markdown'
             )
-            # Notify user
+    else:
+        await query.answer("❌ Failed to approve purchase", show_alert=True)
+
+
+async def callback_reject_purchase(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.callback_query
+    purchase_id = int(query.data.split("_")[-1])
+    if not is_admin_id(query.from_user.id):
+        await query.answer("❌ Admin access only.", show_alert=True)
+        return
+    rejection = reject_purchase(purchase_id, query.from_user.id)
+    if rejection and isinstance(rejection, dict) and rejection.get('already_processed'):
+        await query.answer(f"Already {rejection.get('status', 'processed')}", show_alert=True)
+        return
+    if rejection:
+        await query.answer("✅ Purchase rejected", show_alert=False)
+        await query.message.reply_text("✅ Purchase request has been rejected.")
+    else:
+        await query.answer("❌ Failed to reject purchase", show_alert=True)
+
+
+async def callback_shake_paid(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Admin marks shake order as PAID"""
+    query = update.callback_query
+    shake_id = int(query.data.split("_")[-1])
+    admin_id = query.from_user.id
+
+    if not is_admin_id(admin_id):
+        await query.answer("❌ Admin access only.", show_alert=True)
+        return
+
+    try:
+        from src.database.payment_approvals import approve_shake_payment
+        result = approve_shake_payment(shake_id, admin_id)
+
+        if result:
+            user_id = result.get('user_id')
+            flavor_name = result.get('flavor_name', f"Flavor #{result.get('flavor_id')}")
+
+            # Notify user that order is approved (paid path)
             try:
                 await context.bot.send_message(
-                    chat_id=result['user_id'],
-                    text=f"✅ *Your Shake Credit Purchase is Approved!*\n\n"
-                         f"🥤 {result['credits_requested']} credits added to your account\n"
-                         f"✅ Available to use now!\n\n"
-                         f"Tap 'Order Shake' from menu to order your shake.",
+                    chat_id=user_id,
+                    text=f"✅ *Your Shake Order is Approved - PAID*\n\n"
+                         f"🥤 *{flavor_name}*\n"
+                         f"💵 *Status:* PAID\n"
+                         f"📋 *Request ID:* #{shake_id}\n\n"
+                         f"Your shake is being prepared and ready for pickup soon! 🎉",
                     parse_mode='Markdown'
                 )
             except Exception as e:
-                logger.error(f"Failed to notify user {result['user_id']}: {e}")
-            # Show next purchase request
-            purchases = get_pending_purchase_requests()
-            if purchases:
-                purchase = purchases[0]
-                purchase_text = (
-                    f"💳 *Next Shake Credit Purchase Request*\n\n"
-                    f"👤 User: {purchase['full_name']}\n"
-                    f"🥤 Credits: {purchase['credits_requested']}\n"
-                    f"💵 Amount: Rs {purchase['amount']}\n"
-                )
+                logger.error(f"Failed to notify user {user_id}: {e}")
+
+            # Confirm to admin
+            await query.answer("✅ Shake marked as PAID - order approved!", show_alert=False)
+            await query.edit_message_text(
+                text=f"✅ *SHAKE ORDER - PAID*\n\n"
+                     f"Order #{shake_id} marked as PAID and approved.\n"
+                     f"User will be notified.",
+                parse_mode='Markdown'
+            )
+        else:
+            await query.answer("❌ Failed to mark shake as paid", show_alert=True)
+    except Exception as e:
+        logger.error(f"Error processing shake_paid: {e}")
+        await query.answer(f"❌ Error: {str(e)}", show_alert=True)
+
+
+async def callback_shake_credit_terms(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Admin chooses CREDIT TERMS for shake order"""
+    query = update.callback_query
+    shake_id = int(query.data.split("_")[-1])
+    admin_id = query.from_user.id
+
+    if not is_admin_id(admin_id):
+        await query.answer("❌ Admin access only.", show_alert=True)
+        return
+
+    try:
+        from src.database.payment_approvals import approve_shake_credit
+        result = approve_shake_credit(shake_id, admin_id)
+
+        if result:
+            user_id = result.get('user_id')
+            flavor_name = result.get('flavor_name', f"Flavor #{result.get('flavor_id')}")
+
+            # Notify user that order is on credit terms with payment reminder
+            try:
                 keyboard = [
-                    [InlineKeyboardButton("✅ Approve", callback_data=f"approve_purchase_{purchase['purchase_id']}"),
-                     InlineKeyboardButton("❌ Reject", callback_data=f"reject_purchase_{purchase['purchase_id']}")],
+                    [InlineKeyboardButton("✅ Mark as Paid", callback_data=f"user_paid_shake_{shake_id}")],
                 ]
-                await query.message.reply_text(
-                    purchase_text,
-                    reply_markup=InlineKeyboardMarkup(keyboard),
-                    parse_mode='Markdown'
+                await context.bot.send_message(
+                    chat_id=user_id,
+                    text=f"✅ *Your Shake Order is Approved - CREDIT TERMS*\n\n"
+                         f"🥤 *{flavor_name}*\n"
+                         f"📋 *Payment Terms:* Credit\n"
+                         f"📋 *Request ID:* #{shake_id}\n\n"
+                         f"💳 *Payment Due:* Within 7 days\n"
+                         f"📱 *You will receive payment reminders*\n\n"
+                         f"Your shake is being prepared for pickup! 🎉",
+                    parse_mode='Markdown',
+                    reply_markup=InlineKeyboardMarkup(keyboard)
                 )
+            except Exception as e:
+                logger.error(f"Failed to notify user {user_id}: {e}")
+
+            # Confirm to admin
+            await query.answer("✅ Shake set to CREDIT TERMS - reminders will start", show_alert=False)
+            await query.edit_message_text(
+                text=f"✅ *SHAKE ORDER - CREDIT TERMS*\n\n"
+                     f"Order #{shake_id} approved with credit terms.\n"
+                     f"Automatic payment reminders will be sent to user.\n"
+                     f"User notified.",
+                parse_mode='Markdown'
+            )
         else:
-            await query.answer("❌ Failed to approve purchase", show_alert=True)
-    elif query.data.startswith("reject_purchase_"):
-        purchase_id = int(query.data.split("_")[-1])
-        if not is_admin_id(query.from_user.id):
-            await query.answer("❌ Admin access only.", show_alert=True)
-            return
-        rejection = reject_purchase(purchase_id, query.from_user.id)
-        if rejection and isinstance(rejection, dict) and rejection.get('already_processed'):
-            await query.answer(f"Already {rejection.get('status', 'processed')}", show_alert=True)
-            return
-        if rejection:
-            await query.answer("✅ Purchase rejected", show_alert=False)
-            await query.message.reply_text("✅ Purchase request has been rejected.")
-        else:
-            await query.answer("❌ Failed to reject purchase", show_alert=True)
-    elif query.data.startswith("order_flavor_"):
-        flavor_id = int(query.data.split("_")[-1])
-        user_id = query.from_user.id
-        if not check_user_approved(user_id):
-            await query.answer("Registration pending approval. Contact admin.", show_alert=True)
-            return
-        if await process_shake_order(user_id, flavor_id, context):
-            credits = get_user_credits(user_id)
-            await query.answer("✅ Shake order placed!", show_alert=True)
-            await query.message.reply_text(
-                f"✅ *Shake Order Placed!*\n\n"
-                f"🥤 Your shake has been ordered\n"
-                f"1️⃣ Credit deducted\n"
-                f"✅ Available credits left: {credits['available_credits']}\n\n"
-                f"Your shake will be ready soon!",
+            await query.answer("❌ Failed to set credit terms", show_alert=True)
+    except Exception as e:
+        logger.error(f"Error processing shake_credit_terms: {e}")
+        await query.answer(f"❌ Error: {str(e)}", show_alert=True)
+
+
+async def callback_user_paid_shake(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """User confirms payment for credit-based shake order"""
+    query = update.callback_query
+    shake_id = int(query.data.split("_")[-1])
+    user_id = query.from_user.id
+
+    try:
+        from src.database.shake_operations import mark_user_paid_for_shake
+        result = mark_user_paid_for_shake(shake_id, user_id)
+
+        if result:
+            # Notify admins that user confirmed payment
+            admin_text = (
+                f"🔔 *USER PAYMENT CONFIRMATION*\n\n"
+                f"👤 *User:* {get_user(user_id)['full_name']}\n"
+                f"📱 *ID:* {user_id}\n"
+                f"📋 *Shake Request ID:* #{shake_id}\n\n"
+                f"✅ User has confirmed payment for their credit-based shake order.\n\n"
+                f"*ACTION:* Please review and approve final payment if needed."
+            )
+
+            try:
+                admin_ids = get_moderator_chat_ids()
+                for admin_id in admin_ids:
+                    try:
+                        keyboard = [
+                            [InlineKeyboardButton("✅ Approve Payment", callback_data=f"admin_approve_user_payment_{shake_id}")],
+                        ]
+                        await context.bot.send_message(
+                            chat_id=admin_id,
+                            text=admin_text,
+                            reply_markup=InlineKeyboardMarkup(keyboard),
+                            parse_mode='Markdown'
+                        )
+                    except Exception as e:
+                        logger.error(f"Failed to notify admin {admin_id}: {e}")
+            except Exception as e:
+                logger.error(f"Failed to get admin IDs: {e}")
+
+            # Confirm to user
+            await query.answer("✅ Payment confirmation sent to admin", show_alert=False)
+            await query.edit_message_text(
+                text=f"✅ *Payment Confirmed*\n\n"
+                     f"Your payment for order #{shake_id} has been confirmed.\n"
+                     f"Admins will review and approve shortly. ⏳",
                 parse_mode='Markdown'
             )
         else:
-            await query.answer("❌ Failed to place order. Check your credits.", show_alert=True)
-    elif query.data.startswith("shake_paid_"):
-        # Admin marks shake order as PAID
-        shake_id = int(query.data.split("_")[-1])
-        admin_id = query.from_user.id
-        
-        if not is_admin_id(admin_id):
-            await query.answer("❌ Admin access only.", show_alert=True)
-            return
-        
-        try:
-            from src.database.payment_approvals import approve_shake_payment
-            result = approve_shake_payment(shake_id, admin_id)
-            
-            if result:
-                user_id = result.get('user_id')
-                flavor_name = result.get('flavor_name', f"Flavor #{result.get('flavor_id')}")
-                
-                # Notify user that order is approved (paid path)
-                try:
-                    await context.bot.send_message(
-                        chat_id=user_id,
-                        text=f"✅ *Your Shake Order is Approved - PAID*\n\n"
-                             f"🥤 *{flavor_name}*\n"
-                             f"💵 *Status:* PAID\n"
-                             f"📋 *Request ID:* #{shake_id}\n\n"
-                             f"Your shake is being prepared and ready for pickup soon! 🎉",
-                        parse_mode='Markdown'
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to notify user {user_id}: {e}")
-                
-                # Confirm to admin
-                await query.answer("✅ Shake marked as PAID - order approved!", show_alert=False)
-                await query.edit_message_text(
-                    text=f"✅ *SHAKE ORDER - PAID*\n\n"
-                         f"Order #{shake_id} marked as PAID and approved.\n"
-                         f"User will be notified.",
-                    parse_mode='Markdown'
-                )
-            else:
-                await query.answer("❌ Failed to mark shake as paid", show_alert=True)
-        except Exception as e:
-            logger.error(f"Error processing shake_paid: {e}")
-            await query.answer(f"❌ Error: {str(e)}", show_alert=True)
-    
-    elif query.data.startswith("shake_credit_terms_"):
-        # Admin chooses CREDIT TERMS for shake order
-        shake_id = int(query.data.split("_")[-1])
-        admin_id = query.from_user.id
-        
-        if not is_admin_id(admin_id):
-            await query.answer("❌ Admin access only.", show_alert=True)
-            return
-        
-        try:
-            from src.database.payment_approvals import approve_shake_credit
-            result = approve_shake_credit(shake_id, admin_id)
-            
-            if result:
-                user_id = result.get('user_id')
-                flavor_name = result.get('flavor_name', f"Flavor #{result.get('flavor_id')}")
-                
-                # Notify user that order is on credit terms with payment reminder
-                try:
-                    keyboard = [
-                        [InlineKeyboardButton("✅ Mark as Paid", callback_data=f"user_paid_shake_{shake_id}")],
-                    ]
-                    await context.bot.send_message(
-                        chat_id=user_id,
-                        text=f"✅ *Your Shake Order is Approved - CREDIT TERMS*\n\n"
-                             f"🥤 *{flavor_name}*\n"
-                             f"📋 *Payment Terms:* Credit\n"
-                             f"📋 *Request ID:* #{shake_id}\n\n"
-                             f"💳 *Payment Due:* Within 7 days\n"
-                             f"📱 *You will receive payment reminders*\n\n"
-                             f"Your shake is being prepared for pickup! 🎉",
-                        parse_mode='Markdown',
-                        reply_markup=InlineKeyboardMarkup(keyboard)
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to notify user {user_id}: {e}")
-                
-                # Confirm to admin
-                await query.answer("✅ Shake set to CREDIT TERMS - reminders will start", show_alert=False)
-                await query.edit_message_text(
-                    text=f"✅ *SHAKE ORDER - CREDIT TERMS*\n\n"
-                         f"Order #{shake_id} approved with credit terms.\n"
-                         f"Automatic payment reminders will be sent to user.\n"
-                         f"User notified.",
-                    parse_mode='Markdown'
-                )
-            else:
-                await query.answer("❌ Failed to set credit terms", show_alert=True)
-        except Exception as e:
-            logger.error(f"Error processing shake_credit_terms: {e}")
-            await query.answer(f"❌ Error: {str(e)}", show_alert=True)
-    
-    elif query.data.startswith("user_paid_shake_"):
-        # User confirms payment for credit-based shake order
-        shake_id = int(query.data.split("_")[-1])
-        user_id = query.from_user.id
-        
-        try:
-            from src.database.shake_operations import mark_user_paid_for_shake
-            result = mark_user_paid_for_shake(shake_id, user_id)
-            
-            if result:
-                # Notify admins that user confirmed payment
-                admin_text = (
-                    f"🔔 *USER PAYMENT CONFIRMATION*\n\n"
-                    f"👤 *User:* {get_user(user_id)['full_name']}\n"
-                    f"📱 *ID:* {user_id}\n"
-                    f"📋 *Shake Request ID:* #{shake_id}\n\n"
-                    f"✅ User has confirmed payment for their credit-based shake order.\n\n"
-                    f"*ACTION:* Please review and approve final payment if needed."
-                )
-                
-                try:
-                    admin_ids = get_moderator_chat_ids()
-                    for admin_id in admin_ids:
-                        try:
-                            keyboard = [
-                                [InlineKeyboardButton("✅ Approve Payment", callback_data=f"admin_approve_user_payment_{shake_id}")],
-                            ]
-                            await context.bot.send_message(
-                                chat_id=admin_id,
-                                text=admin_text,
-                                reply_markup=InlineKeyboardMarkup(keyboard),
-                                parse_mode='Markdown'
-                            )
-                        except Exception as e:
-                            logger.error(f"Failed to notify admin {admin_id}: {e}")
-                except Exception as e:
-                    logger.error(f"Failed to get admin IDs: {e}")
-                
-                # Confirm to user
-                await query.answer("✅ Payment confirmation sent to admin", show_alert=False)
-                await query.edit_message_text(
-                    text=f"✅ *Payment Confirmed*\n\n"
-                         f"Your payment for order #{shake_id} has been confirmed.\n"
-                         f"Admins will review and approve shortly. ⏳",
-                    parse_mode='Markdown'
-                )
-            else:
-                await query.answer("❌ Failed to confirm payment", show_alert=True)
-        except Exception as e:
-            logger.error(f"Error processing user_paid_shake: {e}")
-            await query.answer(f"❌ Error: {str(e)}", show_alert=True)
-    
-    elif query.data.startswith("admin_approve_user_payment_"):
-        # Admin approves user's payment confirmation
-        shake_id = int(query.data.split("_")[-1])
-        admin_id = query.from_user.id
-        
-        if not is_admin_id(admin_id):
-            await query.answer("❌ Admin access only.", show_alert=True)
-            return
-        
-        try:
-            from src.database.shake_operations import approve_user_payment
-            result = approve_user_payment(shake_id, admin_id)
-            
-            if result:
-                user_id = result.get('user_id')
-                
-                # Notify user that payment is approved
-                try:
-                    await context.bot.send_message(
-                        chat_id=user_id,
-                        text=f"✅ *Payment Approved!*\n\n"
-                             f"Your payment for order #{shake_id} has been approved by admin.\n"
-                             f"Thank you! 🙏",
-                        parse_mode='Markdown'
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to notify user {user_id}: {e}")
-                
-                await query.answer("✅ Payment approved", show_alert=False)
-                await query.edit_message_text(
-                    text=f"✅ *USER PAYMENT APPROVED*\n\n"
-                         f"Order #{shake_id} payment confirmed and approved.\n"
-                         f"No further reminders will be sent.",
+            await query.answer("❌ Failed to confirm payment", show_alert=True)
+    except Exception as e:
+        logger.error(f"Error processing user_paid_shake: {e}")
+        await query.answer(f"❌ Error: {str(e)}", show_alert=True)
+
+
+async def callback_admin_approve_user_payment(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Admin approves user's payment confirmation"""
+    query = update.callback_query
+    shake_id = int(query.data.split("_")[-1])
+    admin_id = query.from_user.id
+
+    if not is_admin_id(admin_id):
+        await query.answer("❌ Admin access only.", show_alert=True)
+        return
+
+    try:
+        from src.database.shake_operations import approve_user_payment
+        result = approve_user_payment(shake_id, admin_id)
+
+        if result:
+            user_id = result.get('user_id')
+
+            # Notify user that payment is approved
+            try:
+                await context.bot.send_message(
+                    chat_id=user_id,
+                    text=f"✅ *Payment Approved!*\n\n"
+                         f"Your payment for order #{shake_id} has been approved by admin.\n"
+                         f"Thank you! 🙏",
                     parse_mode='Markdown'
                 )
-            else:
-                await query.answer("❌ Failed to approve payment", show_alert=True)
-        except Exception as e:
-            logger.error(f"Error processing admin_approve_user_payment: {e}")
-            await query.answer(f"❌ Error: {str(e)}", show_alert=True)
+            except Exception as e:
+                logger.error(f"Failed to notify user {user_id}: {e}")
+
+            await query.answer("✅ Payment approved", show_alert=False)
+            await query.edit_message_text(
+                text=f"✅ *USER PAYMENT APPROVED*\n\n"
+                     f"Order #{shake_id} payment confirmed and approved.\n"
+                     f"No further reminders will be sent.",
+                parse_mode='Markdown'
+            )
+        else:
+            await query.answer("❌ Failed to approve payment", show_alert=True)
+    except Exception as e:
+        logger.error(f"Error processing admin_approve_user_payment: {e}")
+        await query.answer(f"❌ Error: {str(e)}", show_alert=True)
+
+
+# ==================== CALLBACK ROUTES ====================
+# Menu buttons: the query is answered before the handler runs. Targets given
+# as "module:function" are imported on first press. bot.py adds its own
+# routes to this router and mounts it once (see src/utils/callback_router.py).
+
+callback_router = CallbackRouter()
+
+_ACTIVITY = 'src.features.activity.handler'
+_SHAKE_CREDITS = 'src.handlers.shake_credit_handlers'
+_SHAKE_ORDERS = 'src.handlers.shake_order_handlers'
+_ADMIN = 'src.features.admin'
+_GST_STORE = 'src.handlers.admin_gst_store_handlers'
+
+# (callback_data, handler)
+_EXACT_ROUTES = (
+    ('habit_submit', f'{_ACTIVITY}:get_habits_confirm'),
+    ('cmd_notifications', 'src.handlers.notification_handlers:cmd_notifications'),
+    ('cmd_challenges', 'src.handlers.payment_handlers:cmd_challenges'),
+    ('cmd_my_challenges', 'src.handlers.challenge_handlers:cmd_my_challenges'),
+    ('cmd_weight', f'{_ACTIVITY}:cmd_weight'),
+    ('cmd_water', f'{_ACTIVITY}:cmd_water'),
+    ('cmd_meal', f'{_ACTIVITY}:cmd_meal'),
+    ('cmd_habits', f'{_ACTIVITY}:cmd_habits'),
+    ('cmd_checkin', f'{_ACTIVITY}:cmd_checkin'),
+    ('cmd_qrcode', 'src.handlers.user_handlers:cmd_qrcode'),
+    ('cmd_points_chart', 'src.handlers.user_handlers:cmd_points_chart'),
+    ('cmd_studio_rules', 'src.handlers.user_handlers:cmd_studio_rules'),
+    # Legacy static store, kept for backward compatibility
+    ('cmd_user_store', 'src.handlers.commerce_hub_handlers:cmd_user_store'),
+    ('cmd_store', 'src.handlers.store_user_handlers:cmd_store'),
+    ('cmd_check_shake_credits', f'{_SHAKE_CREDITS}:cmd_check_shake_credits'),
+    ('cmd_order_shake', f'{_SHAKE_ORDERS}:cmd_order_shake_enhanced'),
+    ('cmd_buy_shake_credits', f'{_SHAKE_CREDITS}:cmd_buy_shake_credits'),
+    ('confirm_buy_25', f'{_SHAKE_CREDITS}:callback_confirm_buy_credits'),
+    ('cmd_shake_report', f'{_SHAKE_CREDITS}:cmd_shake_report'),
+    ('cmd_pending_shake_purchases', f'{_SHAKE_CREDITS}:cmd_admin_pending_purchases'),
+    ('cmd_get_telegram_id', 'src.features.misc.handler:cmd_get_telegram_id'),
+    ('cmd_whoami', 'src.features.misc.handler:cmd_whoami'),
+    ('cmd_manage_store', 'src.handlers.commerce_hub_handlers:cmd_manage_store'),
+    ('ar_record_payment', 'src.handlers.ar_handlers:ar_start_record'),
+    ('cmd_add_admin', f'{_ADMIN}:cmd_add_admin'),
+    ('cmd_remove_admin', f'{_ADMIN}:cmd_remove_admin'),
+    ('cmd_list_admins', f'{_ADMIN}:cmd_list_admins'),
+    ('cmd_list_users', f'{_ADMIN}:cmd_list_users'),
+    ('cmd_admin_back', 'src.handlers.role_keyboard_handlers:show_role_menu'),
+    ('admin_delete_user', f'{_ADMIN}:cmd_delete_user'),
+    ('admin_ban_user', f'{_ADMIN}:cmd_ban_user'),
+    ('admin_unban_user', f'{_ADMIN}:cmd_unban_user'),
+    ('cancel_delete', callback_cancel_delete),
+    ('cmd_broadcast', 'src.handlers.broadcast_handlers:cmd_broadcast'),
     # Legacy callbacks
-    elif query.data == "stats":
-        await callback_stats(update, context)
-    elif query.data == "checkin":
-        await callback_checkin(update, context)
-    elif query.data == "shake":
-        await callback_shake(update, context)
-    elif query.data.startswith("select_flavor_"):
-        await callback_select_flavor(update, context)
-    elif query.data == "leaderboard":
-        await callback_leaderboard(update, context)
-    elif query.data == "log_activity":
-        await callback_log_activity(update, context)
-    elif query.data == "settings":
-        await callback_settings(update, context)
-    elif query.data == "main_menu":
-        await callback_main_menu(update, context)
-    # Commerce hub callbacks
-    elif query.data.startswith("store_") or query.data.startswith("sub_") or \
-         query.data.startswith("pt_") or query.data.startswith("event_"):
-        await handle_commerce_callbacks(update, context)
-    else:
-        pass
+    ('stats', callback_stats),
+    ('checkin', callback_checkin),
+    ('shake', callback_shake),
+    ('leaderboard', callback_leaderboard),
+    ('log_activity', callback_log_activity),
+    ('settings', callback_settings),
+    ('main_menu', callback_main_menu),
+)
+
+_ADMIN_EXACT_ROUTES = (
+    ('cmd_pending_attendance', f'{_ADMIN}:cmd_pending_attendance'),
+    ('cmd_pending_shakes', f'{_ADMIN}:cmd_pending_shakes'),
+    ('cmd_admin_dashboard', 'src.handlers.analytics_handlers:cmd_admin_dashboard'),
+    ('cmd_gst_settings', f'{_GST_STORE}:cmd_gst_settings'),
+    ('gst_toggle_on', f'{_GST_STORE}:gst_toggle'),
+    ('gst_toggle_off', f'{_GST_STORE}:gst_toggle'),
+    ('gst_change_mode', f'{_GST_STORE}:gst_change_mode'),
+    ('gst_edit_percent', f'{_GST_STORE}:gst_edit_percent_prompt'),
+    ('cmd_create_store_items', f'{_GST_STORE}:cmd_create_store_items'),
+    ('store_create_item', f'{_GST_STORE}:store_create_item_prompt'),
+    ('store_bulk_upload', f'{_GST_STORE}:store_bulk_upload_prompt'),
+    ('store_download_sample', f'{_GST_STORE}:store_bulk_upload_prompt'),
+    ('store_download_existing', f'{_GST_STORE}:store_download_existing'),
+    ('admin_manage_staff', 'src.handlers.role_keyboard_handlers:show_manage_staff_submenu'),
+    ('admin_manage_admins', 'src.handlers.role_keyboard_handlers:show_manage_admins_submenu'),
+    ('cmd_add_staff', f'{_ADMIN}:cmd_add_staff'),
+    ('cmd_remove_staff', f'{_ADMIN}:cmd_remove_staff'),
+    ('cmd_list_staff', f'{_ADMIN}:cmd_list_staff'),
+)
+
+# (prefix, handler); the longest matching prefix wins
+_PREFIX_ROUTES = (
+    ('habit_toggle_', f'{_ACTIVITY}:get_habits_confirm'),
+    ('order_flavor_', f'{_SHAKE_ORDERS}:process_shake_flavor_selection'),
+    ('confirm_shake_', f'{_SHAKE_ORDERS}:confirm_shake_order'),
+    ('approve_shake_', f'{_SHAKE_ORDERS}:admin_approve_shake'),
+    ('complete_shake_', f'{_SHAKE_ORDERS}:admin_complete_shake'),
+    ('shake_pay_', f'{_SHAKE_CREDITS}:callback_select_shake_payment'),
+    ('approve_shake_purchase_', f'{_SHAKE_CREDITS}:callback_approve_shake_purchase'),
+    ('reject_shake_purchase_', f'{_SHAKE_CREDITS}:callback_reject_shake_purchase'),
+    ('confirm_buy_', callback_request_credit_purchase),
+    ('approve_purchase_', callback_approve_purchase),
+    ('reject_purchase_', callback_reject_purchase),
+    ('shake_paid_', callback_shake_paid),
+    ('shake_credit_terms_', callback_shake_credit_terms),
+    ('user_paid_shake_', callback_user_paid_shake),
+    ('admin_approve_user_payment_', callback_admin_approve_user_payment),
+    ('select_flavor_', callback_select_flavor),
+    # Commerce hub
+    ('store_', 'src.handlers.commerce_hub_handlers:handle_commerce_callbacks'),
+    ('pt_', 'src.handlers.commerce_hub_handlers:handle_commerce_callbacks'),
+    ('event_', 'src.handlers.commerce_hub_handlers:handle_commerce_callbacks'),
+)
+
+_ADMIN_PREFIX_ROUTES = (
+    ('confirm_delete_', f'{_GST_STORE}:confirm_delete_item'),
+    ('edit_field_', f'{_GST_STORE}:prompt_edit_value'),
+    ('store_select_', f'{_GST_STORE}:store_item_select_callback'),
+)
+
+for _data, _handler in _EXACT_ROUTES:
+    callback_router.add(_handler, exact=_data, answer=True)
+for _data, _handler in _ADMIN_EXACT_ROUTES:
+    callback_router.add(_handler, exact=_data, answer=True, guard=verify_admin_access)
+for _prefix, _handler in _PREFIX_ROUTES:
+    callback_router.add(_handler, prefix=_prefix, answer=True)
+for _prefix, _handler in _ADMIN_PREFIX_ROUTES:
+    callback_router.add(_handler, prefix=_prefix, answer=True, guard=verify_admin_access)
+
+
+async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Route a callback query through `callback_router`"""
+    await callback_router.dispatch(update, context)
@@ -10,14 +10,14 @@ from datetime import datetime, date
 from io import BytesIO
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardRemove
 from telegram.ext import ContextTypes, ConversationHandler
-import openpyxl
 
 from src.database.connection import execute_query
 from src.database.ar_operations import create_receivable, create_transactions, update_receivable_status
-from src.utils.excel_templates import generate_store_product_template, generate_subscription_plan_template
 from src.utils.auth import is_admin_id
 from src.utils.role_notifications import get_moderator_chat_ids
 from src.database.user_operations import get_user
+from src.utils.product_search import SOURCE_STORE_PRODUCTS, invalidate_product_index
+from src.utils.catalogue_cache import SECTION_SUBSCRIPTIONS, SECTION_STORE, invalidate_catalogue
 
 logger = logging.getLogger(__name__)
 
@@ -137,6 +137,7 @@ async def process_create_plan(update: Update, context: ContextTypes.DEFAULT_TYPE
         result = execute_query(query, (name, duration_days, price, description, admin_id), fetch_one=True)
         
         if result:
+            invalidate_catalogue(SECTION_SUBSCRIPTIONS)
             # Log audit
             log_audit(admin_id, 'subscription_plan', result['plan_id'], 'create',
                       new_value={'name': name, 'duration': duration_days, 'price': price})
@@ -194,6 +195,7 @@ async def download_store_template(update: Update, context: ContextTypes.DEFAULT_
         query = update.callback_query
         await query.answer()
         
+        from src.utils.excel_templates import generate_store_product_template
         template_file = generate_store_product_template()
         if template_file:
             await query.message.reply_document(
@@ -241,6 +243,7 @@ async def process_product_upload(update: Update, context: ContextTypes.DEFAULT_T
         file_bytes = await file.download_as_bytearray()
         
         # Parse Excel
+        import openpyxl
         wb = openpyxl.load_workbook(BytesIO(file_bytes))
         ws = wb.active
         
@@ -305,6 +308,8 @@ async def process_product_upload(update: Update, context: ContextTypes.DEFAULT_T
                     inserted += 1
             except Exception as e:
                 logger.warning(f"Failed to insert product {product['name']}: {e}")
+        invalidate_product_index(SOURCE_STORE_PRODUCTS)
+        invalidate_catalogue(SECTION_STORE)
         
         # Log bulk audit entry
         log_audit(admin_id, 'store_products', None, 'bulk_upload',
@@ -4,6 +4,9 @@ Manages invoice report generation and delivery for admin users
 Supports Monthly, Quarterly, 6-Month, Yearly, and Custom date range reports
 """
 
+import asyncio
+import logging
+import os
 from datetime import datetime
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -16,19 +19,43 @@ from telegram.ext import (
 from telegram.constants import ChatAction
 
 from src.database.invoice_reports import (
-    get_monthly_invoices, get_monthly_summary,
-    get_quarterly_invoices, get_quarterly_summary,
-    get_six_month_invoices, get_six_month_summary,
-    get_yearly_invoices, get_yearly_summary,
-    get_custom_date_range_invoices, get_custom_date_range_summary
+    get_monthly_summary, get_quarterly_summary,
+    get_six_month_summary, get_yearly_summary,
+    get_custom_date_range_summary, iter_invoices_by_date_range,
+    get_month_range, get_quarter_range, get_half_year_range, get_year_range
 )
-from src.utils.invoice_excel_export import generate_invoice_report_excel
 
+logger = logging.getLogger(__name__)
 
 # Conversation states for custom date range
 CUSTOM_DATE_INPUT = 1
 
 
+async def _send_invoice_report(context: CallbackContext, chat_id, start_date, end_date,
+                               summary, period_name, filename, caption):
+    """Stream invoices into a workbook off the event loop and upload it"""
+    from src.utils.invoice_excel_export import export_invoice_report_file
+    await context.bot.send_chat_action(chat_id, ChatAction.UPLOAD_DOCUMENT)
+    
+    path, row_count = await asyncio.to_thread(
+        export_invoice_report_file,
+        iter_invoices_by_date_range(start_date, end_date),
+        summary,
+        period_name
+    )
+    logger.info(f"[INVOICE_REPORT] {period_name}: {row_count} rows exported")
+    
+    try:
+        with open(path, 'rb') as document:
+            await context.bot.send_document(
+                chat_id=chat_id,
+                document=document,
+                filename=filename,
+                caption=caption
+            )
+    finally:
+        os.unlink(path)
+
 
 
 async def cmd_invoice_reports(update: Update, context: CallbackContext):
@@ -109,23 +136,16 @@ async def callback_invoice_monthly_selected(update: Update, context: CallbackCon
     
     await query.edit_message_text("⏳ Generating monthly report...", reply_markup=None)
     
-    from src.database.invoice_reports import get_monthly_invoices, get_monthly_summary
-    
     try:
-        invoices = get_monthly_invoices(year, month)
         summary = get_monthly_summary(year, month)
         
         month_name = datetime(year, month, 1).strftime('%B %Y')
         
-        excel_buffer = generate_invoice_report_excel(invoices, summary, month_name)
+        start_date, end_date = get_month_range(year, month)
         filename = f'Invoice_Report_{month_name.replace(" ", "_")}.xlsx'
         
-        await context.bot.send_chat_action(update.effective_chat.id, ChatAction.UPLOAD_DOCUMENT)
-        
-        await context.bot.send_document(
-            chat_id=update.effective_chat.id,
-            document=excel_buffer,
-            filename=filename,
+        await _send_invoice_report(
+            context, update.effective_chat.id, start_date, end_date, summary, month_name, filename,
             caption=f"📊 Monthly Invoice Report - {month_name}\n\n"
                    f"Total Invoices: {summary['total_invoices']}\n"
                    f"Total Amount: ₹{summary['total_amount']:,.2f}\n"
@@ -177,20 +197,15 @@ async def callback_invoice_quarterly_selected(update: Update, context: CallbackC
     await query.edit_message_text("⏳ Generating quarterly report...", reply_markup=None)
     
     try:
-        invoices = get_quarterly_invoices(year, quarter)
         summary = get_quarterly_summary(year, quarter)
         
         period_name = f"Q{quarter} {year}"
         
-        excel_buffer = generate_invoice_report_excel(invoices, summary, period_name)
+        start_date, end_date = get_quarter_range(year, quarter)
         filename = f'Invoice_Report_{period_name}.xlsx'
         
-        await context.bot.send_chat_action(update.effective_chat.id, ChatAction.UPLOAD_DOCUMENT)
-        
-        await context.bot.send_document(
-            chat_id=update.effective_chat.id,
-            document=excel_buffer,
-            filename=filename,
+        await _send_invoice_report(
+            context, update.effective_chat.id, start_date, end_date, summary, period_name, filename,
             caption=f"📊 Quarterly Invoice Report - {period_name}\n\n"
                    f"Total Invoices: {summary['total_invoices']}\n"
                    f"Total Amount: ₹{summary['total_amount']:,.2f}\n"
@@ -241,20 +256,15 @@ async def callback_invoice_six_months_selected(update: Update, context: Callback
     await query.edit_message_text("⏳ Generating 6-month report...", reply_markup=None)
     
     try:
-        invoices = get_six_month_invoices(year, half)
         summary = get_six_month_summary(year, half)
         
         period_name = f"H{half} {year}"
         
-        excel_buffer = generate_invoice_report_excel(invoices, summary, period_name)
+        start_date, end_date = get_half_year_range(year, half)
         filename = f'Invoice_Report_{period_name}.xlsx'
         
-        await context.bot.send_chat_action(update.effective_chat.id, ChatAction.UPLOAD_DOCUMENT)
-        
-        await context.bot.send_document(
-            chat_id=update.effective_chat.id,
-            document=excel_buffer,
-            filename=filename,
+        await _send_invoice_report(
+            context, update.effective_chat.id, start_date, end_date, summary, period_name, filename,
             caption=f"📈 6-Month Invoice Report - {period_name}\n\n"
                    f"Total Invoices: {summary['total_invoices']}\n"
                    f"Total Amount: ₹{summary['total_amount']:,.2f}\n"
@@ -300,20 +310,15 @@ async def callback_invoice_yearly_selected(update: Update, context: CallbackCont
     await query.edit_message_text("⏳ Generating yearly report...", reply_markup=None)
     
     try:
-        invoices = get_yearly_invoices(year)
         summary = get_yearly_summary(year)
         
         period_name = str(year)
         
-        excel_buffer = generate_invoice_report_excel(invoices, summary, period_name)
+        start_date, end_date = get_year_range(year)
         filename = f'Invoice_Report_{year}.xlsx'
         
-        await context.bot.send_chat_action(update.effective_chat.id, ChatAction.UPLOAD_DOCUMENT)
-        
-        await context.bot.send_document(
-            chat_id=update.effective_chat.id,
-            document=excel_buffer,
-            filename=filename,
+        await _send_invoice_report(
+            context, update.effective_chat.id, start_date, end_date, summary, period_name, filename,
             caption=f"📉 Yearly Invoice Report - {year}\n\n"
                    f"Total Invoices: {summary['total_invoices']}\n"
                    f"Total Amount: ₹{summary['total_amount']:,.2f}\n"
@@ -389,29 +394,22 @@ async def handle_custom_date_input(update: Update, context: CallbackContext):
     msg = await update.message.reply_text("⏳ Generating custom date range report...")
     
     try:
-        success, invoices, error = get_custom_date_range_invoices(start_date, end_date)
-        
-        if not success:
-            await msg.edit_text(f"❌ {error}")
-            return CUSTOM_DATE_INPUT
-        
         success, summary, error = get_custom_date_range_summary(start_date, end_date)
         
         if not success:
             await msg.edit_text(f"❌ {error}")
             return CUSTOM_DATE_INPUT
         
+        # Auto-swap if reversed (the summary query already validated the range)
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+        
         period_name = f"{start_date.strftime('%d.%m.%Y')} to {end_date.strftime('%d.%m.%Y')}"
         
-        excel_buffer = generate_invoice_report_excel(invoices, summary, period_name)
         filename = f'Invoice_Report_{start_date.strftime("%d%m%Y")}_to_{end_date.strftime("%d%m%Y")}.xlsx'
         
-        await context.bot.send_chat_action(update.effective_chat.id, ChatAction.UPLOAD_DOCUMENT)
-        
-        await context.bot.send_document(
-            chat_id=update.effective_chat.id,
-            document=excel_buffer,
-            filename=filename,
+        await _send_invoice_report(
+            context, update.effective_chat.id, start_date, end_date, summary, period_name, filename,
             caption=f"🗓️ Custom Date Range Invoice Report\n"
                    f"{start_date.strftime('%d.%m.%Y')} to {end_date.strftime('%d.%m.%Y')}\n\n"
                    f"Total Invoices: {summary['total_invoices']}\n"
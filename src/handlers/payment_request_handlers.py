@@ -621,8 +621,8 @@ approval_conversation = ConversationHandler(
     entry_points=[CallbackQueryHandler(callback_approve_start, pattern=r'^approve_req_\d+$')],
     states={
         APPROVE_AMOUNT: [MessageHandler(filters.TEXT & ~filters.COMMAND, approve_receive_amount)],
-        APPROVE_START_DATE: [CallbackQueryHandler(approve_receive_start_date)],
-        APPROVE_END_DATE: [CallbackQueryHandler(approve_receive_end_date)],
+        APPROVE_START_DATE: [CallbackQueryHandler(approve_receive_start_date, pattern=r'^cbcal_')],
+        APPROVE_END_DATE: [CallbackQueryHandler(approve_receive_end_date, pattern=r'^cbcal_')],
     },
     fallbacks=[]
 )
@@ -0,0 +1,61 @@
+"""
+Admin /perf command: hot-path latency, startup stages and lazy imports.
+
+    /perf                 handlers, jobs, queries and Telegram API calls
+    /perf query           one kind only (handler | job | query | telegram)
+    /perf reset           clear the collected samples
+    /perf profile [on|off]  query profiler (src.utils.query_profiler)
+"""
+
+import html
+import logging
+from telegram import Update
+from telegram.ext import ContextTypes
+from src.utils.auth import is_admin
+from src.utils.lazy_handlers import lazy_loads
+from src.utils import query_profiler
+from src.utils.metrics import KINDS, metrics_report, reset_metrics
+from src.utils.startup import startup_report
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+
+async def cmd_perf(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show latency percentiles per handler / query / Bot API method"""
+    if not is_admin(update.effective_user.id):
+        await update.message.reply_text("❌ Admin access only.")
+        return
+
+    arg = context.args[0].lower() if context.args else None
+    if arg == 'reset':
+        reset_metrics()
+        await update.message.reply_text("✅ Latency metrics cleared.")
+        return
+
+    if arg == 'profile':
+        switch = context.args[1].lower() if len(context.args) > 1 else None
+        if switch in ('on', 'off'):
+            query_profiler.set_query_profiling(switch == 'on')
+            if switch == 'on':
+                query_profiler.reset_query_profile()
+        await _reply_pre(update, query_profiler.profile_report())
+        return
+
+    kind = arg if arg in KINDS else None
+    sections = [metrics_report(kind)]
+    if kind is None:
+        sections.append(startup_report())
+        loads = lazy_loads()
+        if loads:
+            sections.append("Loaded on first use:\n" + "\n".join(f"  {ms:7.1f}ms  {name}" for name, ms in loads[:8]))
+
+    await _reply_pre(update, "\n\n".join(sections))
+    logger.info(f"[PERF] report sent to admin {update.effective_user.id} kind={kind or 'all'}")
+
+
+async def _reply_pre(update: Update, text: str):
+    # Keep within one message: <pre></pre> plus the escaped body
+    body = html.escape(text)[:TELEGRAM_MESSAGE_LIMIT - 20]
+    await update.message.reply_text(f"<pre>{body}</pre>", parse_mode="HTML")
@@ -111,19 +111,19 @@ async def show_role_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     state, _ = get_user_access_state(uid)
     if state != STATE_ACTIVE_SUBSCRIBER:
         if state == STATE_NEW_USER:
-            logger.warning(f"[ACCESS] blocked NEW_USER telegram_id={uid} reason=unregistered")
+            logger.warning("[ACCESS] blocked NEW_USER telegram_id=%s reason=unregistered", uid)
         elif state == STATE_REGISTERED_NO_SUBSCRIPTION:
-            logger.warning(f"[ACCESS] blocked REGISTERED_NO_SUBSCRIPTION telegram_id={uid}")
+            logger.warning("[ACCESS] blocked REGISTERED_NO_SUBSCRIPTION telegram_id=%s", uid)
         elif state == STATE_EXPIRED_SUBSCRIBER:
-            logger.warning(f"[ACCESS] blocked EXPIRED_SUBSCRIBER telegram_id={uid}")
+            logger.warning("[ACCESS] blocked EXPIRED_SUBSCRIBER telegram_id=%s", uid)
         # Send user-facing message
         await check_access_gate(update, context, require_subscription=True)
-        logger.info(f"[ACCESS] menu_render_skipped telegram_id={uid}")
+        logger.info("[ACCESS] menu_render_skipped telegram_id=%s", uid)
         return
 
     # STEP 1: STRICT role verification (only for ACTIVE state)
     role = get_user_role(uid)
-    logger.info(f"[ACCESS] menu_access_attempt telegram_id={uid} role={role}")
+    logger.info("[ACCESS] menu_access_attempt telegram_id=%s role=%s", uid, role)
     
     # STEP 2: Route to appropriate menu with strict verification
     if role == 'admin':
@@ -154,7 +154,7 @@ async def show_role_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Gate already ensured ACTIVE; show full user menu
         menu = USER_MENU
         role_text = "🙋 USER MENU"
-        logger.info(f"[ACCESS] user_menu_render telegram_id={uid}")
+        logger.info("[ACCESS] user_menu_render telegram_id=%s", uid)
     
     msg = f"{role_text}\n\nSelect an action:"
     
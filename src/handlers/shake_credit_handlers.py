@@ -547,9 +547,10 @@ async def cmd_admin_pending_purchases(update: Update, context: ContextTypes.DEFA
     else:
         message = update.message
     
-    from src.database.shake_credits_operations import get_pending_purchase_requests
+    from src.database.shake_credits_operations import get_pending_purchase_page
     
-    purchases = get_pending_purchase_requests()
+    # Only the oldest request is shown, so fetch a single row
+    purchases = get_pending_purchase_page(limit=1).rows
     
     if not purchases:
         await message.reply_text("✅ No pending shake credit purchase requests!")
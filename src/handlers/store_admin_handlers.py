@@ -10,10 +10,14 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler, CommandHandler, CallbackQueryHandler, MessageHandler, filters
 
 from src.database.store_operations import (
-    create_or_update_product, get_all_orders, get_order, close_order
+    create_or_update_product, get_orders_page, count_orders_by_status, get_order, close_order
 )
 from src.database.payment_approvals import approve_store_payment, approve_store_credit
 from src.utils.auth import is_admin_id
+from src.utils.keyset_pagination import (
+    KEYSET_CALLBACK_PATTERN, KeysetList, handle_keyset_callback, invalidate_keyset_list,
+    register_keyset_list, show_keyset_list,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,32 @@ logger = logging.getLogger(__name__)
 STORE_ADMIN_MENU, ORDERS_VIEW, ORDER_DETAIL, PAYMENT_ACTION = range(4)
 
 
+def _render_order_row(order: dict) -> str:
+    text = f"📦 Order #{order['order_id']}\n"
+    text += f"👤 User: {order['user_id']}\n"
+    text += f"💰 Total: ₹{order['total_amount']:.2f}\n"
+    text += f"💳 Status: {order['payment_status']}\n"
+    text += f"📅 Created: {order['created_at'].strftime('%d-%m-%Y')}\n\n"
+    return text
+
+
+STORE_ORDERS_LIST = register_keyset_list(KeysetList(
+    name='so',
+    key='order_id',
+    fetch=lambda scope, after, before, limit: get_orders_page(
+        status_filter=scope or None, after=after, before=before, limit=limit
+    ),
+    render_row=_render_order_row,
+    title=lambda scope: f"📋 *{scope} Orders*",
+    empty_text="No orders found.",
+    row_button=lambda order: InlineKeyboardButton(
+        f"Order #{order['order_id']}", callback_data=f"store_order_detail:{order['order_id']}"
+    ),
+    extra_buttons=lambda scope: [[InlineKeyboardButton("⬅️ Back", callback_data="store_admin_orders")]],
+    page_size=5,
+))
+
+
 async def cmd_store_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     /store_admin command - Store management dashboard
@@ -54,17 +84,18 @@ async def store_admin_orders(update: Update, context: ContextTypes.DEFAULT_TYPE)
     await query.answer()
     
     # Get orders that need attention (OPEN or PARTIAL)
-    open_orders = get_all_orders(status_filter='OPEN')
-    partial_orders = get_all_orders(status_filter='PARTIAL')
-    credit_orders = get_all_orders(status_filter='CREDIT')
+    counts = count_orders_by_status()
+    open_count = counts.get('OPEN', 0)
+    partial_count = counts.get('PARTIAL', 0)
+    credit_count = counts.get('CREDIT', 0)
     
-    pending_count = len(open_orders or []) + len(partial_orders or []) + len(credit_orders or [])
+    pending_count = open_count + partial_count + credit_count
     
     text = (
         "📋 *Order Management*\n\n"
-        f"🔓 Open Orders: {len(open_orders or [])}\n"
-        f"🔄 Partial Payment: {len(partial_orders or [])}\n"
-        f"🔐 Credit Orders: {len(credit_orders or [])}\n\n"
+        f"🔓 Open Orders: {open_count}\n"
+        f"🔄 Partial Payment: {partial_count}\n"
+        f"🔐 Credit Orders: {credit_count}\n\n"
         f"⚠️  Total Pending: {pending_count}"
     )
     
@@ -90,41 +121,8 @@ async def store_orders_filter(update: Update, context: ContextTypes.DEFAULT_TYPE
     await query.answer()
     
     status = query.data.split(":")[1]
-    orders = get_all_orders(status_filter=status)
-    
-    if not orders or len(orders) == 0:
-        await query.edit_message_text(
-            f"No {status} orders found.",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("⬅️ Back", callback_data="store_admin_orders")]
-            ])
-        )
-        return ORDERS_VIEW
-    
-    text = f"📋 *{status} Orders* ({len(orders)} total)\n\n"
-    
-    # Show first 5 orders
-    for order in orders[:5]:
-        text += f"📦 Order #{order['order_id']}\n"
-        text += f"👤 User: {order['user_id']}\n"
-        text += f"💰 Total: ₹{order['total_amount']:.2f}\n"
-        text += f"💳 Status: {order['payment_status']}\n"
-        text += f"📅 Created: {order['created_at'].strftime('%d-%m-%Y')}\n\n"
-    
-    keyboard = []
-    
-    # Add buttons for each order
-    for order in orders[:3]:
-        keyboard.append([InlineKeyboardButton(f"Order #{order['order_id']}", 
-                                            callback_data=f"store_order_detail:{order['order_id']}")])
-    
-    keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="store_admin_orders")])
-    
-    await query.edit_message_text(
-        text,
-        parse_mode="Markdown",
-        reply_markup=InlineKeyboardMarkup(keyboard)
-    )
+    invalidate_keyset_list(STORE_ORDERS_LIST.name)
+    await show_keyset_list(update, STORE_ORDERS_LIST.name, scope=status, edit=True)
     
     return ORDERS_VIEW
 
@@ -243,6 +241,7 @@ def get_store_admin_conversation_handler():
             ],
             ORDERS_VIEW: [
                 CallbackQueryHandler(store_admin_orders, pattern="^store_admin_orders$"),
+                CallbackQueryHandler(handle_keyset_callback, pattern=KEYSET_CALLBACK_PATTERN),
                 CallbackQueryHandler(store_orders_filter, pattern="^store_orders_filter:"),
                 CallbackQueryHandler(store_order_detail, pattern="^store_order_detail:"),
             ],
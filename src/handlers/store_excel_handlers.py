@@ -3,6 +3,8 @@ Excel bulk upload for store products
 Handles bulk creation, updates, and price revisions
 """
 
+import asyncio
+import importlib.util
 import logging
 import io
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Document
@@ -15,16 +17,15 @@ from telegram.ext import (
     filters,
 )
 
-from src.database.store_operations import create_or_update_product
+from src.utils.catalogue_cache import SECTION_STORE, invalidate_catalogue
+from src.utils.product_import import ProductImportError, import_products, PRODUCT_COLUMNS
 from src.utils.auth import is_admin_id
 
 logger = logging.getLogger(__name__)
 
-try:
-    import openpyxl
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
+# Checked without importing: openpyxl is loaded only when a workbook is built/read
+OPENPYXL_AVAILABLE = importlib.util.find_spec('openpyxl') is not None
+if not OPENPYXL_AVAILABLE:
     logger.warning("openpyxl not installed - Excel upload disabled")
 
 # Conversation states
@@ -99,100 +100,40 @@ async def handle_excel_file(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await file.download_to_memory(file_bytes)
         file_bytes.seek(0)
         
-        # Parse Excel
-        workbook = openpyxl.load_workbook(file_bytes)
-        sheet = workbook.active
+        progress_msg = await update.message.reply_text("⏳ Importing products...")
+        loop = asyncio.get_running_loop()
         
-        # Expected columns
-        expected_columns = {
-            1: 'product_code',
-            2: 'category',
-            3: 'product_name',
-            4: 'description',
-            5: 'price',
-            6: 'discount_percent',
-            7: 'stock_quantity',
-            8: 'status'
-        }
+        async def _edit_progress(text):
+            try:
+                await progress_msg.edit_text(text)
+            except Exception as e:
+                logger.debug(f"Progress update skipped: {e}")
         
-        # Read header
-        header_row = sheet[1]
-        header_map = {}
-        for col_num, col_name in expected_columns.items():
-            cell = header_row[col_num - 1]
-            if cell.value and cell.value.lower().strip() in [col_name, col_name.replace('_', ' '), col_name.replace('_', '-')]:
-                header_map[col_num] = col_name
+        def report_progress(text):
+            # Called from the import worker thread
+            asyncio.run_coroutine_threadsafe(_edit_progress(text), loop)
         
-        if len(header_map) < len(expected_columns):
-            await update.message.reply_text(
+        try:
+            report = await asyncio.to_thread(import_products, file_bytes, report_progress)
+        except ProductImportError:
+            await progress_msg.edit_text(
                 "❌ Excel header mismatch.\n"
-                f"Expected columns: {', '.join(expected_columns.values())}"
+                f"Expected columns: {', '.join(PRODUCT_COLUMNS)}"
             )
             return EXCEL_UPLOAD
         
-        # Process rows
-        success_count = 0
-        error_count = 0
-        errors = []
+        if report.applied:
+            invalidate_catalogue(SECTION_STORE)
         
-        for row_num, row in enumerate(sheet.iter_rows(min_row=2, values_only=False), start=2):
-            try:
-                product_code = row[0].value
-                category = row[1].value
-                product_name = row[2].value
-                description = row[3].value
-                price = row[4].value
-                discount_percent = row[5].value
-                stock_quantity = row[6].value
-                status = row[7].value
-                
-                # Validate required fields
-                if not product_code or not category or not product_name or price is None:
-                    errors.append(f"Row {row_num}: Missing required fields")
-                    error_count += 1
-                    continue
-                
-                # Type conversions
-                try:
-                    price = float(price)
-                    discount_percent = float(discount_percent or 0)
-                    stock_quantity = int(stock_quantity or 0)
-                    status = (status or 'ACTIVE').upper()
-                    
-                    if status not in ['ACTIVE', 'INACTIVE']:
-                        status = 'ACTIVE'
-                except ValueError as e:
-                    errors.append(f"Row {row_num}: Invalid data type - {str(e)}")
-                    error_count += 1
-                    continue
-                
-                # Create/update product
-                result = create_or_update_product(
-                    product_code=str(product_code).strip(),
-                    category=str(category).strip(),
-                    name=str(product_name).strip(),
-                    description=str(description or "").strip(),
-                    price=price,
-                    discount_percent=discount_percent,
-                    stock=stock_quantity,
-                    status=status
-                )
-                
-                if result:
-                    success_count += 1
-                else:
-                    errors.append(f"Row {row_num}: Failed to upsert product")
-                    error_count += 1
-            
-            except Exception as e:
-                logger.error(f"Error processing row {row_num}: {e}")
-                errors.append(f"Row {row_num}: {str(e)}")
-                error_count += 1
+        errors = report.errors
+        error_count = len(errors)
         
         # Send summary
         summary = (
             f"📊 *Excel Upload Summary*\n\n"
-            f"✅ Success: {success_count}\n"
+            f"🆕 Created: {report.created}\n"
+            f"✏️ Updated: {report.updated}\n"
+            f"➖ Unchanged: {report.unchanged}\n"
             f"❌ Errors: {error_count}\n"
         )
         
@@ -202,15 +143,15 @@ async def handle_excel_file(update: Update, context: ContextTypes.DEFAULT_TYPE):
             summary += f"\n📋 First 10 errors:\n" + "\n".join(errors[:10])
             summary += f"\n... and {len(errors) - 10} more errors"
         
-        await update.message.reply_text(summary, parse_mode="Markdown")
+        await progress_msg.edit_text(summary, parse_mode="Markdown")
         
-        logger.info(f"Excel upload by admin {admin_id}: {success_count} success, {error_count} errors")
+        logger.info(f"Excel upload by admin {admin_id}: {report.applied} applied, {error_count} errors")
         
         return ConversationHandler.END
     
     except Exception as e:
         logger.error(f"Error processing Excel file: {e}")
-        await update.message.reply_text(f"❌ Error processing file: {str(e)}")
+        await update.message.reply_text(f"❌ Error processing file (no products were changed): {str(e)}")
         return EXCEL_UPLOAD
 
 
@@ -220,6 +161,8 @@ async def excel_sample(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
     
     try:
+        import openpyxl
+
         # Create sample workbook
         workbook = openpyxl.Workbook()
         sheet = workbook.active
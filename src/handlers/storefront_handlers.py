@@ -1,29 +1,67 @@
 """
 User Storefront and Product Browsing
 Users can browse and order store products, subscriptions, PT plans, and events
+
+Catalogue screens are rendered once per page and served from
+src.utils.catalogue_cache until an admin edit invalidates them.
 """
 
 import logging
+import re
 from datetime import datetime
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes, ConversationHandler
 
 from src.database.connection import execute_query
 from src.database.ar_operations import create_receivable, create_transactions, update_receivable_status
 from src.utils.auth import check_user_approved
 from src.database.user_operations import user_exists
+from src.utils.product_search import SOURCE_STORE_PRODUCTS, get_product_index
+from src.utils.catalogue_cache import (
+    SECTION_SUBSCRIPTIONS, SECTION_PT_PLANS, SECTION_EVENTS, SECTION_STORE,
+    get_catalogue_page, paginate, page_nav_row, parse_page_callback,
+)
 
 logger = logging.getLogger(__name__)
 
 # Conversation states
 BROWSE_STORE, SELECT_PRODUCT, CONFIRM_ORDER = range(3)
 
+# Category product lists are cached under SECTION_STORE with key "cat:<name>"
+_CATEGORY_KEY_PREFIX = 'cat:'
 
-# ============ Subscription Browsing ============
+# Seat counts change with every registration, so the cached events page holds
+# a marker per event and the live numbers are filled in on each view
+_SEATS_MARKER = re.compile(r'\x00seats:(\d+)\x00')
 
-async def cmd_browse_subscriptions(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Browse available subscription plans"""
-    # Handle both command and callback contexts
+
+def _is_listed_product(product: dict) -> bool:
+    return product.get('status') == 'active' and (product.get('stock') or 0) > 0
+
+
+async def _reply_catalogue(update: Update, page_result, empty_text: str) -> bool:
+    """Send a cached catalogue page; edit in place when paging via buttons."""
+    query = update.callback_query
+    message = query.message if query else update.message
+    if page_result is None:
+        await message.reply_text(empty_text)
+        return False
+    text, markup = page_result
+    if query and query.data and query.data.startswith('catpage_'):
+        try:
+            await query.edit_message_text(text, reply_markup=markup, parse_mode='Markdown')
+        except BadRequest as e:
+            # A stale Prev/Next button can point at the page already shown
+            if 'not modified' not in str(e).lower():
+                raise
+    else:
+        await message.reply_text(text, reply_markup=markup, parse_mode='Markdown')
+    return True
+
+
+async def _ensure_browser(update: Update):
+    """Answer callback, resolve message, and gate on registration/approval."""
     if update.callback_query:
         await update.callback_query.answer()
         message = update.callback_query.message
@@ -34,47 +72,59 @@ async def cmd_browse_subscriptions(update: Update, context: ContextTypes.DEFAULT
     
     if not user_exists(user_id):
         await message.reply_text("❌ You must register first. Use /start")
-        return ConversationHandler.END
+        return None
     if not check_user_approved(user_id):
         await message.reply_text("⏳ Registration pending approval.")
+        return None
+    return message
+
+
+# ============ Subscription Browsing ============
+
+def _render_subscriptions_page(page: int):
+    plans = execute_query("""
+        SELECT plan_id, name, duration_days, price, description
+        FROM subscription_plans
+        WHERE status = 'active'
+        ORDER BY price ASC
+    """)
+    if not plans:
+        return None
+    
+    plans, page, total_pages = paginate(plans, page)
+    text = "📅 *Available Subscription Plans*\n\n"
+    keyboard = []
+    
+    for plan in plans:
+        text += (
+            f"**{plan['name']}**\n"
+            f"⏱️ {plan['duration_days']} days\n"
+            f"💵 Rs {plan['price']}\n"
+            f"📝 {plan['description'] or 'Premium access'}\n\n"
+        )
+        keyboard.append([
+            InlineKeyboardButton(
+                f"Subscribe - Rs {plan['price']}", 
+                callback_data=f"subscribe_plan_{plan['plan_id']}"
+            )
+        ])
+    
+    nav = page_nav_row(SECTION_SUBSCRIPTIONS, page, total_pages)
+    if nav:
+        keyboard.append(nav)
+    keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="main_menu")])
+    return text, InlineKeyboardMarkup(keyboard)
+
+
+async def cmd_browse_subscriptions(update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 0):
+    """Browse available subscription plans"""
+    message = await _ensure_browser(update)
+    if message is None:
         return ConversationHandler.END
     
     try:
-        plans = execute_query("""
-            SELECT plan_id, name, duration_days, price, description
-            FROM subscription_plans
-            WHERE status = 'active'
-            ORDER BY price ASC
-        """)
-        
-        if not plans:
-            await message.reply_text("📭 No subscription plans available.")
-            return ConversationHandler.END
-        
-        text = "📅 *Available Subscription Plans*\n\n"
-        keyboard = []
-        
-        for plan in plans:
-            text += (
-                f"**{plan['name']}**\n"
-                f"⏱️ {plan['duration_days']} days\n"
-                f"💵 Rs {plan['price']}\n"
-                f"📝 {plan['description'] or 'Premium access'}\n\n"
-            )
-            keyboard.append([
-                InlineKeyboardButton(
-                    f"Subscribe - Rs {plan['price']}", 
-                    callback_data=f"subscribe_plan_{plan['plan_id']}"
-                )
-            ])
-        
-        keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="main_menu")])
-        
-        await message.reply_text(
-            text,
-            reply_markup=InlineKeyboardMarkup(keyboard),
-            parse_mode='Markdown'
-        )
+        result = get_catalogue_page(SECTION_SUBSCRIPTIONS, page, _render_subscriptions_page)
+        await _reply_catalogue(update, result, "📭 No subscription plans available.")
     except Exception as e:
         logger.error(f"Error browsing subscriptions: {e}")
         await message.reply_text(f"❌ Error: {e}")
@@ -84,59 +134,50 @@ async def cmd_browse_subscriptions(update: Update, context: ContextTypes.DEFAULT
 
 # ============ PT Plans Browsing ============
 
-async def cmd_browse_pt_plans(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Browse available PT subscription plans"""
-    if update.callback_query:
-        await update.callback_query.answer()
-        message = update.callback_query.message
-        user_id = update.callback_query.from_user.id
-    else:
-        message = update.message
-        user_id = update.message.from_user.id
+def _render_pt_plans_page(page: int):
+    plans = execute_query("""
+        SELECT pt_id, name, duration_days, price, description
+        FROM pt_subscriptions
+        WHERE status = 'active'
+        ORDER BY price ASC
+    """)
+    if not plans:
+        return None
     
-    if not user_exists(user_id):
-        await message.reply_text("❌ You must register first. Use /start")
-        return ConversationHandler.END
-    if not check_user_approved(user_id):
-        await message.reply_text("⏳ Registration pending approval.")
+    plans, page, total_pages = paginate(plans, page)
+    text = "💪 *Available Personal Training Plans*\n\n"
+    keyboard = []
+    
+    for plan in plans:
+        text += (
+            f"**{plan['name']}**\n"
+            f"⏱️ {plan['duration_days']} days\n"
+            f"💵 Rs {plan['price']}\n"
+            f"📝 {plan['description'] or 'Expert training'}\n\n"
+        )
+        keyboard.append([
+            InlineKeyboardButton(
+                f"Enroll - Rs {plan['price']}", 
+                callback_data=f"enroll_pt_{plan['pt_id']}"
+            )
+        ])
+    
+    nav = page_nav_row(SECTION_PT_PLANS, page, total_pages)
+    if nav:
+        keyboard.append(nav)
+    keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="main_menu")])
+    return text, InlineKeyboardMarkup(keyboard)
+
+
+async def cmd_browse_pt_plans(update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 0):
+    """Browse available PT subscription plans"""
+    message = await _ensure_browser(update)
+    if message is None:
         return ConversationHandler.END
     
     try:
-        plans = execute_query("""
-            SELECT pt_id, name, duration_days, price, description
-            FROM pt_subscriptions
-            WHERE status = 'active'
-            ORDER BY price ASC
-        """)
-        
-        if not plans:
-            await message.reply_text("📭 No PT plans available.")
-            return ConversationHandler.END
-        
-        text = "💪 *Available Personal Training Plans*\n\n"
-        keyboard = []
-        
-        for plan in plans:
-            text += (
-                f"**{plan['name']}**\n"
-                f"⏱️ {plan['duration_days']} days\n"
-                f"💵 Rs {plan['price']}\n"
-                f"📝 {plan['description'] or 'Expert training'}\n\n"
-            )
-            keyboard.append([
-                InlineKeyboardButton(
-                    f"Enroll - Rs {plan['price']}", 
-                    callback_data=f"enroll_pt_{plan['pt_id']}"
-                )
-            ])
-        
-        keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="main_menu")])
-        
-        await message.reply_text(
-            text,
-            reply_markup=InlineKeyboardMarkup(keyboard),
-            parse_mode='Markdown'
-        )
+        result = get_catalogue_page(SECTION_PT_PLANS, page, _render_pt_plans_page)
+        await _reply_catalogue(update, result, "📭 No PT plans available.")
     except Exception as e:
         logger.error(f"Error browsing PT plans: {e}")
         await message.reply_text(f"❌ Error: {e}")
@@ -146,61 +187,74 @@ async def cmd_browse_pt_plans(update: Update, context: ContextTypes.DEFAULT_TYPE
 
 # ============ Events Browsing ============
 
-async def cmd_browse_events(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Browse available one-day events"""
-    if update.callback_query:
-        await update.callback_query.answer()
-        message = update.callback_query.message
-        user_id = update.callback_query.from_user.id
-    else:
-        message = update.message
-        user_id = update.message.from_user.id
+def _render_events_page(page: int):
+    events = execute_query("""
+        SELECT event_id, name, event_date, price, description, max_attendees, current_attendees
+        FROM one_day_events
+        WHERE status = 'active' AND event_date >= CURRENT_DATE
+        ORDER BY event_date ASC
+    """)
+    if not events:
+        return None
     
-    if not user_exists(user_id):
-        await message.reply_text("❌ You must register first. Use /start")
-        return ConversationHandler.END
-    if not check_user_approved(user_id):
-        await message.reply_text("⏳ Registration pending approval.")
+    events, page, total_pages = paginate(events, page)
+    text = "🎉 *Upcoming Events*\n\n"
+    keyboard = []
+    
+    for event in events:
+        text += (
+            f"**{event['name']}**\n"
+            f"📅 {event['event_date'].strftime('%d-%m-%Y')}\n"
+            f"💵 Rs {event['price']}\n"
+            f"👥 \x00seats:{event['event_id']}\x00 seats available\n"
+            f"📝 {event['description'] or 'Join us!'}\n\n"
+        )
+        keyboard.append([
+            InlineKeyboardButton(
+                f"Register - Rs {event['price']}", 
+                callback_data=f"register_event_{event['event_id']}"
+            )
+        ])
+    
+    nav = page_nav_row(SECTION_EVENTS, page, total_pages)
+    if nav:
+        keyboard.append(nav)
+    keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="main_menu")])
+    return text, InlineKeyboardMarkup(keyboard)
+
+
+def _fill_event_seats(text: str) -> str:
+    """Replace the seat markers of a cached events page with current availability (one query)"""
+    event_ids = [int(event_id) for event_id in _SEATS_MARKER.findall(text)]
+    if not event_ids:
+        return text
+    placeholders = ', '.join(['%s'] * len(event_ids))
+    rows = execute_query(
+        f"SELECT event_id, max_attendees, current_attendees FROM one_day_events WHERE event_id IN ({placeholders})",
+        tuple(event_ids)
+    ) or []
+    seats = {
+        row['event_id']: row['max_attendees'] - (row['current_attendees'] or 0) if row['max_attendees'] else "∞"
+        for row in rows
+    }
+    return _SEATS_MARKER.sub(lambda m: str(seats.get(int(m.group(1)), 0)), text)
+
+
+async def cmd_browse_events(update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 0):
+    """Browse available one-day events"""
+    message = await _ensure_browser(update)
+    if message is None:
         return ConversationHandler.END
     
     try:
-        events = execute_query("""
-            SELECT event_id, name, event_date, price, description, max_attendees, current_attendees
-            FROM one_day_events
-            WHERE status = 'active' AND event_date >= CURRENT_DATE
-            ORDER BY event_date ASC
-        """)
-        
-        if not events:
-            await message.reply_text("📭 No upcoming events.")
-            return ConversationHandler.END
-        
-        text = "🎉 *Upcoming Events*\n\n"
-        keyboard = []
-        
-        for event in events:
-            availability = event['max_attendees'] - event['current_attendees'] if event['max_attendees'] else "∞"
-            text += (
-                f"**{event['name']}**\n"
-                f"📅 {event['event_date'].strftime('%d-%m-%Y')}\n"
-                f"💵 Rs {event['price']}\n"
-                f"👥 {availability} seats available\n"
-                f"📝 {event['description'] or 'Join us!'}\n\n"
-            )
-            keyboard.append([
-                InlineKeyboardButton(
-                    f"Register - Rs {event['price']}", 
-                    callback_data=f"register_event_{event['event_id']}"
-                )
-            ])
-        
-        keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="main_menu")])
-        
-        await message.reply_text(
-            text,
-            reply_markup=InlineKeyboardMarkup(keyboard),
-            parse_mode='Markdown'
+        # Key by date so yesterday's "upcoming" list is never served
+        result = get_catalogue_page(
+            SECTION_EVENTS, page, _render_events_page, key=datetime.now().strftime('%Y%m%d')
         )
+        if result is not None:
+            text, markup = result
+            result = _fill_event_seats(text), markup
+        await _reply_catalogue(update, result, "📭 No upcoming events.")
     except Exception as e:
         logger.error(f"Error browsing events: {e}")
         await message.reply_text(f"❌ Error: {e}")
@@ -210,47 +264,71 @@ async def cmd_browse_events(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 # ============ Store Products Browsing ============
 
-async def cmd_browse_store(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Browse store products by category"""
-    if update.callback_query:
-        await update.callback_query.answer()
-        message = update.callback_query.message
-        user_id = update.callback_query.from_user.id
-    else:
-        message = update.message
-        user_id = update.message.from_user.id
+def _render_store_categories_page(page: int):
+    index = get_product_index(SOURCE_STORE_PRODUCTS)
+    categories = sorted({str(p['category']) for p in index.rows if p.get('status') == 'active' and p.get('category')})
+    if not categories:
+        return None
     
-    if not user_exists(user_id):
-        await message.reply_text("❌ You must register first. Use /start")
-        return ConversationHandler.END
-    if not check_user_approved(user_id):
-        await message.reply_text("⏳ Registration pending approval.")
+    categories, page, total_pages = paginate(categories, page)
+    keyboard = []
+    for category in categories:
+        keyboard.append([
+            InlineKeyboardButton(f"📦 {category}", callback_data=f"store_cat_{category}")
+        ])
+    
+    nav = page_nav_row(SECTION_STORE, page, total_pages)
+    if nav:
+        keyboard.append(nav)
+    keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="main_menu")])
+    return "🛒 *Store Categories*\n\nSelect a category:", InlineKeyboardMarkup(keyboard)
+
+
+def _render_category_page(category: str, page: int):
+    products = get_product_index(SOURCE_STORE_PRODUCTS).in_category(category, predicate=_is_listed_product)
+    if not products:
+        return None
+    
+    products, page, total_pages = paginate(products, page)
+    text = f"🛒 *{category}*\n\n"
+    keyboard = []
+    
+    for product in products:
+        discount_str = f" (-{product['discount_percent']}%)" if product['discount_percent'] > 0 else ""
+        text += (
+            f"**{product['name']}**\n"
+            f"MRP: Rs {product['mrp']}{discount_str}\n"
+            f"💵 **Rs {product['final_price']}**\n"
+            f"📝 {(product['description'] or '')[:100] or 'Quality product'}\n"
+            f"📦 Stock: {product['stock']}\n\n"
+        )
+        keyboard.append([
+            InlineKeyboardButton(
+                f"Add to Cart - Rs {product['final_price']}", 
+                callback_data=f"add_product_{product['product_id']}"
+            )
+        ])
+    
+    nav = page_nav_row(SECTION_STORE, page, total_pages, key=f"{_CATEGORY_KEY_PREFIX}{category}")
+    if nav:
+        keyboard.append(nav)
+    keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="cmd_browse_store")])
+    return text, InlineKeyboardMarkup(keyboard)
+
+
+async def cmd_browse_store(update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 0):
+    """Browse store products by category"""
+    message = await _ensure_browser(update)
+    if message is None:
         return ConversationHandler.END
     
     try:
-        categories = execute_query("""
-            SELECT DISTINCT category FROM store_products
-            WHERE status = 'active'
-            ORDER BY category
-        """)
-        
-        if not categories:
-            await message.reply_text("📭 No products available.")
-            return ConversationHandler.END
-        
-        keyboard = []
-        for cat in categories:
-            keyboard.append([
-                InlineKeyboardButton(f"📦 {cat['category']}", callback_data=f"store_cat_{cat['category']}")
-            ])
-        
-        keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="main_menu")])
-        
-        await message.reply_text(
-            "🛒 *Store Categories*\n\nSelect a category:",
-            reply_markup=InlineKeyboardMarkup(keyboard),
-            parse_mode='Markdown'
+        result = get_catalogue_page(
+            SECTION_STORE, page, _render_store_categories_page,
+            version=get_product_index(SOURCE_STORE_PRODUCTS)
         )
+        if not await _reply_catalogue(update, result, "📭 No products available."):
+            return ConversationHandler.END
     except Exception as e:
         logger.error(f"Error browsing store: {e}")
         await message.reply_text(f"❌ Error: {e}")
@@ -258,52 +336,22 @@ async def cmd_browse_store(update: Update, context: ContextTypes.DEFAULT_TYPE):
     return BROWSE_STORE
 
 
-async def browse_store_category(update: Update, context: ContextTypes.DEFAULT_TYPE):
+async def browse_store_category(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str = None, page: int = 0):
     """Show products in a category"""
     query = update.callback_query
     await query.answer()
     
-    category = query.data.split("_", 2)[2]
-    user_id = query.from_user.id
+    if category is None:
+        category = query.data.split("_", 2)[2]
     
     try:
-        products = execute_query("""
-            SELECT product_id, name, description, mrp, discount_percent, final_price, stock
-            FROM store_products
-            WHERE status = 'active' AND category = %s AND stock > 0
-            ORDER BY name
-        """, (category,))
-        
-        if not products:
-            await query.message.reply_text(f"📭 No products in {category}.")
-            return BROWSE_STORE
-        
-        text = f"🛒 *{category}*\n\n"
-        keyboard = []
-        
-        for product in products:
-            discount_str = f" (-{product['discount_percent']}%)" if product['discount_percent'] > 0 else ""
-            text += (
-                f"**{product['name']}**\n"
-                f"MRP: Rs {product['mrp']}{discount_str}\n"
-                f"💵 **Rs {product['final_price']}**\n"
-                f"📝 {product['description'][:100] or 'Quality product'}\n"
-                f"📦 Stock: {product['stock']}\n\n"
-            )
-            keyboard.append([
-                InlineKeyboardButton(
-                    f"Add to Cart - Rs {product['final_price']}", 
-                    callback_data=f"add_product_{product['product_id']}"
-                )
-            ])
-        
-        keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="cmd_browse_store")])
-        
-        await query.message.reply_text(
-            text,
-            reply_markup=InlineKeyboardMarkup(keyboard),
-            parse_mode='Markdown'
+        result = get_catalogue_page(
+            SECTION_STORE, page, lambda p: _render_category_page(category, p),
+            key=f"{_CATEGORY_KEY_PREFIX}{category}",
+            version=get_product_index(SOURCE_STORE_PRODUCTS)
         )
+        if not await _reply_catalogue(update, result, f"📭 No products in {category}."):
+            return BROWSE_STORE
     except Exception as e:
         logger.error(f"Error browsing category {category}: {e}")
         await query.message.reply_text(f"❌ Error: {e}")
@@ -311,6 +359,25 @@ async def browse_store_category(update: Update, context: ContextTypes.DEFAULT_TY
     return SELECT_PRODUCT
 
 
+async def browse_catalogue_page(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Prev/Next navigation for every catalogue screen (catpage_* callbacks; catpage_noop is only answered)"""
+    parsed = parse_page_callback(update.callback_query.data)
+    if parsed is None:
+        await update.callback_query.answer()
+        return ConversationHandler.END
+    section, page, key = parsed
+    
+    if section == SECTION_SUBSCRIPTIONS:
+        return await cmd_browse_subscriptions(update, context, page=page)
+    if section == SECTION_PT_PLANS:
+        return await cmd_browse_pt_plans(update, context, page=page)
+    if section == SECTION_EVENTS:
+        return await cmd_browse_events(update, context, page=page)
+    if key.startswith(_CATEGORY_KEY_PREFIX):
+        return await browse_store_category(update, context, category=key[len(_CATEGORY_KEY_PREFIX):], page=page)
+    return await cmd_browse_store(update, context, page=page)
+
+
 # ============ Order Processing ============
 
 async def process_product_order(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -14,10 +14,11 @@ from src.database.subscription_operations import (
     approve_subscription, reject_subscription, get_user_subscription, is_subscription_active,
     is_in_grace_period, is_subscription_expired, get_expiring_subscriptions,
     get_users_in_grace_period, get_expired_subscriptions, mark_subscription_locked,
-    get_user_pending_subscription_request
+    get_user_pending_subscription_request, get_pending_subscription_page
 )
 from src.database.user_operations import get_user
 from src.utils.auth import is_admin
+from src.utils.keyset_pagination import KeysetList, register_keyset_list, show_keyset_list, invalidate_keyset_list
 
 logger = logging.getLogger(__name__)
 
@@ -942,55 +943,37 @@ async def cmd_my_subscription(update: Update, context: ContextTypes.DEFAULT_TYPE
     await show_pending_subscriptions_list(update, context)
 
 
-async def show_pending_subscriptions_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Show list of pending subscriptions (can be called from message or callback)"""
-    # Handle both command and callback contexts
-    if update.callback_query:
-        message = update.callback_query.message
-    else:
-        message = update.message
-    
-    pending = get_pending_subscription_requests()
-    
-    if not pending:
-        text = "📭 No pending subscription requests."
-        if update.callback_query:
-            await update.callback_query.edit_message_text(text, parse_mode="Markdown")
-        else:
-            await message.reply_text(text, parse_mode="Markdown")
-        return
-    
-    text = f"*📋 Pending Subscriptions ({len(pending)})*\n\n"
-    
-    for sub in pending:
-        plan = SUBSCRIPTION_PLANS.get(sub['plan_id'], {})
-        text += (
-            f"👤 {sub['full_name']}\n"
-            f"📱 {sub['phone']}\n"
-            f"💰 Amount: Rs. {sub['amount']:,}\n"
-            f"📅 Plan: {plan.get('name', 'Unknown')}\n"
-            f"🆔 Request ID: `{sub['id']}`\n"
-            f"─────────────────────\n"
-        )
-    
-    keyboard = [
+def _render_pending_subscription_row(sub: dict) -> str:
+    plan = SUBSCRIPTION_PLANS.get(sub['plan_id'], {})
+    return (
+        f"👤 {sub['full_name']}\n"
+        f"📱 {sub['phone']}\n"
+        f"💰 Amount: Rs. {sub['amount']:,}\n"
+        f"📅 Plan: {plan.get('name', 'Unknown')}\n"
+        f"🆔 Request ID: `{sub['id']}`\n"
+        f"─────────────────────\n"
+    )
+
+
+PENDING_SUBSCRIPTIONS_LIST = register_keyset_list(KeysetList(
+    name='ps',
+    key='id',
+    fetch=lambda scope, after, before, limit: get_pending_subscription_page(after=after, before=before, limit=limit),
+    render_row=_render_pending_subscription_row,
+    title=lambda scope: "*📋 Pending Subscriptions*",
+    empty_text="📭 No pending subscription requests.",
+    extra_buttons=lambda scope: [
         [InlineKeyboardButton("👉 Approve Subscription", callback_data="admin_sub_approve")],
         [InlineKeyboardButton("← Back", callback_data="cmd_notifications")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    if update.callback_query:
-        await update.callback_query.edit_message_text(
-            text,
-            reply_markup=reply_markup,
-            parse_mode="Markdown"
-        )
-    else:
-        await message.reply_text(
-            text,
-            reply_markup=reply_markup,
-            parse_mode="Markdown"
-        )
+    ],
+    page_size=5,
+))
+
+
+async def show_pending_subscriptions_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show list of pending subscriptions (can be called from message or callback)"""
+    invalidate_keyset_list(PENDING_SUBSCRIPTIONS_LIST.name)
+    await show_keyset_list(update, PENDING_SUBSCRIPTIONS_LIST.name, edit=bool(update.callback_query))
 
 
 
@@ -34,16 +34,15 @@ if USE_LOCAL_DB:
             return False
 else:
     from src.database.user_operations import user_exists, create_user, get_user, is_user_banned
-from src.database.attendance_operations import (
-    create_attendance_request, get_user_attendance_today, approve_attendance
-)
-from src.config import SUPER_ADMIN_USER_ID, POINTS_CONFIG, GEOFENCE_LAT, GEOFENCE_LNG, GEOFENCE_RADIUS_M
+from src.config import POINTS_CONFIG
 from telegram import ReplyKeyboardMarkup, ReplyKeyboardRemove, KeyboardButton
-from src.utils.geo import haversine_distance_m
+from src.utils.geofence import check_studio_geofence
+from src.utils.checkin_fastpath import (
+    check_in, notify_pending_checkin, CHECKIN_ALREADY, CHECKIN_APPROVED, CHECKIN_FAILED
+)
 from src.database.activity_operations import get_user_points, get_leaderboard
 from src.handlers.role_keyboard_handlers import show_role_menu
 from src.utils.auth import is_admin_id
-from src.utils.role_notifications import get_moderator_chat_ids
 from src.utils.welcome_message import get_welcome_message
 from src.utils.guards import check_registration, check_approval
 from src.database.subscription_operations import (
@@ -138,113 +137,43 @@ async def handle_location_for_checkin(update: Update, context: ContextTypes.DEFA
 
     context.user_data.pop('awaiting_geo_checkin', None)
     user_location = message.location
-    try:
-        lat_u = float(user_location.latitude)
-        lng_u = float(user_location.longitude)
-        lat_c = float(GEOFENCE_LAT)
-        lng_c = float(GEOFENCE_LNG)
-        radius_m = float(GEOFENCE_RADIUS_M or 10)
-    except Exception:
+    match = check_studio_geofence(user_location.latitude, user_location.longitude)
+    if match.studio is None:
         await message.reply_text("❌ Invalid geofence. Contact admin.", reply_markup=ReplyKeyboardRemove())
         return
 
-    distance = haversine_distance_m(lat_u, lng_u, lat_c, lng_c)
-    if distance > radius_m:
+    if not match.within:
         await message.reply_text(
-            f"⛔ Out of range ({int(distance)} m). Be near the studio.",
+            f"⛔ Out of range ({int(match.distance_m)} m). Be near the studio.",
             reply_markup=ReplyKeyboardRemove(),
         )
         return
 
-    already = get_user_attendance_today(user_id)
-    if already and (already.get('status') in ('pending', 'approved')):
+    result = await check_in(user_id)
+    outcome = result['outcome']
+    if outcome == CHECKIN_ALREADY:
         await message.reply_text("📌 Attendance already recorded for today.", reply_markup=ReplyKeyboardRemove())
         return
-
-    created = create_attendance_request(user_id, photo_url=None)
-    if not created:
+    if outcome == CHECKIN_FAILED:
         await message.reply_text("❌ Failed to record attendance. Please try again.", reply_markup=ReplyKeyboardRemove())
         return
-
-    user = get_user(user_id)
-    fee_status = (user.get('fee_status') or '').lower()
-    if fee_status in ("paid", "active"):
-        try:
-            attendance_id = created.get('attendance_id')
-            if attendance_id is not None:
-                approve_attendance(attendance_id, int(SUPER_ADMIN_USER_ID or 0))
-                pts = POINTS_CONFIG.get('attendance', 0)
-                await message.reply_text(
-                    f"✅ Attendance logged and approved. +{pts} points awarded!",
-                    reply_markup=ReplyKeyboardRemove(),
-                )
-                return
-        except Exception:
-            pass
-        await message.reply_text("✅ Attendance logged. Awaiting approval.", reply_markup=ReplyKeyboardRemove())
-        # Notify moderators for manual approval with instant buttons
-        attendance_id = created.get('attendance_id')
-        user_phone = user.get('phone', 'N/A')
-        
-        for chat_id in get_moderator_chat_ids(include_staff=True):
-            try:
-                notification_text = (
-                    "🔔 *NEW GYM CHECK-IN REQUEST*\n\n"
-                    f"👤 *User:* {user['full_name']}\n"
-                    f"📱 *ID:* {user_id}\n"
-                    f"📞 *Phone:* {user_phone}\n"
-                    f"📅 *Date:* {created.get('request_date')}\n"
-                    f"🏢 *Attendance ID:* {attendance_id}\n\n"
-                    "⏳ *Status:* PENDING YOUR APPROVAL\n\n"
-                    "Click buttons below to approve or reject:"
-                )
-                
-                keyboard = [
-                    [InlineKeyboardButton("✅ Approve", callback_data=f"approve_attend_{attendance_id}"),
-                     InlineKeyboardButton("❌ Reject", callback_data=f"reject_attend_{attendance_id}")],
-                ]
-                
-                await context.bot.send_message(
-                    chat_id=chat_id,
-                    text=notification_text,
-                    reply_markup=InlineKeyboardMarkup(keyboard),
-                    parse_mode='Markdown'
-                )
-            except Exception as e:
-                logger.error(f"Failed to notify moderator {chat_id} for attendance: {e}")
+    if outcome == CHECKIN_APPROVED:
+        pts = POINTS_CONFIG.get('attendance', 0)
+        await message.reply_text(
+            f"✅ Attendance logged and approved. +{pts} points awarded!",
+            reply_markup=ReplyKeyboardRemove(),
+        )
         return
 
     await message.reply_text("📝 Attendance recorded. Pending approval (membership inactive).", reply_markup=ReplyKeyboardRemove())
-    attendance_id = created.get('attendance_id')
-    user_phone = user.get('phone', 'N/A')
-    
-    for chat_id in get_moderator_chat_ids(include_staff=True):
-        try:
-            notification_text = (
-                "🔔 *NEW GYM CHECK-IN REQUEST (INACTIVE)*\n\n"
-                f"👤 *User:* {user['full_name']}\n"
-                f"📱 *ID:* {user_id}\n"
-                f"📞 *Phone:* {user_phone}\n"
-                f"📅 *Date:* {created.get('request_date')}\n"
-                f"🏢 *Attendance ID:* {attendance_id}\n\n"
-                "⚠️ *Note:* User has inactive/expired membership\n"
-                "⏳ *Status:* PENDING YOUR APPROVAL\n\n"
-                "Click buttons below to approve or reject:"
-            )
-            
-            keyboard = [
-                [InlineKeyboardButton("✅ Approve", callback_data=f"approve_attend_{attendance_id}"),
-                 InlineKeyboardButton("❌ Reject", callback_data=f"reject_attend_{attendance_id}")],
-            ]
-            
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text=notification_text,
-                reply_markup=InlineKeyboardMarkup(keyboard),
-                parse_mode='Markdown'
-            )
-        except Exception as e:
-            logger.error(f"Failed to notify moderator {chat_id} for attendance: {e}")
+    # Moderators get these batched into a digest during the morning rush
+    await notify_pending_checkin(context.bot, {
+        'user_id': user_id,
+        'full_name': result.get('full_name'),
+        'phone': result.get('phone'),
+        'request_date': result.get('request_date'),
+        'attendance_id': result.get('attendance_id'),
+    })
     return
 
 async def begin_registration(update: Update, context: ContextTypes.DEFAULT_TYPE):
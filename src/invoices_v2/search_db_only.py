@@ -51,12 +51,12 @@ def search_users_db_only(query: str, limit: int = 10) -> List[Dict]:
         return []
     
     query = query.strip()
-    logger.info(f"[INVOICE_USER_SEARCH] db_only_search query='{query}' limit={limit}")
+    logger.info("[INVOICE_USER_SEARCH] db_only_search query='%s' limit=%s", query, limit)
     
     try:
         # Try numeric search first (Telegram ID)
         if query.isdigit():
-            logger.info(f"[INVOICE_USER_SEARCH] numeric_search user_id={query}")
+            logger.debug("[INVOICE_USER_SEARCH] numeric_search user_id=%s", query)
             sql = """
                 SELECT 
                     user_id,
@@ -72,10 +72,10 @@ def search_users_db_only(query: str, limit: int = 10) -> List[Dict]:
             results = execute_query(sql, (query,), fetch_one=False)
             
             if results:
-                logger.info(f"[INVOICE_USER_SEARCH] numeric_match found user_id={query}")
+                logger.info("[INVOICE_USER_SEARCH] numeric_match found user_id=%s", query)
                 return results
             else:
-                logger.info(f"[INVOICE_USER_SEARCH] numeric_match NOT_FOUND user_id={query}")
+                logger.info("[INVOICE_USER_SEARCH] numeric_match NOT_FOUND user_id=%s", query)
                 return []
         
         # Text search: partial match on name or username
@@ -83,7 +83,7 @@ def search_users_db_only(query: str, limit: int = 10) -> List[Dict]:
         search_term = query.lstrip('@').lower()
         like_pattern = f"%{search_term}%"
         
-        logger.info(f"[INVOICE_USER_SEARCH] text_search term='{search_term}' pattern='{like_pattern}'")
+        logger.debug("[INVOICE_USER_SEARCH] text_search term='%s' pattern='%s'", search_term, like_pattern)
         
         sql = """
             SELECT 
@@ -120,14 +120,14 @@ def search_users_db_only(query: str, limit: int = 10) -> List[Dict]:
         )
         
         if results:
-            logger.info(f"[INVOICE_USER_SEARCH] text_match found {len(results)} user(s)")
+            logger.info("[INVOICE_USER_SEARCH] text_match found %s user(s)", len(results))
             return results
         else:
-            logger.info(f"[INVOICE_USER_SEARCH] text_match NOT_FOUND term='{search_term}'")
+            logger.info("[INVOICE_USER_SEARCH] text_match NOT_FOUND term='%s'", search_term)
             return []
     
     except Exception as e:
-        logger.error(f"[INVOICE_USER_SEARCH] error: {e}")
+        logger.error("[INVOICE_USER_SEARCH] error: %s", e)
         return []
 
 def format_user_for_display(user: Dict) -> str:
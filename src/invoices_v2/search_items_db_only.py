@@ -7,7 +7,8 @@ CRITICAL RULES:
 ✅ NO memory/JSON fallback
 ✅ Supported searches:
    - Serial number (exact match, numeric)
-   - Item name (partial, case-insensitive)
+   - Item name (ranked: exact, prefix and typo-tolerant token matches,
+     served from the product search index built from store_items)
 
 Response MUST show:
    - Serial No
@@ -26,6 +27,7 @@ NEVER respond with:
 import logging
 from typing import List, Dict, Optional
 from src.database.connection import execute_query
+from src.utils.product_search import SOURCE_STORE_ITEMS, search_products
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +39,7 @@ def search_store_items_db_only(query: str, limit: int = 20) -> List[Dict]:
     
     Supported search:
     1. Numeric: Serial number exact match
-    2. Text: Partial match on item_name (case-insensitive)
+    2. Text: Ranked fuzzy match on item_name (see src.utils.product_search)
     
     Args:
         query: Search term (item name or serial number)
@@ -81,45 +83,17 @@ def search_store_items_db_only(query: str, limit: int = 20) -> List[Dict]:
                 logger.info(f"[INVOICE_ITEM_SEARCH] numeric_match NOT_FOUND serial={query}")
                 return []
         
-        # Text search: partial match on item_name
+        # Text search: ranked fuzzy match on item_name
         # CRITICAL: Do NOT search users table!
         search_term = query.lower()
-        like_pattern = f"%{search_term}%"
         
         logger.info(f"[INVOICE_ITEM_SEARCH] text_search term='{search_term}'")
         
-        sql = """
-            SELECT 
-                item_id,
-                serial_no,
-                item_name,
-                mrp,
-                gst_percent,
-                is_active
-            FROM store_items
-            WHERE 
-                (
-                    LOWER(item_name) LIKE %s
-                    OR LOWER(COALESCE(normalized_item_name, '')) LIKE %s
-                )
-                AND (is_active = TRUE OR is_active = 1 OR is_active IS NULL)
-            ORDER BY 
-                CASE 
-                    WHEN LOWER(item_name) = %s THEN 0
-                    WHEN LOWER(item_name) LIKE %s THEN 1
-                    ELSE 2
-                END,
-                item_name ASC
-            LIMIT %s
-        """
-        
-        exact_match = search_term
-        starts_with = f"{search_term}%"
-        
-        results = execute_query(
-            sql,
-            (like_pattern, like_pattern, exact_match, starts_with, limit),
-            fetch_one=False
+        results = search_products(
+            search_term,
+            SOURCE_STORE_ITEMS,
+            limit=limit,
+            predicate=lambda item: item.get('is_active') in (None, True, 1),
         )
         
         if results:
@@ -0,0 +1,318 @@
+"""
+Pooled, batched SMTP delivery.
+
+SMTPPool keeps up to SMTP_POOL_SIZE connected, authenticated sessions and
+hands them out. An idle session gets a NOOP before reuse. A session is
+recycled after SMTP_MESSAGES_PER_SESSION messages, and dropped on any
+connection error.
+
+EmailDispatcher runs one sender thread per pooled session. Each thread
+takes up to EMAIL_BATCH_SIZE queued messages and sends them over one
+session: one connect/STARTTLS/login per batch instead of per email.
+Transient failures are retried with exponential backoff, up to
+EMAIL_MAX_RETRIES times. These are dropped connections, 4xx replies and
+network errors. Permanent ones (5xx, refused recipients, bad credentials)
+fail at once. Every queued message has a Future that resolves to True
+(sent) or False (gave up). Handlers await it with `send_async` and never
+block on SMTP.
+
+For local testing, run a debugging server with
+`python -m aiosmtpd -n -l localhost:8025` and set
+SMTP_SERVER=localhost SMTP_PORT=8025 SMTP_SECURITY=none.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import queue
+import random
+import smtplib
+import ssl
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from email.message import Message
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Idle sessions older than this are probed with NOOP before reuse
+IDLE_CHECK_SECONDS = 30
+
+
+class PooledSession:
+    """One connected, authenticated SMTP session and how many messages it has carried"""
+    __slots__ = ('smtp', 'sent', 'last_used')
+
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    """Up to `size` authenticated SMTP sessions, reused across sends"""
+
+    def __init__(self, host: str, port: int, security: str = 'starttls', username: str = '', password: str = '',
+                 size: int = 2, messages_per_session: int = 100, timeout: float = 20):
+        self.host = host
+        self.port = port
+        self.security = security
+        self.username = username
+        self.password = password
+        self.messages_per_session = messages_per_session
+        self.timeout = timeout
+        self.connects = 0
+        self._idle: List[PooledSession] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, size))
+
+    def _connect(self) -> PooledSession:
+        if self.security == 'ssl':
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout, context=ssl.create_default_context())
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.security == 'starttls':
+                smtp.starttls(context=ssl.create_default_context())
+        try:
+            if self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            _close(smtp)
+            raise
+        with self._lock:
+            self.connects += 1
+        logger.debug("[EMAIL] smtp session opened host=%s port=%s", self.host, self.port)
+        return PooledSession(smtp)
+
+    def _checkout(self) -> PooledSession:
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                return self._connect()
+            if time.monotonic() - session.last_used < IDLE_CHECK_SECONDS:
+                return session
+            try:
+                if session.smtp.noop()[0] == 250:
+                    return session
+            except (smtplib.SMTPException, OSError):
+                pass
+            _close(session.smtp)
+
+    @contextmanager
+    def session(self):
+        """Yields a PooledSession; it goes back to the pool unless the block raised or it is used up"""
+        with self._slots:
+            session = self._checkout()
+            try:
+                yield session
+            except BaseException:
+                _close(session.smtp)
+                raise
+            session.last_used = time.monotonic()
+            if session.sent >= self.messages_per_session:
+                _close(session.smtp)
+            else:
+                with self._lock:
+                    self._idle.append(session)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            _close(session.smtp)
+
+
+def _close(smtp: smtplib.SMTP) -> None:
+    try:
+        smtp.quit()
+    except Exception:
+        try:
+            smtp.close()
+        except Exception:
+            pass
+
+
+def is_transient(error: Exception) -> bool:
+    """Worth retrying: dropped connections, network errors and 4xx replies"""
+    if isinstance(error, (smtplib.SMTPAuthenticationError, smtplib.SMTPRecipientsRefused)):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError))
+
+
+class _Job:
+    __slots__ = ('message', 'future', 'attempts')
+
+    def __init__(self, message: Message):
+        self.message = message
+        self.future: Future = Future()
+        self.attempts = 0
+
+
+class EmailDispatcher:
+    """Queue of outgoing messages drained in batches by one thread per pooled session"""
+
+    def __init__(self, pool: SMTPPool, workers: int = 2, batch_size: int = 20, max_retries: int = 3,
+                 retry_base: float = 2.0):
+        self.pool = pool
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self._queue: queue.Queue = queue.Queue()
+        self._delayed: List = []
+        self._order = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        # Guards _delayed, _pending (queued and not yet sent/failed) and _stats
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._stats = {'queued': 0, 'sent': 0, 'failed': 0, 'retried': 0, 'batches': 0}
+
+    def start(self) -> 'EmailDispatcher':
+        self._stopping.clear()
+        for n in range(len(self._threads), self.workers):
+            thread = threading.Thread(target=self._run, name=f"email-sender-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Send what is queued (within `timeout`), fail the rest, stop the threads and close the pool"""
+        self.flush(timeout)
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        with self._cond:
+            leftover = [job for _, _, job in self._delayed]
+            self._delayed = []
+        while not self._queue.empty():
+            leftover.append(self._queue.get_nowait())
+        for job in leftover:
+            self._fail(job, RuntimeError("dispatcher stopped"))
+        self.pool.close()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message is sent or has failed; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    def submit(self, message: Message) -> Future:
+        """Queue one message; the Future resolves to True (sent) or False (failed)"""
+        job = _Job(message)
+        with self._cond:
+            self._pending += 1
+            self._stats['queued'] += 1
+        self._queue.put(job)
+        return job.future
+
+    async def send_async(self, message: Message) -> bool:
+        return await asyncio.wrap_future(self.submit(message))
+
+    async def send_many_async(self, messages: Iterable[Message]) -> Dict[str, int]:
+        """Queue all of `messages` at once and wait for them; {'sent': n, 'failed': n}"""
+        results = await asyncio.gather(*(asyncio.wrap_future(self.submit(m)) for m in messages))
+        sent = sum(1 for ok in results if ok)
+        return {'sent': sent, 'failed': len(results) - sent}
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(self._stats, pending=self._pending, connects=self.pool.connects)
+
+    # --- Sender threads ---
+
+    def _release_due(self) -> float:
+        """Move retries whose backoff has passed onto the queue; seconds until the next one"""
+        now = time.monotonic()
+        with self._cond:
+            while self._delayed and self._delayed[0][0] <= now:
+                self._queue.put(heapq.heappop(self._delayed)[2])
+            return self._delayed[0][0] - now if self._delayed else 0.5
+
+    def _next_batch(self) -> List[_Job]:
+        wait = min(0.5, self._release_due())
+        try:
+            batch = [self._queue.get(timeout=max(0.01, wait))]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._send_batch(batch)
+
+    def _send_batch(self, batch: List[_Job]) -> None:
+        with self._cond:
+            self._stats['batches'] += 1
+        done = 0
+        connected = False
+        try:
+            with self.pool.session() as session:
+                connected = True
+                for job in batch:
+                    try:
+                        session.smtp.send_message(job.message)
+                    except smtplib.SMTPResponseException as e:
+                        if e.smtp_code == 421:
+                            # The server is closing the session; handled below with the rest of the batch
+                            raise
+                        self._give_up_or_retry(job, e)
+                    except smtplib.SMTPRecipientsRefused as e:
+                        self._fail(job, e)
+                    else:
+                        session.sent += 1
+                        self._succeed(job)
+                    done += 1
+        except Exception as e:
+            unsent = batch[done:]
+            if connected and unsent:
+                # Only the message in flight counts an attempt; the rest go out on a fresh session
+                self._give_up_or_retry(unsent.pop(0), e)
+                for job in unsent:
+                    self._requeue(job) if is_transient(e) else self._fail(job, e)
+            else:
+                for job in unsent:
+                    self._give_up_or_retry(job, e)
+
+    def _requeue(self, job: _Job, delay: float = 0.0) -> None:
+        with self._cond:
+            heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._order), job))
+
+    def _give_up_or_retry(self, job: _Job, error: Exception) -> None:
+        job.attempts += 1
+        if not is_transient(error) or job.attempts > self.max_retries:
+            self._fail(job, error)
+            return
+        delay = self.retry_base * 2 ** (job.attempts - 1) * random.uniform(0.8, 1.2)
+        logger.warning("[EMAIL] retry %s/%s in %.1fs to=%s: %s", job.attempts, self.max_retries, delay,
+                       job.message['To'], error)
+        with self._cond:
+            self._stats['retried'] += 1
+        self._requeue(job, delay)
+
+    def _succeed(self, job: _Job) -> None:
+        self._finish(job, True, 'sent')
+
+    def _fail(self, job: _Job, error: Exception) -> None:
+        logger.error("[EMAIL] failed to=%s after %s attempt(s): %s", job.message['To'], max(1, job.attempts), error)
+        self._finish(job, False, 'failed')
+
+    def _finish(self, job: _Job, ok: bool, outcome: str) -> None:
+        with self._cond:
+            self._stats[outcome] += 1
+            self._pending -= 1
+            self._cond.notify_all()
+        job.future.set_result(ok)
@@ -1,18 +1,24 @@
+import asyncio
+import atexit
 import logging
 import smtplib
-import os
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import datetime
+from email.utils import formatdate
+
+from src.config import (
+    EMAIL_BATCH_SIZE, EMAIL_MAX_RETRIES, EMAIL_RETRY_BASE_SECONDS, SENDER_EMAIL, SENDER_NAME, SENDER_PASSWORD,
+    SMTP_MESSAGES_PER_SESSION, SMTP_POOL_SIZE, SMTP_PORT, SMTP_SECURITY, SMTP_SERVER, SMTP_TIMEOUT_SECONDS,
+)
 
 logger = logging.getLogger(__name__)
 
-# Email configuration
-SMTP_SERVER = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
-SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
-SENDER_EMAIL = os.getenv('SENDER_EMAIL', '')
-SENDER_PASSWORD = os.getenv('SENDER_PASSWORD', '')
-SENDER_NAME = os.getenv('SENDER_NAME', 'Fitness Club')
+# How long the blocking send_email() waits for the dispatcher before reporting failure
+SEND_WAIT_SECONDS = 60
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
 
 # Email templates
 EMAIL_TEMPLATES = {
@@ -140,53 +146,92 @@ Fitness Club Team
     }
 }
 
-def send_email(recipient_email, subject, body, template_vars=None):
-    """Send email using SMTP"""
+def _configured():
+    if not SENDER_EMAIL or (SMTP_SECURITY != 'none' and not SENDER_PASSWORD):
+        logger.warning("Email credentials not configured")
+        return False
+    return True
+
+def build_message(recipient_email, subject, body, template_vars=None):
+    """Plain text + HTML message from SENDER_EMAIL"""
+    # Replace template variables if provided
+    if template_vars:
+        body = body.format(**template_vars)
+    
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    message["From"] = f"{SENDER_NAME} <{SENDER_EMAIL}>"
+    message["To"] = recipient_email
+    message["Date"] = formatdate(localtime=True)
+    message.attach(MIMEText(body, "plain"))
+    message.attach(MIMEText(f"<html><body><pre>{body}</pre></body></html>", "html"))
+    return message
+
+def get_email_dispatcher():
+    """Shared dispatcher, started on first use"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            from src.services.email_dispatcher import EmailDispatcher, SMTPPool
+            pool = SMTPPool(SMTP_SERVER, SMTP_PORT, SMTP_SECURITY, SENDER_EMAIL, SENDER_PASSWORD,
+                            size=SMTP_POOL_SIZE, messages_per_session=SMTP_MESSAGES_PER_SESSION,
+                            timeout=SMTP_TIMEOUT_SECONDS)
+            _dispatcher = EmailDispatcher(pool, workers=SMTP_POOL_SIZE, batch_size=EMAIL_BATCH_SIZE,
+                                          max_retries=EMAIL_MAX_RETRIES,
+                                          retry_base=EMAIL_RETRY_BASE_SECONDS).start()
+            atexit.register(stop_email_dispatcher)
+        return _dispatcher
+
+def stop_email_dispatcher(timeout=10.0):
+    """Send what is queued and close the SMTP sessions (shutdown)"""
+    global _dispatcher
+    with _dispatcher_lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        dispatcher.stop(timeout)
+
+def queue_email(recipient_email, subject, body, template_vars=None):
+    """Queue an email; returns a Future resolving to True/False, or None if it could not be queued"""
     try:
         if not recipient_email or not subject or not body:
             logger.warning("Invalid email parameters")
-            return False
-        
-        if not SENDER_EMAIL or not SENDER_PASSWORD:
-            logger.warning("Email credentials not configured")
-            return False
+            return None
+        if not _configured():
+            return None
         
-        # Replace template variables if provided
-        if template_vars:
-            body = body.format(**template_vars)
-        
-        # Create message
-        message = MIMEMultipart("alternative")
-        message["Subject"] = subject
-        message["From"] = f"{SENDER_NAME} <{SENDER_EMAIL}>"
-        message["To"] = recipient_email
-        message["Date"] = datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000")
-        
-        # Create plain text and HTML versions
-        text_part = MIMEText(body, "plain")
-        html_part = MIMEText(f"<html><body><pre>{body}</pre></body></html>", "html")
-        
-        message.attach(text_part)
-        message.attach(html_part)
-        
-        # Send email
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()  # Secure connection
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            server.sendmail(SENDER_EMAIL, recipient_email, message.as_string())
-        
-        logger.info(f"Email sent to {recipient_email}: {subject}")
-        return True
+        return get_email_dispatcher().submit(build_message(recipient_email, subject, body, template_vars))
         
-    except smtplib.SMTPAuthenticationError:
-        logger.error("Email authentication failed - check credentials")
-        return False
-    except smtplib.SMTPException as e:
-        logger.error(f"SMTP error: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error queueing email: {str(e)}")
+        return None
+
+def send_email(recipient_email, subject, body, template_vars=None):
+    """Send email through the pooled dispatcher and wait for the result (blocking; use send_email_async in handlers)"""
+    future = queue_email(recipient_email, subject, body, template_vars)
+    if future is None:
         return False
+    try:
+        sent = future.result(SEND_WAIT_SECONDS)
     except Exception as e:
         logger.error(f"Error sending email: {str(e)}")
         return False
+    if sent:
+        logger.info("[EMAIL] sent to=%s subject=%s", recipient_email, subject)
+    return sent
+
+async def send_email_async(recipient_email, subject, body, template_vars=None):
+    """Queue an email and await the result without blocking the event loop"""
+    future = queue_email(recipient_email, subject, body, template_vars)
+    if future is None:
+        return False
+    return await asyncio.wrap_future(future)
+
+async def send_bulk_emails_async(recipients, subject, body):
+    """Queue one email per (recipient_email, template_vars) and await them all; {'sent': n, 'failed': n}"""
+    futures = [queue_email(email, subject, body, template_vars) for email, template_vars in recipients]
+    results = await asyncio.gather(*(asyncio.wrap_future(f) for f in futures if f is not None))
+    sent = sum(1 for ok in results if ok)
+    return {'sent': sent, 'failed': len(futures) - sent}
 
 def send_payment_due_email(recipient_email, name, days, expiry_date, amount):
     """Send payment due reminder email"""
@@ -264,17 +309,18 @@ def send_daily_reminder_email(recipient_email, name):
 
 def verify_email_configuration():
     """Verify email service is properly configured"""
-    if not SENDER_EMAIL or not SENDER_PASSWORD:
-        logger.warning("Email service not configured - SENDER_EMAIL or SENDER_PASSWORD missing")
+    if not _configured():
         return False
     
     try:
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
+        with get_email_dispatcher().pool.session() as session:
+            session.smtp.noop()
         
         logger.info("Email service configuration verified")
         return True
+    except smtplib.SMTPAuthenticationError:
+        logger.error("Email authentication failed - check credentials")
+        return False
     except Exception as e:
         logger.error(f"Email configuration verification failed: {str(e)}")
         return False
@@ -21,11 +21,11 @@ import logging
 from typing import Dict, Optional, Tuple
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
-from src.database.user_operations import user_exists as db_user_exists, get_user
-from src.database.subscription_operations import (
-    get_user_subscription, is_subscription_active
+from src.database.user_operations import get_user
+from src.utils.eligibility_snapshot import (
+    get_eligibility, ELIGIBILITY_ACTIVE, ELIGIBILITY_NO_SUBSCRIPTION
 )
-from src.utils.auth import is_admin_id
+from src.utils.auth import is_admin_id, is_staff
 from src.config import USE_LOCAL_DB
 
 logger = logging.getLogger(__name__)
@@ -48,9 +48,10 @@ def get_user_access_state(user_id: int) -> Tuple[str, Optional[Dict]]:
     - (EXPIRED_SUBSCRIBER, user_dict)
     """
     try:
-        # Check if user exists in DB
-        if not db_user_exists(user_id):
-            logger.info(f"[ACCESS] user_state NEW_USER telegram_id={user_id}")
+        # Registration + subscription state come from the eligibility snapshot
+        eligibility = get_eligibility(user_id)
+        if not eligibility:
+            logger.debug("[ACCESS] user_state NEW_USER telegram_id=%s", user_id)
             return STATE_NEW_USER, None
         
         user = get_user(user_id)
@@ -58,30 +59,28 @@ def get_user_access_state(user_id: int) -> Tuple[str, Optional[Dict]]:
         # Admin and Staff bypass - always active
         if is_admin_id(user_id) or is_staff(user_id):
             role = "ADMIN" if is_admin_id(user_id) else "STAFF"
-            logger.info(f"[ACCESS] user_state {role} telegram_id={user_id} (subscription exempt)")
+            logger.debug("[ACCESS] user_state %s telegram_id=%s (subscription exempt)", role, user_id)
             return STATE_ACTIVE_SUBSCRIBER, user
         
         # In local DB mode, skip subscription checks
         if USE_LOCAL_DB:
-            logger.info(f"[ACCESS] user_state LOCAL_DB_MODE telegram_id={user_id} (skipping subscription)")
+            logger.debug("[ACCESS] user_state LOCAL_DB_MODE telegram_id=%s (skipping subscription)", user_id)
             return STATE_ACTIVE_SUBSCRIBER, user
         
         # Check subscription
-        sub = get_user_subscription(user_id)
-        
-        if not sub:
-            logger.info(f"[ACCESS] user_state REGISTERED_NO_SUBSCRIPTION telegram_id={user_id}")
+        if eligibility['state'] == ELIGIBILITY_NO_SUBSCRIPTION:
+            logger.debug("[ACCESS] user_state REGISTERED_NO_SUBSCRIPTION telegram_id=%s", user_id)
             return STATE_REGISTERED_NO_SUBSCRIPTION, user
         
-        if is_subscription_active(user_id):
-            logger.info(f"[ACCESS] user_state ACTIVE_SUBSCRIBER telegram_id={user_id}")
+        if eligibility['state'] == ELIGIBILITY_ACTIVE:
+            logger.debug("[ACCESS] user_state ACTIVE_SUBSCRIBER telegram_id=%s", user_id)
             return STATE_ACTIVE_SUBSCRIBER, user
         else:
-            logger.info(f"[ACCESS] user_state EXPIRED_SUBSCRIBER telegram_id={user_id}")
+            logger.debug("[ACCESS] user_state EXPIRED_SUBSCRIBER telegram_id=%s", user_id)
             return STATE_EXPIRED_SUBSCRIBER, user
     
     except Exception as e:
-        logger.error(f"[ACCESS] error_getting_state telegram_id={user_id}: {e}")
+        logger.error("[ACCESS] error_getting_state telegram_id=%s: %s", user_id, e)
         # Default: deny access
         return STATE_NEW_USER, None
 
@@ -114,7 +113,7 @@ async def check_access_gate(
     
     # NEW USER - Redirect to registration
     if state == STATE_NEW_USER:
-        logger.warning(f"[ACCESS] blocked NEW_USER telegram_id={user_id}")
+        logger.warning("[ACCESS] blocked NEW_USER telegram_id=%s", user_id)
         
         if query:
             await query.answer("❌ You must register first.", show_alert=True)
@@ -128,7 +127,7 @@ async def check_access_gate(
     
     # REGISTERED NO SUBSCRIPTION - Show subscription option only
     if state == STATE_REGISTERED_NO_SUBSCRIPTION:
-        logger.warning(f"[ACCESS] blocked REGISTERED_NO_SUBSCRIPTION telegram_id={user_id}")
+        logger.warning("[ACCESS] blocked REGISTERED_NO_SUBSCRIPTION telegram_id=%s", user_id)
         
         if query:
             await query.answer(
@@ -154,7 +153,7 @@ async def check_access_gate(
     
     # EXPIRED SUBSCRIPTION - Show renewal option
     if state == STATE_EXPIRED_SUBSCRIBER:
-        logger.warning(f"[ACCESS] blocked EXPIRED_SUBSCRIBER telegram_id={user_id}")
+        logger.warning("[ACCESS] blocked EXPIRED_SUBSCRIBER telegram_id=%s", user_id)
         
         if query:
             await query.answer("⏰ Your subscription has expired. Please renew to continue.", show_alert=True)
@@ -179,11 +178,11 @@ async def check_access_gate(
     
     # ACTIVE SUBSCRIBER - Allow access
     if state == STATE_ACTIVE_SUBSCRIBER:
-        logger.info(f"[ACCESS] granted telegram_id={user_id} subscription_active=true")
+        logger.debug("[ACCESS] granted telegram_id=%s subscription_active=true", user_id)
         return True
     
     # Unknown state - deny
-    logger.error(f"[ACCESS] unknown_state telegram_id={user_id} state={state}")
+    logger.error("[ACCESS] unknown_state telegram_id=%s state=%s", user_id, state)
     if query:
         await query.answer("❌ Access denied. Please try again.", show_alert=True)
     else:
@@ -213,7 +212,7 @@ async def enforce_registration_only(
     
     # NEW USER - Redirect to registration
     if state == STATE_NEW_USER:
-        logger.warning(f"[ACCESS] blocked_unregistered_user telegram_id={user_id}")
+        logger.warning("[ACCESS] blocked_unregistered_user telegram_id=%s", user_id)
         
         if query:
             await query.answer("❌ You must register first.", show_alert=True)
@@ -226,7 +225,7 @@ async def enforce_registration_only(
         return False
     
     # All other states (registered or better) are allowed
-    logger.info(f"[ACCESS] granted_registered_user telegram_id={user_id} state={state}")
+    logger.debug("[ACCESS] granted_registered_user telegram_id=%s state=%s", user_id, state)
     return True
 
 
@@ -257,7 +256,7 @@ def log_access_attempt(user_id: int, action: str, result: bool) -> None:
     """Log access attempt"""
     status = "✅ GRANTED" if result else "❌ BLOCKED"
     state, _ = get_user_access_state(user_id)
-    logger.info(f"[ACCESS] {status} action={action} user_id={user_id} state={state}")
+    logger.info("[ACCESS] %s action=%s user_id=%s state=%s", status, action, user_id, state)
 
 
 # ============================================================================
@@ -1,28 +1,31 @@
 """
 Admin notifications for QR attendance
 Queues real-time notifications to all admin members
+
+The web workers may run in other processes, so notifications are pushed
+onto the shared event queue (src.web.shared_state). The bot's
+`drain_admin_notifications` job claims them and hands them to the
+per-admin digest aggregator (src.utils.notification_digest); an event is
+acked only after it has been sent to every admin.
 """
 
+import asyncio
+import html
 import logging
-from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-# Store reference to Telegram Application (set by bot.py)
-_telegram_app = None
-
-
-def set_telegram_app(app):
-    """Set the Telegram Application reference (called from bot.py)"""
-    global _telegram_app
-    _telegram_app = app
-    logger.info("Telegram app reference set for admin notifications")
+NOTIFICATION_TYPES = ('attendance_marked', 'admin_override')
+DRAIN_BATCH_SIZE = 100
+CLAIM_LEASE_SECONDS = 600  # an unacked event is handed out again after this
+DELIVERY_MAX_ATTEMPTS = 5  # sends per admin before an event is dropped
 
 
 def queue_admin_notification(notification_type: str, **kwargs):
     """
     Queue async notification to all admin members
-    
+
     Args:
         notification_type: Type of notification ('attendance_marked', etc)
         **kwargs: Notification-specific parameters
@@ -31,132 +34,174 @@ def queue_admin_notification(notification_type: str, **kwargs):
             - timestamp: ISO format timestamp
             - reason: Optional failure reason (for overrides)
     """
-    if not _telegram_app:
-        logger.warning("Telegram app not set, cannot send admin notifications")
+    if notification_type not in NOTIFICATION_TYPES:
+        logger.warning(f"Unknown notification type: {notification_type}")
         return
-    
+
     try:
-        if notification_type == 'attendance_marked':
-            _queue_attendance_notification(**kwargs)
-        elif notification_type == 'admin_override':
-            _queue_override_notification(**kwargs)
-        else:
-            logger.warning(f"Unknown notification type: {notification_type}")
-            
+        from src.web.shared_state import get_event_queue
+        get_event_queue().push(notification_type, kwargs)
+        logger.debug(f"Queued {notification_type} notification for user {kwargs.get('user_id')}")
     except Exception as e:
         logger.error(f"Error queuing admin notification: {e}")
         # Never fail the main request due to notification error
 
 
-def _queue_attendance_notification(user_id: int, distance_m: float, timestamp: str, **kwargs):
-    """Queue attendance notification to admins"""
-    try:
-        from src.database.admin_operations import get_all_admin_ids
-        from src.database.user_operations import get_user
-        
-        # Get user and admin info
-        user = get_user(user_id)
-        admins = get_all_admin_ids()
-        
-        if not user or not admins:
-            logger.debug("No user or admins found for notification")
-            return
-        
-        user_name = user.get('first_name', 'Unknown')
-        
-        # Format notification message
-        message = (
-            f"✅ <b>Attendance Marked</b>\n\n"
-            f"👤 User: {user_name}\n"
-            f"📍 Distance: {distance_m:.1f}m from gym\n"
-            f"⏰ Time: {timestamp}\n\n"
-            f"<i>QR-based attendance via geofence</i>"
-        )
-        
-        # Send to each admin asynchronously
-        for admin_id in admins:
-            try:
-                _telegram_app.job_queue.run_once(
-                    _send_notification_to_admin,
-                    when=0,
-                    context={'admin_id': admin_id, 'message': message, 'user_id': user_id}
-                )
-                logger.debug(f"Queued attendance notification for admin {admin_id}")
-            except Exception as e:
-                logger.error(f"Error queuing notification to admin {admin_id}: {e}")
-                # Continue with other admins
-        
-    except Exception as e:
-        logger.error(f"Error in _queue_attendance_notification: {e}")
+def _plain_name(user: dict, default: str) -> str:
+    return user.get('full_name') or user.get('first_name') or default
 
 
-def _queue_override_notification(user_id: int, admin_id: int, reason: str, **kwargs):
-    """Queue admin override notification to other admins"""
-    try:
-        from src.database.user_operations import get_user
-        from src.database.admin_operations import get_all_admin_ids
-        
-        # Get user info
-        user = get_user(user_id)
-        if not user:
+def _display_name(user: dict, default: str) -> str:
+    return html.escape(_plain_name(user, default))
+
+
+def _build_attendance_notification(user_id: int, distance_m: float, timestamp: str,
+                                   attendance_id: int = None, **kwargs) -> Tuple[Optional[Dict], List[int]]:
+    """Attendance digest entry and the admins to send it to"""
+    from src.database.user_operations import get_user
+    from src.utils.role_notifications import get_moderator_chat_ids
+
+    user = get_user(user_id)
+    admins = get_moderator_chat_ids(include_staff=False)
+    if not user or not admins:
+        logger.debug("No user or admins found for notification")
+        return None, []
+
+    name = _display_name(user, 'Unknown')
+    message = (
+        f"✅ <b>Attendance Marked</b>\n\n"
+        f"👤 User: {name}\n"
+        f"📍 Distance: {float(distance_m):.1f}m from gym\n"
+        f"⏰ Time: {timestamp}\n\n"
+        f"<i>QR-based attendance via geofence</i>"
+    )
+    return {
+        'message': message,
+        'line': f"✅ {name} checked in ({float(distance_m):.0f}m) at {str(timestamp)[11:16]}",
+        'name': _plain_name(user, 'Unknown'),  # button label, not parsed as HTML
+        'user_id': user_id,
+        'attendance_id': attendance_id,
+    }, admins
+
+
+def _build_override_notification(user_id: int, admin_id: int, reason: str, **kwargs) -> Tuple[Optional[Dict], List[int]]:
+    """Override digest entry and the other admins to send it to"""
+    from src.database.user_operations import get_user
+    from src.utils.role_notifications import get_moderator_chat_ids
+
+    user = get_user(user_id)
+    if not user:
+        return None, []
+    admin = get_user(admin_id) or {}
+
+    name = _display_name(user, 'Unknown')
+    admin_name = _display_name(admin, str(admin_id))
+    reason = html.escape(str(reason))
+    message = (
+        f"🔓 <b>Attendance Override</b>\n\n"
+        f"👤 Member: {name}\n"
+        f"👨‍💼 Override by: {admin_name}\n"
+        f"📝 Reason: {reason}\n\n"
+        f"<i>Manual override via /override_attendance</i>"
+    )
+    # Send to all admins except the one who did the override
+    admins = [other for other in get_moderator_chat_ids(include_staff=False) if other != admin_id]
+    return {
+        'message': message,
+        'line': f"🔓 {name} overridden by {admin_name}: {reason}",
+        'name': _plain_name(user, 'Unknown'),
+        'user_id': user_id,
+    }, admins
+
+
+def _build_notification(kind: str, payload: dict) -> Tuple[Optional[Dict], List[int]]:
+    if kind == 'attendance_marked':
+        return _build_attendance_notification(**payload)
+    return _build_override_notification(**payload)
+
+
+class _Delivery:
+    """
+    Receipt for one queued event, called by send_admin_digest after each send.
+
+    Once every recipient has been tried the event is acked; admins whose send
+    failed get a fresh copy of the event addressed only to them.
+    """
+
+    def __init__(self, queue, event: dict, payload: dict, recipients: List[int], attempts: int):
+        self.queue = queue
+        self.event = event
+        self.payload = payload
+        self.pending = set(recipients)
+        self.failed = []
+        self.attempts = attempts
+
+    def __call__(self, admin_id: int, delivered: bool):
+        if admin_id not in self.pending:
             return
-        
-        user_name = user.get('first_name', 'Unknown')
-        admin_name = user.get('first_name', 'Admin')  # TODO: Get admin name from admin_id
-        
-        message = (
-            f"🔓 <b>Attendance Override</b>\n\n"
-            f"👤 Member: {user_name}\n"
-            f"👨‍💼 Override by: {admin_name}\n"
-            f"📝 Reason: {reason}\n\n"
-            f"<i>Manual override via /override_attendance</i>"
-        )
-        
-        # Send to all admins except the one who did the override
-        admins = get_all_admin_ids()
-        for other_admin_id in admins:
-            if other_admin_id != admin_id:
-                try:
-                    _telegram_app.job_queue.run_once(
-                        _send_notification_to_admin,
-                        when=0,
-                        context={'admin_id': other_admin_id, 'message': message, 'user_id': user_id}
-                    )
-                except Exception as e:
-                    logger.error(f"Error queuing override notification to admin {other_admin_id}: {e}")
-        
-    except Exception as e:
-        logger.error(f"Error in _queue_override_notification: {e}")
+        self.pending.discard(admin_id)
+        if not delivered:
+            self.failed.append(admin_id)
+        if self.pending:
+            return
+        try:
+            if self.failed and self.attempts + 1 < DELIVERY_MAX_ATTEMPTS:
+                retry = dict(self.payload, only_admins=self.failed, attempts=self.attempts + 1)
+                self.queue.push(self.event['kind'], retry)
+            elif self.failed:
+                logger.error(f"[NOTIFY] Giving up on {self.event['kind']} for admins {self.failed} "
+                             f"after {DELIVERY_MAX_ATTEMPTS} attempts")
+            self.queue.ack([self.event['id']])
+        except Exception as e:
+            # Left claimed; it is delivered again once the lease runs out
+            logger.error(f"Error acknowledging admin notification {self.event['id']}: {e}")
+
 
+async def drain_admin_notifications(context) -> int:
+    """
+    Job callback: route queued notifications from the web workers; returns messages sent now
+
+    Events are claimed rather than removed and only acked once every recipient
+    has been sent it (instantly or in a digest), so a failed send or a crash
+    before the digest flush means the event is delivered again, not lost.
+    """
+    from src.config import ADMIN_DIGEST_WINDOW_SECONDS
+    from src.web.shared_state import get_event_queue
+    from src.database.notification_preferences import get_admin_notification_prefs
+    from src.utils.notification_digest import deliver_admin_event, notified_admins
 
-async def _send_notification_to_admin(context):
-    """Send notification message to admin (async callback)"""
+    # Must outlast the digest window, or buffered events would be claimed twice
+    lease = max(CLAIM_LEASE_SECONDS, 10 * ADMIN_DIGEST_WINDOW_SECONDS)
+    queue = get_event_queue()
     try:
-        admin_id = context.job.context['admin_id']
-        message = context.job.context['message']
-        user_id = context.job.context['user_id']
-        
-        # Send message with optional override button
-        keyboard = []
-        if context.job.context.get('show_override'):
-            keyboard = [[
-                {'text': '🔓 Override', 'callback_data': f'override_attend:{user_id}'}
-            ]]
-        
-        from telegram import InlineKeyboardMarkup
-        
-        reply_markup = None
-        if keyboard:
-            reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await context.bot.send_message(
-            chat_id=admin_id,
-            text=message,
-            parse_mode='HTML',
-            reply_markup=reply_markup
-        )
-        
-        logger.debug(f"Notification sent to admin {admin_id}")
-        
+        events = await asyncio.to_thread(queue.claim_batch, DRAIN_BATCH_SIZE, lease)
     except Exception as e:
-        logger.error(f"Error sending notification to admin: {e}")
+        logger.error(f"Error reading admin notification queue: {e}")
+        return 0
+    if not events:
+        return 0
+
+    prefs = await asyncio.to_thread(get_admin_notification_prefs)
+    sent = 0
+    done = []
+    for event in events:
+        payload = dict(event['payload'])
+        only_admins = payload.pop('only_admins', None)
+        attempts = payload.pop('attempts', 0)
+        try:
+            entry, admins = await asyncio.to_thread(_build_notification, event['kind'], payload)
+        except Exception as e:
+            # Left claimed, so it is retried after the lease
+            logger.error(f"Error building {event['kind']} notification: {e}")
+            continue
+        if only_admins is not None:
+            admins = [admin_id for admin_id in admins if admin_id in only_admins]
+        recipients = notified_admins(admins, prefs) if entry else []
+        if not recipients:
+            done.append(event['id'])
+            continue
+        entry['receipt'] = _Delivery(queue, event, payload, recipients, attempts)
+        sent += await deliver_admin_event(context.bot, entry, recipients, prefs)
+    if done:
+        await asyncio.to_thread(queue.ack, done)
+    return sent
@@ -4,7 +4,6 @@ Enforces grace period rules (3 days max, 3 attendances max if unpaid)
 """
 
 import logging
-from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +11,7 @@ logger = logging.getLogger(__name__)
 def check_attendance_eligibility(user_id: int) -> dict:
     """
     Check if user is eligible to mark attendance
-    Reuses existing subscription_operations functions
+    Answers from the eligibility snapshot (src.utils.eligibility_snapshot)
     
     Args:
         user_id: Telegram user ID
@@ -26,12 +25,13 @@ def check_attendance_eligibility(user_id: int) -> dict:
         }
     """
     try:
-        from src.database.subscription_operations import is_subscription_active, is_in_grace_period
-        from src.database.user_operations import get_user
+        from src.utils.eligibility_snapshot import (
+            get_eligibility, ELIGIBILITY_ACTIVE, ELIGIBILITY_GRACE
+        )
         
-        # Get user data
-        user = get_user(user_id)
-        if not user:
+        # Served from the in-memory snapshot (no DB read on the hot path)
+        eligibility = get_eligibility(user_id)
+        if not eligibility:
             logger.warning(f"User not found: {user_id}")
             return {
                 'eligible': False,
@@ -41,7 +41,7 @@ def check_attendance_eligibility(user_id: int) -> dict:
             }
         
         # Check subscription status
-        if is_subscription_active(user_id):
+        if eligibility['state'] == ELIGIBILITY_ACTIVE:
             logger.debug(f"User {user_id} has active subscription")
             return {
                 'eligible': True,
@@ -51,34 +51,9 @@ def check_attendance_eligibility(user_id: int) -> dict:
             }
         
         # Check if in grace period
-        if is_in_grace_period(user_id):
-            logger.debug(f"User {user_id} is in grace period")
-            
-            # Get subscription to check grace period end date
-            from src.database.subscription_operations import get_user_subscription
-            sub = get_user_subscription(user_id)
-            
-            if sub and sub.get('grace_period_end'):
-                grace_period_end = sub['grace_period_end']
-                days_left = max(0, (grace_period_end - datetime.now()).days + 1)
-            else:
-                days_left = 3  # Default 3 days
-            
-            # Count attendances in grace period (last 7 days)
-            # CRITICAL: Use queue_date not request_date, count only approved attendances
-            from src.database.connection import execute_query
-            grace_count = execute_query(
-                """
-                SELECT COUNT(*) as count FROM attendance_queue
-                WHERE user_id = %s 
-                AND queue_date >= CURRENT_DATE - INTERVAL '7 days'
-                AND status = 'approved'
-                """,
-                (user_id,),
-                fetch_one=True
-            )
-            attendance_count = grace_count.get('count', 0) if grace_count else 0
-            attempts_left = max(0, 3 - attendance_count)
+        if eligibility['state'] == ELIGIBILITY_GRACE:
+            days_left = eligibility['grace_days_left']
+            attempts_left = eligibility['grace_attempts_left']
             
             # FAIL SAFE: Return min(days_left, attempts_left) to enforce both constraints
             effective_grace_left = min(days_left, attempts_left) if attempts_left > 0 else 0
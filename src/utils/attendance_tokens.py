@@ -1,68 +1,100 @@
 """
 Thread-safe single-use token management for QR attendance
 Prevents replay attacks using atomic check-and-delete pattern
+
+Two backends, picked by ATTENDANCE_TOKEN_BACKEND:
+- 'memory': lock-striped shards, each with an expiry min-heap, so cleanup
+  only pops tokens that have actually expired (amortised O(1) per token)
+  and requests on different shards never wait on each other
+- 'sqlite': tokens live in ATTENDANCE_TOKEN_DB, survive a restart and are
+  shared by every web worker process; consume is a single DELETE ... RETURNING
 """
 
+import heapq
+import sqlite3
 import threading
+from pathlib import Path
 import secrets
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+TOKEN_TTL_SECONDS = 120
+SQLITE_CLEANUP_INTERVAL_SECONDS = 30
+
+
+class _TokenShard:
+    """One stripe of the in-memory store (tokens + expiry heap + lock)"""
+
+    __slots__ = ('tokens', 'expiry_heap', 'lock')
+
+    def __init__(self):
+        self.tokens = {}  # {token_string: {'user_id': int, 'expires_at': float}}
+        self.expiry_heap = []  # [(expires_at, token_string)]
+        self.lock = threading.Lock()
+
 
 class TokenStore:
     """Thread-safe in-memory token storage with atomic operations"""
-    
-    def __init__(self):
-        """Initialize token store with lock"""
-        self._tokens = {}  # {token_string: {'user_id': int, 'expires_at': float}}
-        self._lock = threading.Lock()  # Protects all token access
-        logger.info("TokenStore initialized with threading.Lock protection")
-    
-    def generate_token(self, user_id: int, ttl_seconds: int = 120) -> str:
+
+    def __init__(self, shard_count: int = 16):
+        """Initialize token store with one lock per shard"""
+        self._shards = [_TokenShard() for _ in range(max(1, shard_count))]
+        logger.info(f"TokenStore initialized with {len(self._shards)} lock-striped shards")
+
+    def _shard_for(self, token: str) -> _TokenShard:
+        # Tokens are random hex, so their prefix spreads evenly across shards
+        try:
+            index = int(token[:8], 16)
+        except (TypeError, ValueError):
+            index = hash(token)
+        return self._shards[index % len(self._shards)]
+
+    def generate_token(self, user_id: int, ttl_seconds: int = TOKEN_TTL_SECONDS) -> str:
         """
         Generate single-use attendance token
-        
+
         Args:
             user_id: Telegram user ID
             ttl_seconds: Token lifetime in seconds (default 120)
-        
+
         Returns:
             Random 32-character hex token string
         """
         try:
-            with self._lock:  # ACQUIRE LOCK
-                # Cleanup expired tokens before generating new one
-                self._cleanup_expired_tokens()
-                
-                # Generate random hex token
-                token = secrets.token_hex(16)  # 32 characters
-                expires_at = time.time() + ttl_seconds
-                
+            # Generate random hex token
+            token = secrets.token_hex(16)  # 32 characters
+            expires_at = time.time() + ttl_seconds
+            shard = self._shard_for(token)
+
+            with shard.lock:  # ACQUIRE SHARD LOCK
+                self._cleanup_expired_tokens(shard)
+
                 # Store token with expiry
-                self._tokens[token] = {
+                shard.tokens[token] = {
                     'user_id': user_id,
                     'expires_at': expires_at
                 }
-                
+                heapq.heappush(shard.expiry_heap, (expires_at, token))
+
                 logger.debug(f"Token generated for user {user_id}: TTL {ttl_seconds}s")
                 return token
             # RELEASE LOCK
         except Exception as e:
             logger.error(f"Error generating token: {e}")
             raise
-    
+
     def validate_and_consume_token(self, token: str) -> tuple[bool, int | str]:
         """
         Atomically validate and consume token (check-and-delete pattern)
-        
+
         Prevents replay attacks by deleting token immediately after first validation.
         This operation is atomic - no race conditions possible.
-        
+
         Args:
             token: Token string to validate
-        
+
         Returns:
             tuple[bool, int | str]: (is_valid, user_id_or_reason)
             - (True, user_id) if valid
@@ -70,68 +102,163 @@ class TokenStore:
             - (False, 'TOKEN_EXPIRED') if expired
         """
         try:
-            with self._lock:  # ACQUIRE LOCK - blocks until available
-                # Step 1: Cleanup expired tokens (lazy cleanup)
-                self._cleanup_expired_tokens()
-                
-                # Step 2: Check if token exists
-                if token not in self._tokens:
-                    logger.debug(f"Token validation failed: TOKEN_NOT_FOUND")
+            shard = self._shard_for(token)
+            with shard.lock:  # ACQUIRE SHARD LOCK - only this stripe blocks
+                # Atomic check-and-delete; the heap entry goes stale and is skipped later
+                token_data = shard.tokens.pop(token, None)
+                if token_data is None:
+                    logger.debug("Token validation failed: TOKEN_NOT_FOUND")
                     return False, 'TOKEN_NOT_FOUND'
-                
-                # Step 3: Check if expired
-                token_data = self._tokens[token]
-                current_time = time.time()
-                
-                if current_time > token_data['expires_at']:
-                    user_id = token_data['user_id']
-                    del self._tokens[token]  # Delete expired token
+
+                user_id = token_data['user_id']
+                if time.time() > token_data['expires_at']:
                     logger.debug(f"Token validation failed for user {user_id}: TOKEN_EXPIRED")
                     return False, 'TOKEN_EXPIRED'
-                
-                # Step 4: Token is valid - consume it immediately (atomic delete)
-                user_id = token_data['user_id']
-                del self._tokens[token]  # ATOMIC: Delete inside lock
-                
+
                 logger.info(f"Token validated and consumed for user {user_id}")
                 return True, user_id
             # RELEASE LOCK - race condition impossible
         except Exception as e:
             logger.error(f"Error validating token: {e}")
             return False, 'SERVER_ERROR'
-    
-    def _cleanup_expired_tokens(self) -> int:
+
+    def _cleanup_expired_tokens(self, shard: _TokenShard) -> int:
         """
-        Remove expired tokens (called inside lock only)
-        Lazy cleanup: only runs when generate or validate is called
-        
+        Remove expired tokens from one shard (called inside its lock only)
+        Pops the expiry heap only while its head has expired, so each token
+        is cleaned up once instead of rescanning the whole store
+
         Returns:
             Number of tokens cleaned up
         """
         current_time = time.time()
-        expired_tokens = [
-            token for token, data in self._tokens.items()
-            if current_time > data['expires_at']
-        ]
-        
-        for token in expired_tokens:
-            del self._tokens[token]
-        
-        if expired_tokens:
-            logger.debug(f"Cleaned up {len(expired_tokens)} expired tokens")
-        
-        return len(expired_tokens)
-    
+        heap = shard.expiry_heap
+        removed = 0
+        while heap and heap[0][0] < current_time:
+            expires_at, token = heapq.heappop(heap)
+            data = shard.tokens.get(token)
+            # Skip heap entries for tokens already consumed
+            if data is not None and data['expires_at'] == expires_at:
+                del shard.tokens[token]
+                removed += 1
+
+        if removed:
+            logger.debug(f"Cleaned up {removed} expired tokens")
+
+        return removed
+
     def get_active_token_count(self) -> int:
         """Get count of active (non-expired) tokens (for monitoring)"""
         try:
-            with self._lock:
-                self._cleanup_expired_tokens()
-                return len(self._tokens)
+            total = 0
+            for shard in self._shards:
+                with shard.lock:
+                    self._cleanup_expired_tokens(shard)
+                    total += len(shard.tokens)
+            return total
         except Exception as e:
             logger.error(f"Error getting token count: {e}")
             return -1
 
 
+class SQLiteTokenStore:
+    """Token storage in a SQLite file, shared by every process that opens it"""
+
+    def __init__(self, db_path: str):
+        self._db_path = str(db_path)
+        self._local = threading.local()  # one connection per waitress thread
+        self._next_cleanup = 0.0
+        Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS attendance_tokens (
+                    token TEXT PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_attendance_tokens_expiry ON attendance_tokens (expires_at)")
+        logger.info(f"SQLiteTokenStore initialized at {self._db_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _maybe_cleanup(self, conn: sqlite3.Connection) -> None:
+        # Indexed range delete at most every SQLITE_CLEANUP_INTERVAL_SECONDS per process
+        now = time.time()
+        if now < self._next_cleanup:
+            return
+        self._next_cleanup = now + SQLITE_CLEANUP_INTERVAL_SECONDS
+        removed = conn.execute("DELETE FROM attendance_tokens WHERE expires_at < ?", (now,)).rowcount
+        if removed:
+            logger.debug(f"Cleaned up {removed} expired tokens")
+
+    def generate_token(self, user_id: int, ttl_seconds: int = TOKEN_TTL_SECONDS) -> str:
+        """Generate single-use attendance token (see TokenStore.generate_token)"""
+        try:
+            conn = self._connect()
+            self._maybe_cleanup(conn)
+            token = secrets.token_hex(16)
+            conn.execute(
+                "INSERT INTO attendance_tokens (token, user_id, expires_at) VALUES (?, ?, ?)",
+                (token, user_id, time.time() + ttl_seconds)
+            )
+            logger.debug(f"Token generated for user {user_id}: TTL {ttl_seconds}s")
+            return token
+        except Exception as e:
+            logger.error(f"Error generating token: {e}")
+            raise
+
+    def validate_and_consume_token(self, token: str) -> tuple[bool, int | str]:
+        """Atomically validate and consume token (see TokenStore.validate_and_consume_token)"""
+        try:
+            conn = self._connect()
+            # Single statement, so two workers can never both consume the same token
+            row = conn.execute(
+                "DELETE FROM attendance_tokens WHERE token = ? RETURNING user_id, expires_at",
+                (token,)
+            ).fetchone()
+            if row is None:
+                logger.debug("Token validation failed: TOKEN_NOT_FOUND")
+                return False, 'TOKEN_NOT_FOUND'
+
+            user_id, expires_at = row
+            if time.time() > expires_at:
+                logger.debug(f"Token validation failed for user {user_id}: TOKEN_EXPIRED")
+                return False, 'TOKEN_EXPIRED'
+
+            logger.info(f"Token validated and consumed for user {user_id}")
+            return True, user_id
+        except Exception as e:
+            logger.error(f"Error validating token: {e}")
+            return False, 'SERVER_ERROR'
+
+    def get_active_token_count(self) -> int:
+        """Get count of active (non-expired) tokens (for monitoring)"""
+        try:
+            row = self._connect().execute(
+                "SELECT COUNT(*) FROM attendance_tokens WHERE expires_at >= ?", (time.time(),)
+            ).fetchone()
+            return row[0]
+        except Exception as e:
+            logger.error(f"Error getting token count: {e}")
+            return -1
+
+
+def create_token_store():
+    """Build the store selected by ATTENDANCE_TOKEN_BACKEND"""
+    from src.config import ATTENDANCE_TOKEN_BACKEND, ATTENDANCE_TOKEN_DB, ATTENDANCE_TOKEN_SHARDS
+
+    if ATTENDANCE_TOKEN_BACKEND == 'sqlite':
+        return SQLiteTokenStore(ATTENDANCE_TOKEN_DB)
+    return TokenStore(shard_count=ATTENDANCE_TOKEN_SHARDS)
+
+
 # Module-level singleton instance (shared across all Flask requests)
-token_store = TokenStore()
+token_store = create_token_store()
@@ -0,0 +1,177 @@
+"""
+Table-driven routing for inline-button callbacks.
+
+Routes are registered declaratively and the whole table is mounted as one
+PTB CallbackQueryHandler:
+
+    router = CallbackRouter()
+    router.add(cmd_notifications, exact='cmd_notifications')
+    router.add('src.handlers.reminder_settings_handlers:callback_quick_water_interval',
+               prefix='quick_water_interval_')
+    router.mount(application)
+
+Lookup is a dict hit for exact callback_data, otherwise the longest
+registered prefix found by walking a character trie. callback_data is
+capped at 64 bytes by Telegram, so dispatch cost does not grow with the
+number of buttons. Exact routes always win over prefixes
+(`quick_water_interval_custom` vs `quick_water_interval_`).
+
+The handler only claims callback_data that has a route; anything else
+falls through to handlers registered after it. Each dispatch is timed as
+the `cb:<route key>` handler series (src.utils.metrics).
+
+A handler may be a coroutine function or a "module:attr" string that is
+imported on first dispatch. `answer=True` answers the query before the
+handler runs; `guard` is an async (update, context) -> bool check (e.g.
+verify_admin_access) that must pass first.
+"""
+
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, Optional, Union
+
+from telegram import Update
+from telegram.ext import ApplicationHandlerStop, CallbackQueryHandler, ContextTypes
+
+from src.utils.lazy_handlers import load_target
+from src.utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable]
+Guard = Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[bool]]
+
+
+class Route:
+    __slots__ = ('key', 'target', 'answer', 'guard', 'prefix', '_handler')
+
+    def __init__(self, key: str, target: Union[Handler, str], answer: bool, guard: Optional[Guard],
+                 prefix: bool = False):
+        self.key = key
+        self.target = target
+        self.answer = answer
+        self.guard = guard
+        self.prefix = prefix
+        self._handler = None if isinstance(target, str) else target
+
+    @property
+    def handler(self) -> Handler:
+        if self._handler is None:
+            self._handler = load_target(self.target)
+        return self._handler
+
+    @property
+    def name(self) -> str:
+        if isinstance(self.target, str):
+            return self.target
+        return getattr(self.target, '__name__', repr(self.target))
+
+
+class _TrieNode:
+    __slots__ = ('children', 'route')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.route: Optional[Route] = None
+
+
+def _keys(value: Union[str, Iterable[str], None]):
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(value)
+
+
+class CallbackRouter:
+    """Exact-match dict plus longest-prefix trie over callback_data"""
+
+    def __init__(self, answer: bool = False):
+        self.answer = answer
+        self._exact: Dict[str, Route] = {}
+        self._root = _TrieNode()
+        self._prefix_count = 0
+
+    def __len__(self) -> int:
+        return len(self._exact) + self._prefix_count
+
+    def add(self, handler: Union[Handler, str], *, exact=None, prefix=None,
+            answer: Optional[bool] = None, guard: Optional[Guard] = None) -> None:
+        """Route one or more exact values and/or prefixes to `handler`; duplicates raise ValueError"""
+        answer = self.answer if answer is None else answer
+        exact_keys, prefix_keys = _keys(exact), _keys(prefix)
+        if not exact_keys and not prefix_keys:
+            raise ValueError("route needs at least one exact value or prefix")
+        for key in exact_keys:
+            if key in self._exact:
+                raise ValueError(f"duplicate callback route {key!r}")
+            self._exact[key] = Route(key, handler, answer, guard)
+        for key in prefix_keys:
+            if not key:
+                raise ValueError("empty callback prefix")
+            node = self._root
+            for char in key:
+                node = node.children.setdefault(char, _TrieNode())
+            if node.route is not None:
+                raise ValueError(f"duplicate callback prefix {key!r}")
+            node.route = Route(key, handler, answer, guard, prefix=True)
+            self._prefix_count += 1
+
+    def route(self, *, exact=None, prefix=None, answer: Optional[bool] = None, guard: Optional[Guard] = None):
+        """Decorator form of `add`"""
+        def decorator(handler):
+            self.add(handler, exact=exact, prefix=prefix, answer=answer, guard=guard)
+            return handler
+        return decorator
+
+    def resolve(self, data: Optional[str]) -> Optional[Route]:
+        if not data:
+            return None
+        route = self._exact.get(data)
+        if route is not None:
+            return route
+        node, best = self._root, None
+        for char in data:
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.route is not None:
+                best = node.route
+        return best
+
+    def routes(self) -> Iterator[Route]:
+        """Every registered route: exact values first, then prefixes"""
+        yield from self._exact.values()
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.route is not None:
+                yield node.route
+            stack.extend(node.children.values())
+
+    def matches(self, data) -> bool:
+        """CallbackQueryHandler pattern: claim only routed callback_data"""
+        return isinstance(data, str) and self.resolve(data) is not None
+
+    async def dispatch(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        query = update.callback_query
+        route = self.resolve(query.data)
+        if route is None:
+            return None
+        logger.info(f"[CALLBACK] {query.data} -> {route.name} user={query.from_user.id}")
+        with timed('handler', f'cb:{route.key}', (ApplicationHandlerStop,)):
+            if route.answer:
+                try:
+                    await query.answer()
+                except Exception as e:
+                    # Old/expired queries cannot be answered; still handle the press
+                    logger.debug(f"[CALLBACK] could not answer {query.data}: {e}")
+            if route.guard is not None and not await route.guard(update, context):
+                return None
+            return await route.handler(update, context)
+
+    def handler(self) -> CallbackQueryHandler:
+        return CallbackQueryHandler(self.dispatch, pattern=self.matches)
+
+    def mount(self, application, group: int = 0) -> None:
+        application.add_handler(self.handler(), group=group)
+        logger.info(f"[CALLBACK] router mounted routes={len(self)}")
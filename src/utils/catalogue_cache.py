@@ -0,0 +1,119 @@
+"""
+Pre-rendered storefront catalogue pages.
+
+The storefront (subscription plans, PT plans, events, store categories and
+category product lists) changes rarely but is rendered on every tap. This
+module keeps the final message text and InlineKeyboardMarkup per
+(section, key, page) so repeat browsing is a dict lookup.
+
+Entries are dropped when:
+- an admin edit calls `invalidate_catalogue(section)`
+- the `version` object passed by the caller changes (store pages pass the
+  product search index, which is swapped on every catalogue write)
+- they are older than CATALOGUE_TTL_SECONDS (safety net for edits made
+  outside the bot, and for date-bound lists such as upcoming events)
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+logger = logging.getLogger(__name__)
+
+SECTION_SUBSCRIPTIONS = 'subs'
+SECTION_PT_PLANS = 'pt'
+SECTION_EVENTS = 'events'
+SECTION_STORE = 'store'
+
+CATALOGUE_PAGE_SIZE = 8
+CATALOGUE_TTL_SECONDS = 600
+
+# callback_data: catpage_<section>_<page>[_<key>]
+CATALOGUE_PAGE_PREFIX = 'catpage_'
+# The "2/5" page indicator: answered without editing (an identical edit is rejected by Telegram)
+CATALOGUE_PAGE_NOOP = f"{CATALOGUE_PAGE_PREFIX}noop"
+
+
+class CataloguePage(NamedTuple):
+    text: str
+    markup: InlineKeyboardMarkup
+    version: object
+    built_at: float
+
+
+_pages: Dict[Tuple[str, str, int], CataloguePage] = {}
+_lock = threading.Lock()
+
+
+def paginate(rows: List, page: int, page_size: int = CATALOGUE_PAGE_SIZE) -> Tuple[List, int, int]:
+    """Slice rows for a page; returns (rows, clamped_page, total_pages)."""
+    total_pages = max(1, (len(rows) + page_size - 1) // page_size)
+    page = min(max(0, page), total_pages - 1)
+    start = page * page_size
+    return rows[start:start + page_size], page, total_pages
+
+
+def page_nav_row(section: str, page: int, total_pages: int, key: str = '') -> List[InlineKeyboardButton]:
+    """Prev/next buttons for a catalogue page (empty when there is one page)."""
+    if total_pages <= 1:
+        return []
+    suffix = f"_{key}" if key else ''
+    row = []
+    if page > 0:
+        row.append(InlineKeyboardButton("◀️ Prev", callback_data=f"{CATALOGUE_PAGE_PREFIX}{section}_{page - 1}{suffix}"))
+    row.append(InlineKeyboardButton(f"{page + 1}/{total_pages}", callback_data=CATALOGUE_PAGE_NOOP))
+    if page < total_pages - 1:
+        row.append(InlineKeyboardButton("Next ▶️", callback_data=f"{CATALOGUE_PAGE_PREFIX}{section}_{page + 1}{suffix}"))
+    return row
+
+
+def parse_page_callback(data: str) -> Optional[Tuple[str, int, str]]:
+    """Decode catpage_<section>_<page>[_<key>] into (section, page, key)."""
+    if not data or not data.startswith(CATALOGUE_PAGE_PREFIX):
+        return None
+    parts = data[len(CATALOGUE_PAGE_PREFIX):].split('_', 2)
+    if len(parts) < 2 or not parts[1].isdigit():
+        return None
+    return parts[0], int(parts[1]), parts[2] if len(parts) > 2 else ''
+
+
+def get_catalogue_page(
+    section: str,
+    page: int,
+    render: Callable[[int], Optional[Tuple[str, InlineKeyboardMarkup]]],
+    key: str = '',
+    version: object = None,
+) -> Optional[Tuple[str, InlineKeyboardMarkup]]:
+    """Return (text, markup) for a page, rendering it only on a cache miss.
+
+    `render(page)` returns None for an empty catalogue; empty results are
+    not cached so a newly added product shows up immediately.
+    """
+    cache_key = (section, key, page)
+    cached = _pages.get(cache_key)
+    now = time.monotonic()
+    if cached is not None and cached.version is version and now - cached.built_at < CATALOGUE_TTL_SECONDS:
+        return cached.text, cached.markup
+
+    rendered = render(page)
+    if rendered is None:
+        return None
+    text, markup = rendered
+    with _lock:
+        _pages[cache_key] = CataloguePage(text, markup, version, now)
+    logger.debug(f"[CATALOGUE] rendered section={section} key={key} page={page}")
+    return text, markup
+
+
+def invalidate_catalogue(section: Optional[str] = None) -> None:
+    """Drop cached pages for one section, or all sections."""
+    with _lock:
+        if section is None:
+            _pages.clear()
+        else:
+            for cache_key in [k for k in _pages if k[0] == section]:
+                del _pages[cache_key]
+    logger.info(f"[CATALOGUE] invalidated section={section or 'all'}")
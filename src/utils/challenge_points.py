@@ -125,23 +125,8 @@ def get_weekly_checkin_count(user_id: int) -> int:
     Returns:
         int: Number of approved check-ins this week
     """
-    try:
-        db = DatabaseConnection()
-        query = """
-            SELECT COUNT(*) as count
-            FROM attendance_queue
-            WHERE user_id = %s
-            AND status = 'approved'
-            AND approved_at >= DATE_TRUNC('week', CURRENT_DATE)
-            AND approved_at < DATE_TRUNC('week', CURRENT_DATE) + INTERVAL '7 days'
-        """
-        
-        result = db.execute_query(query, (user_id,))
-        return result['count'] if result else 0
-        
-    except Exception as e:
-        logger.error(f"Error getting weekly check-in count: {e}")
-        return 0
+    from src.database.streak_operations import get_streak_summary
+    return get_streak_summary(user_id)['week_count']
 
 def check_and_award_weekly_bonus(user_id: int) -> dict:
     """
@@ -0,0 +1,156 @@
+"""
+Check-in fast path for the morning rush.
+
+Between CHECKIN_RUSH_START_HOUR and CHECKIN_RUSH_END_HOUR dozens of members
+share their location at once. Each check-in here costs:
+
+- a set lookup against today's "already checked in" registry (seeded from
+  the DB at midnight, or lazily on the first check-in of the day), so
+  repeat taps never touch the database
+- one DB transaction (`record_checkin_fast`) run off the event loop, with
+  the UNIQUE(user_id, queue_date) upsert as the source of truth
+
+Moderator alerts for check-ins that need manual approval go through the
+admin digest (src.utils.notification_digest): during the rush they are
+buffered into one digest per moderator instead of one message per member
+per moderator, and each moderator's mute/instant preference applies.
+"""
+
+import asyncio
+import html
+import logging
+import threading
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from src.config import (
+    SUPER_ADMIN_USER_ID, CHECKIN_RUSH_START_HOUR, CHECKIN_RUSH_END_HOUR,
+)
+
+logger = logging.getLogger(__name__)
+
+CHECKIN_ALREADY = 'already'
+CHECKIN_APPROVED = 'approved'
+CHECKIN_PENDING = 'pending'
+CHECKIN_FAILED = 'failed'
+
+_checked_in: set = set()
+_registry_day: Optional[date] = None
+_registry_lock = threading.Lock()
+
+
+def seed_checkin_registry(user_ids=None, day: date = None) -> int:
+    """Reset the registry for `day` (default today), loading today's check-ins from the DB."""
+    global _checked_in, _registry_day
+    day = day or date.today()
+    if user_ids is None:
+        from src.database.attendance_operations import get_checked_in_user_ids_today
+        user_ids = get_checked_in_user_ids_today()
+    with _registry_lock:
+        _checked_in = {int(uid) for uid in user_ids}
+        _registry_day = day
+    logger.info(f"[CHECKIN] registry seeded day={day} members={len(_checked_in)}")
+    return len(_checked_in)
+
+
+def _ensure_today():
+    if _registry_day != date.today():
+        seed_checkin_registry()
+
+
+def is_checked_in_today(user_id: int) -> bool:
+    return _registry_day == date.today() and user_id in _checked_in
+
+
+def forget_checkin(user_id: int) -> None:
+    """Allow another check-in today (e.g. after an admin rejection)."""
+    with _registry_lock:
+        _checked_in.discard(int(user_id))
+
+
+def is_rush_hour(now: datetime = None) -> bool:
+    hour = (now or datetime.now()).hour
+    return CHECKIN_RUSH_START_HOUR <= hour < CHECKIN_RUSH_END_HOUR
+
+
+def _check_in_sync(user_id: int) -> Dict:
+    """Blocking part of a check-in (registry + one DB transaction)."""
+    from src.database.attendance_operations import record_checkin_fast
+
+    _ensure_today()
+    if user_id in _checked_in:
+        return {'outcome': CHECKIN_ALREADY}
+
+    try:
+        result = record_checkin_fast(user_id, int(SUPER_ADMIN_USER_ID or 0))
+    except Exception as e:
+        logger.error(f"[CHECKIN] fast path failed for user {user_id}: {e}")
+        return {'outcome': CHECKIN_FAILED}
+    if result is None:
+        return {'outcome': CHECKIN_FAILED}
+
+    with _registry_lock:
+        _checked_in.add(user_id)
+    if not result['created']:
+        result['outcome'] = CHECKIN_ALREADY
+    elif result['approved']:
+        result['outcome'] = CHECKIN_APPROVED
+    else:
+        result['outcome'] = CHECKIN_PENDING
+    return result
+
+
+async def check_in(user_id: int) -> Dict:
+    """Record a geofenced check-in; result['outcome'] is one of the CHECKIN_* values."""
+    if is_checked_in_today(user_id):
+        return {'outcome': CHECKIN_ALREADY}
+    return await asyncio.to_thread(_check_in_sync, user_id)
+
+
+def _checkin_entry(alert: Dict) -> Dict:
+    """Admin digest entry (HTML, user data escaped) for a check-in awaiting approval"""
+    name = alert.get('full_name') or str(alert['user_id'])
+    safe_name = html.escape(name)
+    message = (
+        "🔔 <b>NEW GYM CHECK-IN REQUEST</b>\n\n"
+        f"👤 <b>User:</b> {safe_name}\n"
+        f"📱 <b>ID:</b> {alert['user_id']}\n"
+        f"📞 <b>Phone:</b> {html.escape(str(alert.get('phone') or 'N/A'))}\n"
+        f"📅 <b>Date:</b> {alert.get('request_date')}\n"
+        f"🏢 <b>Attendance ID:</b> {alert['attendance_id']}\n\n"
+        "⚠️ <b>Note:</b> User has inactive/expired membership\n"
+        "⏳ <b>Status:</b> PENDING YOUR APPROVAL\n\n"
+        "Click buttons below to approve or reject:"
+    )
+    return {
+        'message': message,
+        'line': f"🔔 {safe_name} (<code>{alert['user_id']}</code>) awaits check-in approval - #{alert['attendance_id']}",
+        'name': name,
+        'user_id': alert['user_id'],
+        'attendance_id': alert['attendance_id'],
+    }
+
+
+async def notify_pending_checkin(bot, alert: Dict) -> None:
+    """
+    Hand a check-in awaiting approval to the admin digest.
+
+    During the rush each admin's preference applies (digest or instant);
+    outside it every admin who has not muted notifications gets it now.
+    """
+    from src.database.notification_preferences import get_admin_notification_prefs
+    from src.utils.notification_digest import deliver_admin_event
+    from src.utils.role_notifications import get_moderator_chat_ids
+
+    try:
+        admins = await asyncio.to_thread(get_moderator_chat_ids, True)
+        prefs = await asyncio.to_thread(get_admin_notification_prefs)
+    except Exception as e:
+        logger.error(f"[CHECKIN] could not notify moderators of attendance {alert.get('attendance_id')}: {e}")
+        return
+    await deliver_admin_event(bot, _checkin_entry(alert), admins, prefs, digest=is_rush_hour())
+
+
+async def reset_checkin_registry(context) -> None:
+    """Midnight job: start the new day's registry from the DB."""
+    await asyncio.to_thread(seed_checkin_registry)
@@ -0,0 +1,302 @@
+"""
+In-memory membership eligibility snapshot.
+
+Eligibility only changes when a subscription is approved/locked or when the
+clock crosses end_date / grace_period_end, yet the access gate, the QR
+verify endpoint and the is_subscription_* helpers used to hit the
+subscriptions table on every request.
+
+The snapshot keeps, per registered user_id, the latest active
+subscription's end_date and grace_period_end plus the number of approved
+attendances in the grace window. State, grace days left and grace attempts
+left are derived from those on read, so a date boundary needs no rebuild.
+
+Maintenance:
+- full rebuild nightly (`rebuild_eligibility_snapshot` job) and lazily on
+  first use
+- `refresh_eligibility(user_id)` after subscription approval/locking, and on
+  a cache miss (e.g. a member who registered since the last rebuild)
+- `invalidate_eligibility_snapshot()` after bulk subscription edits (the
+  daily lock of expired subscriptions)
+- `record_grace_attendance(user_id)` when an attendance is approved
+- `drop_eligibility(user_id)` when a user is deleted
+
+With WEB_SERVER_MODE=external the bot and each web worker hold their own
+snapshot. Every change above is also published on the shared change log
+(src.web.shared_state), and each process applies the others' changes at
+most ELIGIBILITY_SYNC_SECONDS after they happen: a changed user is dropped
+and re-read on next use, and a full-rebuild notice invalidates the whole
+snapshot.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+ELIGIBILITY_ACTIVE = 'ACTIVE'
+ELIGIBILITY_GRACE = 'GRACE'
+ELIGIBILITY_EXPIRED = 'EXPIRED'
+ELIGIBILITY_NO_SUBSCRIPTION = 'NO_SUBSCRIPTION'
+
+GRACE_MAX_ATTENDANCES = 3
+GRACE_WINDOW_DAYS = 7
+
+CHANGE_TOPIC = 'eligibility'
+# Notices older than this are pruned by the nightly rebuild, which publishes a full rebuild itself
+CHANGE_RETENTION_SECONDS = 2 * 24 * 3600
+
+
+class EligibilityEntry(NamedTuple):
+    end_date: Optional[datetime]
+    grace_period_end: Optional[datetime]
+    grace_attendance_count: int = 0
+
+
+_entries: Dict[int, EligibilityEntry] = {}
+_loaded = False
+_lock = threading.Lock()
+
+# Shared change log position (None until the first build) and this process's own notices
+_change_cursor: Optional[int] = None
+_own_changes = set()
+_next_sync = 0.0
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _grace_window_start() -> str:
+    return (date.today() - timedelta(days=GRACE_WINDOW_DAYS)).strftime('%Y-%m-%d')
+
+
+def _shared() -> bool:
+    from src.config import WEB_SERVER_MODE
+    return WEB_SERVER_MODE == 'external'
+
+
+def _publish(user_id: Optional[int]) -> None:
+    """Tell the other processes that one user (None: everyone) changed"""
+    if not _shared():
+        return
+    try:
+        from src.web.shared_state import get_change_log
+        notice = get_change_log().publish(CHANGE_TOPIC, None if user_id is None else str(user_id))
+        with _lock:
+            # Before the first build the cursor starts past this notice anyway
+            if _change_cursor is not None:
+                _own_changes.add(notice)
+    except Exception as e:
+        logger.error(f"[ELIGIBILITY] could not publish change user={user_id}: {e}")
+
+
+def _apply_shared_changes() -> None:
+    """Drop the users other processes changed since the last sync (throttled)"""
+    global _change_cursor, _next_sync, _loaded
+    now = time.monotonic()
+    with _lock:
+        if _change_cursor is None or now < _next_sync:
+            return
+        from src.config import ELIGIBILITY_SYNC_SECONDS
+        _next_sync = now + ELIGIBILITY_SYNC_SECONDS
+        cursor = _change_cursor
+    try:
+        from src.web.shared_state import get_change_log
+        notices = get_change_log().read_since(cursor, CHANGE_TOPIC)
+    except Exception as e:
+        logger.error(f"[ELIGIBILITY] could not read shared changes: {e}")
+        return
+    if not notices:
+        return
+
+    with _lock:
+        _change_cursor = max(_change_cursor or 0, notices[-1][0])
+        for notice, item in notices:
+            if notice in _own_changes:
+                _own_changes.discard(notice)
+            elif item is None:
+                _loaded = False
+            else:
+                _entries.pop(int(item), None)
+    logger.debug("[ELIGIBILITY] applied %s shared changes", len(notices))
+
+
+def build_eligibility_snapshot() -> int:
+    """Reload every registered user's eligibility (three queries in total)."""
+    global _entries, _loaded, _change_cursor
+    from src.database.connection import execute_query
+
+    # Changes published from here on are applied after the build
+    cursor = None
+    if _shared():
+        try:
+            from src.web.shared_state import get_change_log
+            cursor = get_change_log().last_id()
+        except Exception as e:
+            logger.error(f"[ELIGIBILITY] could not read shared change log: {e}")
+
+    users = execute_query("SELECT user_id FROM users") or []
+    subs = execute_query(
+        "SELECT user_id, end_date, grace_period_end FROM subscriptions "
+        "WHERE status = 'active' ORDER BY created_at ASC"
+    ) or []
+    counts = execute_query(
+        "SELECT user_id, COUNT(*) AS count FROM attendance_queue "
+        "WHERE queue_date >= %s AND status = 'approved' GROUP BY user_id",
+        (_grace_window_start(),)
+    ) or []
+
+    latest = {row['user_id']: row for row in subs}  # ordered by created_at, last wins
+    attended = {row['user_id']: int(row['count'] or 0) for row in counts}
+    entries = {}
+    for row in users:
+        uid = int(row['user_id'])
+        sub = latest.get(row['user_id']) or {}
+        entries[uid] = EligibilityEntry(
+            _to_datetime(sub.get('end_date')),
+            _to_datetime(sub.get('grace_period_end')),
+            attended.get(row['user_id'], 0),
+        )
+
+    with _lock:
+        _entries = entries
+        _loaded = True
+        if cursor is not None:
+            _change_cursor = cursor
+    logger.info(f"[ELIGIBILITY] snapshot built users={len(entries)} subscriptions={len(latest)}")
+    return len(entries)
+
+
+def _load_entry(user_id: int) -> Optional[EligibilityEntry]:
+    from src.database.connection import execute_query
+
+    user = execute_query("SELECT user_id FROM users WHERE user_id = %s", (user_id,), fetch_one=True)
+    if not user:
+        with _lock:
+            _entries.pop(user_id, None)
+        return None
+    sub = execute_query(
+        "SELECT end_date, grace_period_end FROM subscriptions "
+        "WHERE user_id = %s AND status = 'active' ORDER BY created_at DESC LIMIT 1",
+        (user_id,),
+        fetch_one=True
+    ) or {}
+    count = execute_query(
+        "SELECT COUNT(*) AS count FROM attendance_queue "
+        "WHERE user_id = %s AND queue_date >= %s AND status = 'approved'",
+        (user_id, _grace_window_start()),
+        fetch_one=True
+    ) or {}
+    entry = EligibilityEntry(
+        _to_datetime(sub.get('end_date')),
+        _to_datetime(sub.get('grace_period_end')),
+        int(count.get('count') or 0),
+    )
+    with _lock:
+        _entries[user_id] = entry
+    logger.debug(f"[ELIGIBILITY] refreshed user={user_id}")
+    return entry
+
+
+def refresh_eligibility(user_id: int) -> Optional[EligibilityEntry]:
+    """Re-read one user's eligibility after a change; None if the user does not exist."""
+    entry = _load_entry(int(user_id))
+    _publish(int(user_id))
+    return entry
+
+
+def drop_eligibility(user_id: int) -> None:
+    with _lock:
+        _entries.pop(int(user_id), None)
+    _publish(int(user_id))
+
+
+def record_grace_attendance(user_id: int) -> None:
+    """Count an approved attendance towards the grace allowance."""
+    with _lock:
+        entry = _entries.get(int(user_id))
+        if entry is not None:
+            _entries[int(user_id)] = entry._replace(grace_attendance_count=entry.grace_attendance_count + 1)
+    _publish(int(user_id))
+
+
+def _entry_for(user_id: int) -> Optional[EligibilityEntry]:
+    if _shared():
+        _apply_shared_changes()
+    if not _loaded:
+        build_eligibility_snapshot()
+    entry = _entries.get(int(user_id))
+    if entry is None:
+        entry = _load_entry(int(user_id))
+    return entry
+
+
+def get_eligibility(user_id: int, now: datetime = None) -> Optional[Dict]:
+    """
+    Eligibility for a registered user, or None if the user is not registered.
+
+    Returns:
+        {'state', 'end_date', 'grace_period_end', 'grace_days_left', 'grace_attempts_left'}
+    """
+    entry = _entry_for(user_id)
+    if entry is None:
+        return None
+
+    now = now or datetime.now()
+    grace_days_left = 0
+    grace_attempts_left = 0
+    if entry.end_date is None or entry.grace_period_end is None:
+        state = ELIGIBILITY_NO_SUBSCRIPTION
+    elif now <= entry.end_date:
+        state = ELIGIBILITY_ACTIVE
+    elif now <= entry.grace_period_end:
+        state = ELIGIBILITY_GRACE
+        grace_days_left = max(0, (entry.grace_period_end - now).days + 1)
+        grace_attempts_left = max(0, GRACE_MAX_ATTENDANCES - entry.grace_attendance_count)
+    else:
+        state = ELIGIBILITY_EXPIRED
+
+    return {
+        'state': state,
+        'end_date': entry.end_date,
+        'grace_period_end': entry.grace_period_end,
+        'grace_days_left': grace_days_left,
+        'grace_attempts_left': grace_attempts_left,
+    }
+
+
+def invalidate_eligibility_snapshot() -> None:
+    """Force a full rebuild on next use, in every process."""
+    global _loaded
+    with _lock:
+        _loaded = False
+    _publish(None)
+
+
+def _nightly_rebuild() -> None:
+    build_eligibility_snapshot()
+    # The grace window moved for everyone; workers rebuild too
+    _publish(None)
+    if _shared():
+        from src.web.shared_state import get_change_log
+        get_change_log().prune(CHANGE_RETENTION_SECONDS)
+
+
+async def rebuild_eligibility_snapshot(context) -> None:
+    """Nightly job: rebuild the whole snapshot off the event loop."""
+    try:
+        await asyncio.to_thread(_nightly_rebuild)
+    except Exception as e:
+        logger.error(f"[ELIGIBILITY] nightly rebuild failed: {e}")
@@ -9,6 +9,7 @@ from src.utils import followup_manager
 from src.database.connection import execute_query
 from src.config import SUPER_ADMIN_USER_ID, USE_LOCAL_DB
 from src.utils.role_notifications import get_moderator_chat_ids
+from src.utils.metrics import timed_job
 import logging
 
 logger = logging.getLogger(__name__)
@@ -172,4 +173,4 @@ def schedule_followups(application, chat_id, event_key, context_vars=None):
                 logger.error(f"Error running followup job {job_name}: {e}")
 
         # schedule job with payload
-        application.job_queue.run_once(_followup_job, delay, name=job_name, data={'chat_id': chat_id, 'template': tpl, 'context_vars': context_vars or {}})
+        application.job_queue.run_once(timed_job(_followup_job, 'followup'), delay, name=job_name, data={'chat_id': chat_id, 'template': tpl, 'context_vars': context_vars or {}})
@@ -1,64 +1,223 @@
 """
 Geofence validation using Haversine formula
 Server-side only distance calculation
+
+`GeofenceEngine` checks a point against every studio in STUDIO_LOCATIONS
+(or the single GEOFENCE_LAT/LNG studio). Per-studio radians, cos(lat) and a
+lat/lng bounding box are computed once; a point is first matched against
+the boxes and only candidates pay for a haversine. `check_points` evaluates
+a whole batch (e.g. a day's check-ins for a fraud audit) in one call,
+vectorised with numpy when it is installed. numpy is imported by the first
+batch check, not at startup (the check-in handlers import this module).
 """
 
+import json
 import logging
 import math
+import threading
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+_UNLOADED = object()
+np = _UNLOADED  # numpy once loaded by _numpy(); None when not installed
 
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE_LAT = 111320.0
+BBOX_MARGIN = 1.01  # pad the boxes so rounding never rejects a point on the edge
+
+# Used when neither STUDIO_LOCATIONS nor GEOFENCE_LAT/LNG is configured
+DEFAULT_STUDIO_LAT = 19.996429
+DEFAULT_STUDIO_LNG = 73.754282
+DEFAULT_RADIUS_M = 10
+
+
+def _numpy():
+    global np
+    if np is _UNLOADED:
+        try:
+            import numpy
+        except ImportError:  # optional: batch checks fall back to pure Python
+            numpy = None
+        np = numpy
+    return np
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate distance between two GPS coordinates using Haversine formula
-    
+
     Args:
         lat1, lon1: User's coordinates (from browser GPS)
         lat2, lon2: Gym's coordinates
-    
+
     Returns:
         Distance in meters
     """
     try:
-        R = 6371000  # Earth radius in meters
-        
         # Convert to radians
         phi1 = math.radians(lat1)
         phi2 = math.radians(lat2)
         delta_phi = math.radians(lat2 - lat1)
         delta_lambda = math.radians(lon2 - lon1)
-        
+
         # Haversine formula
         a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
         c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        
-        distance = R * c
+
+        distance = EARTH_RADIUS_M * c
         return distance
     except Exception as e:
         logger.error(f"Error calculating distance: {e}")
         return float('inf')  # Return infinity on error (fails geofence check)
 
 
-def is_within_geofence(user_lat: float, user_lon: float, gym_lat: float, gym_lon: float, 
-                       radius_meters: int = 10) -> tuple[bool, float]:
+class Studio(NamedTuple):
+    name: str
+    lat: float
+    lng: float
+    radius_m: float
+
+
+class GeofenceMatch(NamedTuple):
+    """Nearest studio to a point; `within` is True if the point is inside its radius."""
+    studio: Optional[Studio]
+    distance_m: float
+    within: bool
+
+
+class GeofenceEngine:
+    """Point-in-studio checks against a fixed set of studios"""
+
+    def __init__(self, studios: Iterable[Studio]):
+        self.studios: List[Studio] = list(studios)
+        self._phi = [math.radians(s.lat) for s in self.studios]
+        self._lam = [math.radians(s.lng) for s in self.studios]
+        self._cos_phi = [math.cos(phi) for phi in self._phi]
+        self._bbox = []
+        for studio, cos_phi in zip(self.studios, self._cos_phi):
+            dlat = studio.radius_m * BBOX_MARGIN / METERS_PER_DEGREE_LAT
+            dlng = studio.radius_m * BBOX_MARGIN / (METERS_PER_DEGREE_LAT * max(cos_phi, 1e-6))
+            self._bbox.append((studio.lat - dlat, studio.lat + dlat, studio.lng - dlng, studio.lng + dlng))
+        self._np_ready = False
+
+    def _prepare_arrays(self, np) -> None:
+        self._np_phi = np.array(self._phi)
+        self._np_lam = np.array(self._lam)
+        self._np_cos_phi = np.array(self._cos_phi)
+        self._np_radius = np.array([s.radius_m for s in self.studios])
+        self._np_ready = True
+
+    def _distance(self, index: int, phi: float, lam: float, cos_phi: float) -> float:
+        a = (math.sin((self._phi[index] - phi) / 2) ** 2
+             + cos_phi * self._cos_phi[index] * math.sin((self._lam[index] - lam) / 2) ** 2)
+        return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+    def check(self, lat: float, lng: float) -> GeofenceMatch:
+        """Nearest studio containing the point, else the nearest studio overall"""
+        if not self.studios:
+            return GeofenceMatch(None, float('inf'), False)
+        phi, lam = math.radians(lat), math.radians(lng)
+        cos_phi = math.cos(phi)
+
+        # Bounding-box prefilter: only studios whose box holds the point can contain it
+        best = None
+        for i, (lat_min, lat_max, lng_min, lng_max) in enumerate(self._bbox):
+            if lat_min <= lat <= lat_max and lng_min <= lng <= lng_max:
+                distance = self._distance(i, phi, lam, cos_phi)
+                if distance <= self.studios[i].radius_m and (best is None or distance < best[1]):
+                    best = (i, distance)
+        if best is not None:
+            return GeofenceMatch(self.studios[best[0]], best[1], True)
+
+        # Outside every studio: report the nearest one for the rejection message
+        distance, i = min((self._distance(i, phi, lam, cos_phi), i) for i in range(len(self.studios)))
+        return GeofenceMatch(self.studios[i], distance, False)
+
+    def check_points(self, points: Sequence[Tuple[float, float]]) -> List[GeofenceMatch]:
+        """Evaluate many (lat, lng) points at once; same result as check() per point"""
+        np = _numpy()
+        if np is None or not points or not self.studios:
+            return [self.check(lat, lng) for lat, lng in points]
+        if not self._np_ready:
+            self._prepare_arrays(np)
+
+        coords = np.radians(np.asarray(points, dtype=float).reshape(-1, 2))
+        phi = coords[:, 0:1]
+        lam = coords[:, 1:2]
+        # points x studios haversine in one pass
+        a = (np.sin((self._np_phi - phi) / 2) ** 2
+             + np.cos(phi) * self._np_cos_phi * np.sin((self._np_lam - lam) / 2) ** 2)
+        distances = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+        inside = distances <= self._np_radius
+        # Nearest containing studio where there is one, else nearest overall
+        ranked = np.where(inside, distances, distances + np.inf)
+        nearest_inside = ranked.argmin(axis=1)
+        nearest = distances.argmin(axis=1)
+        any_inside = inside.any(axis=1)
+        chosen = np.where(any_inside, nearest_inside, nearest)
+
+        rows = np.arange(len(chosen))
+        return [
+            GeofenceMatch(self.studios[int(i)], float(d), bool(w))
+            for i, d, w in zip(chosen, distances[rows, chosen], any_inside)
+        ]
+
+
+def load_studios() -> List[Studio]:
     """
-    Check if user is within geofence radius of gym
-    
-    Args:
-        user_lat, user_lon: User's GPS coordinates
-        gym_lat, gym_lon: Gym's GPS coordinates
-        radius_meters: Allowed radius (default 10m, range 5-20m)
-    
-    Returns:
-        tuple[bool, float]: (is_within_geofence, distance_in_meters)
+    Studios from STUDIO_LOCATIONS (JSON list of {name, lat, lng, radius_m}),
+    else the single GEOFENCE_LAT/LNG/RADIUS_M studio
     """
+    from src.config import STUDIO_LOCATIONS, GEOFENCE_LAT, GEOFENCE_LNG, GEOFENCE_RADIUS_M
+
+    if STUDIO_LOCATIONS:
+        try:
+            return [
+                Studio(
+                    str(item.get('name') or f"Studio {n}"),
+                    float(item['lat']),
+                    float(item['lng']),
+                    float(item.get('radius_m') or GEOFENCE_RADIUS_M or DEFAULT_RADIUS_M),
+                )
+                for n, item in enumerate(json.loads(STUDIO_LOCATIONS), start=1)
+            ]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"[GEOFENCE] invalid STUDIO_LOCATIONS, using GEOFENCE_LAT/LNG: {e}")
+
+    return [Studio(
+        'Studio',
+        GEOFENCE_LAT or DEFAULT_STUDIO_LAT,
+        GEOFENCE_LNG or DEFAULT_STUDIO_LNG,
+        float(GEOFENCE_RADIUS_M or DEFAULT_RADIUS_M),
+    )]
+
+
+_engine: Optional[GeofenceEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_geofence_engine() -> GeofenceEngine:
+    """Process-wide engine built from config on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = GeofenceEngine(load_studios())
+                logger.info(f"[GEOFENCE] engine ready with {len(_engine.studios)} studio(s)")
+    return _engine
+
+
+def check_studio_geofence(lat: float, lng: float) -> GeofenceMatch:
+    """Check one point against every configured studio"""
     try:
-        distance = haversine_distance(user_lat, user_lon, gym_lat, gym_lon)
-        is_within = distance <= radius_meters
-        
-        logger.debug(f"Geofence check: distance={distance:.1f}m, radius={radius_meters}m, within={is_within}")
-        return is_within, distance
+        return get_geofence_engine().check(float(lat), float(lng))
     except Exception as e:
         logger.error(f"Error checking geofence: {e}")
-        return False, float('inf')
+        return GeofenceMatch(None, float('inf'), False)
+
+
+def audit_checkin_points(points: Sequence[Tuple[float, float]]) -> List[GeofenceMatch]:
+    """Re-validate a batch of check-in coordinates (fraud audit) in one call"""
+    return get_geofence_engine().check_points(points)
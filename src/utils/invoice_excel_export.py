@@ -1,59 +1,155 @@
 """
 Invoice Report Excel Export Module
 Generates Excel workbooks with invoice data and summary statistics
+
+Workbooks are written in openpyxl write-only mode: rows are streamed to disk
+as they arrive and every cell references a shared named style, so memory
+stays flat no matter how many invoices a (yearly) report contains.
 """
 
+import os
+import tempfile
+from decimal import Decimal
 from io import BytesIO
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 
 
+INVOICE_HEADERS = [
+    'Invoice ID',
+    'Customer Name',
+    'Phone',
+    'Items Count',
+    'Subtotal',
+    'GST',
+    'Shipping',
+    'Total Amount',
+    'Status',
+    'Created Date',
+    'Paid Date'
+]
+INVOICE_COLUMN_WIDTHS = [15, 18, 15, 12, 12, 12, 12, 14, 12, 13, 13]
+
+CURRENCY_COLUMNS = {5, 6, 7, 8}  # Subtotal, GST, Shipping, Total
+CENTERED_COLUMNS = {4, 9, 10, 11}  # Items Count, Status, Created, Paid
+
+STYLE_TITLE = 'inv_title'
+STYLE_HEADER = 'inv_header'
+STYLE_LABEL = 'inv_label'
+STYLE_VALUE = 'inv_value'
+STYLE_CELL = 'inv_cell'
+STYLE_CURRENCY = 'inv_currency'
+STYLE_CENTER = 'inv_center'
+
+
+def _register_styles(wb):
+    """Add the shared named styles used by every report cell"""
+    thin = Side(style='thin')
+    thin_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    dark_fill = PatternFill(start_color='1F4E78', end_color='1F4E78', fill_type='solid')
+
+    styles = [
+        NamedStyle(name=STYLE_TITLE, font=Font(size=16, bold=True, color='FFFFFF'), fill=dark_fill,
+                   alignment=Alignment(horizontal='center', vertical='center')),
+        NamedStyle(name=STYLE_HEADER, font=Font(bold=True, color='FFFFFF'), fill=dark_fill,
+                   alignment=Alignment(horizontal='center', vertical='center')),
+        NamedStyle(name=STYLE_LABEL, font=Font(bold=True),
+                   fill=PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')),
+        NamedStyle(name=STYLE_VALUE, alignment=Alignment(horizontal='right')),
+        NamedStyle(name=STYLE_CELL, border=thin_border),
+        NamedStyle(name=STYLE_CURRENCY, border=thin_border, number_format='₹#,##0.00',
+                   alignment=Alignment(horizontal='right')),
+        NamedStyle(name=STYLE_CENTER, border=thin_border, alignment=Alignment(horizontal='center')),
+    ]
+    for style in styles:
+        wb.add_named_style(style)
+
+
+def _styled(ws, value, style):
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+def write_invoice_report_excel(invoices, summary, period_name, output):
+    """
+    Stream an invoice report workbook into `output`
+
+    Args:
+        invoices: Iterable of invoice dicts (a DB generator is consumed lazily)
+        summary: Dict with summary statistics
+        period_name: String describing the period (e.g., "January 2026", "Q1 2026")
+        output: File path or binary file object
+
+    Returns:
+        Number of invoice rows written
+    """
+    wb = Workbook(write_only=True)
+    _register_styles(wb)
+
+    add_summary_sheet(wb, summary, period_name)
+    row_count = add_invoices_sheet(wb, invoices)
+
+    wb.save(output)
+    return row_count
+
+
+def export_invoice_report_file(invoices, summary, period_name):
+    """
+    Write an invoice report to a temporary .xlsx file
+
+    Blocking: run via asyncio.to_thread. The caller must delete the file.
+
+    Returns:
+        Tuple (path, row_count)
+    """
+    fd, path = tempfile.mkstemp(prefix='invoice_report_', suffix='.xlsx')
+    os.close(fd)
+    try:
+        row_count = write_invoice_report_excel(invoices, summary, period_name, path)
+    except Exception:
+        os.unlink(path)
+        raise
+    return path, row_count
+
+
 def generate_invoice_report_excel(invoices, summary, period_name):
     """
     Generate Excel workbook with invoice report
-    
+
     Args:
         invoices: List of invoice dicts from database
         summary: Dict with summary statistics
         period_name: String describing the period (e.g., "January 2026", "Q1 2026")
-        
+
     Returns:
         BytesIO object containing Excel file
     """
-    wb = Workbook()
-    
-    # Remove default sheet
-    if 'Sheet' in wb.sheetnames:
-        wb.remove(wb['Sheet'])
-    
-    # Add sheets
-    add_summary_sheet(wb, summary, period_name)
-    add_invoices_sheet(wb, invoices)
-    
-    # Save to BytesIO
     excel_buffer = BytesIO()
-    wb.save(excel_buffer)
+    write_invoice_report_excel(invoices, summary, period_name, excel_buffer)
     excel_buffer.seek(0)
-    
+
     return excel_buffer
 
 
 def add_summary_sheet(wb, summary, period_name):
     """Add summary statistics sheet"""
-    ws = wb.create_sheet('Summary', 0)
-    
-    # Header
-    ws['A1'] = f'Invoice Report - {period_name}'
-    ws['A1'].font = Font(size=16, bold=True, color='FFFFFF')
-    ws['A1'].fill = PatternFill(start_color='1F4E78', end_color='1F4E78', fill_type='solid')
-    ws.merge_cells('A1:D1')
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws = wb.create_sheet('Summary')
+
+    # Set column widths (write-only sheets need these before any row)
+    ws.column_dimensions['A'].width = 25
+    ws.column_dimensions['B'].width = 20
     ws.row_dimensions[1].height = 25
-    
-    # Empty row
     ws.row_dimensions[2].height = 5
-    
+
+    # Header (merged cells are not available in write-only mode)
+    ws.append([_styled(ws, f'Invoice Report - {period_name}', STYLE_TITLE)])
+
+    # Empty row
+    ws.append([])
+
     # Summary metrics
     metrics = [
         ('Total Invoices:', summary.get('total_invoices', 0)),
@@ -63,66 +159,35 @@ def add_summary_sheet(wb, summary, period_name):
         ('Unique Customers:', summary.get('unique_customers', 0)),
         ('Average Invoice:', f"₹{summary.get('avg_invoice_amount', 0):,.2f}"),
     ]
-    
-    row = 3
-    header_fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
-    
+
     for label, value in metrics:
-        ws[f'A{row}'] = label
-        ws[f'A{row}'].font = Font(bold=True)
-        ws[f'A{row}'].fill = header_fill
-        
-        ws[f'B{row}'] = value
-        ws[f'B{row}'].alignment = Alignment(horizontal='right')
-        
-        row += 1
-    
-    # Set column widths
-    ws.column_dimensions['A'].width = 25
-    ws.column_dimensions['B'].width = 20
+        ws.append([_styled(ws, label, STYLE_LABEL), _styled(ws, value, STYLE_VALUE)])
+
+
+def _cell_style(col_num, value):
+    if col_num in CURRENCY_COLUMNS:
+        return STYLE_CURRENCY if isinstance(value, (int, float, Decimal)) else STYLE_CELL
+    if col_num in CENTERED_COLUMNS:
+        return STYLE_CENTER
+    return STYLE_CELL
 
 
 def add_invoices_sheet(wb, invoices):
-    """Add detailed invoices sheet"""
-    ws = wb.create_sheet('Invoices', 1)
-    
-    # Header row
-    headers = [
-        'Invoice ID',
-        'Customer Name',
-        'Phone',
-        'Items Count',
-        'Subtotal',
-        'GST',
-        'Shipping',
-        'Total Amount',
-        'Status',
-        'Created Date',
-        'Paid Date'
-    ]
-    
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.value = header
-        cell.font = Font(bold=True, color='FFFFFF')
-        cell.fill = PatternFill(start_color='1F4E78', end_color='1F4E78', fill_type='solid')
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-    
+    """Add detailed invoices sheet; returns the number of invoice rows"""
+    ws = wb.create_sheet('Invoices')
+
+    for col_num, width in enumerate(INVOICE_COLUMN_WIDTHS, 1):
+        ws.column_dimensions[get_column_letter(col_num)].width = width
     ws.row_dimensions[1].height = 20
-    
+
     # Freeze header row
     ws.freeze_panes = 'A2'
-    
-    # Data rows
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    for row_num, invoice in enumerate(invoices, 2):
-        cells = [
+
+    ws.append([_styled(ws, header, STYLE_HEADER) for header in INVOICE_HEADERS])
+
+    row_count = 0
+    for invoice in invoices:
+        values = [
             invoice.get('invoice_id', ''),
             invoice.get('full_name', 'N/A'),
             invoice.get('phone', ''),
@@ -131,29 +196,14 @@ def add_invoices_sheet(wb, invoices):
             invoice.get('gst_total', 0),
             invoice.get('shipping', 0),
             invoice.get('final_total', 0),
-            invoice.get('status', 'pending').capitalize(),
+            (invoice.get('status') or 'pending').capitalize(),
             invoice.get('created_date', ''),
             invoice.get('paid_date', '') or '-'
         ]
-        
-        for col_num, value in enumerate(cells, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = thin_border
-            
-            # Format currency columns
-            if col_num in [5, 6, 7, 8]:  # Subtotal, GST, Shipping, Total
-                if isinstance(value, (int, float)):
-                    cell.number_format = '₹#,##0.00'
-                    cell.alignment = Alignment(horizontal='right')
-            
-            # Center alignment for counts and dates
-            elif col_num in [4, 9, 10, 11]:
-                cell.alignment = Alignment(horizontal='center')
-    
-    # Set column widths
-    column_widths = [15, 18, 15, 12, 12, 12, 12, 14, 12, 13, 13]
-    for col_num, width in enumerate(column_widths, 1):
-        ws.column_dimensions[get_column_letter(col_num)].width = width
-    
-    return ws
+        ws.append([
+            _styled(ws, value, _cell_style(col_num, value))
+            for col_num, value in enumerate(values, 1)
+        ])
+        row_count += 1
+
+    return row_count
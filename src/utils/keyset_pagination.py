@@ -0,0 +1,197 @@
+"""
+Keyset-paginated admin lists.
+
+Admin queues (pending users, attendance, subscriptions, shake purchases,
+store orders) can hold thousands of rows. Instead of fetching everything or
+OFFSET-paging, each page is read with
+
+    ... WHERE <filters> AND id > %s ORDER BY id LIMIT n + 1
+
+so every page costs one indexed range scan regardless of depth. The cursor
+(the first/last id of the visible page) travels in callback_data:
+
+    kp:<list>:<n|p>:<base36 id>[:<scope>]
+
+`n` = rows after the id, `p` = rows before it, `scope` = list filter
+(e.g. an order status). Visited pages are cached briefly so Prev/Next
+flipping does not re-query.
+
+Usage:
+    register_keyset_list(KeysetList(name='pu', fetch=..., render_row=...))
+    await show_keyset_list(update, 'pu')
+and mount `handle_keyset_callback` once with pattern KEYSET_CALLBACK_PATTERN.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.ext import ContextTypes
+
+from src.database.pagination import KEYSET_PAGE_SIZE, KeysetPage
+from src.utils.auth import is_admin_id
+
+logger = logging.getLogger(__name__)
+
+KEYSET_CALLBACK_PREFIX = 'kp:'
+KEYSET_CALLBACK_PATTERN = r'^kp:'
+KEYSET_CACHE_TTL_SECONDS = 20
+KEYSET_CACHE_MAX_PAGES = 256
+
+_B36 = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+def to_base36(value: int) -> str:
+    value = int(value)
+    if value < 0:
+        return '-' + to_base36(-value)
+    if value == 0:
+        return '0'
+    digits = []
+    while value:
+        value, rem = divmod(value, 36)
+        digits.append(_B36[rem])
+    return ''.join(reversed(digits))
+
+
+def encode_cursor(list_name: str, direction: str, key: int, scope: str = '') -> str:
+    """Build compact callback_data for a page cursor (kept under 64 bytes)."""
+    data = f"{KEYSET_CALLBACK_PREFIX}{list_name}:{direction}:{to_base36(key)}"
+    if scope:
+        data += f":{scope}"
+    if len(data.encode('utf-8')) > 64:
+        raise ValueError(f"Keyset callback_data too long: {data}")
+    return data
+
+
+def decode_cursor(data: str) -> Optional[Tuple[str, str, int, str]]:
+    """Parse callback_data into (list_name, direction, key, scope)."""
+    if not data or not data.startswith(KEYSET_CALLBACK_PREFIX):
+        return None
+    parts = data[len(KEYSET_CALLBACK_PREFIX):].split(':', 3)
+    if len(parts) < 3 or parts[1] not in ('n', 'p'):
+        return None
+    try:
+        key = int(parts[2], 36)
+    except ValueError:
+        return None
+    return parts[0], parts[1], key, parts[3] if len(parts) > 3 else ''
+
+
+class KeysetList:
+    """Declarative description of one paginated admin list."""
+
+    def __init__(self, name: str, key: str,
+                 fetch: Callable[..., KeysetPage],
+                 render_row: Callable[[Dict], str],
+                 title: Callable[[str], str],
+                 empty_text: str = "✅ Nothing pending!",
+                 row_button: Optional[Callable[[Dict], InlineKeyboardButton]] = None,
+                 extra_buttons: Optional[Callable[[str], List[List[InlineKeyboardButton]]]] = None,
+                 page_size: int = KEYSET_PAGE_SIZE):
+        self.name = name
+        self.key = key
+        self.fetch = fetch
+        self.render_row = render_row
+        self.title = title
+        self.empty_text = empty_text
+        self.row_button = row_button
+        self.extra_buttons = extra_buttons
+        self.page_size = page_size
+
+
+_lists: Dict[str, KeysetList] = {}
+_page_cache: "OrderedDict[tuple, Tuple[float, KeysetPage]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def register_keyset_list(spec: KeysetList) -> KeysetList:
+    _lists[spec.name] = spec
+    return spec
+
+
+def invalidate_keyset_list(name: Optional[str] = None) -> None:
+    """Drop cached pages after the underlying queue changed."""
+    with _cache_lock:
+        for cache_key in [k for k in _page_cache if name is None or k[0] == name]:
+            del _page_cache[cache_key]
+
+
+def get_keyset_page(spec: KeysetList, scope: str = '', direction: str = 'n',
+                    key: Optional[int] = None) -> KeysetPage:
+    cache_key = (spec.name, scope, direction, key)
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _page_cache.get(cache_key)
+        if cached and now - cached[0] < KEYSET_CACHE_TTL_SECONDS:
+            _page_cache.move_to_end(cache_key)
+            return cached[1]
+
+    after = key if direction == 'n' else None
+    before = key if direction == 'p' else None
+    page = spec.fetch(scope=scope, after=after, before=before, limit=spec.page_size)
+    with _cache_lock:
+        _page_cache[cache_key] = (now, page)
+        while len(_page_cache) > KEYSET_CACHE_MAX_PAGES:
+            _page_cache.popitem(last=False)
+    return page
+
+
+def render_keyset_page(spec: KeysetList, page: KeysetPage, scope: str = '') -> Tuple[str, InlineKeyboardMarkup]:
+    text = spec.title(scope) + "\n\n" + "".join(spec.render_row(row) for row in page.rows)
+    keyboard = []
+    if spec.row_button:
+        keyboard.extend([spec.row_button(row)] for row in page.rows)
+    nav = []
+    if page.rows and page.has_prev:
+        nav.append(InlineKeyboardButton("◀️ Prev", callback_data=encode_cursor(spec.name, 'p', page.rows[0][spec.key], scope)))
+    if page.rows and page.has_next:
+        nav.append(InlineKeyboardButton("Next ▶️", callback_data=encode_cursor(spec.name, 'n', page.rows[-1][spec.key], scope)))
+    if nav:
+        keyboard.append(nav)
+    if spec.extra_buttons:
+        keyboard.extend(spec.extra_buttons(scope))
+    return text, InlineKeyboardMarkup(keyboard)
+
+
+async def show_keyset_list(update: Update, name: str, scope: str = '', direction: str = 'n',
+                           key: Optional[int] = None, edit: bool = False) -> bool:
+    """Send (or edit in place) one page of a registered list; False when empty."""
+    spec = _lists[name]
+    page = get_keyset_page(spec, scope, direction, key)
+    query = update.callback_query
+    message = query.message if query else update.message
+
+    if not page.rows:
+        markup = InlineKeyboardMarkup(spec.extra_buttons(scope)) if spec.extra_buttons else None
+        if edit and query:
+            await query.edit_message_text(spec.empty_text, reply_markup=markup)
+        else:
+            await message.reply_text(spec.empty_text, reply_markup=markup)
+        return False
+
+    text, markup = render_keyset_page(spec, page, scope)
+    if edit and query:
+        await query.edit_message_text(text, reply_markup=markup, parse_mode='Markdown')
+    else:
+        await message.reply_text(text, reply_markup=markup, parse_mode='Markdown')
+    return True
+
+
+async def handle_keyset_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Single PTB entry point for every kp:* Prev/Next button."""
+    query = update.callback_query
+    parsed = decode_cursor(query.data)
+    if parsed is None or parsed[0] not in _lists:
+        await query.answer("List expired, please reopen it.", show_alert=True)
+        return
+    name, direction, key, scope = parsed
+
+    if not is_admin_id(query.from_user.id):
+        await query.answer("❌ Admin access only.", show_alert=True)
+        return
+
+    await query.answer()
+    await show_keyset_list(update, name, scope=scope, direction=direction, key=key, edit=True)
@@ -0,0 +1,169 @@
+"""
+Lazy handler loading and startup import accounting.
+
+Handlers for commands and buttons can be declared by "module:function"
+instead of importing the module in bot.main:
+
+    application.add_handler(CommandHandler('reports', lazy_callback('src.handlers.report_handlers:cmd_reports_menu')))
+    callback_router.add('src.handlers.report_handlers:callback_report_eod', exact='report_eod')
+
+The module is imported on the first update that needs it. Modules whose
+ConversationHandlers must exist at registration time still load eagerly,
+so heavy libraries (openpyxl, reportlab, matplotlib, PIL, qrcode) are
+imported inside the functions that use them.
+
+`start_import_timing()` installs a meta-path hook that times every `src.*`
+module and heavy library imported until `stop_import_timing()`.
+`import_report()` lists the slowest ones together with the lazy loads
+done since startup.
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from importlib.abc import MetaPathFinder
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEAVY_LIBRARIES = frozenset({'matplotlib', 'PIL', 'reportlab', 'openpyxl', 'qrcode', 'numpy', 'pandas'})
+
+# module -> [inclusive seconds, self seconds]
+_startup_costs: Dict[str, List[float]] = {}
+# module -> seconds, for imports done by lazy_callback / load_target after startup
+_lazy_costs: Dict[str, float] = {}
+_lock = threading.Lock()
+_timer: Optional['_ImportTimer'] = None
+
+
+def _tracked(fullname: str) -> bool:
+    return fullname == 'src' or fullname.startswith('src.') or fullname in HEAVY_LIBRARIES
+
+
+class _TimedLoader:
+    """Wraps a loader so exec_module is timed; everything else is delegated"""
+
+    def __init__(self, loader, timer: '_ImportTimer'):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def exec_module(self, module):
+        self._timer.enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.leave(module.__name__, time.perf_counter() - start)
+
+
+class _ImportTimer(MetaPathFinder):
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _stack(self) -> List[float]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enter(self) -> None:
+        self._stack().append(0.0)
+
+    def leave(self, name: str, elapsed: float) -> None:
+        stack = self._stack()
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        with _lock:
+            _startup_costs[name] = [elapsed, max(elapsed - children, 0.0)]
+
+    def find_spec(self, fullname, path, target=None):
+        if not _tracked(fullname):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+
+def start_import_timing() -> None:
+    global _timer
+    if _timer is None:
+        _timer = _ImportTimer()
+        sys.meta_path.insert(0, _timer)
+
+
+def stop_import_timing() -> None:
+    global _timer
+    if _timer is not None:
+        sys.meta_path.remove(_timer)
+        _timer = None
+
+
+def load_target(target: str):
+    """Resolve "module:attr", recording the import time if the module was not loaded yet"""
+    module_name, _, attr = target.partition(':')
+    if module_name in sys.modules:
+        return getattr(sys.modules[module_name], attr)
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed = time.perf_counter() - start
+    with _lock:
+        _lazy_costs[module_name] = elapsed
+    logger.info(f"[LAZY] loaded {module_name} in {elapsed * 1000:.0f}ms")
+    return getattr(module, attr)
+
+
+def lazy_callback(target: str) -> Callable:
+    """Async PTB callback that imports `target` ("module:function") on first use"""
+    handler = None
+
+    async def callback(update, context):
+        nonlocal handler
+        if handler is None:
+            handler = load_target(target)
+        return await handler(update, context)
+
+    callback.__name__ = target.rpartition(':')[2]
+    callback.__qualname__ = target
+    return callback
+
+
+def import_costs(limit: int = 15) -> List[Tuple[str, float, float]]:
+    """[(module, inclusive_ms, self_ms)] for startup imports, slowest first"""
+    with _lock:
+        rows = [(name, inc * 1000, own * 1000) for name, (inc, own) in _startup_costs.items()]
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows[:limit]
+
+
+def lazy_loads() -> List[Tuple[str, float]]:
+    with _lock:
+        rows = [(name, seconds * 1000) for name, seconds in _lazy_costs.items()]
+    return sorted(rows, key=lambda row: row[1], reverse=True)
+
+
+def import_report(limit: int = 15) -> str:
+    with _lock:
+        total = sum(own for _, own in _startup_costs.values()) * 1000
+        heavy = sorted(name for name in _startup_costs if name in HEAVY_LIBRARIES)
+    lines = [f"Startup imports: {total:.0f}ms across {len(_startup_costs)} modules"]
+    for name, inclusive, own in import_costs(limit):
+        lines.append(f"  {own:7.1f}ms self {inclusive:7.1f}ms total  {name}")
+    lines.append(f"Heavy libraries at startup: {', '.join(heavy) or 'none'}")
+    loads = lazy_loads()
+    if loads:
+        lines.append("Loaded on first use:")
+        lines.extend(f"  {ms:7.1f}ms  {name}" for name, ms in loads)
+    return "\n".join(lines)
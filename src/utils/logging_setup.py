@@ -0,0 +1,170 @@
+"""
+Process-wide logging: queued, optionally structured, sampled.
+
+configure_logging() puts a single QueueHandler on the root logger. A
+QueueListener thread formats each record and writes it to the rotating
+file and stdout, so code on the event loop only builds the LogRecord and
+puts it on a queue; it never waits on the disk. The record's message is
+formatted on the listener thread. Call sites that pass %-style arguments
+(`logger.info("[TAG] user_id=%s", uid)`) therefore skip the string work
+on the hot path, and skip it entirely when the level is disabled.
+
+LOG_FORMAT=json writes one JSON object per line with ts, level, logger,
+tag (the leading [TAG]), msg, any `extra=` fields, and exc.
+LOG_LEVELS sets per-logger levels (`src.utils.access_gate=WARNING,httpx=WARNING`).
+LOG_SAMPLE keeps 1 in N DEBUG/INFO records per tag (`ACCESS=10`).
+Warnings and errors are never sampled. A kept record carries `sampled=N`.
+"""
+
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes; anything else on a record came from `extra=`
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[QueueListener] = None
+_queued: Optional[QueueHandler] = None
+
+
+def split_tag(message: str):
+    """'[ACCESS] granted ...' -> ('ACCESS', 'granted ...'); (None, message) without a tag"""
+    if message.startswith('['):
+        end = message.find(']', 1, 40)
+        if end > 0:
+            return message[1:end], message[end + 1:].lstrip()
+    return None, message
+
+
+def parse_pairs(spec: str) -> Dict[str, str]:
+    """'a=1, b=2' -> {'a': '1', 'b': '2'}; malformed entries are ignored"""
+    pairs = {}
+    for item in (spec or '').split(','):
+        name, sep, value = item.partition('=')
+        if sep and name.strip() and value.strip():
+            pairs[name.strip()] = value.strip()
+    return pairs
+
+
+class TagSampler(logging.Filter):
+    """Keeps every Nth DEBUG/INFO record per [TAG]"""
+
+    def __init__(self, rates: Dict[str, int]):
+        super().__init__()
+        self.rates = {tag: every for tag, every in rates.items() if every > 1}
+        self._counters = {tag: itertools.count() for tag in self.rates}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates or not isinstance(record.msg, str):
+            return True
+        tag, _ = split_tag(record.msg)
+        every = self.rates.get(tag)
+        if every is None:
+            return True
+        if next(self._counters[tag]) % every:
+            return False
+        record.sampled = every
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+        tag, message = split_tag(record.getMessage())
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+        }
+        if tag:
+            entry['tag'] = tag
+        entry['msg'] = message
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_FIELDS)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        sampled = getattr(record, 'sampled', None)
+        return f"{line} (1 in {sampled})" if sampled else line
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueues the record as is; QueueHandler.prepare would format it on the caller's thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def apply_levels(spec: str) -> None:
+    for name, level in parse_pairs(spec).items():
+        logging.getLogger(name).setLevel(level.upper())
+
+
+def configure_logging(log_file: Optional[str] = None, console: bool = True) -> bool:
+    """Install the queued handlers on the root logger; False (levels only) if it already has handlers"""
+    from src.config import LOG_FORMAT, LOG_LEVEL, LOG_LEVELS, LOG_SAMPLE
+    global _listener, _queued
+
+    apply_levels(LOG_LEVELS)
+    root = logging.getLogger()
+    if root.handlers:
+        return False
+
+    formatter = JsonFormatter() if LOG_FORMAT == 'json' else TextFormatter(TEXT_FORMAT)
+    handlers = []
+    if log_file:
+        handlers.append(RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding='utf-8'))
+    if console:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    _queued = _DeferredQueueHandler(records)
+    rates = {tag: int(every) for tag, every in parse_pairs(LOG_SAMPLE).items() if every.isdigit()}
+    if rates:
+        _queued.addFilter(TagSampler(rates))
+    root.addHandler(_queued)
+    root.setLevel(LOG_LEVEL)
+
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_restart_listener)
+    return True
+
+
+def _restart_listener() -> None:
+    # A forked child (web tier workers) inherits the queue but not the listener thread
+    global _listener
+    if _listener is not None:
+        _listener = QueueListener(_listener.queue, *_listener.handlers, respect_handler_level=True)
+        _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush whatever is queued, stop the listener thread and detach from the root logger"""
+    global _listener, _queued
+    if _queued is not None:
+        logging.getLogger().removeHandler(_queued)
+        _queued = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
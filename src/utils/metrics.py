@@ -0,0 +1,292 @@
+"""
+In-process latency metrics for the bot's hot paths.
+
+Series are keyed by (kind, name):
+
+    handler   PTB handler callbacks: /command, cb:<route> for the callback
+              router, msg:<function> for message handlers
+    job       JobQueue callbacks scheduled at startup, by job name
+    query     execute_query, by normalised SQL fingerprint
+    telegram  outbound Bot API calls, by method (sendMessage, answerCallbackQuery)
+
+Each series keeps its lifetime count, error count and total time, plus the
+last METRICS_WINDOW samples for p50/p95/p99. Recording one sample takes a
+lock and appends to a deque. Percentiles are computed only when read.
+
+`instrument_handlers(application)` wraps every registered handler callback,
+including those nested in ConversationHandlers. `instrument_jobs` does the
+same for jobs queued at startup; code that queues jobs later (per-user
+reminders, follow-ups) wraps the callback itself with `timed_job`, under one
+series per job type rather than per job name. The query and Telegram series are recorded by
+connection.execute_query and utils.timed_request.TimedHTTPXRequest.
+
+While a handler or job runs, `current_caller()` returns its name and a
+per-invocation id (a ContextVar, so it follows asyncio.to_thread). The
+query profiler uses it to attribute queries to their caller.
+
+Read from /metrics on the web app (only when METRICS_TOKEN is set) and
+the admin /perf command. With WEB_SERVER_MODE=external the web workers
+are other processes, so the bot publishes its series to the shared state
+every METRICS_PUBLISH_SECONDS (`publish_metrics_snapshot`) and /metrics
+returns that copy alongside the worker's own series.
+"""
+
+import asyncio
+import itertools
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from src.config import METRICS_WINDOW
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('handler', 'job', 'query', 'telegram')
+CALLER_KINDS = frozenset({'handler', 'job'})
+BOT_SNAPSHOT = 'metrics:bot'  # shared_state snapshot name of the bot process's series
+
+
+class _Series:
+    __slots__ = ('count', 'errors', 'total_ms', 'max_ms', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=METRICS_WINDOW)
+
+
+_series: Dict[Tuple[str, str], _Series] = {}
+_lock = threading.Lock()
+
+# (handler/job name, invocation id) of the update or job being processed
+_caller: ContextVar[Optional[Tuple[str, int]]] = ContextVar('metrics_caller', default=None)
+_invocations = itertools.count(1)
+
+
+def current_caller() -> Optional[Tuple[str, int]]:
+    return _caller.get()
+
+
+def record(kind: str, name: str, seconds: float, error: bool = False) -> None:
+    ms = seconds * 1000
+    key = (kind, name)
+    with _lock:
+        series = _series.get(key)
+        if series is None:
+            series = _series[key] = _Series()
+        series.count += 1
+        series.errors += error
+        series.total_ms += ms
+        if ms > series.max_ms:
+            series.max_ms = ms
+        series.samples.append(ms)
+
+
+@contextmanager
+def timed(kind: str, name: str, ignore: tuple = ()):
+    """Time the block; exceptions count as errors unless they are in `ignore`"""
+    token = _caller.set((name, next(_invocations))) if kind in CALLER_KINDS else None
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except ignore:
+        raise
+    except BaseException:
+        error = True
+        raise
+    finally:
+        record(kind, name, time.perf_counter() - start, error)
+        if token is not None:
+            _caller.reset(token)
+
+
+def reset_metrics() -> None:
+    with _lock:
+        _series.clear()
+
+
+# --- SQL fingerprints ---
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """Collapse literals, placeholders and IN lists so one statement shape is one series"""
+    text = _STRING.sub('?', sql)
+    text = _NUMBER.sub('?', text)
+    text = _PLACEHOLDER.sub('?', text)
+    text = _IN_LIST.sub('(...)', text)
+    text = _WHITESPACE.sub(' ', text).strip()
+    return text[:160]
+
+
+# --- PTB handlers ---
+
+def handler_name(handler) -> str:
+    from telegram.ext import CallbackQueryHandler, CommandHandler, MessageHandler
+
+    if isinstance(handler, CommandHandler):
+        return '/' + sorted(handler.commands)[0]
+    name = getattr(handler.callback, '__name__', None) or repr(handler.callback)
+    if isinstance(handler, CallbackQueryHandler):
+        return f'cb:{name}'
+    if isinstance(handler, MessageHandler):
+        return f'msg:{name}'
+    return name
+
+
+def _wrap(callback, name: str, ignore: tuple):
+    async def timed_callback(update, context):
+        with timed('handler', name, ignore):
+            return await callback(update, context)
+
+    timed_callback.__name__ = getattr(callback, '__name__', name)
+    timed_callback.__wrapped__ = callback
+    return timed_callback
+
+
+def timed_job(callback, name: str):
+    """JobQueue callback that records a 'job' sample under `name` and sets current_caller()"""
+    async def timed_callback(context):
+        with timed('job', name):
+            return await callback(context)
+
+    timed_callback.__name__ = getattr(callback, '__name__', name)
+    timed_callback.__wrapped__ = callback
+    return timed_callback
+
+
+def _walk(handlers):
+    from telegram.ext import ConversationHandler
+
+    for handler in handlers:
+        if isinstance(handler, ConversationHandler):
+            yield from _walk(handler.entry_points)
+            for state_handlers in handler.states.values():
+                yield from _walk(state_handlers)
+            yield from _walk(handler.fallbacks)
+        else:
+            yield handler
+
+
+def instrument_handlers(application) -> int:
+    """Wrap every registered handler callback in a timer; returns how many were wrapped"""
+    from telegram.ext import ApplicationHandlerStop
+    from src.utils.callback_router import CallbackRouter
+
+    wrapped = 0
+    for group in application.handlers.values():
+        for handler in _walk(group):
+            callback = getattr(handler, 'callback', None)
+            if callback is None or hasattr(callback, '__wrapped__'):
+                continue
+            if isinstance(getattr(callback, '__self__', None), CallbackRouter):
+                continue  # the router times each route itself
+            handler.callback = _wrap(callback, handler_name(handler), (ApplicationHandlerStop,))
+            wrapped += 1
+    logger.info(f"[METRICS] timing {wrapped} handlers")
+    return wrapped
+
+
+def instrument_jobs(application) -> int:
+    """Wrap the callbacks of jobs queued so far (startup jobs) in a timer"""
+    wrapped = 0
+    for job in application.job_queue.jobs():
+        if hasattr(job.callback, '__wrapped__'):
+            continue
+        job.callback = timed_job(job.callback, job.name or getattr(job.callback, '__name__', 'job'))
+        wrapped += 1
+    logger.info(f"[METRICS] timing {wrapped} jobs")
+    return wrapped
+
+
+# --- Reading ---
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def metrics_snapshot(kind: Optional[str] = None) -> List[Dict]:
+    """One dict per series, slowest p95 first"""
+    with _lock:
+        items = [(k, s.count, s.errors, s.total_ms, s.max_ms, list(s.samples))
+                 for k, s in _series.items() if kind is None or k[0] == kind]
+    rows = []
+    for (series_kind, name), count, errors, total_ms, max_ms, samples in items:
+        samples.sort()
+        rows.append({
+            'kind': series_kind,
+            'name': name,
+            'count': count,
+            'errors': errors,
+            'error_rate': round(errors / count, 4) if count else 0.0,
+            'avg_ms': round(total_ms / count, 2) if count else 0.0,
+            'p50_ms': round(_percentile(samples, 50), 2),
+            'p95_ms': round(_percentile(samples, 95), 2),
+            'p99_ms': round(_percentile(samples, 99), 2),
+            'max_ms': round(max_ms, 2),
+        })
+    rows.sort(key=lambda row: row['p95_ms'], reverse=True)
+    return rows
+
+
+async def publish_metrics_snapshot(context) -> None:
+    """Job callback: copy this process's series to the shared state for the web workers"""
+    from src.web.shared_state import get_snapshot_store
+
+    try:
+        await asyncio.to_thread(get_snapshot_store().put, BOT_SNAPSHOT, metrics_snapshot())
+    except Exception as e:
+        logger.error(f"[METRICS] publishing snapshot failed: {e}")
+
+
+def published_metrics_snapshot(kind: Optional[str] = None) -> Optional[Dict]:
+    """The bot's last published series as {'published_at', 'age_seconds', 'series'}; None if never published"""
+    from src.web.shared_state import get_snapshot_store
+
+    try:
+        published = get_snapshot_store().get(BOT_SNAPSHOT)
+    except Exception as e:
+        logger.error(f"[METRICS] reading published snapshot failed: {e}")
+        return None
+    if published is None:
+        return None
+    rows, updated_at = published
+    return {
+        'published_at': datetime.fromtimestamp(updated_at).isoformat(timespec='seconds'),
+        'age_seconds': round(time.time() - updated_at, 1),
+        'series': [row for row in rows if kind is None or row['kind'] == kind],
+    }
+
+
+def metrics_report(kind: Optional[str] = None, limit: int = 8) -> str:
+    lines = []
+    for series_kind in ((kind,) if kind else KINDS):
+        rows = metrics_snapshot(series_kind)
+        calls = sum(row['count'] for row in rows)
+        lines.append(f"{series_kind}: {len(rows)} series, {calls} calls")
+        for row in rows[:limit]:
+            errors = f" err={row['error_rate']:.1%}" if row['errors'] else ''
+            lines.append(
+                f"  p50 {row['p50_ms']:7.1f} p95 {row['p95_ms']:7.1f} p99 {row['p99_ms']:7.1f}ms "
+                f"n={row['count']}{errors}  {row['name'][:60]}"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,135 @@
+"""
+Per-admin notification digests.
+
+The one delivery path for admin notifications: QR attendance and overrides
+from the web tier (src.utils.admin_notifications) and location check-ins
+awaiting approval (src.utils.checkin_fastpath) all call
+`deliver_admin_event`. Events are buffered per admin and sent as one digest
+every ADMIN_DIGEST_WINDOW_SECONDS by `flush_admin_digests`, with
+approve/reject buttons for each pending attendance in it. With 10 admins
+and 300 morning check-ins that is a few dozen messages instead of 3,000.
+
+Each admin's stored preferences (src.database.notification_preferences)
+decide the route: muted admins get nothing, 'instant' admins get every
+event straight away, everyone else gets the digest.
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from src.database.notification_preferences import NOTIFY_PRIORITY_INSTANT
+
+logger = logging.getLogger(__name__)
+
+DIGEST_MAX_ENTRIES = 10  # events per message; one approve/reject row each
+
+_digests: Dict[int, List[Dict]] = {}
+_digests_lock = threading.Lock()
+
+
+def notified_admins(admin_ids: List[int], prefs: Dict[int, Dict]) -> List[int]:
+    """The admins an event is delivered to at all (everyone not muted)"""
+    return [admin_id for admin_id in admin_ids if not (prefs.get(admin_id) or {}).get('muted')]
+
+
+def route_admin_event(entry: Dict, admin_ids: List[int], prefs: Dict[int, Dict]) -> List[int]:
+    """
+    Buffer `entry` for every digest admin.
+
+    Args:
+        entry: {'message': full HTML text, 'line': one-line HTML summary,
+                'name': plain-text member name (button labels), 'user_id': int,
+                'attendance_id': optional pending attendance,
+                'receipt': optional callable(admin_id, delivered) run after each send attempt}
+        admin_ids: recipients
+        prefs: output of get_admin_notification_prefs()
+
+    Returns:
+        Admins who want this event delivered immediately
+    """
+    instant = []
+    with _digests_lock:
+        for admin_id in notified_admins(admin_ids, prefs):
+            if (prefs.get(admin_id) or {}).get('priority') == NOTIFY_PRIORITY_INSTANT:
+                instant.append(admin_id)
+            else:
+                _digests.setdefault(admin_id, []).append(entry)
+    return instant
+
+
+def take_pending_digests() -> Dict[int, List[Dict]]:
+    """Remove and return everything buffered so far"""
+    global _digests
+    with _digests_lock:
+        pending, _digests = _digests, {}
+    return pending
+
+
+def format_digest(entries: List[Dict]) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+    if len(entries) == 1:
+        text = entries[0]['message']
+    else:
+        lines = [f"🔔 <b>{len(entries)} notifications</b>\n"]
+        lines.extend(entry['line'] for entry in entries)
+        text = "\n".join(lines)
+
+    keyboard = []
+    for entry in entries:
+        attendance_id = entry.get('attendance_id')
+        if not attendance_id:
+            continue
+        label = entry.get('name', '') if len(entries) > 1 else ''
+        keyboard.append([
+            InlineKeyboardButton(f"✅ {label}".strip(), callback_data=f"approve_attend_{attendance_id}"),
+            InlineKeyboardButton(f"❌ {label}".strip(), callback_data=f"reject_attend_{attendance_id}"),
+        ])
+    return text, InlineKeyboardMarkup(keyboard) if keyboard else None
+
+
+async def send_admin_digest(bot, admin_id: int, entries: List[Dict]) -> int:
+    """Send entries to one admin in chunks; returns messages sent"""
+    sent = 0
+    for start in range(0, len(entries), DIGEST_MAX_ENTRIES):
+        chunk = entries[start:start + DIGEST_MAX_ENTRIES]
+        text, markup = format_digest(chunk)
+        delivered = False
+        try:
+            await bot.send_message(chat_id=admin_id, text=text, parse_mode='HTML', reply_markup=markup)
+            sent += 1
+            delivered = True
+        except Exception as e:
+            logger.error(f"Error sending notification digest to admin {admin_id}: {e}")
+        for entry in chunk:
+            receipt = entry.get('receipt')
+            if receipt is not None:
+                receipt(admin_id, delivered)
+    return sent
+
+
+async def deliver_admin_event(bot, entry: Dict, admin_ids: List[int], prefs: Dict[int, Dict],
+                              digest: bool = True) -> int:
+    """
+    Route one event: buffer it for digest admins and send it to 'instant' ones now.
+
+    With digest=False every admin who has not muted notifications gets it
+    now (e.g. a check-in outside the rush). Returns messages sent now.
+    """
+    instant = route_admin_event(entry, admin_ids, prefs) if digest else notified_admins(admin_ids, prefs)
+    sent = 0
+    for admin_id in instant:
+        sent += await send_admin_digest(bot, admin_id, [entry])
+    return sent
+
+
+async def flush_admin_digests(context) -> int:
+    """Job callback: send each admin their buffered notifications as one digest"""
+    pending = take_pending_digests()
+    sent = 0
+    for admin_id, entries in pending.items():
+        sent += await send_admin_digest(context.bot, admin_id, entries)
+    if pending:
+        logger.info(f"[NOTIFY_DIGEST] admins={len(pending)} events={sum(map(len, pending.values()))} messages={sent}")
+    return sent
@@ -0,0 +1,163 @@
+"""
+Streaming bulk product import from Excel.
+
+The workbook is opened read-only and rows are streamed as plain values, so
+memory does not grow with the sheet. Every row is validated, the whole file
+is diffed against the current catalogue (one SELECT), and only new or
+changed products are written with batched upserts inside one transaction —
+a failed import leaves the catalogue untouched.
+
+Blocking: call `import_products` via asyncio.to_thread. The optional
+`progress(text)` callback is invoked from that worker thread.
+"""
+
+import logging
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.database.store_operations import bulk_upsert_products, get_product_snapshot
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_COLUMNS = (
+    'product_code', 'category', 'product_name', 'description',
+    'price', 'discount_percent', 'stock_quantity', 'status',
+)
+PRODUCT_STATUSES = ('ACTIVE', 'INACTIVE')
+
+IMPORT_PROGRESS_EVERY = 500
+IMPORT_BATCH_SIZE = 200
+
+
+class ProductImportError(ValueError):
+    """The uploaded file cannot be imported at all (e.g. wrong header)."""
+
+
+class ProductImportReport:
+    """Outcome of one import run."""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.errors: List[str] = []
+
+    @property
+    def applied(self) -> int:
+        return self.created + self.updated
+
+
+def _header_matches(value, column: str) -> bool:
+    if not isinstance(value, str):
+        return False
+    return value.lower().strip() in (column, column.replace('_', ' '), column.replace('_', '-'))
+
+
+def read_product_rows(file_obj) -> Iterator[Tuple[int, tuple]]:
+    """Yield (row_number, values) for each non-empty data row of the active sheet."""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        header = tuple(header) + (None,) * (len(PRODUCT_COLUMNS) - len(header))
+        if not all(_header_matches(header[i], col) for i, col in enumerate(PRODUCT_COLUMNS)):
+            raise ProductImportError(f"Expected columns: {', '.join(PRODUCT_COLUMNS)}")
+
+        for row_num, values in enumerate(rows, start=2):
+            values = tuple(values[:len(PRODUCT_COLUMNS)])
+            if not any(v not in (None, '') for v in values):
+                continue
+            yield row_num, values + (None,) * (len(PRODUCT_COLUMNS) - len(values))
+    finally:
+        workbook.close()
+
+
+def validate_product_row(row_num: int, values: tuple) -> Tuple[Optional[Dict], Optional[str]]:
+    """Convert one sheet row into a store_products record, or return an error."""
+    product_code, category, product_name, description, price, discount_percent, stock_quantity, status = values
+
+    if not product_code or not category or not product_name or price is None:
+        return None, f"Row {row_num}: Missing required fields"
+
+    try:
+        price = float(price)
+        discount_percent = float(discount_percent or 0)
+        stock_quantity = int(stock_quantity or 0)
+    except (TypeError, ValueError) as e:
+        return None, f"Row {row_num}: Invalid data type - {str(e)}"
+
+    if price < 0 or stock_quantity < 0 or not 0 <= discount_percent <= 100:
+        return None, f"Row {row_num}: Price/stock must be positive and discount 0-100"
+
+    status = str(status or 'ACTIVE').strip().upper()
+    if status not in PRODUCT_STATUSES:
+        status = 'ACTIVE'
+
+    return {
+        'product_code': str(product_code).strip(),
+        'category': str(category).strip(),
+        'name': str(product_name).strip(),
+        'description': str(description or "").strip(),
+        'price': price,
+        'discount_percent': discount_percent,
+        'stock': stock_quantity,
+        'status': status,
+    }, None
+
+
+def _is_unchanged(existing: Dict, product: Dict) -> bool:
+    try:
+        return (
+            str(existing.get('category') or '') == product['category']
+            and str(existing.get('name') or '') == product['name']
+            and str(existing.get('description') or '') == product['description']
+            and float(existing.get('price') or 0) == product['price']
+            and float(existing.get('discount_percent') or 0) == product['discount_percent']
+            and int(existing.get('stock') or 0) == product['stock']
+            and str(existing.get('status') or '').upper() == product['status']
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def import_products(file_obj, progress: Optional[Callable[[str], None]] = None,
+                    batch_size: int = IMPORT_BATCH_SIZE) -> ProductImportReport:
+    """Validate, diff and apply a product sheet. Raises ProductImportError on a bad file."""
+    report = ProductImportReport()
+    pending: Dict[str, Dict] = {}
+
+    for row_num, values in read_product_rows(file_obj):
+        report.rows_read += 1
+        product, error = validate_product_row(row_num, values)
+        if error:
+            report.errors.append(error)
+        else:
+            # Later rows win, matching the old row-by-row upsert
+            pending[product['product_code']] = product
+        if progress and report.rows_read % IMPORT_PROGRESS_EVERY == 0:
+            progress(f"⏳ Validated {report.rows_read} rows...")
+
+    snapshot = get_product_snapshot()
+    changes = []
+    for code, product in pending.items():
+        existing = snapshot.get(code)
+        if existing is None:
+            report.created += 1
+        elif _is_unchanged(existing, product):
+            report.unchanged += 1
+            continue
+        else:
+            report.updated += 1
+        changes.append(product)
+
+    if progress:
+        progress(f"⏳ Saving {len(changes)} changed products...")
+    bulk_upsert_products(changes, batch_size=batch_size)
+
+    logger.info(
+        f"[PRODUCT_IMPORT] rows={report.rows_read} created={report.created} "
+        f"updated={report.updated} unchanged={report.unchanged} errors={len(report.errors)}"
+    )
+    return report
@@ -0,0 +1,264 @@
+"""
+Ranked fuzzy product search over the store catalogue.
+
+Both catalogue tables (`store_items` for GST/invoice items and
+`store_products` for the storefront) are loaded once into an in-memory
+index of normalised tokens. Queries are matched token by token:
+
+    exact token   -> strongest match
+    token prefix  -> "herba" finds "Herbalife"
+    substring     -> "life" finds "Herbalife" (old LIKE behaviour)
+    edit distance -> "herbalfe" / "formla" still find the product
+
+Writers call `invalidate_product_index(source)` after changing the
+catalogue; the index is rebuilt lazily on the next search so a bulk Excel
+upload costs one rebuild instead of one per row.
+"""
+
+import bisect
+import logging
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SOURCE_STORE_ITEMS = 'store_items'
+SOURCE_STORE_PRODUCTS = 'store_products'
+
+_SOURCE_QUERIES = {
+    SOURCE_STORE_ITEMS: "SELECT * FROM store_items",
+    SOURCE_STORE_PRODUCTS: "SELECT * FROM store_products",
+}
+
+# Column aliases across the legacy/v2 schemas of the catalogue tables
+_NAME_KEYS = ('item_name', 'name')
+_CODE_KEYS = ('hsn_code', 'hsn', 'product_code')
+_SERIAL_KEYS = ('serial_no', 'serial', 'product_id')
+
+# Scores per matched query token
+_SCORE_EXACT = 3.0
+_SCORE_PREFIX = 2.0
+_SCORE_INFIX = 1.5
+_SCORE_FUZZY = 1.0
+
+_SPLIT_RE = re.compile(r'[^0-9a-z]+')
+_ALNUM_BOUNDARY_RE = re.compile(r'(?<=[a-z])(?=[0-9])|(?<=[0-9])(?=[a-z])')
+
+
+def normalize_text(text) -> str:
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    if text is None:
+        return ''
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return ' '.join(_SPLIT_RE.split(text)).strip()
+
+
+def tokenize(text) -> List[str]:
+    """Split text into search tokens ("F1 500ml" -> ['f1', 'f', '1', '500ml', '500', 'ml'])."""
+    tokens = []
+    for word in normalize_text(text).split():
+        tokens.append(word)
+        parts = _ALNUM_BOUNDARY_RE.split(word)
+        if len(parts) > 1:
+            tokens.extend(p for p in parts if p)
+    return tokens
+
+
+def _max_distance(token: str) -> int:
+    """Allowed edit distance grows with token length (short and numeric tokens must be exact)."""
+    if len(token) <= 3 or any(ch.isdigit() for ch in token):
+        return 0
+    if len(token) <= 6:
+        return 1
+    return 2
+
+
+def bounded_edit_distance(a: str, b: str, max_dist: int) -> int:
+    """Levenshtein distance with early exit; returns max_dist + 1 when exceeded."""
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(a) + 1))
+    for i, cb in enumerate(b, start=1):
+        current = [i] + [0] * len(a)
+        row_min = i
+        for j, ca in enumerate(a, start=1):
+            cost = 0 if ca == cb else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if current[j] < row_min:
+                row_min = current[j]
+        if row_min > max_dist:
+            return max_dist + 1
+        previous = current
+    return previous[-1]
+
+
+def _first(row: Dict, keys: Tuple[str, ...]):
+    for key in keys:
+        value = row.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+class ProductSearchIndex:
+    """Immutable token index over a list of catalogue rows."""
+
+    def __init__(self, rows: List[Dict]):
+        self.rows = list(rows or [])
+        self._names = []
+        self._postings: Dict[str, set] = {}
+        self._serials: Dict[str, int] = {}
+        self._categories: Dict[str, List[int]] = {}
+        for pos, row in enumerate(self.rows):
+            name = _first(row, _NAME_KEYS) or ''
+            self._names.append(normalize_text(name))
+            serial = _first(row, _SERIAL_KEYS)
+            if serial is not None:
+                self._serials.setdefault(str(serial).strip(), pos)
+            code = _first(row, _CODE_KEYS) or ''
+            for token in set(tokenize(name) + tokenize(code)):
+                self._postings.setdefault(token, set()).add(pos)
+            category = row.get('category')
+            if category is not None:
+                self._categories.setdefault(str(category), []).append(pos)
+        for positions in self._categories.values():
+            positions.sort(key=lambda p: self._names[p])
+        self._vocab = sorted(self._postings)
+        self._by_length: Dict[int, List[str]] = {}
+        for token in self._vocab:
+            self._by_length.setdefault(len(token), []).append(token)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get_by_serial(self, serial) -> Optional[Dict]:
+        pos = self._serials.get(str(serial).strip())
+        return self.rows[pos] if pos is not None else None
+
+    def in_category(self, category: str, predicate=None) -> List[Dict]:
+        """Rows of one category ordered by name (storefront browsing)."""
+        rows = (self.rows[pos] for pos in self._categories.get(str(category), ()))
+        return [row for row in rows if predicate is None or predicate(row)]
+
+    def _match_token(self, token: str) -> Dict[int, float]:
+        """Best score per row position for a single query token."""
+        scores: Dict[int, float] = {}
+
+        def _add(token_hit: str, score: float):
+            for pos in self._postings.get(token_hit, ()):
+                if score > scores.get(pos, 0.0):
+                    scores[pos] = score
+
+        if token in self._postings:
+            _add(token, _SCORE_EXACT)
+
+        start = bisect.bisect_left(self._vocab, token)
+        for vocab_token in self._vocab[start:]:
+            if not vocab_token.startswith(token):
+                break
+            if vocab_token != token:
+                _add(vocab_token, _SCORE_PREFIX)
+
+        # Keep the old LIKE '%term%' recall for "life" -> "herbalife"
+        if len(token) >= 3:
+            for vocab_token in self._vocab:
+                if len(vocab_token) > len(token) and token in vocab_token[1:]:
+                    _add(vocab_token, _SCORE_INFIX)
+
+        max_dist = _max_distance(token)
+        if max_dist:
+            for length in range(len(token) - max_dist, len(token) + max_dist + 1):
+                for vocab_token in self._by_length.get(length, ()):
+                    dist = bounded_edit_distance(token, vocab_token, max_dist)
+                    if 0 < dist <= max_dist:
+                        _add(vocab_token, _SCORE_FUZZY - 0.25 * (dist - 1))
+        return scores
+
+    def search(self, term: str, limit: int = 10, predicate=None) -> List[Dict]:
+        """Return rows ranked by token coverage, match quality and name."""
+        query_tokens = list(dict.fromkeys(normalize_text(term).split()))
+        if not query_tokens:
+            return []
+
+        totals: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        for token in query_tokens:
+            for pos, score in self._match_token(token).items():
+                totals[pos] = totals.get(pos, 0.0) + score
+                matched[pos] = matched.get(pos, 0) + 1
+
+        phrase = ' '.join(query_tokens)
+        ranked = []
+        for pos, score in totals.items():
+            row = self.rows[pos]
+            if predicate is not None and not predicate(row):
+                continue
+            name = self._names[pos]
+            if name == phrase:
+                score += _SCORE_EXACT
+            elif name.startswith(phrase):
+                score += _SCORE_PREFIX
+            ranked.append((-matched[pos], -score, name, pos))
+        ranked.sort()
+        return [self.rows[pos] for _, _, _, pos in ranked[:limit]]
+
+
+_indexes: Dict[str, ProductSearchIndex] = {}
+_dirty: Dict[str, bool] = {}
+_lock = threading.Lock()
+
+
+def _load_rows(source: str) -> List[Dict]:
+    from src.database.connection import execute_query
+    rows = execute_query(_SOURCE_QUERIES[source])
+    return rows or []
+
+
+def get_product_index(source: str = SOURCE_STORE_ITEMS) -> ProductSearchIndex:
+    """Return the cached index for a catalogue table, rebuilding it if stale."""
+    if source not in _SOURCE_QUERIES:
+        raise ValueError(f"Unknown product search source: {source}")
+    index = _indexes.get(source)
+    if index is not None and not _dirty.get(source):
+        return index
+    with _lock:
+        index = _indexes.get(source)
+        if index is None or _dirty.get(source):
+            _dirty[source] = False
+            index = ProductSearchIndex(_load_rows(source))
+            _indexes[source] = index
+            logger.info(f"[PRODUCT_SEARCH] index built source={source} rows={len(index)}")
+    return index
+
+
+def invalidate_product_index(source: Optional[str] = None) -> None:
+    """Mark one (or every) catalogue index stale; rebuilt on next search."""
+    for name in ([source] if source else list(_SOURCE_QUERIES)):
+        _dirty[name] = True
+    logger.debug(f"[PRODUCT_SEARCH] index invalidated source={source or 'all'}")
+
+
+def search_products(term: str, source: str = SOURCE_STORE_ITEMS, limit: int = 10, predicate=None) -> List[Dict]:
+    """Ranked fuzzy search; numeric terms also resolve an exact serial first."""
+    index = get_product_index(source)
+    term = (term or '').strip()
+    if not term:
+        return []
+    results = []
+    if term.isdigit():
+        row = index.get_by_serial(term)
+        if row is not None and (predicate is None or predicate(row)):
+            results.append(row)
+    for row in index.search(term, limit=limit, predicate=predicate):
+        if len(results) >= limit:
+            break
+        if not any(row is r for r in results):
+            results.append(row)
+    return results
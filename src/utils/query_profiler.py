@@ -0,0 +1,214 @@
+"""
+Opt-in query profiler (QUERY_PROFILE=1, or `/perf profile on`).
+
+While enabled, every execute_query call is:
+- aggregated in memory by SQL fingerprint: calls, total/max time, rows,
+  and calls per handler/job (src.utils.metrics.current_caller)
+- appended to QUERY_PROFILE_LOG as one JSON line
+  {ts, ms, rows, fp, caller, inv, params, error}
+- also written to SLOW_QUERY_LOG when it took SLOW_QUERY_MS or longer
+
+`params` holds the shapes of the bound parameters (int, str(12),
+list(40)), never their values. Both logs rotate like the main bot log.
+
+`tools/query_report.py` reads the JSON lines offline and ranks
+fingerprints by total time. It flags fingerprints that one handler/job
+invocation runs many times (N+1 candidates).
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.config import QUERY_PROFILE_LOG, SLOW_QUERY_LOG, SLOW_QUERY_MS
+from src.utils.metrics import current_caller
+
+logger = logging.getLogger(__name__)
+
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUPS = 5
+N_PLUS_ONE_CALLS = 5  # same fingerprint this many times in one invocation
+
+ENABLED = False
+
+_profile: Dict[str, Dict] = {}
+_lock = threading.Lock()
+_profile_log: Optional[logging.Logger] = None
+_slow_log: Optional[logging.Logger] = None
+
+
+def _file_logger(name: str, path: str) -> logging.Logger:
+    log = logging.getLogger(name)
+    target = str(Path(path).resolve())
+    if not any(getattr(h, 'baseFilename', None) == target for h in log.handlers):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+    return log
+
+
+def set_query_profiling(enabled: bool) -> None:
+    global ENABLED, _profile_log, _slow_log
+    if enabled and _profile_log is None:
+        _profile_log = _file_logger('query_profile', QUERY_PROFILE_LOG)
+        _slow_log = _file_logger('slow_queries', SLOW_QUERY_LOG)
+    ENABLED = enabled
+    logger.info(f"[PROFILE] query profiling {'on' if enabled else 'off'} slow>={SLOW_QUERY_MS}ms")
+
+
+def reset_query_profile() -> None:
+    with _lock:
+        _profile.clear()
+
+
+def param_shape(value) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, (int, float)):
+        return type(value).__name__
+    if isinstance(value, (str, bytes, list, tuple, set, frozenset, dict)):
+        return f'{type(value).__name__}({len(value)})'
+    if isinstance(value, datetime):
+        return 'datetime'
+    if isinstance(value, date):
+        return 'date'
+    return type(value).__name__
+
+
+def row_count(result) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return 1
+    if isinstance(result, int):
+        return max(result, 0)
+    return 0
+
+
+def observe(fp: str, seconds: float, result, params, error: bool) -> None:
+    """Called by execute_query for every query while profiling is enabled"""
+    ms = seconds * 1000
+    rows = row_count(result)
+    caller = current_caller()
+    name, inv = caller if caller else ('-', None)
+
+    with _lock:
+        entry = _profile.get(fp)
+        if entry is None:
+            entry = _profile[fp] = {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0, 'callers': Counter()}
+        entry['calls'] += 1
+        entry['total_ms'] += ms
+        entry['max_ms'] = max(entry['max_ms'], ms)
+        entry['rows'] += rows
+        entry['callers'][name] += 1
+
+    line = json.dumps({
+        'ts': round(time.time(), 3), 'ms': round(ms, 3), 'rows': rows, 'fp': fp,
+        'caller': name, 'inv': inv, 'params': [param_shape(p) for p in (params or ())], 'error': error,
+    })
+    try:
+        _profile_log.info(line)
+        if ms >= SLOW_QUERY_MS:
+            _slow_log.info(line)
+    except Exception as e:
+        logger.debug(f"[PROFILE] could not write profile line: {e}")
+
+
+def profile_top(limit: int = 10) -> List[Dict]:
+    """In-memory aggregate since profiling was enabled, by total time"""
+    with _lock:
+        rows = [dict(entry, fp=fp, callers=entry['callers'].most_common(3)) for fp, entry in _profile.items()]
+    rows.sort(key=lambda row: row['total_ms'], reverse=True)
+    return rows[:limit]
+
+
+def profile_report(limit: int = 10) -> str:
+    rows = profile_top(limit)
+    lines = [f"Query profile ({'on' if ENABLED else 'off'}, slow>={SLOW_QUERY_MS}ms): {len(_profile)} fingerprints"]
+    for row in rows:
+        callers = ", ".join(f"{name}×{count}" for name, count in row['callers'])
+        lines.append(f"  {row['total_ms']:8.0f}ms n={row['calls']} rows={row['rows']}  {row['fp'][:70]}")
+        lines.append(f"           by {callers}")
+    return "\n".join(lines)
+
+
+# --- Offline analysis (tools/query_report.py) ---
+
+def load_records(paths: Iterable[str]) -> Iterable[Dict]:
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def summarise(records: Iterable[Dict], n_plus_one: int = N_PLUS_ONE_CALLS) -> List[Dict]:
+    """Aggregate profile lines by fingerprint, ranked by total time"""
+    by_fp: Dict[str, Dict] = {}
+    per_invocation: Dict[tuple, int] = defaultdict(int)
+    for rec in records:
+        entry = by_fp.get(rec['fp'])
+        if entry is None:
+            entry = by_fp[rec['fp']] = {
+                'fp': rec['fp'], 'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                'rows': 0, 'callers': Counter(), 'params': Counter(),
+            }
+        entry['calls'] += 1
+        entry['errors'] += bool(rec.get('error'))
+        entry['total_ms'] += rec['ms']
+        entry['max_ms'] = max(entry['max_ms'], rec['ms'])
+        entry['rows'] += rec.get('rows', 0)
+        entry['callers'][rec.get('caller', '-')] += 1
+        entry['params'][tuple(rec.get('params', ()))] += 1
+        if rec.get('inv') is not None:
+            per_invocation[(rec['fp'], rec['caller'], rec['inv'])] += 1
+
+    worst: Dict[tuple, int] = {}
+    for (fp, caller, _), count in per_invocation.items():
+        worst[(fp, caller)] = max(worst.get((fp, caller), 0), count)
+
+    summary = []
+    for fp, entry in by_fp.items():
+        entry['avg_ms'] = entry['total_ms'] / entry['calls']
+        entry['n_plus_one'] = sorted(
+            ((caller, count) for (f, caller), count in worst.items() if f == fp and count >= n_plus_one),
+            key=lambda item: item[1], reverse=True,
+        )
+        summary.append(entry)
+    summary.sort(key=lambda entry: entry['total_ms'], reverse=True)
+    return summary
+
+
+def format_summary(summary: List[Dict], top: int = 20) -> str:
+    total = sum(entry['total_ms'] for entry in summary) or 1.0
+    lines = [f"{len(summary)} fingerprints, {sum(e['calls'] for e in summary)} queries, {total:.0f}ms total", ""]
+    for rank, entry in enumerate(summary[:top], 1):
+        lines.append(
+            f"#{rank} {entry['total_ms']:.0f}ms ({entry['total_ms'] / total:.0%}) calls={entry['calls']} "
+            f"avg={entry['avg_ms']:.1f}ms max={entry['max_ms']:.1f}ms rows/call={entry['rows'] / entry['calls']:.1f}"
+            + (f" errors={entry['errors']}" if entry['errors'] else '')
+        )
+        lines.append(f"   {entry['fp']}")
+        lines.append("   callers: " + ", ".join(f"{name}×{n}" for name, n in entry['callers'].most_common(4)))
+        shapes, _ = entry['params'].most_common(1)[0]
+        if shapes:
+            lines.append(f"   params: ({', '.join(shapes)})")
+        for caller, count in entry['n_plus_one'][:3]:
+            lines.append(f"   N+1? {caller} ran this {count}× in one invocation")
+        lines.append("")
+    return "\n".join(lines)
@@ -12,6 +12,7 @@ from src.database.reports_operations import (
     get_top_performers, get_inactive_users, get_expiring_soon_members,
     get_membership_stats
 )
+from src.database.rollup_operations import get_period_summary, PERIOD_WEEK, PERIOD_MONTH
 
 logger = logging.getLogger(__name__)
 
@@ -296,6 +297,14 @@ def generate_eod_report(date: Optional[datetime] = None) -> str:
     report += f"✅ Habits: {total_habits}\n"
     report += f"🥛 Shakes: {total_shakes}\n\n"
     
+    # Week / month to date (from the period rollups)
+    week = get_period_summary(PERIOD_WEEK, date.date())
+    month = get_period_summary(PERIOD_MONTH, date.date())
+    report += "📆 *WEEK / MONTH TO DATE*\n"
+    report += f"✅ Active Members: {week['active_members']} / {month['active_members']}\n"
+    report += f"🏋️ Attendance: {week['attendance_days']} / {month['attendance_days']}\n"
+    report += f"💰 Points: {week['points_earned']} / {month['points_earned']}\n\n"
+    
     # Top 5 Performers Today
     top_today = sorted(activities, key=lambda x: x['activity_score'], reverse=True)[:5]
     report += "🏆 *TOP 5 TODAY*\n"
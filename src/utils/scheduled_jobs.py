@@ -8,6 +8,7 @@ from src.utils.report_generator import generate_eod_report
 from src.database.reports_operations import move_expired_to_inactive
 from src.database.user_operations import get_all_paid_users
 from src.config import SUPER_ADMIN_USER_ID
+from src.utils.metrics import timed_job
 
 logger = logging.getLogger(__name__)
 
@@ -47,15 +48,18 @@ def _notify_admin_reminder_failure(ctx, user_id: int, rtype: str, error: Excepti
         logger.debug("Could not notify admin about reminder failure")
 
 
-def schedule_user_water_reminder(application, user_id: int, interval_minutes: int):
-    """Schedule a repeating per-user water reminder. Idempotent."""
+def schedule_user_water_reminder(application, user_id: int, interval_minutes: int, replace: bool = True):
+    """Schedule a repeating per-user water reminder. Idempotent.
+
+    replace=False skips the lookup for an existing job (bootstrap already knows there is none).
+    """
     try:
         job_name = f"water:{user_id}"
         # Cancel existing job if interval changed
-        existing = application.job_queue.get_jobs_by_name(job_name)
+        existing = application.job_queue.get_jobs_by_name(job_name) if replace else ()
         if existing:
             # If existing interval differs we reschedule
-            logger.info(f"[REMINDER] type=LOG_WATER user_id={user_id} rescheduling interval={interval_minutes}")
+            logger.info("[REMINDER] type=LOG_WATER user_id=%s rescheduling interval=%s", user_id, interval_minutes)
             for j in existing:
                 try:
                     j.schedule_removal()
@@ -67,7 +71,7 @@ def schedule_user_water_reminder(application, user_id: int, interval_minutes: in
             from src.database.reminder_operations import get_reminder_profile
             prefs = get_reminder_profile(user_id)
             if not prefs or not prefs.get('water_enabled', True):
-                logger.info(f"[REMINDER] type=LOG_WATER user_id={user_id} disabled")
+                logger.info("[REMINDER] type=LOG_WATER user_id=%s disabled", user_id)
                 return
             # send single reminder
             try:
@@ -80,13 +84,13 @@ def schedule_user_water_reminder(application, user_id: int, interval_minutes: in
                 keyboard = [[InlineKeyboardButton("💧 Log Water", callback_data="cmd_water")]]
                 reply_markup = InlineKeyboardMarkup(keyboard)
                 await ctx.bot.send_message(chat_id=user_id, text=text, parse_mode="Markdown", reply_markup=reply_markup)
-                logger.info(f"[REMINDER_SENT] type=water user_id={user_id}")
+                logger.info("[REMINDER_SENT] type=water user_id=%s", user_id)
             except Exception as e:
                 logger.error(f"Could not send water reminder to user {user_id}: {e}")
                 _notify_admin_reminder_failure(ctx, user_id, "water", e)
 
-        application.job_queue.run_repeating(_user_water_job, interval=interval_minutes * 60, first=10, name=job_name)
-        logger.info(f"[REMINDER_BOOT] type=water user_id={user_id} interval={interval_minutes}m")
+        application.job_queue.run_repeating(timed_job(_user_water_job, 'reminder:water'), interval=interval_minutes * 60, first=10, name=job_name)
+        logger.debug("[REMINDER_BOOT] type=water user_id=%s interval=%sm", user_id, interval_minutes)
     except Exception as e:
         logger.debug(f"Failed to schedule water reminder for {user_id}: {e}")
 
@@ -100,12 +104,12 @@ def cancel_user_water_reminder(application, user_id: int):
                 j.schedule_removal()
             except Exception:
                 pass
-        logger.info(f"[REMINDER] type=LOG_WATER user_id={user_id} cancelled")
+        logger.info("[REMINDER] type=LOG_WATER user_id=%s cancelled", user_id)
     except Exception as e:
         logger.debug(f"Failed to cancel water reminder for {user_id}: {e}")
 
 
-def schedule_user_weight_reminder(application, user_id: int, time_str: str):
+def schedule_user_weight_reminder(application, user_id: int, time_str: str, replace: bool = True):
     """Schedule a daily per-user weight reminder at `time_str` (HH:MM). Idempotent."""
     try:
         # parse time_str
@@ -118,7 +122,7 @@ def schedule_user_weight_reminder(application, user_id: int, time_str: str):
             hh, mm = 6, 0
 
         job_name = f"weight:{user_id}"
-        existing = application.job_queue.get_jobs_by_name(job_name)
+        existing = application.job_queue.get_jobs_by_name(job_name) if replace else ()
         if existing:
             # Remove existing before scheduling new
             for j in existing:
@@ -126,13 +130,13 @@ def schedule_user_weight_reminder(application, user_id: int, time_str: str):
                     j.schedule_removal()
                 except Exception:
                     pass
-            logger.info(f"[REMINDER] type=LOG_WEIGHT user_id={user_id} rescheduled new_time={time_str}")
+            logger.info("[REMINDER] type=LOG_WEIGHT user_id=%s rescheduled new_time=%s", user_id, time_str)
 
         async def _user_weight_job(ctx: ContextTypes.DEFAULT_TYPE):
             from src.database.reminder_operations import get_reminder_profile
             prefs = get_reminder_profile(user_id)
             if not prefs or not prefs.get('weight_enabled', True):
-                logger.info(f"[REMINDER] type=LOG_WEIGHT user_id={user_id} disabled")
+                logger.info("[REMINDER] type=LOG_WEIGHT user_id=%s disabled", user_id)
                 return
             try:
                 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
@@ -144,33 +148,33 @@ def schedule_user_weight_reminder(application, user_id: int, time_str: str):
                 keyboard = [[InlineKeyboardButton("⚖️ Log Weight", callback_data="cmd_weight")]]
                 reply_markup = InlineKeyboardMarkup(keyboard)
                 await ctx.bot.send_message(chat_id=user_id, text=text, parse_mode="Markdown", reply_markup=reply_markup)
-                logger.info(f"[REMINDER_SENT] type=weight user_id={user_id}")
+                logger.info("[REMINDER_SENT] type=weight user_id=%s", user_id)
             except Exception as e:
                 logger.error(f"Could not send weight reminder to user {user_id}: {e}")
                 _notify_admin_reminder_failure(ctx, user_id, "weight", e)
 
         from datetime import time as dt_time
-        application.job_queue.run_daily(_user_weight_job, time=dt_time(hour=hh, minute=mm), name=job_name)
-        logger.info(f"[REMINDER_BOOT] type=weight user_id={user_id} time={time_str}")
+        application.job_queue.run_daily(timed_job(_user_weight_job, 'reminder:weight'), time=dt_time(hour=hh, minute=mm), name=job_name)
+        logger.debug("[REMINDER_BOOT] type=weight user_id=%s time=%s", user_id, time_str)
     except Exception as e:
         logger.debug(f"Failed to schedule weight reminder for {user_id}: {e}")
 
 
 def cancel_user_weight_reminder(application, user_id: int):
     try:
-        job_name = f"weight_reminder_{user_id}"
+        job_name = f"weight:{user_id}"
         existing = application.job_queue.get_jobs_by_name(job_name)
         for j in existing:
             try:
                 j.schedule_removal()
             except Exception:
                 pass
-        logger.info(f"[REMINDER] type=LOG_WEIGHT user_id={user_id} cancelled")
+        logger.info("[REMINDER] type=LOG_WEIGHT user_id=%s cancelled", user_id)
     except Exception as e:
         logger.debug(f"Failed to cancel weight reminder for {user_id}: {e}")
 
 
-def schedule_user_meal_reminder(application, user_id: int, meal: str, time_str: str):
+def schedule_user_meal_reminder(application, user_id: int, meal: str, time_str: str, replace: bool = True):
     if meal not in {"lunch", "dinner"}:
         return
     try:
@@ -182,7 +186,7 @@ def schedule_user_meal_reminder(application, user_id: int, meal: str, time_str:
             hh, mm = (13, 0) if meal == "lunch" else (20, 0)
 
         job_name = f"{meal}:{user_id}"
-        existing = application.job_queue.get_jobs_by_name(job_name)
+        existing = application.job_queue.get_jobs_by_name(job_name) if replace else ()
         for j in existing:
             try:
                 j.schedule_removal()
@@ -193,7 +197,7 @@ def schedule_user_meal_reminder(application, user_id: int, meal: str, time_str:
             from src.database.reminder_operations import get_reminder_profile
             prefs = get_reminder_profile(user_id)
             if not prefs or not prefs.get(f"{meal}_enabled", False):
-                logger.info(f"[REMINDER] type={meal} user_id={user_id} disabled")
+                logger.info("[REMINDER] type=%s user_id=%s disabled", meal, user_id)
                 return
             try:
                 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
@@ -204,14 +208,14 @@ def schedule_user_meal_reminder(application, user_id: int, meal: str, time_str:
                 )
                 keyboard = [[InlineKeyboardButton("🍽️ Log Meal", callback_data="cmd_meal")]]
                 await ctx.bot.send_message(chat_id=user_id, text=text, parse_mode="Markdown", reply_markup=InlineKeyboardMarkup(keyboard))
-                logger.info(f"[REMINDER_SENT] type={meal} user_id={user_id}")
+                logger.info("[REMINDER_SENT] type=%s user_id=%s", meal, user_id)
             except Exception as e:
                 logger.error(f"Could not send {meal} reminder to user {user_id}: {e}")
                 _notify_admin_reminder_failure(ctx, user_id, meal, e)
 
         from datetime import time as dt_time
-        application.job_queue.run_daily(_meal_job, time=dt_time(hour=hh, minute=mm), name=job_name)
-        logger.info(f"[REMINDER_BOOT] type={meal} user_id={user_id} time={time_str}")
+        application.job_queue.run_daily(timed_job(_meal_job, f'reminder:{meal}'), time=dt_time(hour=hh, minute=mm), name=job_name)
+        logger.debug("[REMINDER_BOOT] type=%s user_id=%s time=%s", meal, user_id, time_str)
     except Exception as e:
         logger.debug(f"Failed to schedule {meal} reminder for {user_id}: {e}")
 
@@ -227,48 +231,66 @@ def cancel_user_meal_reminder(application, user_id: int, meal: str):
                 j.schedule_removal()
             except Exception:
                 pass
-        logger.info(f"[REMINDER] type={meal} user_id={user_id} cancelled")
+        logger.info("[REMINDER] type=%s user_id=%s cancelled", meal, user_id)
     except Exception as e:
         logger.debug(f"Failed to cancel {meal} reminder for {user_id}: {e}")
 
 
-def schedule_all_user_reminders(application):
+def schedule_profile_reminders(application, profile: dict, existing: set = None) -> list:
+    """Schedule or cancel one reminder_profile row's reminders; returns the scheduled types.
+
+    `existing` is the set of queued job names. Bootstrap passes it so users
+    without a job skip the per-name job queue scans.
+    """
+    uid = profile.get('user_id')
+
+    def queued(name):
+        return existing is None or name in existing
+
+    scheduled = []
+    if profile.get('water_enabled'):
+        schedule_user_water_reminder(application, uid, profile.get('water_interval_minutes', 60),
+                                     replace=queued(f"water:{uid}"))
+        scheduled.append('water')
+    elif queued(f"water:{uid}"):
+        cancel_user_water_reminder(application, uid)
+
+    if profile.get('weight_enabled'):
+        schedule_user_weight_reminder(application, uid, profile.get('weight_time', '06:00'),
+                                      replace=queued(f"weight:{uid}"))
+        scheduled.append('weight')
+    elif queued(f"weight:{uid}"):
+        cancel_user_weight_reminder(application, uid)
+
+    for meal, default_time in (('lunch', '13:00'), ('dinner', '20:00')):
+        if profile.get(f'{meal}_enabled'):
+            schedule_user_meal_reminder(application, uid, meal, profile.get(f'{meal}_time', default_time),
+                                        replace=queued(f"{meal}:{uid}"))
+            scheduled.append(meal)
+        elif queued(f"{meal}:{uid}"):
+            cancel_user_meal_reminder(application, uid, meal)
+
+    logger.debug("[REMINDER_BOOT] user_id=%s scheduled=%s", uid, scheduled)
+    return scheduled
+
+
+def queued_job_names(application) -> set:
+    return {job.name for job in application.job_queue.jobs()}
+
+
+def schedule_all_user_reminders(application, profiles: list = None):
     """Bootstrap per-user reminders from reminder_profile (idempotent)."""
     try:
-        from src.database.reminder_operations import get_all_profiles
+        if profiles is None:
+            from src.database.reminder_operations import get_all_profiles
 
-        logger.info("[BOOTSTRAP] Loading reminder profiles for scheduling...")
-        profiles = get_all_profiles() or []
+            logger.info("[BOOTSTRAP] Loading reminder profiles for scheduling...")
+            profiles = get_all_profiles() or []
         logger.info(f"[BOOTSTRAP] Found {len(profiles)} reminder profiles")
 
+        existing = queued_job_names(application)
         for p in profiles:
-            uid = p.get('user_id')
-            scheduled = []
-            if p.get('water_enabled'):
-                schedule_user_water_reminder(application, uid, p.get('water_interval_minutes', 60))
-                scheduled.append('water')
-            else:
-                cancel_user_water_reminder(application, uid)
-
-            if p.get('weight_enabled'):
-                schedule_user_weight_reminder(application, uid, p.get('weight_time', '06:00'))
-                scheduled.append('weight')
-            else:
-                cancel_user_weight_reminder(application, uid)
-
-            if p.get('lunch_enabled'):
-                schedule_user_meal_reminder(application, uid, 'lunch', p.get('lunch_time', '13:00'))
-                scheduled.append('lunch')
-            else:
-                cancel_user_meal_reminder(application, uid, 'lunch')
-
-            if p.get('dinner_enabled'):
-                schedule_user_meal_reminder(application, uid, 'dinner', p.get('dinner_time', '20:00'))
-                scheduled.append('dinner')
-            else:
-                cancel_user_meal_reminder(application, uid, 'dinner')
-
-            logger.info(f"[REMINDER_BOOT] user_id={uid} scheduled={scheduled}")
+            schedule_profile_reminders(application, p, existing)
 
         logger.info("[SCHEDULER] reminder scheduling complete")
     except Exception as e:
@@ -994,21 +1016,5 @@ def get_weekly_checkin_count(user_id: int) -> int:
     Get user's check-in count for current week
     Helper function for daily processing
     """
-    try:
-        from src.database.connection import DatabaseConnection
-        db = DatabaseConnection()
-        
-        query = """
-            SELECT COUNT(*) as count
-            FROM attendance_queue
-            WHERE user_id = %s
-            AND status = 'approved'
-            AND approved_at >= DATE_TRUNC('week', CURRENT_DATE)
-            AND approved_at < DATE_TRUNC('week', CURRENT_DATE) + INTERVAL '7 days'
-        """
-        
-        result = db.execute_query(query, (user_id,))
-        return result['count'] if result else 0
-    except Exception as e:
-        logger.error(f"Error getting weekly check-in count: {e}")
-        return 0
+    from src.database.streak_operations import get_streak_summary
+    return get_streak_summary(user_id)['week_count']
@@ -0,0 +1,222 @@
+"""
+Staged, non-blocking startup.
+
+bot.main builds the Application, registers handlers and starts polling;
+nothing that talks to the database runs before the first getUpdates.
+The rest runs as a one-shot job right after polling starts, in order:
+
+    db         connection check (remote DB only)
+    schema     pending migrations/ (src.database.migrations)
+    reminders  per-user reminder jobs from reminder_profile
+    caches     eligibility snapshot, today's check-in registry
+    dashboard  30 days of dashboard counters re-derived from history
+    rollups    activity rollups for any missing day in ROLLUP_BACKFILL_DAYS
+    streaks    attendance streak rows seeded from history (first start only)
+
+The last three need the tables created by `schema`; they only run once it
+is ready (or skipped) and are left pending otherwise.
+
+Blocking work runs in a worker thread. Reminder jobs are registered on
+the event loop in slices of REMINDER_BOOTSTRAP_BATCH profiles so updates
+keep flowing during the bootstrap.
+
+If the DB check fails the super admin is alerted once and the stages are
+retried every STARTUP_DB_RETRY_SECONDS. Stage state and timings are
+available from `startup_status()` / `startup_report()` and are included
+in the web tier's /health response.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STAGE_PENDING = 'pending'
+STAGE_RUNNING = 'running'
+STAGE_READY = 'ready'
+STAGE_FAILED = 'failed'
+STAGE_SKIPPED = 'skipped'
+
+STARTUP_STAGES = ('db', 'schema', 'reminders', 'caches', 'dashboard', 'rollups', 'streaks')
+
+_stages: Dict[str, Dict] = {}
+_lock = threading.Lock()
+
+
+def reset_startup_stages(skipped=()) -> None:
+    with _lock:
+        _stages.clear()
+        for name in STARTUP_STAGES:
+            _stages[name] = {
+                'state': STAGE_SKIPPED if name in skipped else STAGE_PENDING,
+                'ms': None,
+                'detail': None,
+                'error': None,
+            }
+
+
+def _mark(name: str, **fields) -> None:
+    with _lock:
+        _stages.setdefault(name, {'state': STAGE_PENDING, 'ms': None, 'detail': None, 'error': None}).update(fields)
+
+
+def stage_state(name: str) -> Optional[str]:
+    with _lock:
+        stage = _stages.get(name)
+        return stage['state'] if stage else None
+
+
+def startup_status() -> Dict[str, Dict]:
+    with _lock:
+        return {name: dict(stage) for name, stage in _stages.items()}
+
+
+def startup_ready() -> bool:
+    with _lock:
+        return bool(_stages) and all(s['state'] in (STAGE_READY, STAGE_SKIPPED) for s in _stages.values())
+
+
+def startup_report() -> str:
+    status = startup_status()
+    if not status:
+        return "Startup stages: not scheduled"
+    lines = [f"Startup stages: {'ready' if startup_ready() else 'in progress'}"]
+    for name, stage in status.items():
+        ms = f"{stage['ms']:.0f}ms" if stage['ms'] is not None else '-'
+        extra = stage['error'] or stage['detail'] or ''
+        lines.append(f"  {name:<10} {stage['state']:<8} {ms:>8}  {extra}".rstrip())
+    return "\n".join(lines)
+
+
+async def run_stage(name: str, fn, *args) -> bool:
+    """Run one stage (coroutine functions on the loop, anything else in a thread) and record the outcome"""
+    if stage_state(name) == STAGE_SKIPPED:
+        return True
+    _mark(name, state=STAGE_RUNNING, error=None)
+    start = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(fn):
+            detail = await fn(*args)
+        else:
+            detail = await asyncio.to_thread(fn, *args)
+    except Exception as e:
+        ms = (time.perf_counter() - start) * 1000
+        _mark(name, state=STAGE_FAILED, ms=ms, error=str(e))
+        logger.error(f"[STARTUP] {name} failed after {ms:.0f}ms: {e}")
+        return False
+    ms = (time.perf_counter() - start) * 1000
+    _mark(name, state=STAGE_READY, ms=ms, detail=detail)
+    logger.info(f"[STARTUP] {name} ready in {ms:.0f}ms" + (f" ({detail})" if detail else ""))
+    return True
+
+
+# --- Stages ---
+
+def check_database() -> None:
+    from src.database.connection import test_connection
+    if not test_connection():
+        raise RuntimeError("database connection test failed")
+
+
+def apply_migrations() -> str:
+    from src.database.migrations import run_migrations
+    applied = run_migrations()
+    return f"applied={','.join(applied)}" if applied else "up to date"
+
+
+async def bootstrap_reminders(application) -> str:
+    from src.config import REMINDER_BOOTSTRAP_BATCH
+    from src.database.reminder_operations import get_all_profiles
+    from src.utils.scheduled_jobs import queued_job_names, schedule_profile_reminders
+
+    profiles = await asyncio.to_thread(get_all_profiles) or []
+    existing = queued_job_names(application)
+    for i, profile in enumerate(profiles, 1):
+        schedule_profile_reminders(application, profile, existing)
+        if i % REMINDER_BOOTSTRAP_BATCH == 0:
+            # Let queued updates through between slices
+            await asyncio.sleep(0)
+    return f"profiles={len(profiles)}"
+
+
+def warm_caches() -> str:
+    from src.utils.checkin_fastpath import seed_checkin_registry
+    from src.utils.eligibility_snapshot import build_eligibility_snapshot
+    members = build_eligibility_snapshot()
+    checked_in = seed_checkin_registry()
+    return f"members={members} checked_in={checked_in}"
+
+
+def backfill_dashboard() -> str:
+    from src.database.dashboard_metrics import ENGAGEMENT_WINDOW_DAYS, reconcile_counters
+    rows = reconcile_counters(ENGAGEMENT_WINDOW_DAYS + 1)
+    return f"rows={rows}"
+
+
+def backfill_rollups() -> str:
+    from datetime import date, timedelta
+    from src.config import ROLLUP_BACKFILL_DAYS
+    from src.database.rollup_operations import ensure_rollups
+    ensure_rollups(date.today() - timedelta(days=ROLLUP_BACKFILL_DAYS))
+    return f"days={ROLLUP_BACKFILL_DAYS}"
+
+
+def seed_streaks() -> str:
+    from src.database.streak_operations import seed_attendance_streaks_once
+    return "seeded" if seed_attendance_streaks_once() else "already seeded"
+
+
+async def _alert_db_failure(context, error: str) -> None:
+    from src.config import SUPER_ADMIN_USER_ID
+    if not SUPER_ADMIN_USER_ID:
+        return
+    try:
+        await context.bot.send_message(
+            chat_id=int(SUPER_ADMIN_USER_ID),
+            text=f"🚨 Bot started but the database is unreachable\nError: {error}\nRetrying in the background.",
+        )
+    except Exception as e:
+        logger.error(f"[STARTUP] could not alert admin: {e}")
+
+
+async def run_startup_stages(context) -> None:
+    """One-shot job: run the deferred startup stages after polling has started."""
+    from src.config import STARTUP_DB_RETRY_SECONDS
+
+    attempt = (context.job.data or {}).get('attempt', 1) if context.job else 1
+    if not await run_stage('db', check_database):
+        if attempt == 1:
+            await _alert_db_failure(context, startup_status()['db']['error'])
+        context.job_queue.run_once(
+            run_startup_stages, when=STARTUP_DB_RETRY_SECONDS,
+            data={'attempt': attempt + 1}, name='startup_stages'
+        )
+        logger.warning(f"[STARTUP] retrying in {STARTUP_DB_RETRY_SECONDS}s (attempt {attempt + 1})")
+        return
+
+    schema_ready = await run_stage('schema', apply_migrations)
+    await run_stage('reminders', bootstrap_reminders, context.application)
+    await run_stage('caches', warm_caches)
+    if schema_ready:
+        await run_stage('dashboard', backfill_dashboard)
+        await run_stage('rollups', backfill_rollups)
+        await run_stage('streaks', seed_streaks)
+    logger.info(f"[STARTUP] {startup_report()}")
+
+
+def schedule_startup_stages(application, skip_db: bool = False, skip_migrations: bool = False,
+                            skip_bootstrap: bool = False) -> None:
+    """Queue the deferred stages to run as soon as the job queue starts (i.e. with polling)"""
+    skipped = set()
+    if skip_db:
+        skipped.add('db')
+    if skip_migrations:
+        skipped.add('schema')
+    if skip_bootstrap:
+        skipped.update(('reminders', 'caches', 'dashboard', 'rollups', 'streaks'))
+    reset_startup_stages(skipped)
+    application.job_queue.run_once(run_startup_stages, when=0, data={'attempt': 1}, name='startup_stages')
+    logger.info(f"[STARTUP] deferred stages queued: {', '.join(s for s in STARTUP_STAGES if s not in skipped)}")
@@ -13,6 +13,7 @@ from src.database.subscription_operations import (
     get_expiring_subscriptions, get_users_in_grace_period,
     get_expired_subscriptions, mark_subscription_locked
 )
+from src.utils.eligibility_snapshot import invalidate_eligibility_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -136,7 +137,7 @@ async def lock_expired_subscriptions(bot: Bot):
         locked_count = 0
         for user in expired:
             try:
-                if mark_subscription_locked(user['user_id']):
+                if mark_subscription_locked(user['user_id'], refresh_snapshot=False):
                     locked_count += 1
                     
                     # Notify user
@@ -152,6 +153,9 @@ async def lock_expired_subscriptions(bot: Bot):
             except Exception as e:
                 logger.error(f"Failed to lock subscription for {user['user_id']}: {e}")
         
+        if locked_count:
+            # One snapshot rebuild on next use instead of a refresh per locked member
+            invalidate_eligibility_snapshot()
         logger.info(f"Locked {locked_count} expired subscriptions")
         
     except Exception as e:
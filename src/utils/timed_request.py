@@ -0,0 +1,26 @@
+"""
+Bot API request backend that records per-method latency.
+
+Passed to Application.builder().request(...). getUpdates uses its own
+request object and is not timed, because its long poll would swamp the series.
+"""
+
+import time
+
+from telegram.request import HTTPXRequest
+
+from src.utils.metrics import record
+
+
+class TimedHTTPXRequest(HTTPXRequest):
+
+    async def do_request(self, url: str, method: str, request_data=None, **timeouts):
+        name = url.rsplit('/', 1)[-1]
+        start = time.perf_counter()
+        try:
+            code, payload = await super().do_request(url, method, request_data, **timeouts)
+        except Exception:
+            record('telegram', name, time.perf_counter() - start, error=True)
+            raise
+        record('telegram', name, time.perf_counter() - start, error=code >= 400)
+        return code, payload
@@ -24,10 +24,10 @@ def load_registry() -> List[Dict]:
     try:
         with open(REGISTRY_FILE, 'r', encoding='utf-8') as f:
             users = json.load(f)
-            logger.info(f"[USER_REGISTRY] loaded_users_count={len(users)} path={REGISTRY_FILE}")
+            logger.info("[USER_REGISTRY] loaded_users_count=%s path=%s", len(users), REGISTRY_FILE)
             return users
     except Exception as e:
-        logger.error(f"[USER_REGISTRY] Error loading: {e}")
+        logger.error("[USER_REGISTRY] Error loading: %s", e)
         return []
 
 
@@ -38,7 +38,7 @@ def save_registry(users: List[Dict]) -> None:
         with open(REGISTRY_FILE, 'w', encoding='utf-8') as f:
             json.dump(users, f, indent=2, ensure_ascii=False)
     except Exception as e:
-        logger.error(f"[USER_REGISTRY] Error saving: {e}")
+        logger.error("[USER_REGISTRY] Error saving: %s", e)
 
 
 def track_user(user_id: int, first_name: str = '', last_name: str = '', 
@@ -81,7 +81,7 @@ def track_user(user_id: int, first_name: str = '', last_name: str = '',
         })
     
     save_registry(users)
-    logger.info(f"[USER_REGISTRY] tracked user_id={user_id} name={full_name}")
+    logger.info("[USER_REGISTRY] tracked user_id=%s name=%s", user_id, full_name)
 
 
 def search_registry(term: str, limit: int = 10) -> List[Dict]:
@@ -0,0 +1,59 @@
+"""
+Per-user statistics cache for My Stats and the statistics helpers.
+
+`get_user_stats(user_id)` returns the dict built by
+statistics_operations.compute_user_stats (one combined query) and keeps it
+for USER_STATS_TTL_SECONDS, so repeated taps and reminder quick actions
+are served from memory. Writers that change a member's logs, points or
+attendance call `invalidate_user_stats(user_id)`; the TTL only bounds
+staleness from writes that bypass them (e.g. manual SQL).
+
+Cached dicts are shared between callers and must not be mutated.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_entries: Dict[int, Tuple[float, Dict]] = {}
+# Bumped on invalidation so a compute that raced a write is not cached
+_versions: Dict[int, int] = {}
+_lock = threading.Lock()
+
+
+def get_user_stats(user_id: int) -> Optional[Dict]:
+    """Cached stats for `user_id`; None if the user does not exist or the query failed"""
+    from src.config import USER_STATS_TTL_SECONDS
+
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(user_id)
+        version = _versions.get(user_id, 0)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    from src.database.statistics_operations import compute_user_stats
+    try:
+        stats = compute_user_stats(user_id)
+    except Exception as e:
+        logger.error(f"[STATS_CACHE] compute failed user_id={user_id}: {e}")
+        return None
+    if stats is not None:
+        with _lock:
+            if _versions.get(user_id, 0) == version:
+                _entries[user_id] = (now + USER_STATS_TTL_SECONDS, stats)
+    return stats
+
+
+def invalidate_user_stats(user_id: int) -> None:
+    with _lock:
+        _entries.pop(user_id, None)
+        _versions[user_id] = _versions.get(user_id, 0) + 1
+
+
+def clear_user_stats_cache() -> None:
+    with _lock:
+        _entries.clear()
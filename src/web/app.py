@@ -7,6 +7,7 @@ Flask web layer for QR attendance
 """
 
 import logging
+import os
 from flask import Flask, request, jsonify, render_template_string
 from datetime import datetime
 
@@ -257,8 +258,41 @@ def create_app():
     
     @app.route('/health', methods=['GET'])
     def health():
-        """Health check endpoint"""
-        return jsonify({'status': 'ok', 'timestamp': datetime.now().isoformat()}), 200
+        """Health check endpoint (includes deferred startup stages when embedded in the bot)"""
+        from src.utils.startup import startup_ready, startup_status
+        body = {'status': 'ok', 'timestamp': datetime.now().isoformat()}
+        stages = startup_status()
+        if stages:
+            body['ready'] = startup_ready()
+            body['startup'] = stages
+        return jsonify(body), 200
+    
+    
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """
+        Latency percentiles per handler / query / Bot API method
+
+        Requires METRICS_TOKEN; with no token configured the endpoint does
+        not exist (404), since this app is public for the QR pages.
+
+        With WEB_SERVER_MODE=external `series` covers only the worker that
+        answered; `bot` is the bot process's last published copy (None until
+        its first publish).
+        """
+        from src.config import METRICS_TOKEN, WEB_SERVER_MODE
+        from src.utils.metrics import metrics_snapshot, published_metrics_snapshot
+        if not METRICS_TOKEN:
+            return jsonify({'error': 'Not found'}), 404
+        token = request.headers.get('X-Metrics-Token') or request.args.get('token')
+        if token != METRICS_TOKEN:
+            return jsonify({'error': 'Forbidden'}), 403
+        kind = request.args.get('kind')
+        body = {'timestamp': datetime.now().isoformat(), 'series': metrics_snapshot(kind)}
+        if WEB_SERVER_MODE == 'external':
+            body['worker_pid'] = os.getpid()
+            body['bot'] = published_metrics_snapshot(kind)
+        return jsonify(body), 200
     
     
     @app.route('/qr/attendance', methods=['GET'])
@@ -372,24 +406,17 @@ def create_app():
             
             # Step 3: Check geofence
             # ================================================
-            from src.utils.geofence import is_within_geofence
-            from src.config import GEOFENCE_LAT, GEOFENCE_LNG, GEOFENCE_RADIUS_M
-            
-            # Use config values; fallback to defaults if not set
-            GYM_LAT = GEOFENCE_LAT or 19.996429
-            GYM_LON = GEOFENCE_LNG or 73.754282
-            GEOFENCE_RADIUS = GEOFENCE_RADIUS_M or 10  # default 10 meters
+            from src.utils.geofence import check_studio_geofence
             
-            is_within, distance = is_within_geofence(
-                user_lat, user_lon,
-                GYM_LAT, GYM_LON,
-                GEOFENCE_RADIUS
-            )
+            match = check_studio_geofence(user_lat, user_lon)
+            distance = match.distance_m
+            studio_name = match.studio.name if match.studio else 'unknown'
+            radius = match.studio.radius_m if match.studio else 0
             
-            logger.debug(f"User {user_id} distance from gym: {distance:.1f}m (geofence: {GEOFENCE_RADIUS}m)")
+            logger.debug(f"User {user_id} distance from {studio_name}: {distance:.1f}m (geofence: {radius}m)")
             
-            if not is_within:
-                logger.warning(f"User {user_id} outside geofence: {distance:.1f}m > {GEOFENCE_RADIUS}m")
+            if not match.within:
+                logger.warning(f"User {user_id} outside geofence: {distance:.1f}m > {radius}m ({studio_name})")
                 return jsonify({
                     'success': False,
                     'reason': 'OUTSIDE_GEOFENCE',
@@ -438,7 +465,8 @@ def create_app():
                     'attendance_marked',
                     user_id=user_id,
                     distance_m=distance,
-                    timestamp=datetime.now().isoformat()
+                    timestamp=datetime.now().isoformat(),
+                    attendance_id=request_id
                 )
             except Exception as e:
                 logger.error(f"Failed to queue admin notification: {e}")
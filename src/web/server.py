@@ -0,0 +1,92 @@
+"""
+Standalone QR attendance web tier.
+
+    WEB_SERVER_MODE=external python -m src.web.server [--workers N] [--port P]
+
+The parent binds the listening socket once and forks N waitress workers
+that all accept on it, so the web tier no longer shares a GIL with the
+bot's event loop and scales with WEB_WORKERS. Workers keep no state of
+their own: attendance tokens use the SQLite token store, admin
+notifications go through the shared event queue, which the bot drains, and
+each worker's eligibility snapshot follows the bot's changes through the
+shared change log.
+Run the bot with the same WEB_SERVER_MODE=external so it does not start
+its embedded server.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import signal
+import socket
+
+from src.config import WEB_PORT, WEB_WORKERS, WEB_THREADS, ATTENDANCE_TOKEN_BACKEND
+from src.utils.logging_setup import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    return sock
+
+
+def _run_worker(sock: socket.socket, threads: int) -> None:
+    from waitress import serve
+    from src.web.app import create_app
+
+    # The parent handles SIGINT; workers stop on SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logger.info(f"[WEB] worker {multiprocessing.current_process().pid} serving")
+    serve(create_app(), sockets=[sock], threads=threads, _quiet=True)
+
+
+def run_server(host: str = '0.0.0.0', port: int = WEB_PORT,
+               workers: int = WEB_WORKERS, threads: int = WEB_THREADS) -> None:
+    """Serve the QR web app with `workers` processes until interrupted."""
+    if workers > 1 and ATTENDANCE_TOKEN_BACKEND != 'sqlite':
+        logger.warning("[WEB] tokens are per-process with ATTENDANCE_TOKEN_BACKEND=memory; "
+                       "use sqlite when running several workers")
+
+    sock = bind_socket(host, port)
+    ctx = multiprocessing.get_context('fork')
+    procs = [ctx.Process(target=_run_worker, args=(sock, threads), daemon=True) for _ in range(max(1, workers))]
+    for proc in procs:
+        proc.start()
+    logger.info(f"[WEB] listening on {host}:{port} with {len(procs)} workers x {threads} threads")
+
+    def _stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        for proc in procs:
+            proc.join()
+    except KeyboardInterrupt:
+        logger.info("[WEB] shutting down workers")
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+        for proc in procs:
+            proc.join(timeout=5)
+        sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="QR attendance web tier")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=WEB_PORT)
+    parser.add_argument('--workers', type=int, default=WEB_WORKERS)
+    parser.add_argument('--threads', type=int, default=WEB_THREADS)
+    args = parser.parse_args()
+
+    configure_logging()
+    run_server(args.host, args.port, args.workers, args.threads)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+Shared state between the QR web workers and the bot process.
+
+Web workers may run as separate processes (`python -m src.web.server`), so
+anything they hand to the bot goes through a small queue in a local SQLite
+file (WEB_SHARED_STATE_DB) instead of process memory. The interface is a
+plain push / pop-batch queue, so a Redis list could stand in for it later
+without touching the callers.
+
+Caches that every process keeps for itself (the eligibility snapshot) stay
+current through the change log in the same file: a process publishes what it
+changed and the others drop their copy of it.
+
+Read-only views of the bot's state that the web tier serves (the /metrics
+latency series) are published as named snapshots, replaced on each write.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _SharedSQLite:
+    """Per-thread connections to a SQLite file opened by several processes"""
+
+    SCHEMA = ''
+
+    def __init__(self, db_path: str):
+        self._db_path = str(db_path)
+        self._local = threading.local()
+        Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._connect().execute(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+class SharedEventQueue(_SharedSQLite):
+    """FIFO of (kind, payload) events shared by every process opening the same file
+
+    Consumers that must not lose events claim a batch, then ack each event
+    once it has been handled. An event whose claim is not acked within the
+    lease (the consumer crashed) can be claimed again.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS web_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            claimed_at REAL
+        )
+    """
+
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        conn = self._connect()
+        # Queue files created before claims existed
+        if 'claimed_at' not in {row[1] for row in conn.execute("PRAGMA table_info(web_events)")}:
+            conn.execute("ALTER TABLE web_events ADD COLUMN claimed_at REAL")
+
+    def push(self, kind: str, payload: Dict) -> None:
+        self._connect().execute(
+            "INSERT INTO web_events (kind, payload, created_at) VALUES (?, ?, ?)",
+            (kind, json.dumps(payload, default=str), time.time())
+        )
+
+    def pop_batch(self, limit: int = 100) -> List[Dict]:
+        """Remove and return up to `limit` oldest events as {'kind', 'payload', 'created_at'}"""
+        rows = self._connect().execute(
+            "DELETE FROM web_events WHERE id IN (SELECT id FROM web_events ORDER BY id LIMIT ?) "
+            "RETURNING id, kind, payload, created_at",
+            (limit,)
+        ).fetchall()
+        rows.sort(key=lambda row: row[0])
+        return [
+            {'kind': kind, 'payload': json.loads(payload), 'created_at': created_at}
+            for _, kind, payload, created_at in rows
+        ]
+
+    def claim_batch(self, limit: int = 100, lease_seconds: float = 600) -> List[Dict]:
+        """Claim up to `limit` oldest unclaimed (or lease-expired) events without removing them
+
+        Returns {'id', 'kind', 'payload', 'created_at'}; pass the ids to ack().
+        """
+        now = time.time()
+        rows = self._connect().execute(
+            "UPDATE web_events SET claimed_at = ? WHERE id IN ("
+            "SELECT id FROM web_events WHERE claimed_at IS NULL OR claimed_at < ? ORDER BY id LIMIT ?"
+            ") RETURNING id, kind, payload, created_at",
+            (now, now - lease_seconds, limit)
+        ).fetchall()
+        rows.sort(key=lambda row: row[0])
+        return [
+            {'id': event_id, 'kind': kind, 'payload': json.loads(payload), 'created_at': created_at}
+            for event_id, kind, payload, created_at in rows
+        ]
+
+    def ack(self, event_ids: List[int]) -> None:
+        """Remove handled events"""
+        if event_ids:
+            placeholders = ', '.join('?' * len(event_ids))
+            self._connect().execute(f"DELETE FROM web_events WHERE id IN ({placeholders})", list(event_ids))
+
+    def size(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM web_events").fetchone()[0]
+
+
+class SharedChangeLog(_SharedSQLite):
+    """Change notices that every process reads from its own cursor
+
+    Unlike the event queue nothing is consumed: each process remembers the
+    last id it has seen. Readers that lag by more than the prune age only
+    miss notices older than the next full-rebuild notice.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS web_changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic TEXT NOT NULL,
+            item TEXT,
+            created_at REAL NOT NULL
+        )
+    """
+
+    def publish(self, topic: str, item: Optional[str] = None) -> int:
+        """Announce that `item` of `topic` changed (None: everything); returns the notice id"""
+        return self._connect().execute(
+            "INSERT INTO web_changes (topic, item, created_at) VALUES (?, ?, ?)",
+            (topic, item, time.time())
+        ).lastrowid
+
+    def last_id(self) -> int:
+        return self._connect().execute("SELECT COALESCE(MAX(id), 0) FROM web_changes").fetchone()[0]
+
+    def read_since(self, after_id: int, topic: str) -> List[Tuple[int, Optional[str]]]:
+        """(id, item) notices of `topic` newer than `after_id`, oldest first"""
+        return self._connect().execute(
+            "SELECT id, item FROM web_changes WHERE id > ? AND topic = ? ORDER BY id",
+            (after_id, topic)
+        ).fetchall()
+
+    def prune(self, max_age_seconds: float) -> int:
+        return self._connect().execute(
+            "DELETE FROM web_changes WHERE created_at < ?", (time.time() - max_age_seconds,)
+        ).rowcount
+
+
+class SharedSnapshots(_SharedSQLite):
+    """Latest JSON value per name, written by one process and read by the others"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS web_snapshots (
+            name TEXT PRIMARY KEY,
+            payload TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """
+
+    def put(self, name: str, payload) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO web_snapshots (name, payload, updated_at) VALUES (?, ?, ?)",
+            (name, json.dumps(payload, default=str), time.time())
+        )
+
+    def get(self, name: str) -> Optional[Tuple[object, float]]:
+        """(payload, updated_at) or None if `name` was never published"""
+        row = self._connect().execute(
+            "SELECT payload, updated_at FROM web_snapshots WHERE name = ?", (name,)
+        ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+
+_event_queue: Optional[SharedEventQueue] = None
+_change_log: Optional[SharedChangeLog] = None
+_snapshots: Optional[SharedSnapshots] = None
+_shared_lock = threading.Lock()
+
+
+def get_event_queue() -> SharedEventQueue:
+    """Process-wide queue on WEB_SHARED_STATE_DB (created on first use)"""
+    global _event_queue
+    if _event_queue is None:
+        with _shared_lock:
+            if _event_queue is None:
+                from src.config import WEB_SHARED_STATE_DB
+                _event_queue = SharedEventQueue(WEB_SHARED_STATE_DB)
+                logger.info(f"[WEB] shared event queue at {WEB_SHARED_STATE_DB}")
+    return _event_queue
+
+
+def get_change_log() -> SharedChangeLog:
+    """Process-wide change log on WEB_SHARED_STATE_DB (created on first use)"""
+    global _change_log
+    if _change_log is None:
+        with _shared_lock:
+            if _change_log is None:
+                from src.config import WEB_SHARED_STATE_DB
+                _change_log = SharedChangeLog(WEB_SHARED_STATE_DB)
+    return _change_log
+
+
+def get_snapshot_store() -> SharedSnapshots:
+    """Process-wide snapshot store on WEB_SHARED_STATE_DB (created on first use)"""
+    global _snapshots
+    if _snapshots is None:
+        with _shared_lock:
+            if _snapshots is None:
+                from src.config import WEB_SHARED_STATE_DB
+                _snapshots = SharedSnapshots(WEB_SHARED_STATE_DB)
+    return _snapshots
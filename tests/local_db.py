@@ -0,0 +1,58 @@
+"""
+Shared set-up for unittest-style tests.
+
+use_local_db() points src.database at a throwaway SQLite file, the way the
+bot runs with USE_LOCAL_DB=true. Patches are stopped and the temporary
+directory is removed when the test finishes.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest.mock import patch
+
+from src.database import connection
+
+
+def start_patches(test, *patchers):
+    """Start each patcher and stop it when `test` finishes"""
+    for p in patchers:
+        p.start()
+        test.addCleanup(p.stop)
+
+
+def temp_dir(test) -> str:
+    """A new directory, removed when `test` finishes"""
+    path = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, path, True)
+    return path
+
+
+def use_local_db(test, name: str = 'test.db', modules=(), migrate: bool = False) -> str:
+    """Route execute_query to a new SQLite file and return its path.
+
+    `modules` that keep their own USE_LOCAL_DB/USE_REMOTE_DB copies are
+    switched to local mode too. `migrate` applies migrations/ to the file,
+    as the bot's schema startup stage does.
+    """
+    path = os.path.join(temp_dir(test), name)
+    patchers = [patch.object(connection, 'LOCAL_DB_PATH', path)]
+    for module in (connection, *modules):
+        patchers += [patch.object(module, 'USE_LOCAL_DB', True), patch.object(module, 'USE_REMOTE_DB', False)]
+    start_patches(test, *patchers)
+    if migrate:
+        from src.database.migrations import run_migrations
+        run_migrations()
+    return path
+
+
+def sqlite_execute(path: str, sql: str, params=()) -> list:
+    """Run one statement directly against the file (test data) and return the fetched rows"""
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+        conn.commit()
+        return rows
+    finally:
+        conn.close()
@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import patch
+
+from src.utils import access_gate
+from src.utils.eligibility_snapshot import ELIGIBILITY_ACTIVE, ELIGIBILITY_NO_SUBSCRIPTION
+from tests.local_db import start_patches
+
+
+class TestAccessState(unittest.TestCase):
+
+    def setUp(self):
+        self.eligibility = {'state': ELIGIBILITY_ACTIVE}
+        start_patches(
+            self,
+            patch.object(access_gate, 'get_eligibility', lambda user_id: self.eligibility),
+            patch.object(access_gate, 'get_user', lambda user_id: {'user_id': user_id}),
+            patch.object(access_gate, 'is_admin_id', return_value=False),
+            patch.object(access_gate, 'USE_LOCAL_DB', False),
+        )
+
+    def test_registered_member_is_not_treated_as_new(self):
+        # is_staff used to be called without being imported, so every member fell through to NEW_USER
+        with patch('src.utils.auth.is_staff_db', return_value=False), \
+                patch('src.utils.auth.is_admin', return_value=False):
+            state, user = access_gate.get_user_access_state(5)
+        self.assertEqual(state, access_gate.STATE_ACTIVE_SUBSCRIBER)
+        self.assertEqual(user, {'user_id': 5})
+
+    def test_staff_skip_the_subscription_check(self):
+        self.eligibility = {'state': ELIGIBILITY_NO_SUBSCRIPTION}
+        with patch.object(access_gate, 'is_staff', return_value=False):
+            self.assertEqual(access_gate.get_user_access_state(5)[0], access_gate.STATE_REGISTERED_NO_SUBSCRIPTION)
+        with patch.object(access_gate, 'is_staff', return_value=True):
+            self.assertEqual(access_gate.get_user_access_state(5)[0], access_gate.STATE_ACTIVE_SUBSCRIBER)
+
+
+if __name__ == '__main__':
+    unittest.main()
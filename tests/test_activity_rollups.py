@@ -0,0 +1,87 @@
+import sqlite3
+import unittest
+from datetime import date, datetime, timedelta
+
+from src.database import reports_operations, rollup_operations as ro
+from tests.local_db import sqlite_execute, use_local_db
+
+
+def _create_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE users (user_id INTEGER PRIMARY KEY, full_name TEXT, telegram_username TEXT, fee_status TEXT,
+                            total_points INTEGER DEFAULT 0, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE daily_logs (user_id INTEGER, log_date DATE, weight REAL, water_cups INTEGER DEFAULT 0,
+                                 meals_logged INTEGER DEFAULT 0, habits_completed BOOLEAN DEFAULT 0);
+        CREATE TABLE attendance_queue (queue_id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER,
+                                       queue_date DATE, status TEXT);
+        CREATE TABLE shake_requests (request_id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER,
+                                     requested_at TIMESTAMP);
+        CREATE TABLE points_transactions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, points INTEGER,
+                                          activity TEXT, created_at TIMESTAMP);
+    """)
+    conn.executemany(
+        "INSERT INTO users (user_id, full_name, fee_status, total_points, created_at) VALUES (?, ?, ?, ?, ?)",
+        [(1, 'Asha', 'paid', 100, '2020-01-01 00:00:00'), (2, 'Ravi', 'paid', 40, '2020-01-01 00:00:00'),
+         (3, 'Meena', 'unpaid', 0, '2020-01-01 00:00:00')],
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestActivityRollups(unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = use_local_db(self, 'rollups.db', modules=[ro], migrate=True)
+        _create_db(self.db_path)
+        self.today = date.today()
+
+    def _log_day(self, user_id, day):
+        sqlite_execute(self.db_path, "INSERT INTO daily_logs (user_id, log_date, weight, water_cups, meals_logged) VALUES (?, ?, 70, 4, 2)",
+                      (user_id, day.isoformat()))
+        sqlite_execute(self.db_path, "INSERT INTO attendance_queue (user_id, queue_date, status) VALUES (?, ?, 'approved')",
+                      (user_id, day.isoformat()))
+        sqlite_execute(self.db_path, "INSERT INTO points_transactions (user_id, points, activity, created_at) VALUES (?, 10, 'attendance', ?)",
+                      (user_id, f"{day} 07:30:00"))
+
+    def test_daily_activity_and_rebuild_is_idempotent(self):
+        self._log_day(1, self.today)
+        sqlite_execute(self.db_path, "INSERT INTO shake_requests (user_id, requested_at) VALUES (1, ?)", (f"{self.today} 08:00:00",))
+
+        self.assertEqual(ro.build_daily_rollup(self.today), 1)
+        self.assertEqual(ro.build_daily_rollup(self.today), 1)
+
+        activity = {a['user_id']: a for a in reports_operations.get_member_daily_activity(datetime.now())}
+        self.assertEqual(len(activity), 3)
+        asha = activity[1]
+        self.assertEqual((asha['attendance_count'], asha['weight_logs'], asha['water_cups'], asha['meal_logs'],
+                          asha['shake_orders'], asha['points_earned']), (1, 1, 4, 2, 1, 10))
+        self.assertEqual(asha['activity_score'], 1 + 1 + 1 + 2)
+        self.assertEqual(activity[2]['activity_score'], 0)
+
+        week = ro.get_period_summary(ro.PERIOD_WEEK, self.today)
+        self.assertEqual((week['active_members'], week['attendance_days'], week['points_earned']), (1, 1, 10))
+
+    def test_top_performers_and_inactive_users(self):
+        for offset in range(3):
+            self._log_day(1, self.today - timedelta(days=offset))
+        self._log_day(2, self.today - timedelta(days=20))
+
+        performers = reports_operations.get_top_performers(days=7)
+        self.assertEqual([p['user_id'] for p in performers], [1])
+        self.assertEqual(performers[0]['attendance_days'], 3)
+        self.assertEqual(performers[0]['total_activity_days'], 12)
+
+        # Older history is only visible once rolled up (startup backfill)
+        ro.ensure_rollups(self.today - timedelta(days=30))
+        inactive = reports_operations.get_inactive_users(days=7)
+        self.assertEqual([m['user_id'] for m in inactive], [3, 2])
+        self.assertEqual(inactive[1]['days_inactive'], 20)
+
+    def test_period_bounds(self):
+        self.assertEqual(ro.period_bounds(ro.PERIOD_WEEK, date(2026, 10, 21)), (date(2026, 10, 19), date(2026, 10, 25)))
+        self.assertEqual(ro.period_bounds(ro.PERIOD_MONTH, date(2024, 2, 10)), (date(2024, 2, 1), date(2024, 2, 29)))
+
+
+if __name__ == '__main__':
+    unittest.main()
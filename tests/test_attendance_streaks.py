@@ -0,0 +1,71 @@
+import unittest
+from datetime import date, timedelta
+
+from src.database import app_settings_operations, streak_operations as so
+from tests.local_db import sqlite_execute, use_local_db
+
+MONDAY = date(2026, 10, 12)
+
+
+class TestStreakState(unittest.TestCase):
+
+    def test_sunday_does_not_break_a_streak(self):
+        saturday, monday = MONDAY + timedelta(days=5), MONDAY + timedelta(days=7)
+        self.assertTrue(so.continues_streak(saturday, monday))
+        self.assertFalse(so.continues_streak(MONDAY + timedelta(days=4), monday))
+
+    def test_build_from_dates(self):
+        days = [MONDAY + timedelta(days=n) for n in (0, 1, 2, 4, 5, 7, 8)]  # gap on Friday, Sunday rest
+        state = so.build_streak_state(days)
+        self.assertEqual(state['current_streak'], 4)
+        self.assertEqual(state['longest_streak'], 4)
+        self.assertEqual(state['week_start'], MONDAY + timedelta(days=7))
+        self.assertEqual(state['week_count'], 2)
+
+    def test_summary_expires_current_streak_and_week(self):
+        state = so.build_streak_state([MONDAY, MONDAY + timedelta(days=1)])
+        self.assertEqual(so.summarize_streak(state, MONDAY + timedelta(days=2))['current_streak'], 2)
+        later = so.summarize_streak(state, MONDAY + timedelta(days=9))
+        self.assertEqual((later['current_streak'], later['longest_streak'], later['week_count']), (0, 2, 0))
+
+
+class TestStreakTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = use_local_db(self, 'streaks.db', modules=[so, app_settings_operations], migrate=True)
+        sqlite_execute(self.db_path, "CREATE TABLE attendance_queue (user_id INTEGER, queue_date DATE, status TEXT)")
+
+    def _approve(self, day):
+        sqlite_execute(self.db_path, "INSERT INTO attendance_queue VALUES (1, ?, 'approved')", (day.isoformat(),))
+        so.record_attendance_streak(1, day)
+
+    def test_incremental_updates_match_a_rebuild(self):
+        for n in (0, 1, 2, 3):
+            self._approve(MONDAY + timedelta(days=n))
+        self._approve(MONDAY + timedelta(days=3))  # duplicate approval is a no-op
+        # Late approval of an earlier day falls back to a rebuild
+        self._approve(MONDAY - timedelta(days=2))
+
+        summary = so.get_streak_summary(1, today=MONDAY + timedelta(days=4))
+        self.assertEqual(summary['current_streak'], 5)
+        self.assertEqual(summary['week_count'], 4)
+        self.assertEqual(so._load_state(1)['longest_streak'],
+                         so.rebuild_attendance_streak(1)['longest_streak'])
+
+    def test_seed_runs_once_even_after_early_checkins(self):
+        sqlite_execute(self.db_path, "INSERT INTO attendance_queue VALUES (2, ?, 'approved')", (MONDAY.isoformat(),))
+        self._approve(MONDAY)  # a check-in before the startup seed writes member 1's row
+
+        self.assertTrue(so.seed_attendance_streaks_once())
+        self.assertEqual(so._load_state(2)['current_streak'], 1)
+
+        sqlite_execute(self.db_path, "INSERT INTO attendance_queue VALUES (3, ?, 'approved')", (MONDAY.isoformat(),))
+        self.assertFalse(so.seed_attendance_streaks_once())
+        self.assertIsNone(so._load_state(3))
+
+    def test_unknown_member(self):
+        self.assertEqual(so.get_streak_summary(42)['current_streak'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from src.utils import attendance_tokens
+from src.utils.attendance_tokens import SQLiteTokenStore, TokenStore
+
+
+class TokenStoreContract:
+    """Behaviour both backends must share"""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def test_single_use(self):
+        store = self.make_store()
+        token = store.generate_token(42)
+        self.assertEqual(store.validate_and_consume_token(token), (True, 42))
+        self.assertEqual(store.validate_and_consume_token(token), (False, 'TOKEN_NOT_FOUND'))
+
+    def test_expired(self):
+        store = self.make_store()
+        token = store.generate_token(7, ttl_seconds=-1)
+        self.assertEqual(store.validate_and_consume_token(token), (False, 'TOKEN_EXPIRED'))
+
+    def test_concurrent_consume_wins_once(self):
+        store = self.make_store()
+        tokens = [store.generate_token(uid) for uid in range(50)]
+        wins = []
+
+        def consume():
+            for token in tokens:
+                ok, _ = store.validate_and_consume_token(token)
+                if ok:
+                    wins.append(token)
+
+        threads = [threading.Thread(target=consume) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(wins), sorted(tokens))
+        self.assertEqual(store.get_active_token_count(), 0)
+
+
+class TestShardedTokenStore(TokenStoreContract, unittest.TestCase):
+
+    def make_store(self):
+        return TokenStore(shard_count=4)
+
+    def test_cleanup_only_pops_expired(self):
+        store = TokenStore(shard_count=1)
+        now = 1000.0
+        with patch.object(attendance_tokens.time, 'time', return_value=now):
+            old = [store.generate_token(uid, ttl_seconds=10) for uid in range(100)]
+            live = store.generate_token(999, ttl_seconds=600)
+            store.validate_and_consume_token(old[0])
+        with patch.object(attendance_tokens.time, 'time', return_value=now + 60):
+            self.assertEqual(store.get_active_token_count(), 1)
+            self.assertEqual(store.validate_and_consume_token(live), (True, 999))
+        self.assertEqual(store._shards[0].expiry_heap, [(now + 600, live)])
+
+
+class TestSQLiteTokenStore(TokenStoreContract, unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), 'tokens', 'attendance_tokens.db')
+
+    def make_store(self):
+        return SQLiteTokenStore(self.db_path)
+
+    def test_shared_between_instances(self):
+        # Two instances stand in for two web workers / a restart
+        token = self.make_store().generate_token(5)
+        self.assertEqual(self.make_store().validate_and_consume_token(token), (True, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.database import connection
+from tools.bench import dataset
+from tools.bench.cases import CASES
+from tools.bench.runner import compare, run_suite
+
+
+class TestBenchSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, 'bench.db')
+        self.counts = dataset.generate_dataset(self.db_path, members=60, days=30, seed=3)
+
+    def test_dataset_is_reproducible(self):
+        again = os.path.join(self.tmp, 'again.db')
+        self.assertEqual(dataset.generate_dataset(again, members=60, days=30, seed=3), self.counts)
+        self.assertEqual(dataset.table_counts(again), dataset.table_counts(self.db_path))
+        self.assertEqual(self.counts['users'], 60)
+        self.assertGreater(self.counts['daily_logs'], 0)
+        self.assertEqual(dataset.parse_scale('10k'), 10_000)
+        self.assertEqual(dataset.parse_scale('2500'), 2500)
+
+    def test_every_case_runs_without_raising(self):
+        db_path = connection.LOCAL_DB_PATH
+        results = run_suite(self.db_path, iterations=2, seed=3)
+
+        self.assertEqual(connection.LOCAL_DB_PATH, db_path)
+        self.assertEqual(list(results['cases']), list(CASES))
+        for name, row in results['cases'].items():
+            self.assertEqual(row['errors'], 0, f"{name}: {row.get('first_error')}")
+            self.assertLessEqual(row['p50_ms'], row['max_ms'])
+        self.assertGreater(results['cases']['access_gate']['queries_per_op'], 0)
+
+        conn = sqlite3.connect(self.db_path)
+        recipients = conn.execute("SELECT COUNT(*) FROM users WHERE status = 'active' AND is_approved = 1").fetchone()[0]
+        conn.close()
+        self.assertEqual(results['cases']['broadcast']['messages_per_op'], recipients)
+
+    def test_compare_flags_slower_or_chattier_cases(self):
+        def run(p50, queries):
+            return {'p50_ms': p50, 'queries_per_op': queries, 'errors': 0}
+
+        baseline = {'cases': {'a': run(10.0, 2), 'b': run(10.0, 2), 'c': run(10.0, 2)}}
+        current = {'cases': {'a': run(11.0, 2), 'b': run(15.0, 2), 'c': run(10.0, 3), 'new': run(1.0, 1)}}
+        rows = {row['case']: row for row in compare(baseline, current, threshold=0.2)}
+
+        self.assertEqual(set(rows), {'a', 'b', 'c'})
+        self.assertFalse(rows['a']['regression'])
+        self.assertTrue(rows['b']['regression'])
+        self.assertTrue(rows['c']['regression'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import unittest
+from datetime import date
+from unittest import mock
+
+from telegram import InlineKeyboardMarkup
+
+from src.utils import catalogue_cache as cc
+
+
+class TestCatalogueCache(unittest.TestCase):
+
+    def setUp(self):
+        cc.invalidate_catalogue()
+        self.renders = []
+
+    def tearDown(self):
+        cc.invalidate_catalogue()
+
+    def render(self, page):
+        self.renders.append(page)
+        return f"page {page}", InlineKeyboardMarkup([])
+
+    def test_page_rendered_once_until_invalidated(self):
+        first = cc.get_catalogue_page(cc.SECTION_SUBSCRIPTIONS, 0, self.render)
+        second = cc.get_catalogue_page(cc.SECTION_SUBSCRIPTIONS, 0, self.render)
+        self.assertEqual(first, second)
+        self.assertEqual(self.renders, [0])
+
+        cc.invalidate_catalogue(cc.SECTION_PT_PLANS)
+        cc.get_catalogue_page(cc.SECTION_SUBSCRIPTIONS, 0, self.render)
+        self.assertEqual(self.renders, [0])
+
+        cc.invalidate_catalogue(cc.SECTION_SUBSCRIPTIONS)
+        cc.get_catalogue_page(cc.SECTION_SUBSCRIPTIONS, 0, self.render)
+        self.assertEqual(self.renders, [0, 0])
+
+    def test_version_change_rerenders(self):
+        v1, v2 = object(), object()
+        cc.get_catalogue_page(cc.SECTION_STORE, 0, self.render, version=v1)
+        cc.get_catalogue_page(cc.SECTION_STORE, 0, self.render, version=v1)
+        cc.get_catalogue_page(cc.SECTION_STORE, 0, self.render, version=v2)
+        self.assertEqual(self.renders, [0, 0])
+
+    def test_empty_catalogue_not_cached(self):
+        calls = []
+        def render_empty(page):
+            calls.append(page)
+            return None
+        self.assertIsNone(cc.get_catalogue_page(cc.SECTION_EVENTS, 0, render_empty))
+        self.assertIsNone(cc.get_catalogue_page(cc.SECTION_EVENTS, 0, render_empty))
+        self.assertEqual(len(calls), 2)
+
+    def test_paginate_and_nav_callbacks(self):
+        rows, page, total = cc.paginate(list(range(20)), 5, page_size=8)
+        self.assertEqual((rows, page, total), ([16, 17, 18, 19], 2, 3))
+
+        nav = cc.page_nav_row(cc.SECTION_STORE, 1, 3, key='cat:Shakes_Protein')
+        self.assertEqual(len(nav), 3)
+        for button in nav:
+            self.assertLessEqual(len(button.callback_data.encode()), 64)
+        self.assertEqual(cc.parse_page_callback(nav[2].callback_data), ('store', 2, 'cat:Shakes_Protein'))
+        self.assertEqual(cc.page_nav_row(cc.SECTION_STORE, 0, 1), [])
+
+    def test_page_indicator_is_only_answered(self):
+        from src.handlers import storefront_handlers as sf
+
+        indicator = cc.page_nav_row(cc.SECTION_SUBSCRIPTIONS, 1, 3)[1]
+        self.assertEqual(indicator.callback_data, cc.CATALOGUE_PAGE_NOOP)
+        query = mock.MagicMock(data=indicator.callback_data, answer=mock.AsyncMock())
+        update = mock.MagicMock(callback_query=query)
+        with mock.patch.object(sf, 'cmd_browse_subscriptions') as browse:
+            asyncio.run(sf.browse_catalogue_page(update, None))
+        browse.assert_not_called()
+        query.answer.assert_awaited_once()
+
+    def test_unchanged_page_edit_is_ignored(self):
+        from telegram.error import BadRequest
+        from src.handlers import storefront_handlers as sf
+
+        query = mock.MagicMock(data='catpage_subs_1')
+        query.edit_message_text = mock.AsyncMock(side_effect=BadRequest("Message is not modified"))
+        update = mock.MagicMock(callback_query=query)
+        self.assertTrue(asyncio.run(sf._reply_catalogue(update, ("page", InlineKeyboardMarkup([])), "empty")))
+
+        query.edit_message_text.side_effect = BadRequest("Can't parse entities")
+        with self.assertRaises(BadRequest):
+            asyncio.run(sf._reply_catalogue(update, ("page", InlineKeyboardMarkup([])), "empty"))
+
+    def test_event_seats_are_filled_live(self):
+        from src.handlers import storefront_handlers as sf
+
+        event = {'event_id': 7, 'name': 'Yoga Day', 'event_date': date(2030, 6, 21), 'price': 100,
+                 'description': None, 'max_attendees': 20, 'current_attendees': 5}
+        with mock.patch.object(sf, 'execute_query', return_value=[event]):
+            text, _ = cc.get_catalogue_page(cc.SECTION_EVENTS, 0, sf._render_events_page)
+            self.assertIn('15 seats available', sf._fill_event_seats(text))
+
+        # The cached page is reused; only the seat count is read again
+        with mock.patch.object(sf, 'execute_query', return_value=[dict(event, current_attendees=19)]) as query:
+            text, _ = cc.get_catalogue_page(cc.SECTION_EVENTS, 0, sf._render_events_page)
+            self.assertIn('1 seats available', sf._fill_event_seats(text))
+        self.assertEqual(query.call_count, 1)
+        self.assertIn('IN (%s)', query.call_args[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
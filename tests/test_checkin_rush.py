@@ -0,0 +1,114 @@
+import asyncio
+import sqlite3
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.database import attendance_operations
+from src.utils import checkin_fastpath as fp, notification_digest
+from tests.local_db import sqlite_execute, use_local_db
+
+MEMBERS = 200
+UNPAID_EVERY = 4  # every 4th member has an inactive membership
+
+
+def _create_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE users (user_id INTEGER PRIMARY KEY, full_name TEXT, phone TEXT,
+                            fee_status TEXT, total_points INTEGER DEFAULT 0);
+        CREATE TABLE attendance_queue (attendance_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                       user_id INTEGER NOT NULL, queue_date DATE NOT NULL,
+                                       status TEXT DEFAULT 'pending', approved_by INTEGER,
+                                       approved_at TIMESTAMP, UNIQUE(user_id, queue_date));
+        CREATE TABLE points_transactions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER,
+                                          points INTEGER, activity TEXT, description TEXT);
+    """)
+    conn.executemany(
+        "INSERT INTO users (user_id, full_name, phone, fee_status) VALUES (?, ?, ?, ?)",
+        [(uid, f"Member {uid}", "9999999999", 'unpaid' if uid % UNPAID_EVERY == 0 else 'paid')
+         for uid in range(1, MEMBERS + 1)]
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestCheckinRush(unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = use_local_db(self, 'rush.db', modules=[attendance_operations])
+        _create_db(self.db_path)
+        fp.seed_checkin_registry(user_ids=[])
+        notification_digest.take_pending_digests()
+        self.addCleanup(notification_digest.take_pending_digests)
+
+    def _query(self, sql):
+        return sqlite_execute(self.db_path, sql)[0][0]
+
+    def test_200_member_rush(self):
+        async def rush():
+            # Every member taps twice at the same moment
+            user_ids = [uid for uid in range(1, MEMBERS + 1) for _ in range(2)]
+            return await asyncio.gather(*(fp.check_in(uid) for uid in user_ids))
+
+        started = time.perf_counter()
+        results = asyncio.run(rush())
+        elapsed = time.perf_counter() - started
+
+        outcomes = [r['outcome'] for r in results]
+        unpaid = MEMBERS // UNPAID_EVERY
+        self.assertEqual(outcomes.count(fp.CHECKIN_APPROVED), MEMBERS - unpaid)
+        self.assertEqual(outcomes.count(fp.CHECKIN_PENDING), unpaid)
+        self.assertEqual(outcomes.count(fp.CHECKIN_ALREADY), MEMBERS)
+        self.assertEqual(self._query("SELECT COUNT(*) FROM attendance_queue"), MEMBERS)
+        self.assertEqual(self._query("SELECT COUNT(*) FROM points_transactions"), MEMBERS - unpaid)
+        self.assertLess(elapsed, 10)
+
+        # Later taps are answered from the registry without touching the DB
+        with patch.object(attendance_operations, 'record_checkin_fast', side_effect=AssertionError):
+            again = asyncio.run(fp.check_in(1))
+        self.assertEqual(again['outcome'], fp.CHECKIN_ALREADY)
+
+    def _notify(self, bot, alerts, rush, prefs=None):
+        with patch.object(fp, 'is_rush_hour', return_value=rush), \
+                patch('src.utils.role_notifications.get_moderator_chat_ids', return_value=[101, 102]), \
+                patch('src.database.notification_preferences.get_admin_notification_prefs', return_value=prefs or {}):
+            async def run():
+                for alert in alerts:
+                    await fp.notify_pending_checkin(bot, alert)
+            asyncio.run(run())
+
+    def test_rush_alerts_are_digested(self):
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+        alerts = [{'user_id': uid, 'full_name': f"Member {uid}", 'attendance_id': uid} for uid in range(25)]
+
+        self._notify(bot, alerts, rush=True)
+        self.assertEqual(bot.send_message.await_count, 0)
+        sent = asyncio.run(notification_digest.flush_admin_digests(MagicMock(bot=bot)))
+        # 25 alerts -> 3 digest messages, each to 2 moderators
+        self.assertEqual(sent, 6)
+        self.assertEqual(notification_digest.take_pending_digests(), {})
+
+    def test_alerts_follow_admin_preferences_and_escape_names(self):
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+        alert = {'user_id': 7, 'full_name': 'A_<b>*', 'attendance_id': 70}
+
+        # Outside the rush: straight away to everyone not muted
+        self._notify(bot, [alert], rush=False, prefs={102: {'muted': True}})
+        self.assertEqual([c.kwargs['chat_id'] for c in bot.send_message.await_args_list], [101])
+        sent = bot.send_message.await_args.kwargs
+        self.assertEqual(sent['parse_mode'], 'HTML')
+        self.assertIn('A_&lt;b&gt;*', sent['text'])
+        self.assertEqual(sent['reply_markup'].inline_keyboard[0][0].callback_data, 'approve_attend_70')
+
+        # During the rush: 'instant' admins now, digest admins at the next flush
+        bot.send_message.reset_mock()
+        self._notify(bot, [alert], rush=True, prefs={102: {'priority': 'instant'}})
+        self.assertEqual([c.kwargs['chat_id'] for c in bot.send_message.await_args_list], [102])
+        self.assertEqual(list(notification_digest.take_pending_digests()), [101])
+
+
+if __name__ == '__main__':
+    unittest.main()
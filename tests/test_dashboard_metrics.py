@@ -0,0 +1,85 @@
+import sqlite3
+import unittest
+from datetime import date, timedelta
+
+from src.database import dashboard_metrics as dm, statistics_operations
+from tests.local_db import sqlite_execute, use_local_db
+
+
+def _create_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE users (user_id INTEGER PRIMARY KEY, fee_status TEXT, total_points INTEGER DEFAULT 0);
+        CREATE TABLE daily_logs (user_id INTEGER, log_date DATE);
+        CREATE TABLE attendance_queue (attendance_id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER,
+                                       queue_date DATE);
+        CREATE TABLE points_transactions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, points INTEGER,
+                                          activity TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE fee_payments (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, amount REAL,
+                                   status TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE challenges (challenge_id INTEGER PRIMARY KEY, status TEXT);
+        CREATE TABLE challenge_participants (user_id INTEGER, challenge_id INTEGER, status TEXT);
+    """)
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?)", [(1, 'paid', 50), (2, 'unpaid', 0), (3, 'paid', 10)])
+    conn.commit()
+    conn.close()
+
+
+class TestDashboardMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = use_local_db(self, 'metrics.db', modules=[dm], migrate=True)
+        _create_db(self.db_path)
+
+    def test_counters_accumulate(self):
+        dm.record_points_metric('workout', 10)
+        dm.record_points_metric('workout', 5)
+        dm.record_points_metric('attendance', 20)
+        dm.record_attendance_metric()
+
+        self.assertEqual(dm.get_metric_totals(dm.METRIC_POINTS, date.today()), {'count': 3, 'amount': 35.0})
+        self.assertEqual(dm.get_metric_totals(dm.METRIC_ATTENDANCE, date.today())['count'], 1)
+        activities = dm.get_activity_totals(date.today())
+        self.assertEqual([a['activity'] for a in activities], ['workout', 'attendance'])
+        self.assertEqual(activities[0]['avg_points'], 7.5)
+
+    def test_reconcile_rebuilds_from_source_tables(self):
+        yesterday = date.today() - timedelta(days=1)
+        sqlite_execute(self.db_path, "INSERT INTO points_transactions (user_id, points, activity, created_at) VALUES (1, 10, 'workout', ?)",
+                      (f"{yesterday} 09:00:00",))
+        sqlite_execute(self.db_path, "INSERT INTO points_transactions (user_id, points, activity) VALUES (1, 20, 'attendance')")
+        sqlite_execute(self.db_path, "INSERT INTO attendance_queue (user_id, queue_date) VALUES (1, ?)", (date.today().isoformat(),))
+        # A counter that drifted (e.g. a missed or duplicated bump) is overwritten
+        dm.bump_metric(dm.METRIC_POINTS, 999, count=7)
+
+        dm.reconcile_counters(days=2)
+
+        self.assertEqual(dm.get_metric_totals(dm.METRIC_POINTS, yesterday), {'count': 2, 'amount': 30.0})
+        self.assertEqual(dm.get_metric_totals(dm.METRIC_POINTS, date.today())['count'], 1)
+        self.assertEqual(dm.get_metric_totals(dm.METRIC_ATTENDANCE, date.today())['count'], 1)
+
+    def test_snapshots_and_readers(self):
+        sqlite_execute(self.db_path, "INSERT INTO fee_payments (user_id, amount, status) VALUES (1, 1000, 'completed')")
+        sqlite_execute(self.db_path, "INSERT INTO points_transactions (user_id, points, activity) VALUES (1, 10, 'workout')")
+        dm.refresh_dashboard_metrics()
+
+        platform = statistics_operations.get_platform_statistics()
+        self.assertEqual(platform['total_users'], 3)
+        self.assertEqual(platform['active_members'], 2)
+        self.assertEqual(platform['total_points'], 60)
+        self.assertEqual(platform['today_activities'], 1)
+
+        engagement = statistics_operations.get_engagement_metrics()
+        self.assertEqual(engagement['active_users'], 1)
+        self.assertEqual(engagement['total_points_awarded'], 10)
+
+        # Payments are applied to the revenue snapshot without a rebuild
+        dm.record_payment_metric(500)
+        revenue = dm.get_dashboard_snapshot(dm.SECTION_REVENUE)
+        self.assertEqual(revenue['total_payments'], 2)
+        self.assertEqual(revenue['total_revenue'], 1500)
+        self.assertEqual(revenue['monthly_revenue'], 1500)
+
+
+if __name__ == '__main__':
+    unittest.main()
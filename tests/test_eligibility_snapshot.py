@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from src.utils import eligibility_snapshot as es
+from src.utils.attendance_eligibility import check_attendance_eligibility
+from src.web import shared_state
+from src.web.shared_state import SharedChangeLog
+from tests.local_db import start_patches, temp_dir
+
+END = datetime(2026, 3, 31, 23, 59, 59)
+GRACE_END = datetime(2026, 4, 7, 23, 59, 59)
+
+
+class TestEligibilitySnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = {
+            'users': [{'user_id': 1}, {'user_id': 2}, {'user_id': 3}],
+            'subs': [
+                {'user_id': 1, 'end_date': '2026-01-31 23:59:59', 'grace_period_end': '2026-02-07 23:59:59'},
+                {'user_id': 1, 'end_date': END, 'grace_period_end': GRACE_END},
+                {'user_id': 2, 'end_date': END, 'grace_period_end': GRACE_END},
+            ],
+            'counts': [{'user_id': 2, 'count': 2}],
+        }
+        self.calls = []
+        patcher = patch('src.database.connection.execute_query', side_effect=self._execute)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(es.invalidate_eligibility_snapshot)
+        es.invalidate_eligibility_snapshot()
+
+    def _execute(self, query, params=None, fetch_one=False):
+        self.calls.append(query)
+        if 'FROM users WHERE' in query:
+            return {'user_id': params[0]} if params[0] <= 4 else None
+        if 'FROM users' in query:
+            return self.rows['users']
+        if 'FROM subscriptions WHERE user_id' in query:
+            return None
+        if 'FROM subscriptions' in query:
+            return self.rows['subs']
+        if 'WHERE user_id' in query:
+            return {'count': 0}
+        return self.rows['counts']
+
+    def test_state_follows_the_clock(self):
+        self.assertEqual(es.get_eligibility(1, now=datetime(2026, 3, 31, 12))['state'], es.ELIGIBILITY_ACTIVE)
+        grace = es.get_eligibility(1, now=datetime(2026, 4, 1, 9))
+        self.assertEqual(grace['state'], es.ELIGIBILITY_GRACE)
+        self.assertEqual((grace['grace_days_left'], grace['grace_attempts_left']), (7, 3))
+        self.assertEqual(es.get_eligibility(1, now=datetime(2026, 4, 8, 0, 0, 1))['state'], es.ELIGIBILITY_EXPIRED)
+        self.assertEqual(es.get_eligibility(3)['state'], es.ELIGIBILITY_NO_SUBSCRIPTION)
+        # One build, no per-read queries
+        self.assertEqual(len(self.calls), 3)
+
+    def test_grace_attempts_are_counted(self):
+        now = datetime(2026, 4, 2, 9)
+        self.assertEqual(es.get_eligibility(2, now=now)['grace_attempts_left'], 1)
+        es.record_grace_attendance(2)
+        self.assertEqual(es.get_eligibility(2, now=now)['grace_attempts_left'], 0)
+
+        with patch.object(es, 'datetime') as fake_datetime:
+            fake_datetime.now.return_value = now
+            result = check_attendance_eligibility(2)
+        self.assertFalse(result['eligible'])
+        self.assertEqual(result['reason'], 'GRACE_PERIOD_ACTIVE')
+
+    def test_miss_refreshes_single_user(self):
+        self.assertEqual(es.get_eligibility(4)['state'], es.ELIGIBILITY_NO_SUBSCRIPTION)
+        self.assertIsNone(es.get_eligibility(99))
+        self.assertEqual(check_attendance_eligibility(99)['reason'], 'USER_NOT_FOUND')
+        es.drop_eligibility(4)
+        self.assertNotIn(4, es._entries)
+
+    def test_bulk_lock_rebuilds_once(self):
+        from src.utils import subscription_scheduler
+
+        es.get_eligibility(1)
+        expired = [{'user_id': 1}, {'user_id': 2}]
+        with patch.object(subscription_scheduler, 'get_expired_subscriptions', return_value=expired), \
+                patch.object(subscription_scheduler, 'mark_subscription_locked', return_value=True) as lock:
+            asyncio.run(subscription_scheduler.lock_expired_subscriptions(AsyncMock()))
+
+        self.assertEqual([c.kwargs for c in lock.call_args_list], [{'refresh_snapshot': False}] * 2)
+        self.assertFalse(es._loaded)
+        es.get_eligibility(1)
+        self.assertEqual(len(self.calls), 6)
+
+
+class TestSharedEligibilityChanges(TestEligibilitySnapshot):
+    """WEB_SERVER_MODE=external: this process is a web worker, `bot` another process"""
+
+    def setUp(self):
+        super().setUp()
+        path = f"{temp_dir(self)}/web_shared_state.db"
+        self.bot = SharedChangeLog(path)
+        start_patches(
+            self,
+            patch('src.config.WEB_SERVER_MODE', 'external'),
+            patch('src.config.ELIGIBILITY_SYNC_SECONDS', 0),
+            patch.object(shared_state, '_change_log', SharedChangeLog(path)),
+            patch.object(es, '_change_cursor', None),
+            patch.object(es, '_own_changes', set()),
+        )
+
+    def test_changes_from_other_processes_are_applied(self):
+        now = datetime(2026, 4, 2, 9)
+        self.bot.publish(es.CHANGE_TOPIC, '1')  # before the build: already reflected in it
+        es.get_eligibility(1, now=now)
+        self.assertEqual(len(self.calls), 3)
+
+        # A renewal approved in the bot process: only that member is re-read
+        self.bot.publish(es.CHANGE_TOPIC, '2')
+        self.bot.publish('other', '1')
+        es.get_eligibility(1, now=now)
+        self.assertEqual(len(self.calls), 3)
+        es.get_eligibility(2, now=now)
+        self.assertEqual(len(self.calls), 6)
+
+        # This worker's own check-in is published but not re-read here
+        es.record_grace_attendance(1)
+        es.get_eligibility(1, now=now)
+        self.assertEqual(len(self.calls), 6)
+        self.assertEqual([item for _, item in self.bot.read_since(0, es.CHANGE_TOPIC)], ['1', '2', '1'])
+
+        self.bot.publish(es.CHANGE_TOPIC, None)
+        es.get_eligibility(1, now=now)
+        self.assertEqual(len(self.calls), 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import asyncio
+import socketserver
+import threading
+import unittest
+from email.message import EmailMessage
+
+from src.services.email_dispatcher import EmailDispatcher, SMTPPool
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO, MAIL, RCPT, DATA, NOOP, RSET, QUIT"""
+
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self._reply("220 test ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.decode().strip().split(' ')[0].upper()
+            if verb in ('EHLO', 'HELO'):
+                self._reply("250 test")
+            elif verb in ('MAIL', 'RCPT', 'NOOP', 'RSET'):
+                self._reply("250 OK")
+            elif verb == 'DATA':
+                self._reply("354 go ahead")
+                body = []
+                for data in iter(self.rfile.readline, b''):
+                    if data == b'.\r\n':
+                        break
+                    body.append(data)
+                with server.lock:
+                    reply = server.fail_next.pop(0) if server.fail_next else None
+                    if reply is None:
+                        server.messages.append(b''.join(body))
+                self._reply(reply or "250 queued")
+                if reply and reply.startswith('421'):
+                    return
+            elif verb == 'QUIT':
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("502 not implemented")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+        self.fail_next = []
+
+
+def _message(n):
+    message = EmailMessage()
+    message['From'] = 'club@example.com'
+    message['To'] = f'member{n}@example.com'
+    message['Subject'] = f'Reminder {n}'
+    message.set_content('Time to log your activity')
+    return message
+
+
+class TestEmailDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.server = _SMTPServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def _dispatcher(self, **options):
+        pool = SMTPPool('127.0.0.1', self.server.server_address[1], security='none', size=2, timeout=5)
+        options.setdefault('retry_base', 0.01)
+        dispatcher = EmailDispatcher(pool, workers=2, batch_size=10, **options).start()
+        self.addCleanup(dispatcher.stop, 5)
+        return dispatcher
+
+    def test_batches_share_pooled_sessions(self):
+        dispatcher = self._dispatcher()
+        futures = [dispatcher.submit(_message(n)) for n in range(40)]
+        self.assertTrue(dispatcher.flush(10))
+
+        self.assertTrue(all(future.result() for future in futures))
+        self.assertEqual(len(self.server.messages), 40)
+        self.assertLessEqual(self.server.connections, 2)
+        stats = dispatcher.stats()
+        self.assertEqual((stats['sent'], stats['failed'], stats['pending']), (40, 0, 0))
+
+    def test_transient_failures_are_retried(self):
+        self.server.fail_next = ["451 try again later", "421 closing connection"]
+        dispatcher = self._dispatcher()
+        futures = [dispatcher.submit(_message(n)) for n in range(5)]
+        self.assertTrue(dispatcher.flush(10))
+
+        self.assertTrue(all(future.result() for future in futures))
+        self.assertEqual(len(self.server.messages), 5)
+        self.assertEqual(dispatcher.stats()['retried'], 2)
+
+    def test_permanent_failure_and_retry_limit(self):
+        self.server.fail_next = ["550 no such user"] + ["451 try again later"] * 3
+        dispatcher = self._dispatcher(max_retries=2)
+        rejected = dispatcher.submit(_message(1))
+        self.assertFalse(rejected.result(10))
+        exhausted = dispatcher.submit(_message(2))
+        self.assertFalse(exhausted.result(10))
+
+        self.assertEqual(self.server.messages, [])
+        self.assertEqual(dispatcher.stats()['failed'], 2)
+
+    def test_send_async(self):
+        dispatcher = self._dispatcher()
+
+        async def run():
+            sent = await dispatcher.send_async(_message(0))
+            return sent, await dispatcher.send_many_async(_message(n) for n in range(1, 6))
+
+        self.assertEqual(asyncio.run(run()), (True, {'sent': 5, 'failed': 0}))
+        self.assertEqual(len(self.server.messages), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
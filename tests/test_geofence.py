@@ -0,0 +1,62 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from src.utils import geofence
+from src.utils.geofence import GeofenceEngine, Studio, haversine_distance
+
+STUDIOS = [
+    Studio('Main', 19.996429, 73.754282, 10),
+    Studio('Annex', 19.996600, 73.754282, 50),  # ~19m north, bigger radius
+    Studio('Pune', 18.520430, 73.856744, 20),
+]
+
+
+class TestGeofenceEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = GeofenceEngine(STUDIOS)
+        rng = random.Random(7)
+        self.points = [
+            (s.lat + rng.uniform(-0.0008, 0.0008), s.lng + rng.uniform(-0.0008, 0.0008))
+            for s in STUDIOS for _ in range(200)
+        ]
+
+    def _expected(self, lat, lng):
+        distances = [(haversine_distance(lat, lng, s.lat, s.lng), s) for s in STUDIOS]
+        inside = [(d, s) for d, s in distances if d <= s.radius_m]
+        d, s = min(inside or distances, key=lambda pair: pair[0])
+        return s.name, d, bool(inside)
+
+    def test_check_matches_scalar_haversine(self):
+        for lat, lng in self.points:
+            match = self.engine.check(lat, lng)
+            name, distance, within = self._expected(lat, lng)
+            self.assertEqual((match.studio.name, match.within), (name, within))
+            self.assertAlmostEqual(match.distance_m, distance, places=3)
+
+    def test_larger_radius_studio_wins_when_nearer_one_excludes(self):
+        # 15m from Main (outside its 10m) but inside Annex's 50m
+        match = self.engine.check(19.996429 + 15 / 111320.0, 73.754282)
+        self.assertTrue(match.within)
+        self.assertEqual(match.studio.name, 'Annex')
+
+    def test_batch_matches_single_checks(self):
+        single = [self.engine.check(lat, lng) for lat, lng in self.points]
+        self.assertEqual([m.studio for m in self.engine.check_points(self.points)], [m.studio for m in single])
+        with patch.object(geofence, 'np', None):
+            fallback = GeofenceEngine(STUDIOS).check_points(self.points)
+        self.assertEqual(fallback, single)
+        for batch, one in zip(self.engine.check_points(self.points), single):
+            self.assertEqual(batch.within, one.within)
+            self.assertAlmostEqual(batch.distance_m, one.distance_m, places=3)
+
+    def test_studios_from_config(self):
+        with patch('src.config.STUDIO_LOCATIONS', '[{"name": "A", "lat": 1, "lng": 2, "radius_m": 15}, {"lat": 3, "lng": 4}]'), \
+                patch('src.config.GEOFENCE_RADIUS_M', 12):
+            studios = geofence.load_studios()
+        self.assertEqual(studios, [Studio('A', 1.0, 2.0, 15.0), Studio('Studio 2', 3.0, 4.0, 12.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from openpyxl import load_workbook
+
+from src.utils.invoice_excel_export import export_invoice_report_file, INVOICE_HEADERS
+
+
+def _invoices(count):
+    for i in range(count):
+        yield {
+            'invoice_id': f'INV{i:05d}',
+            'full_name': f'Member {i}',
+            'phone': '9999999999',
+            'items_count': 2,
+            'items_subtotal': Decimal('100.00'),
+            'gst_total': 18.0,
+            'shipping': 0,
+            'final_total': Decimal('118.00'),
+            'status': 'paid' if i % 2 else None,
+            'created_date': date(2026, 1, 1),
+            'paid_date': None,
+        }
+
+
+class TestInvoiceExcelExport(unittest.TestCase):
+
+    def test_streams_generator_into_file(self):
+        summary = {'total_invoices': 250, 'total_amount': 29500.0}
+        path, row_count = export_invoice_report_file(_invoices(250), summary, '2026')
+        try:
+            self.assertEqual(row_count, 250)
+            wb = load_workbook(path)
+            self.assertEqual(wb.sheetnames, ['Summary', 'Invoices'])
+            self.assertEqual(wb['Summary']['A1'].value, 'Invoice Report - 2026')
+            self.assertEqual(wb['Summary']['B3'].value, 250)
+
+            ws = wb['Invoices']
+            self.assertEqual([c.value for c in ws[1]], INVOICE_HEADERS)
+            self.assertEqual(ws.max_row, 251)
+            self.assertEqual(ws.freeze_panes, 'A2')
+            self.assertEqual(ws['H2'].number_format, '₹#,##0.00')
+            self.assertEqual(ws['I2'].value, 'Pending')
+            self.assertEqual(ws['K2'].value, '-')
+        finally:
+            os.unlink(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
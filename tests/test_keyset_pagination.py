@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import patch
+
+from src.database import pagination
+from src.database.pagination import KeysetPage, fetch_keyset_page
+from src.utils import keyset_pagination as kp
+
+
+class TestKeysetCursor(unittest.TestCase):
+
+    def test_cursor_round_trip(self):
+        data = kp.encode_cursor('so', 'n', 123456, 'PARTIAL')
+        self.assertEqual(data, 'kp:so:n:2n9c:PARTIAL')
+        self.assertEqual(kp.decode_cursor(data), ('so', 'n', 123456, 'PARTIAL'))
+        self.assertEqual(kp.decode_cursor(kp.encode_cursor('pu', 'p', 0)), ('pu', 'p', 0, ''))
+
+    def test_rejects_bad_data(self):
+        self.assertIsNone(kp.decode_cursor('kp:pu:x:10'))
+        self.assertIsNone(kp.decode_cursor('kp:pu:n:!!'))
+        self.assertIsNone(kp.decode_cursor('store_order_detail:5'))
+        with self.assertRaises(ValueError):
+            kp.encode_cursor('pu', 'n', 1, 'x' * 60)
+
+
+class TestFetchKeysetPage(unittest.TestCase):
+
+    BASE = "SELECT * FROM users WHERE approval_status = %s"
+
+    def test_first_page_ascending(self):
+        rows = [{'user_id': i} for i in (1, 2, 3)]
+        with patch.object(pagination, 'execute_query', return_value=rows) as mock_query:
+            page = fetch_keyset_page(self.BASE, ('pending',), 'user_id', limit=2)
+        sql, params = mock_query.call_args[0]
+        self.assertTrue(sql.endswith("ORDER BY user_id ASC LIMIT %s"))
+        self.assertEqual(params, ('pending', 3))
+        self.assertEqual(page, KeysetPage(rows[:2], has_prev=False, has_next=True))
+
+    def test_previous_page_descending_list(self):
+        # Newest-first list, going back towards newer ids than 50
+        rows = [{'id': 51}, {'id': 52}]
+        with patch.object(pagination, 'execute_query', return_value=rows) as mock_query:
+            page = fetch_keyset_page(self.BASE, ('pending',), 'id', limit=5, before=50, descending=True)
+        sql, params = mock_query.call_args[0]
+        self.assertIn("AND id > %s ORDER BY id ASC", sql)
+        self.assertEqual(params, ('pending', 50, 6))
+        self.assertEqual([r['id'] for r in page.rows], [52, 51])
+        self.assertFalse(page.has_prev)
+        self.assertTrue(page.has_next)
+
+
+class TestKeysetPageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.spec = kp.register_keyset_list(kp.KeysetList(
+            name='test', key='id', fetch=self.fetch,
+            render_row=lambda row: f"{row['id']}\n", title=lambda scope: "Test",
+        ))
+
+    def tearDown(self):
+        kp.invalidate_keyset_list()
+
+    def fetch(self, scope, after, before, limit):
+        self.calls.append((scope, after, before))
+        return KeysetPage([{'id': 1}, {'id': 2}], has_prev=after is not None, has_next=True)
+
+    def test_page_cached_until_invalidated(self):
+        kp.get_keyset_page(self.spec, key=None)
+        kp.get_keyset_page(self.spec, key=None)
+        kp.get_keyset_page(self.spec, direction='n', key=2)
+        self.assertEqual(self.calls, [('', None, None), ('', 2, None)])
+
+        kp.invalidate_keyset_list('test')
+        kp.get_keyset_page(self.spec, key=None)
+        self.assertEqual(len(self.calls), 3)
+
+    def test_render_adds_navigation(self):
+        page = kp.get_keyset_page(self.spec, direction='n', key=5)
+        text, markup = kp.render_keyset_page(self.spec, page)
+        self.assertEqual(text, "Test\n\n1\n2\n")
+        labels = [button.callback_data for button in markup.inline_keyboard[-1]]
+        self.assertEqual(labels, ['kp:test:p:1', 'kp:test:n:2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
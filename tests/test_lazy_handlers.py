@@ -0,0 +1,61 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from src.utils import lazy_handlers
+from tests.local_db import start_patches, temp_dir
+
+
+class TestLazyHandlers(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = temp_dir(self)
+        sys.path.insert(0, self.tmp)
+        self.addCleanup(sys.path.remove, self.tmp)
+        self.addCleanup(lazy_handlers.stop_import_timing)
+        start_patches(
+            self,
+            patch.object(lazy_handlers, '_startup_costs', {}),
+            patch.object(lazy_handlers, '_lazy_costs', {}),
+        )
+
+    def _write_module(self, name, body):
+        with open(os.path.join(self.tmp, f'{name}.py'), 'w') as f:
+            f.write(body)
+        self.addCleanup(sys.modules.pop, name, None)
+
+    def test_lazy_callback_imports_on_first_call(self):
+        self._write_module('lazy_probe_handlers', "async def cmd_probe(update, context):\n    return update * 2\n")
+        callback = lazy_handlers.lazy_callback('lazy_probe_handlers:cmd_probe')
+
+        self.assertNotIn('lazy_probe_handlers', sys.modules)
+        self.assertEqual(callback.__name__, 'cmd_probe')
+        self.assertEqual(asyncio.run(callback(21, None)), 42)
+        self.assertIn('lazy_probe_handlers', sys.modules)
+        self.assertEqual([name for name, _ in lazy_handlers.lazy_loads()], ['lazy_probe_handlers'])
+
+    def test_startup_timing_records_tracked_modules(self):
+        pkg = os.path.join(self.tmp, 'src_probe')
+        os.makedirs(pkg)
+        with open(os.path.join(pkg, '__init__.py'), 'w') as f:
+            f.write('')
+        self._write_module('plain_probe', "VALUE = 1\n")
+        self.addCleanup(sys.modules.pop, 'src_probe', None)
+
+        with patch.object(lazy_handlers, '_tracked', lambda name: name.endswith('_probe')):
+            lazy_handlers.start_import_timing()
+            import plain_probe  # noqa: F401
+            import src_probe  # noqa: F401
+            lazy_handlers.stop_import_timing()
+
+        modules = [row[0] for row in lazy_handlers.import_costs()]
+        self.assertEqual(sorted(modules), ['plain_probe', 'src_probe'])
+        self.assertEqual(plain_probe.VALUE, 1)
+        self.assertIn('Startup imports:', lazy_handlers.import_report())
+        self.assertNotIn(lazy_handlers._timer, sys.meta_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+
+from telegram import Bot
+from telegram.error import RetryAfter
+from telegram.ext import Application, CallbackQueryHandler, CommandHandler, MessageHandler, filters
+
+from tools.loadtest.fake_api import FakeBotAPI, callback_query, make_user, photo_message, text_message
+from tools.loadtest.runner import run_application
+
+
+async def _start(update, context):
+    await update.message.reply_text("Welcome")
+
+
+async def _photo(update, context):
+    await update.message.reply_photo(update.message.photo[-1].file_id)
+
+
+async def _button(update, context):
+    await update.callback_query.answer()
+    await update.callback_query.edit_message_text("Done")
+
+
+class TestFakeBotAPI(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeBotAPI().start()
+        self.addCleanup(self.api.stop)
+
+    def _bot(self):
+        return Bot(self.api.token, base_url=f"{self.api.base_url}/bot")
+
+    def test_bot_methods_and_token_check(self):
+        async def run():
+            async with self._bot() as bot:
+                message = await bot.send_message(42, "hello")
+                self.assertEqual((message.chat_id, message.text), (42, "hello"))
+                self.assertTrue(await bot.set_my_commands([('start', 'Start')]))
+            wrong = Bot('999:WRONG', base_url=f"{self.api.base_url}/bot")
+            with self.assertRaises(Exception):
+                await wrong.get_me()
+
+        asyncio.run(run())
+        self.assertEqual(self.api.calls['sendMessage'], 1)
+        self.assertEqual(self.api.stats()['extra_replies'], 1)
+
+    def test_flood_rate_raises_retry_after(self):
+        self.api.flood_rate = 1.0
+
+        async def run():
+            async with self._bot() as bot:
+                with self.assertRaises(RetryAfter):
+                    await bot.send_message(42, "hello")
+
+        asyncio.run(run())
+        self.assertEqual(self.api.stats()['retry_after'], 1)
+
+    def test_updates_reach_handlers_and_replies_are_timed(self):
+        application = Application.builder().token(self.api.token).base_url(f"{self.api.base_url}/bot").build()
+        application.add_handler(CommandHandler('start', _start))
+        application.add_handler(MessageHandler(filters.PHOTO, _photo))
+        application.add_handler(CallbackQueryHandler(_button))
+        users = [make_user(5000 + n) for n in range(5)]
+        scripts = {'mixed': [(user, [text_message(user, '/start'), photo_message(user), callback_query(user, 'go')])
+                             for user in users]}
+
+        results = run_application(application, self.api, scripts, settle=0, concurrency=3, reply_timeout=5)
+
+        row = results['scenarios']['mixed']
+        self.assertEqual((row['updates'], row['answered'], row['unanswered']), (15, 15, 0))
+        self.assertGreater(row['p50_ms'], 0)
+        stats = self.api.stats()
+        self.assertEqual((stats['delivered'], stats['replied']), (15, 15))
+        # The edit after answering the callback is a follow-up, not a second answer
+        self.assertEqual(stats['extra_replies'], 5)
+        self.assertEqual(self.api.calls['sendPhoto'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.utils import logging_setup
+from src.utils.logging_setup import JsonFormatter, TagSampler, configure_logging, split_tag, stop_logging
+
+
+def _record(msg, *args, level=logging.INFO, **extra):
+    record = logging.LogRecord('src.test', level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestLoggingSetup(unittest.TestCase):
+
+    def test_split_tag(self):
+        self.assertEqual(split_tag("[ACCESS] granted telegram_id=1"), ('ACCESS', 'granted telegram_id=1'))
+        self.assertEqual(split_tag("plain message"), (None, 'plain message'))
+        self.assertEqual(split_tag("[unterminated tag"), (None, '[unterminated tag'))
+
+    def test_sampler_keeps_one_in_n_per_tag(self):
+        sampler = TagSampler({'ACCESS': 5})
+        kept = [sampler.filter(_record("[ACCESS] user_state %s", n)) for n in range(20)]
+        self.assertEqual(kept.count(True), 4)
+        self.assertTrue(all(sampler.filter(_record("[ACCESS] blocked", level=logging.WARNING)) for _ in range(5)))
+        self.assertTrue(all(sampler.filter(_record("[OTHER] x")) for _ in range(5)))
+
+        record = _record("[ACCESS] user_state %s", 1)
+        sampler = TagSampler({'ACCESS': 5})
+        self.assertTrue(sampler.filter(record))
+        self.assertEqual(record.sampled, 5)
+
+    def test_json_formatter_fields(self):
+        line = JsonFormatter().format(_record("[REMINDER_BOOT] user_id=%s", 42, profiles=3))
+        entry = json.loads(line)
+        self.assertEqual((entry['tag'], entry['msg'], entry['level']), ('REMINDER_BOOT', 'user_id=42', 'INFO'))
+        self.assertEqual(entry['profiles'], 3)
+
+    def test_configure_logging_writes_through_the_queue(self):
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        root.handlers = []
+        self.addCleanup(setattr, root, 'handlers', saved_handlers)
+        self.addCleanup(root.setLevel, saved_level)
+        self.addCleanup(stop_logging)
+        path = os.path.join(tempfile.mkdtemp(), 'bot.log')
+
+        with mock.patch.multiple('src.config', LOG_FORMAT='json', LOG_LEVEL='INFO',
+                                 LOG_LEVELS='src.noisy=WARNING', LOG_SAMPLE='ACCESS=3'):
+            self.assertTrue(configure_logging(path, console=False))
+            self.assertFalse(configure_logging(path, console=False))
+
+        log = logging.getLogger('src.test_logging')
+        for n in range(6):
+            log.info("[ACCESS] user_state telegram_id=%s", n)
+        log.warning("[ACCESS] blocked telegram_id=%s", 9)
+        logging.getLogger('src.noisy').info("dropped by the per-logger level")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            log.exception("[DB] failed")
+        stop_logging()
+        self.assertIsNone(logging_setup._listener)
+
+        with open(path, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([entry['msg'] for entry in entries],
+                         ['user_state telegram_id=0', 'user_state telegram_id=3', 'blocked telegram_id=9', 'failed'])
+        self.assertEqual(entries[0]['sampled'], 3)
+        self.assertIn('ValueError: boom', entries[-1]['exc'])
+        self.assertEqual(logging.getLogger('src.noisy').level, logging.WARNING)
+        logging.getLogger('src.noisy').setLevel(logging.NOTSET)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from telegram.ext import (
+    Application, ApplicationHandlerStop, CommandHandler, ConversationHandler, MessageHandler, filters
+)
+
+from src.database import connection
+from src.utils import metrics
+from src.utils.callback_router import CallbackRouter
+
+
+def _series(kind):
+    return {row['name']: row for row in metrics.metrics_snapshot(kind)}
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset_metrics()
+        self.addCleanup(metrics.reset_metrics)
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            metrics.fingerprint("SELECT *  FROM users\n WHERE user_id = %s AND name = 'Asha' LIMIT 10"),
+            "SELECT * FROM users WHERE user_id = ? AND name = ? LIMIT ?",
+        )
+        self.assertEqual(
+            metrics.fingerprint("DELETE FROM t1 WHERE id IN (%s, %s, %s)"),
+            metrics.fingerprint("DELETE FROM t1 WHERE id IN (?,?)"),
+        )
+
+    def test_percentiles_and_error_rate(self):
+        for ms in range(1, 101):
+            metrics.record('query', 'q', ms / 1000, error=ms > 95)
+        row = _series('query')['q']
+
+        self.assertEqual(row['count'], 100)
+        self.assertEqual(row['error_rate'], 0.05)
+        self.assertEqual((row['p50_ms'], row['p95_ms'], row['p99_ms'], row['max_ms']), (50, 95, 99, 100))
+        self.assertIn('query: 1 series, 100 calls', metrics.metrics_report())
+
+    def test_handlers_router_and_queries_are_timed(self):
+        application = Application.builder().token('123:TEST').build()
+        router = CallbackRouter()
+        router.add(AsyncMock(side_effect=ApplicationHandlerStop), exact='stop')
+
+        async def cmd_start(update, context):
+            return 1
+
+        async def on_text(update, context):
+            raise RuntimeError('boom')
+
+        conversation = ConversationHandler(
+            entry_points=[CommandHandler('start', cmd_start)],
+            states={1: [MessageHandler(filters.TEXT, on_text)]},
+            fallbacks=[],
+        )
+        application.add_handler(conversation)
+        router.mount(application)
+        self.assertEqual(metrics.instrument_handlers(application), 2)
+        self.assertEqual(metrics.instrument_handlers(application), 0)
+
+        entry, state = conversation.entry_points[0], conversation.states[1][0]
+        self.assertEqual(asyncio.run(entry.callback(None, None)), 1)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(state.callback(None, None))
+        query = SimpleNamespace(data='stop', from_user=SimpleNamespace(id=1), answer=AsyncMock())
+        with self.assertRaises(ApplicationHandlerStop):
+            asyncio.run(router.dispatch(SimpleNamespace(callback_query=query), None))
+
+        handlers = _series('handler')
+        self.assertEqual(handlers['/start']['errors'], 0)
+        self.assertEqual(handlers['msg:on_text']['errors'], 1)
+        self.assertEqual(handlers['cb:stop']['errors'], 0)
+
+        db_path = os.path.join(tempfile.mkdtemp(), 'metrics.db')
+        with patch.object(connection, 'LOCAL_DB_PATH', db_path), \
+                patch.object(connection, 'USE_LOCAL_DB', True), \
+                patch.object(connection, 'USE_REMOTE_DB', False):
+            connection.execute_query("CREATE TABLE t (id INTEGER)")
+            for n in range(3):
+                connection.execute_query("INSERT INTO t VALUES (%s)", (n,))
+            with self.assertRaises(Exception):
+                connection.execute_query("SELECT nope FROM t")
+        queries = _series('query')
+        self.assertEqual(queries['INSERT INTO t VALUES (?)']['count'], 3)
+        self.assertEqual(queries['SELECT nope FROM t']['errors'], 1)
+
+    def test_bot_api_calls_are_timed_by_method(self):
+        from telegram.request import HTTPXRequest
+        from src.utils.timed_request import TimedHTTPXRequest
+
+        request = TimedHTTPXRequest()
+        with patch.object(HTTPXRequest, 'do_request', AsyncMock(side_effect=[(200, b'{}'), (429, b'{}')])):
+            for _ in range(2):
+                asyncio.run(request.do_request(url='https://api.telegram.org/botX/sendMessage', method='POST'))
+        row = _series('telegram')['sendMessage']
+        self.assertEqual((row['count'], row['errors']), (2, 1))
+
+    def test_metrics_endpoint(self):
+        from src.web.app import create_app
+
+        metrics.record('handler', '/start', 0.01)
+        client = create_app().test_client()
+        with patch('src.config.METRICS_TOKEN', ''):
+            self.assertEqual(client.get('/metrics').status_code, 404)
+        with patch('src.config.METRICS_TOKEN', 'secret'):
+            self.assertEqual(client.get('/metrics').status_code, 403)
+            response = client.get('/metrics?kind=handler', headers={'X-Metrics-Token': 'secret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['name'] for row in response.get_json()['series']], ['/start'])
+
+    def test_metrics_endpoint_in_external_mode_includes_the_bot(self):
+        from src.web import shared_state
+        from src.web.app import create_app
+        from tests.local_db import start_patches, temp_dir
+
+        start_patches(
+            self,
+            patch('src.config.WEB_SERVER_MODE', 'external'),
+            patch('src.config.METRICS_TOKEN', 'secret'),
+            patch.object(shared_state, '_snapshots', shared_state.SharedSnapshots(os.path.join(temp_dir(self), 'state.db'))),
+        )
+        client = create_app().test_client()
+        self.assertIsNone(client.get('/metrics?token=secret').get_json()['bot'])
+
+        # Recorded in the bot process, published by its job
+        metrics.record('handler', '/checkin', 0.02)
+        metrics.record('query', 'SELECT ?', 0.001)
+        asyncio.run(metrics.publish_metrics_snapshot(None))
+        metrics.reset_metrics()
+
+        body = client.get('/metrics?kind=handler&token=secret').get_json()
+        self.assertEqual(body['series'], [])
+        self.assertEqual([row['name'] for row in body['bot']['series']], ['/checkin'])
+        self.assertLess(body['bot']['age_seconds'], 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import sqlite3
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.database import app_settings_operations, migrations
+from tests.local_db import sqlite_execute, use_local_db
+
+
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = use_local_db(self, 'migrate.db', modules=[app_settings_operations])
+        self.tmp = Path(self.db_path).parent
+
+    def _write(self, name, body):
+        directory = self.tmp / 'migrations'
+        directory.mkdir(exist_ok=True)
+        (directory / name).write_text(body)
+        return directory
+
+    def test_applies_once_in_order_for_the_dialect(self):
+        self._write('001_old.sql', "DROP TABLE users;\n")
+        self._write('002_items.sql', "-- items\nCREATE TABLE items (id INTEGER);\nINSERT INTO items VALUES (1);\n")
+        self._write('003_more.mysql.sql', "CREATE TABLE nope (id INT AUTO_INCREMENT);\n")
+        directory = self._write('003_more.sqlite.sql', "INSERT INTO items VALUES (2);")
+
+        self.assertEqual([m.name for m in migrations.discover_migrations(directory)],
+                         ['001_old', '002_items', '003_more'])
+        self.assertEqual(migrations.run_migrations(directory, baseline=1), ['001_old', '002_items', '003_more'])
+        self.assertEqual(migrations.run_migrations(directory, baseline=1), [])
+
+        self.assertEqual(sqlite_execute(self.db_path, "SELECT COUNT(*) FROM items"), [(2,)])
+        self.assertTrue(all(row['applied'] for row in migrations.migration_status(directory)))
+
+    def test_failure_stops_and_is_retried(self):
+        self._write('001_bad.sql', "CREATE TABLE a (id INTEGER);\nNOT SQL;\n")
+        directory = self._write('002_next.sql', "CREATE TABLE b (id INTEGER);\n")
+
+        with self.assertRaises(sqlite3.Error):
+            migrations.run_migrations(directory, baseline=None)
+        self.assertEqual([m.name for m in migrations.pending_migrations(directory)], ['001_bad', '002_next'])
+
+        with self.assertRaises(ValueError):
+            self._write('002_twice.sql', "")
+            migrations.discover_migrations(directory)
+
+    def test_repo_migrations_on_a_legacy_local_db(self):
+        sqlite_execute(self.db_path, "CREATE TABLE users (user_id INTEGER PRIMARY KEY)")
+        sqlite_execute(self.db_path,
+                       "CREATE TABLE reminder_profile (user_id INTEGER PRIMARY KEY, water_enabled INTEGER DEFAULT 1)")
+
+        applied = migrations.run_migrations()
+        self.assertIn('003_reminder_profile', applied)
+        self.assertIn('004_app_settings', applied)
+
+        conn = sqlite3.connect(self.db_path)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(reminder_profile)")}
+        self.assertTrue({'dinner_time', 'water_interval_minutes', 'updated_at'} <= columns)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertTrue({'admin_notification_prefs', 'metric_counters', 'metric_snapshots', 'user_daily_rollups',
+                         'user_period_rollups', 'rollup_runs', 'attendance_streaks'} <= tables)
+        # Baselined hand-applied migrations were recorded, not executed
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM users").fetchone()[0], 0)
+        conn.close()
+
+        app_settings_operations.set_app_setting('welcome', 'hi')
+        app_settings_operations.set_app_setting('welcome', 'hello')
+        with patch.object(app_settings_operations, 'execute_query',
+                          wraps=app_settings_operations.execute_query) as query:
+            self.assertEqual(app_settings_operations.get_app_setting('welcome'), 'hello')
+        self.assertEqual(query.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.utils import notification_digest as nd
+
+
+def _entry(uid):
+    return {'message': f"<b>Attendance</b> {uid}", 'line': f"✅ Member {uid}", 'name': f"Member {uid}",
+            'user_id': uid, 'attendance_id': 1000 + uid}
+
+
+class TestNotificationDigest(unittest.TestCase):
+
+    def setUp(self):
+        nd.take_pending_digests()
+        self.bot = MagicMock()
+        self.bot.send_message = AsyncMock()
+
+    def test_rush_is_coalesced_per_admin(self):
+        admins = list(range(1, 11))
+        prefs = {9: {'muted': True, 'priority': 'digest'}, 10: {'muted': False, 'priority': 'instant'}}
+        instant = []
+        for uid in range(300):
+            instant.extend(nd.route_admin_event(_entry(uid), admins, prefs))
+
+        self.assertEqual(instant, [10] * 300)
+        sent = asyncio.run(nd.flush_admin_digests(MagicMock(bot=self.bot)))
+        # 8 digest admins x 30 chunks of 10, instead of 300 messages each
+        self.assertEqual(sent, 8 * 30)
+        chat_ids = {c.kwargs['chat_id'] for c in self.bot.send_message.await_args_list}
+        self.assertEqual(chat_ids, set(range(1, 9)))
+        self.assertEqual(nd.take_pending_digests(), {})
+
+    def test_digest_has_approve_reject_buttons(self):
+        text, markup = nd.format_digest([_entry(1), _entry(2), dict(_entry(3), attendance_id=None)])
+        self.assertIn('3 notifications', text)
+        rows = markup.inline_keyboard
+        self.assertEqual(len(rows), 2)
+        self.assertEqual([b.callback_data for b in rows[0]], ['approve_attend_1001', 'reject_attend_1001'])
+
+        text, _ = nd.format_digest([_entry(5)])
+        self.assertEqual(text, "<b>Attendance</b> 5")
+
+    def test_deliver_admin_event(self):
+        prefs = {2: {'muted': True}, 3: {'priority': 'instant'}}
+
+        self.assertEqual(asyncio.run(nd.deliver_admin_event(self.bot, _entry(1), [1, 2, 3], prefs)), 1)
+        self.assertEqual(self.bot.send_message.await_args.kwargs['chat_id'], 3)
+        self.assertEqual(list(nd.take_pending_digests()), [1])
+
+        # Not digested: everyone not muted, now
+        self.assertEqual(asyncio.run(nd.deliver_admin_event(self.bot, _entry(2), [1, 2, 3], prefs, digest=False)), 2)
+        self.assertEqual(nd.take_pending_digests(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+import openpyxl
+
+from src.utils import product_import
+from src.utils.product_import import ProductImportError, import_products
+from tests.local_db import start_patches
+
+
+def _workbook(rows, header=product_import.PRODUCT_COLUMNS):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(list(header))
+    for row in rows:
+        ws.append(row)
+    buf = io.BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+    return buf
+
+
+class TestProductImport(unittest.TestCase):
+
+    def setUp(self):
+        self.snapshot = {
+            'P1': {'product_code': 'P1', 'category': 'Supplements', 'name': 'Whey', 'description': '',
+                   'price': Decimal('1500.00'), 'discount_percent': Decimal('10.00'), 'stock': 50, 'status': 'ACTIVE'},
+            'P2': {'product_code': 'P2', 'category': 'Supplements', 'name': 'Creatine', 'description': '',
+                   'price': Decimal('800.00'), 'discount_percent': 0, 'stock': 30, 'status': 'ACTIVE'},
+        }
+        self.written = []
+        start_patches(
+            self,
+            patch.object(product_import, 'get_product_snapshot', return_value=self.snapshot),
+            patch.object(product_import, 'bulk_upsert_products',
+                         side_effect=lambda rows, batch_size: self.written.extend(rows)),
+        )
+
+    def test_diff_only_writes_changes(self):
+        buf = _workbook([
+            ['P1', 'Supplements', 'Whey', None, 1500, 10, 50, 'active'],
+            ['P2', 'Supplements', 'Creatine', None, 850, 0, 30, 'ACTIVE'],
+            ['P3', 'Accessories', 'Towel', 'Microfiber', 300, None, None, None],
+            [None, None, None, None, None, None, None, None],
+            ['P4', 'Accessories', None, None, 100, 0, 1, 'ACTIVE'],
+            ['P5', 'Accessories', 'Bottle', None, 'abc', 0, 1, 'ACTIVE'],
+        ])
+        progress = []
+        report = import_products(buf, progress.append)
+
+        self.assertEqual(report.rows_read, 5)
+        self.assertEqual((report.created, report.updated, report.unchanged), (1, 1, 1))
+        self.assertEqual(len(report.errors), 2)
+        self.assertTrue(report.errors[0].startswith('Row 6:'))
+        self.assertEqual([p['product_code'] for p in self.written], ['P2', 'P3'])
+        self.assertEqual(self.written[1]['status'], 'ACTIVE')
+        self.assertTrue(progress)
+
+    def test_bad_header_rejected(self):
+        buf = _workbook([['P1']], header=['code', 'name'])
+        with self.assertRaises(ProductImportError):
+            import_products(buf)
+        self.assertEqual(self.written, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from src.utils import product_search as ps
+
+
+ITEMS = [
+    {'serial': 1, 'name': 'Herbalife Formula 1 Vanilla', 'hsn': '2106', 'mrp': 2400, 'gst': 18},
+    {'serial': 2, 'name': 'Herbalife Formula 1 Chocolate', 'hsn': '2106', 'mrp': 2400, 'gst': 18},
+    {'serial': 3, 'name': 'Afresh Energy Drink Lemon', 'hsn': '2101', 'mrp': 900, 'gst': 18},
+    {'serial': 4, 'name': 'Protein Bar 500ml Shaker', 'hsn': '3924', 'mrp': 350, 'gst': 12},
+]
+
+
+class TestProductSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = ps.ProductSearchIndex(ITEMS)
+
+    def names(self, term, **kwargs):
+        return [row['name'] for row in self.index.search(term, **kwargs)]
+
+    def test_misspelled_name_still_matches(self):
+        self.assertEqual(self.names('herbalfe formla chocolat')[0], 'Herbalife Formula 1 Chocolate')
+        self.assertIn('Afresh Energy Drink Lemon', self.names('afresh enrgy'))
+
+    def test_prefix_and_substring_matches(self):
+        self.assertEqual(len(self.names('herba')), 2)
+        self.assertEqual(len(self.names('life')), 2)
+        self.assertEqual(self.names('500')[0], 'Protein Bar 500ml Shaker')
+
+    def test_full_coverage_ranks_first(self):
+        self.assertEqual(self.names('formula vanilla')[0], 'Herbalife Formula 1 Vanilla')
+
+    def test_short_tokens_are_not_fuzzy(self):
+        self.assertEqual(self.names('xyz'), [])
+
+    def test_hsn_and_predicate(self):
+        self.assertEqual(len(self.names('2106')), 2)
+        self.assertEqual(self.names('2106', predicate=lambda r: r['serial'] == 2), ['Herbalife Formula 1 Chocolate'])
+
+    def test_bounded_edit_distance(self):
+        self.assertEqual(ps.bounded_edit_distance('formla', 'formula', 2), 1)
+        self.assertEqual(ps.bounded_edit_distance('shaker', 'vanilla', 2), 3)
+
+
+class TestProductSearchCache(unittest.TestCase):
+
+    def setUp(self):
+        self.orig_load = ps._load_rows
+        self.loads = []
+
+        def fake_load(source):
+            self.loads.append(source)
+            return list(ITEMS)
+
+        ps._load_rows = fake_load
+        ps._indexes.clear()
+        ps._dirty.clear()
+
+    def tearDown(self):
+        ps._load_rows = self.orig_load
+        ps._indexes.clear()
+        ps._dirty.clear()
+
+    def test_index_is_built_once_until_invalidated(self):
+        ps.search_products('herbalife')
+        ps.search_products('afresh')
+        self.assertEqual(self.loads, ['store_items'])
+        ps.invalidate_product_index('store_items')
+        ps.invalidate_product_index('store_items')
+        ps.search_products('afresh')
+        self.assertEqual(self.loads, ['store_items', 'store_items'])
+
+    def test_numeric_term_returns_exact_serial_first(self):
+        results = ps.search_products('3')
+        self.assertEqual(results[0]['serial'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import os
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from src.database import connection
+from src.utils import metrics, query_profiler
+from tests.local_db import start_patches, use_local_db
+
+
+class TestQueryProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = os.path.dirname(use_local_db(self, 'profile.db'))
+        self.profile_log = os.path.join(self.tmp, 'query_profile.jsonl')
+        self.slow_log = os.path.join(self.tmp, 'slow_queries.log')
+        start_patches(
+            self,
+            patch.object(query_profiler, 'QUERY_PROFILE_LOG', self.profile_log),
+            patch.object(query_profiler, 'SLOW_QUERY_LOG', self.slow_log),
+            patch.object(query_profiler, 'SLOW_QUERY_MS', 1000),
+            patch.object(query_profiler, '_profile_log', None),
+            patch.object(query_profiler, '_slow_log', None),
+        )
+        self.addCleanup(self._close_logs)
+        self.addCleanup(query_profiler.set_query_profiling, False)
+        query_profiler.reset_query_profile()
+        connection.execute_query("CREATE TABLE members (user_id INTEGER, name TEXT)")
+        for uid in range(6):
+            connection.execute_query("INSERT INTO members VALUES (%s, %s)", (uid, f'member{uid}'))
+
+    def _close_logs(self):
+        for name in ('query_profile', 'slow_queries'):
+            log = logging.getLogger(name)
+            for handler in list(log.handlers):
+                handler.close()
+                log.removeHandler(handler)
+
+    def test_off_by_default(self):
+        self.assertFalse(query_profiler.ENABLED)
+        self.assertEqual(query_profiler.profile_top(), [])
+        self.assertFalse(os.path.exists(self.profile_log))
+
+    def test_n_plus_one_attributed_to_handler(self):
+        query_profiler.set_query_profiling(True)
+
+        async def cmd_leaderboard():
+            with metrics.timed('handler', '/leaderboard'):
+                members = await asyncio.to_thread(connection.execute_query, "SELECT user_id FROM members")
+                for row in members:
+                    await asyncio.to_thread(
+                        connection.execute_query, "SELECT name FROM members WHERE user_id = %s",
+                        (row['user_id'],), True)
+
+        asyncio.run(cmd_leaderboard())
+        connection.execute_query("SELECT COUNT(*) AS n FROM members WHERE name = 'x' AND user_id > %s", (date.today(),))
+
+        top = {row['fp']: row for row in query_profiler.profile_top()}
+        lookup = top['SELECT name FROM members WHERE user_id = ?']
+        self.assertEqual((lookup['calls'], lookup['rows']), (6, 6))
+        self.assertEqual(lookup['callers'], [('/leaderboard', 6)])
+
+        summary = query_profiler.summarise(query_profiler.load_records([self.profile_log]))
+        by_fp = {entry['fp']: entry for entry in summary}
+        self.assertEqual(by_fp['SELECT name FROM members WHERE user_id = ?']['n_plus_one'], [('/leaderboard', 6)])
+        self.assertEqual(by_fp['SELECT user_id FROM members']['n_plus_one'], [])
+        counted = by_fp['SELECT COUNT(*) AS n FROM members WHERE name = ? AND user_id > ?']
+        self.assertEqual(list(counted['params']), [('date',)])
+        self.assertIn('N+1? /leaderboard ran this 6×', query_profiler.format_summary(summary))
+        self.assertEqual(os.path.getsize(self.slow_log), 0)
+
+    def test_reminder_jobs_scheduled_later_are_attributed(self):
+        from src.utils.scheduled_jobs import schedule_user_water_reminder
+
+        query_profiler.set_query_profiling(True)
+        application = MagicMock()
+        application.job_queue.get_jobs_by_name.return_value = []
+        schedule_user_water_reminder(application, 3, 60)
+        job = application.job_queue.run_repeating.call_args.args[0]
+
+        def get_reminder_profile(user_id):
+            connection.execute_query("SELECT name FROM members WHERE user_id = %s", (user_id,), True)
+            return {'water_enabled': False}
+
+        with patch('src.database.reminder_operations.get_reminder_profile', get_reminder_profile):
+            asyncio.run(job(MagicMock()))
+
+        top = {row['fp']: row for row in query_profiler.profile_top()}
+        self.assertEqual(top['SELECT name FROM members WHERE user_id = ?']['callers'], [('reminder:water', 1)])
+        self.assertIn('reminder:water', {row['name'] for row in metrics.metrics_snapshot('job')})
+
+    def test_slow_queries_logged_with_param_shapes(self):
+        query_profiler.set_query_profiling(True)
+        with patch.object(query_profiler, 'SLOW_QUERY_MS', 0):
+            connection.execute_query("SELECT * FROM members WHERE name = %s", ('member1',))
+        with open(self.slow_log) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn('"params": ["str(7)"]', lines[0])
+        self.assertNotIn('member1', lines[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from datetime import date, timedelta
+
+from src.database import reports_operations
+from tests.local_db import sqlite_execute, use_local_db
+
+
+class TestMembershipStats(unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = use_local_db(self, 'reports.db')
+        sqlite_execute(self.db_path, """
+            CREATE TABLE users (user_id INTEGER PRIMARY KEY, fee_status TEXT, fee_expiry_date DATE,
+                                total_points INTEGER, created_at TIMESTAMP)
+        """)
+        today = date.today()
+        old = f"{today - timedelta(days=400)} 09:00:00"
+        for row in (
+            (1, 'paid', today + timedelta(days=3), 50, old),        # active, expiring this week
+            (2, 'active', None, 20, f"{today} 08:00:00"),          # active, joined today
+            (3, 'paid', today - timedelta(days=1), 10, old),        # lapsed
+            (4, 'unpaid', None, 0, old),
+        ):
+            sqlite_execute(self.db_path, "INSERT INTO users VALUES (?, ?, ?, ?, ?)",
+                           (row[0], row[1], row[2] and row[2].isoformat(), row[3], row[4]))
+
+    def test_counts_on_local_sqlite(self):
+        # Used PostgreSQL-only FILTER / INTERVAL through a raw connection, so the EOD report got {} locally
+        self.assertEqual(reports_operations.get_membership_stats(), {
+            'total_members': 4,
+            'active_members': 2,
+            'inactive_members': 2,
+            'expiring_soon': 1,
+            'new_this_month': 1,
+            'total_points_all': 80,
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
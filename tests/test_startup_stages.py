@@ -0,0 +1,113 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.utils import scheduled_jobs, startup
+
+
+def _context(attempt=1):
+    return SimpleNamespace(
+        job=SimpleNamespace(data={'attempt': attempt}),
+        job_queue=MagicMock(),
+        application=SimpleNamespace(job_queue=MagicMock()),
+        bot=SimpleNamespace(send_message=AsyncMock()),
+    )
+
+
+class TestStartupStages(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(startup._stages.clear)
+
+    def test_stages_run_in_order_and_report_readiness(self):
+        calls = []
+        application = MagicMock()
+        startup.schedule_startup_stages(application, skip_db=True)
+        application.job_queue.run_once.assert_called_once()
+        self.assertFalse(startup.startup_ready())
+        self.assertEqual(startup.stage_state('db'), startup.STAGE_SKIPPED)
+
+        async def reminders(app):
+            calls.append('reminders')
+            return 'profiles=2'
+
+        with patch.object(startup, 'apply_migrations', lambda: calls.append('schema')), \
+                patch.object(startup, 'bootstrap_reminders', reminders), \
+                patch.object(startup, 'warm_caches', lambda: calls.append('caches') and None), \
+                patch.object(startup, 'backfill_dashboard', lambda: calls.append('dashboard') and None), \
+                patch.object(startup, 'backfill_rollups', lambda: calls.append('rollups') and None), \
+                patch.object(startup, 'seed_streaks', lambda: calls.append('streaks') and None):
+            asyncio.run(startup.run_startup_stages(_context()))
+
+        self.assertEqual(calls, ['schema', 'reminders', 'caches', 'dashboard', 'rollups', 'streaks'])
+        self.assertTrue(startup.startup_ready())
+        status = startup.startup_status()
+        self.assertEqual(status['reminders']['detail'], 'profiles=2')
+        self.assertIsNotNone(status['caches']['ms'])
+        self.assertIn('reminders  ready', startup.startup_report())
+
+    def test_backfills_wait_for_the_schema(self):
+        startup.schedule_startup_stages(MagicMock(), skip_db=True)
+        with patch.object(startup, 'apply_migrations', side_effect=RuntimeError('locked')), \
+                patch.object(startup, 'bootstrap_reminders', AsyncMock()), \
+                patch.object(startup, 'warm_caches'), \
+                patch.object(startup, 'backfill_dashboard') as dashboard, \
+                patch.object(startup, 'backfill_rollups') as rollups, \
+                patch.object(startup, 'seed_streaks') as streaks:
+            asyncio.run(startup.run_startup_stages(_context()))
+
+        for backfill in (dashboard, rollups, streaks):
+            backfill.assert_not_called()
+        self.assertEqual(startup.stage_state('streaks'), startup.STAGE_PENDING)
+        self.assertFalse(startup.startup_ready())
+
+    def test_db_failure_alerts_once_and_retries(self):
+        startup.schedule_startup_stages(MagicMock())
+        context = _context()
+        with patch.object(startup, 'check_database', side_effect=RuntimeError('refused')), \
+                patch.object(startup, 'apply_migrations') as schemas, \
+                patch('src.config.SUPER_ADMIN_USER_ID', '42'):
+            asyncio.run(startup.run_startup_stages(context))
+            retry = _context(attempt=2)
+            asyncio.run(startup.run_startup_stages(retry))
+
+        schemas.assert_not_called()
+        context.bot.send_message.assert_awaited_once()
+        retry.bot.send_message.assert_not_awaited()
+        self.assertEqual(context.job_queue.run_once.call_args.kwargs['data'], {'attempt': 2})
+        self.assertEqual(startup.startup_status()['db']['error'], 'refused')
+        self.assertEqual(startup.stage_state('schema'), startup.STAGE_PENDING)
+        self.assertFalse(startup.startup_ready())
+
+
+class TestReminderBootstrap(unittest.TestCase):
+
+    def test_bootstrap_skips_per_user_job_lookups(self):
+        application = MagicMock()
+        application.job_queue.jobs.return_value = [SimpleNamespace(name='water:2')]
+        profiles = [
+            {'user_id': 1, 'water_enabled': True, 'water_interval_minutes': 30, 'lunch_enabled': True},
+            {'user_id': 2, 'water_enabled': False},
+        ]
+        with patch('src.database.reminder_operations.get_all_profiles', return_value=profiles):
+            detail = asyncio.run(startup.bootstrap_reminders(application))
+
+        self.assertEqual(detail, 'profiles=2')
+        # Only the one job that is actually queued is looked up (to cancel it)
+        application.job_queue.get_jobs_by_name.assert_called_once_with('water:2')
+        self.assertEqual(application.job_queue.run_repeating.call_args.kwargs['name'], 'water:1')
+        self.assertEqual(application.job_queue.run_daily.call_args.kwargs['name'], 'lunch:1')
+
+    def test_profile_without_index_keeps_idempotent_lookups(self):
+        application = MagicMock()
+        application.job_queue.get_jobs_by_name.return_value = []
+        scheduled = scheduled_jobs.schedule_profile_reminders(application, {'user_id': 5, 'weight_enabled': True})
+
+        self.assertEqual(scheduled, ['weight'])
+        looked_up = [c.args[0] for c in application.job_queue.get_jobs_by_name.call_args_list]
+        self.assertEqual(looked_up, ['water:5', 'weight:5', 'lunch:5', 'dinner:5'])
+
+
+if __name__ == '__main__':
+    unittest.main()
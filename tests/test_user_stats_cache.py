@@ -0,0 +1,88 @@
+import sqlite3
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from src.database import activity_operations, statistics_operations, streak_operations
+from src.utils import user_stats_cache
+from tests.local_db import start_patches, use_local_db
+
+
+def _create_db(path):
+    today = date.today()
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE users (user_id INTEGER PRIMARY KEY, total_points INTEGER DEFAULT 0);
+        CREATE TABLE daily_logs (user_id INTEGER, log_date DATE, weight REAL, water_cups INTEGER DEFAULT 0,
+                                 meals_logged INTEGER DEFAULT 0, habits_completed BOOLEAN DEFAULT 0,
+                                 attendance BOOLEAN DEFAULT 0);
+        CREATE TABLE attendance_queue (user_id INTEGER, queue_date DATE, status TEXT);
+        CREATE TABLE points_transactions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, points INTEGER,
+                                          activity TEXT, description TEXT);
+    """)
+    conn.execute("INSERT INTO users VALUES (1, 120)")
+    conn.executemany(
+        "INSERT INTO daily_logs VALUES (1, ?, ?, ?, ?, ?, ?)",
+        [
+            (today.isoformat(), 71.0, 4, 2, 1, 1),
+            ((today - timedelta(days=2)).isoformat(), 72.5, 6, 3, 0, 1),
+            ((today - timedelta(days=10)).isoformat(), None, 2, 1, 0, 0),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO attendance_queue VALUES (1, ?, 'approved')",
+        [((today - timedelta(days=n)).isoformat(),) for n in (0, 1, 2, 5)],
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestUserStatsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = use_local_db(self, 'stats.db', modules=[streak_operations], migrate=True)
+        _create_db(self.db_path)
+        start_patches(self, patch('src.database.dashboard_metrics.bump_metric'))
+        user_stats_cache.clear_user_stats_cache()
+        streak_operations.seed_attendance_streaks()
+
+    def test_combined_query(self):
+        stats = statistics_operations.compute_user_stats(1)
+
+        self.assertEqual(stats['total_points'], 120)
+        self.assertEqual(stats['today_activity']['water_cups'], 4)
+        self.assertTrue(stats['today_activity']['habits_completed'])
+        self.assertEqual(stats['weekly']['days_logged'], 2)
+        self.assertEqual(stats['weekly']['total_water'], 10)
+        self.assertEqual(stats['weekly']['attendance_count'], 2)
+        self.assertEqual(stats['consistency']['total_days'], 3)
+        self.assertEqual(stats['consistency']['weight_log_days'], 2)
+        self.assertEqual([w['week'] for w in stats['weekly_comparison']], ['Current', 'Previous'])
+        self.assertEqual(stats['current_weight'], 71.0)
+        self.assertEqual(stats['weight_change'], 1.5)
+        self.assertEqual(stats['attendance_streak'], 3)
+        self.assertEqual(stats['longest_streak'], 3)
+        self.assertIsNone(statistics_operations.compute_user_stats(999))
+
+    def test_cached_until_a_writer_invalidates(self):
+        with patch.object(statistics_operations, 'compute_user_stats',
+                          wraps=statistics_operations.compute_user_stats) as compute:
+            for _ in range(5):
+                self.assertEqual(statistics_operations.get_user_statistics(1)['total_points'], 120)
+            self.assertEqual(statistics_operations.get_attendance_streak(1), 3)
+            self.assertEqual(compute.call_count, 1)
+
+            activity_operations.add_points(1, 10, 'water_intake')
+            self.assertEqual(statistics_operations.get_user_statistics(1)['total_points'], 130)
+            self.assertEqual(compute.call_count, 2)
+
+    def test_ttl_expiry(self):
+        with patch('src.config.USER_STATS_TTL_SECONDS', 0), \
+                patch.object(statistics_operations, 'compute_user_stats', return_value={'total_points': 1}) as compute:
+            user_stats_cache.get_user_stats(1)
+            user_stats_cache.get_user_stats(1)
+        self.assertEqual(compute.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.utils import admin_notifications, notification_digest
+from src.web import shared_state
+from src.web.shared_state import SharedEventQueue
+from tests.local_db import temp_dir
+
+
+class TestSharedEventQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = os.path.join(temp_dir(self), 'state', 'web_shared_state.db')
+
+    def test_fifo_across_instances(self):
+        producer = SharedEventQueue(self.db_path)  # e.g. a web worker
+        consumer = SharedEventQueue(self.db_path)  # the bot process
+        for uid in range(5):
+            producer.push('attendance_marked', {'user_id': uid})
+
+        first = consumer.pop_batch(limit=3)
+        self.assertEqual([e['payload']['user_id'] for e in first], [0, 1, 2])
+        self.assertEqual([e['payload']['user_id'] for e in consumer.pop_batch()], [3, 4])
+        self.assertEqual(consumer.pop_batch(), [])
+
+    def test_claimed_events_stay_until_acked(self):
+        queue = SharedEventQueue(self.db_path)
+        for uid in range(3):
+            queue.push('attendance_marked', {'user_id': uid})
+
+        claimed = queue.claim_batch(limit=2, lease_seconds=60)
+        self.assertEqual([e['payload']['user_id'] for e in claimed], [0, 1])
+        self.assertEqual([e['payload']['user_id'] for e in queue.claim_batch(lease_seconds=60)], [2])
+        self.assertEqual(queue.claim_batch(lease_seconds=60), [])
+
+        queue.ack([claimed[0]['id']])
+        self.assertEqual(queue.size(), 2)
+        # An unacked claim is handed out again once its lease has run out
+        with patch('src.web.shared_state.time.time', return_value=time.time() + 120):
+            self.assertEqual([e['payload']['user_id'] for e in queue.claim_batch(lease_seconds=60)], [1, 2])
+
+    def _drain(self, queue, bot, prefs):
+        with patch.object(shared_state, '_event_queue', queue), \
+                patch('src.database.user_operations.get_user', return_value={'full_name': 'Asha'}), \
+                patch('src.utils.role_notifications.get_moderator_chat_ids', return_value=[1, 2, 3]), \
+                patch('src.database.notification_preferences.get_admin_notification_prefs', return_value=prefs):
+            return asyncio.run(admin_notifications.drain_admin_notifications(MagicMock(bot=bot)))
+
+    def test_failed_sends_are_requeued_for_those_admins(self):
+        queue = SharedEventQueue(self.db_path)
+        queue.push('attendance_marked', {'user_id': 9, 'distance_m': 4.2, 'timestamp': '2026-01-01T07:00:00'})
+        instant = {admin_id: {'priority': 'instant'} for admin_id in (1, 2, 3)}
+        bot = MagicMock()
+
+        async def send_message(chat_id, **kwargs):
+            if chat_id == 2:
+                raise RuntimeError('Telegram unavailable')
+        bot.send_message = AsyncMock(side_effect=send_message)
+
+        self.assertEqual(self._drain(queue, bot, instant), 2)
+        retry = queue.claim_batch(lease_seconds=0)
+        self.assertEqual(len(retry), 1)
+        self.assertEqual((retry[0]['payload']['only_admins'], retry[0]['payload']['attempts']), ([2], 1))
+
+        bot.send_message = AsyncMock()
+        with patch('src.web.shared_state.time.time', return_value=time.time() + 3600):
+            self.assertEqual(self._drain(queue, bot, instant), 1)
+        self.assertEqual(bot.send_message.await_args.kwargs['chat_id'], 2)
+        self.assertEqual(queue.size(), 0)
+
+    def test_drain_delivers_queued_notifications(self):
+        queue = SharedEventQueue(self.db_path)
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+
+        with patch.object(shared_state, '_event_queue', queue), \
+                patch('src.database.user_operations.get_user', return_value={'full_name': 'Asha'}), \
+                patch('src.utils.role_notifications.get_moderator_chat_ids', return_value=[1, 2, 3]), \
+                patch('src.database.notification_preferences.get_admin_notification_prefs', return_value={}):
+            admin_notifications.queue_admin_notification(
+                'attendance_marked', user_id=9, distance_m=4.2, timestamp='2026-01-01T07:00:00')
+            admin_notifications.queue_admin_notification('admin_override', user_id=9, admin_id=2, reason='GPS')
+            admin_notifications.queue_admin_notification('unknown', user_id=9)
+            context = MagicMock(bot=bot)
+            self.assertEqual(asyncio.run(admin_notifications.drain_admin_notifications(context)), 0)
+            # Buffered for the digest, so not acked yet
+            self.assertEqual(queue.size(), 2)
+            sent = asyncio.run(notification_digest.flush_admin_digests(context))
+
+        # One digest per admin; admin 2 did the override so only gets the attendance
+        self.assertEqual(sent, 3)
+        self.assertEqual(queue.size(), 0)
+        texts = {c.kwargs['chat_id']: c.kwargs['text'] for c in bot.send_message.await_args_list}
+        self.assertIn('2 notifications', texts[1])
+        self.assertIn('Attendance Marked', texts[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
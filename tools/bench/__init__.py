@@ -0,0 +1,18 @@
+"""
+Benchmark suite for the bot's hot paths.
+
+Usage:
+    python -m tools.bench [--scale 1k|10k|50k|N] [--years 2] [--cases a,b] [--out results.json]
+    python -m tools.bench --compare baseline.json [--threshold 0.2] [--out current.json]
+
+The first run for a (scale, years, seed) generates a local SQLite dataset
+under --data-dir. Later runs reuse it. Each run works on a fresh copy, so
+cases that write (rollups, points) start from the same state every time.
+
+Every case times one operation as the bot performs it: an access-gate
+check per update, a callback dispatch, a search, a PDF, an export, a
+nightly job, a broadcast. Results are written as JSON: percentiles per
+case, queries per operation from the query metrics, and errors (raised
+and logged). `--compare` diffs a run against a saved one and exits
+non-zero on a regression.
+"""
@@ -0,0 +1,94 @@
+"""
+python -m tools.bench --help (run from the project root)
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# The suite always runs on a generated local SQLite file
+os.environ['USE_LOCAL_DB'] = 'true'
+os.environ['USE_REMOTE_DB'] = 'false'
+
+import logging  # noqa: E402
+
+from tools.bench import __doc__ as USAGE  # noqa: E402
+from tools.bench.dataset import dataset_path, generate_dataset, parse_scale, table_counts  # noqa: E402
+from tools.bench.runner import compare, format_comparison, format_results, run_suite  # noqa: E402
+from tools.bench.cases import CASES  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m tools.bench', description=USAGE.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter, epilog=USAGE)
+    parser.add_argument('--scale', default='1k', help='members: 1k, 10k, 50k or a number (default 1k)')
+    parser.add_argument('--years', type=float, default=2.0, help='years of activity history (default 2)')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--cases', help=f"comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument('--iterations', type=int, help='override every case\'s iteration count')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed iterations per case (default 1)')
+    parser.add_argument('--bot-latency-ms', type=float, default=0.0, help='fake Bot API latency per call')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'fitness_club_bench'),
+                        help='where datasets, the working copy and bench.log live')
+    parser.add_argument('--regenerate', action='store_true', help='rebuild the dataset even if cached')
+    parser.add_argument('--out', help='write results JSON here (default: stdout)')
+    parser.add_argument('--compare', metavar='BASELINE', help='results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='regression threshold (default 0.2 = +20%%)')
+    parser.add_argument('--log-level', default='WARNING', help='bot log level written to bench.log')
+    parser.add_argument('--list', action='store_true', help='list cases and exit')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in CASES.values():
+            print(f"{case.name:<18} n={case.iterations:<5} {case.description}")
+        return 0
+
+    data_dir = Path(args.data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(filename=data_dir / 'bench.log', level=args.log_level.upper(),
+                        format='%(asctime)s %(name)s %(levelname)s %(message)s')
+
+    members, days = parse_scale(args.scale), max(1, int(args.years * 365))
+    source = dataset_path(data_dir, members, days, args.seed)
+    if args.regenerate or not source.exists():
+        for stale in data_dir.glob(f"bench_{members}m_{days}d_s{args.seed}_*.db"):
+            stale.unlink()
+        print(f"Generating {source.name} ...", file=sys.stderr)
+        generate_dataset(source, members, days, args.seed)
+    work = data_dir / 'work.db'
+    shutil.copyfile(source, work)
+
+    results = run_suite(work, args.cases.split(',') if args.cases else None, args.iterations, args.warmup,
+                        args.seed, args.bot_latency_ms / 1000,
+                        progress=lambda name: print(f"  {name} ...", file=sys.stderr))
+    results['meta'].update(dataset=source.name, members=members, days=days, rows=table_counts(source))
+    print(format_results(results), file=sys.stderr)
+
+    status = 0
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        before = baseline.get('meta', {})
+        shape = ('members', 'days', 'seed')
+        if any(before.get(key) != results['meta'][key] for key in shape):
+            described = ', '.join(f"{key}={before.get(key)}" for key in shape)
+            print(f"Warning: baseline was run on a different dataset ({described})", file=sys.stderr)
+        rows = compare(baseline, results, args.threshold)
+        results['comparison'] = {'baseline': args.compare, 'threshold': args.threshold, 'cases': rows}
+        print(format_comparison(rows, args.threshold), file=sys.stderr)
+        status = 1 if any(row['regression'] for row in rows) else 0
+
+    payload = json.dumps(results, indent=2, default=str)
+    if args.out:
+        Path(args.out).write_text(payload + "\n", encoding='utf-8')
+        print(f"Results written to {args.out}", file=sys.stderr)
+    else:
+        print(payload)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
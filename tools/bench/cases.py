@@ -0,0 +1,250 @@
+"""
+Benchmark cases.
+
+A case is a setup function registered with @case. Setup runs once per
+run (not timed) and returns the operation to time: `op(i)`, a plain or a
+coroutine function called once per iteration. Setup may read the dataset
+through execute_query; the query metrics are reset before timing starts.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, Dict, List, NamedTuple
+
+from src.database.connection import execute_query
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable
+    iterations: int
+    description: str
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, iterations: int):
+    def decorator(setup):
+        CASES[name] = Case(name, setup, iterations, (setup.__doc__ or '').strip())
+        return setup
+    return decorator
+
+
+class BenchContext:
+    """What a case's setup gets: seeded RNG, the fake bot and run options"""
+
+    def __init__(self, seed: int = 7, bot_latency: float = 0.0):
+        self.rng = random.Random(seed)
+        self.bot = FakeBot(bot_latency)
+
+    def member_ids(self) -> List[int]:
+        return [row['user_id'] for row in execute_query("SELECT user_id FROM users ORDER BY user_id") or []]
+
+
+# --- Telegram stand-ins ---
+
+class FakeBot:
+    """Bot.send_message with a fixed latency; counts what was sent"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.sent = 0
+
+    async def send_message(self, chat_id, text, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.sent += 1
+        return SimpleNamespace(message_id=self.sent, chat_id=chat_id, text=text)
+
+
+class FakeMessage:
+    async def reply_text(self, text, **kwargs):
+        return SimpleNamespace(text=text)
+
+
+class FakeQuery:
+    def __init__(self, data: str, user_id: int):
+        self.data = data
+        self.from_user = SimpleNamespace(id=user_id)
+        self.message = FakeMessage()
+
+    async def answer(self, *args, **kwargs):
+        return True
+
+
+def fake_update(user_id: int, data: str = None):
+    query = FakeQuery(data, user_id) if data is not None else None
+    return SimpleNamespace(effective_user=SimpleNamespace(id=user_id), effective_message=FakeMessage(),
+                           callback_query=query)
+
+
+def fake_context(bot: FakeBot):
+    return SimpleNamespace(bot=bot, user_data={}, chat_data={}, bot_data={}, args=[])
+
+
+# --- Cases ---
+
+@case('access_gate', iterations=2000)
+def access_gate(ctx: BenchContext):
+    """check_access_gate for one update (95% registered members, 5% unknown ids)"""
+    from src.utils.access_gate import check_access_gate
+
+    members = ctx.member_ids()
+    updates = [fake_update(ctx.rng.choice(members) if ctx.rng.random() < 0.95 else 900_000_000 + n)
+               for n in range(1000)]
+
+    async def op(i):
+        return await check_access_gate(updates[i % len(updates)], None)
+    return op
+
+
+@case('callback_dispatch', iterations=5000)
+def callback_dispatch(ctx: BenchContext):
+    """CallbackRouter.dispatch over the production route table (handlers stubbed)"""
+    from src.handlers.callback_handlers import callback_router
+    from src.utils.callback_router import CallbackRouter
+
+    async def handled(update, context):
+        return None
+
+    router = CallbackRouter()
+    data = []
+    for route in callback_router.routes():
+        if route.prefix:
+            router.add(handled, prefix=route.key, answer=route.answer)
+            data.append(f"{route.key}{ctx.rng.randint(1, 99999)}")
+        else:
+            router.add(handled, exact=route.key, answer=route.answer)
+            data.append(route.key)
+    updates = [fake_update(1, ctx.rng.choice(data)) for _ in range(1000)]
+
+    async def op(i):
+        return await router.dispatch(updates[i % len(updates)], None)
+    return op
+
+
+@case('user_search', iterations=300)
+def user_search(ctx: BenchContext):
+    """search_users_db_only: partial names, usernames with @, Telegram ids"""
+    from src.invoices_v2.search_db_only import search_users_db_only
+
+    rows = execute_query("SELECT user_id, first_name, last_name, username FROM users") or []
+    terms = []
+    for _ in range(200):
+        row = ctx.rng.choice(rows)
+        terms.append(ctx.rng.choice((
+            row['first_name'][:4], row['last_name'], f"{row['first_name']} {row['last_name'][:2]}",
+            f"@{row['username']}", str(row['user_id']),
+        )))
+
+    def op(i):
+        return search_users_db_only(terms[i % len(terms)])
+    return op
+
+
+@case('item_search', iterations=1000)
+def item_search(ctx: BenchContext):
+    """search_store_items_db_only: words, prefixes, typos and serial numbers"""
+    from src.invoices_v2.search_items_db_only import search_store_items_db_only
+
+    rows = execute_query("SELECT serial_no, item_name FROM store_items") or []
+    terms = []
+    for _ in range(200):
+        row = ctx.rng.choice(rows)
+        word = ctx.rng.choice(row['item_name'].split())
+        typo = word[:-2] + word[-1] if len(word) > 4 else word
+        terms.append(ctx.rng.choice((word, word[:4], typo, row['item_name'][:12], str(row['serial_no']))))
+
+    def op(i):
+        return search_store_items_db_only(terms[i % len(terms)])
+    return op
+
+
+@case('invoice_pdf', iterations=50)
+def invoice_pdf(ctx: BenchContext):
+    """generate_invoice_pdf for stored invoices (1-5 lines each)"""
+    from src.invoices_v2.pdf import generate_invoice_pdf
+
+    invoices = execute_query(
+        "SELECT i.*, u.full_name FROM invoices i JOIN users u ON u.user_id = i.user_id "
+        "ORDER BY i.created_at DESC LIMIT 20"
+    ) or []
+    payloads = []
+    for invoice in invoices:
+        lines = execute_query("SELECT * FROM invoice_items WHERE invoice_id = %s", (invoice['invoice_id'],)) or []
+        payloads.append({
+            'invoice_id': invoice['invoice_id'],
+            'date': str(invoice['created_at'])[:10],
+            'user_name': invoice['full_name'],
+            'user_id': invoice['user_id'],
+            'items': [{
+                'name': line['item_name'], 'quantity': line['quantity'], 'rate': line['rate'],
+                'discount_percent': line['discount_percent'],
+                'taxable': line['line_total'] / (1 + line['gst_percent'] / 100),
+                'gst_amount': line['line_total'] - line['line_total'] / (1 + line['gst_percent'] / 100),
+                'line_total': line['line_total'],
+            } for line in lines],
+            'items_subtotal': invoice['items_subtotal'],
+            'shipping': invoice['shipping'],
+            'gst_total': invoice['gst_total'],
+            'final_total': invoice['final_total'],
+        })
+
+    def op(i):
+        return generate_invoice_pdf(payloads[i % len(payloads)]).getbuffer().nbytes
+    return op
+
+
+@case('excel_export', iterations=3)
+def excel_export(ctx: BenchContext):
+    """Yearly invoice report: streamed rows into a write-only workbook"""
+    import os
+    from src.database.invoice_reports import get_invoice_summary, iter_invoices_by_date_range
+    from src.utils.invoice_excel_export import export_invoice_report_file
+
+    end = datetime.now()
+    start = end - timedelta(days=365)
+
+    def op(i):
+        path, rows = export_invoice_report_file(iter_invoices_by_date_range(start, end),
+                                                get_invoice_summary(start, end), 'Last 12 months')
+        os.unlink(path)
+        return rows
+    return op
+
+
+@case('eod_report', iterations=5)
+def eod_report(ctx: BenchContext):
+    """generate_eod_report (rebuilds today's rollup, as the nightly job does)"""
+    from src.utils.report_generator import generate_eod_report
+
+    def op(i):
+        return generate_eod_report()
+    return op
+
+
+@case('challenge_scoring', iterations=2)
+def challenge_scoring(ctx: BenchContext):
+    """process_daily_challenge_points for every active participant"""
+    from src.utils.scheduled_jobs import process_daily_challenge_points
+
+    context = fake_context(ctx.bot)
+
+    async def op(i):
+        return await process_daily_challenge_points(context)
+    return op
+
+
+@case('broadcast', iterations=3)
+def broadcast(ctx: BenchContext):
+    """broadcast_new_subscription_plan to every active member via the fake bot"""
+    from src.handlers.broadcast_handlers import broadcast_new_subscription_plan
+
+    context = fake_context(ctx.bot)
+
+    async def op(i):
+        return await broadcast_new_subscription_plan(context, '90 Day Plan', 90, 1200.0, 'Benchmark run')
+    return op
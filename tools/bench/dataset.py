@@ -0,0 +1,419 @@
+"""
+Generated local SQLite dataset for the benchmark suite.
+
+The tables carry the columns the benchmarked code paths read, with the
+indexes from schema.sql. Content is a pure function of (members, days,
+seed) and the generation date: dates are offsets from today, so
+"today's activity" and "expiring this week" always have data.
+"""
+
+import logging
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+SCALES = {'1k': 1_000, '10k': 10_000, '50k': 50_000}
+
+ACTIVITY = 0.15  # mean share of days a member logs anything
+BATCH_ROWS = 50_000
+USER_ID_BASE = 200_000_000
+
+FIRST_NAMES = (
+    'Aarav', 'Aditi', 'Akash', 'Ananya', 'Arjun', 'Asha', 'Bhavna', 'Deepak', 'Divya', 'Gaurav',
+    'Ishaan', 'Kavya', 'Kiran', 'Meera', 'Neha', 'Nikhil', 'Pooja', 'Priya', 'Rahul', 'Ravi',
+    'Rohan', 'Sakshi', 'Sanjay', 'Shreya', 'Sneha', 'Suresh', 'Tanvi', 'Varun', 'Vikram', 'Zoya',
+)
+LAST_NAMES = (
+    'Agarwal', 'Bose', 'Chopra', 'Das', 'Desai', 'Gupta', 'Iyer', 'Jain', 'Joshi', 'Kapoor',
+    'Khan', 'Kumar', 'Malhotra', 'Mehta', 'Menon', 'Mishra', 'Nair', 'Patel', 'Pillai', 'Rao',
+    'Reddy', 'Sharma', 'Shetty', 'Singh', 'Sinha', 'Thakur', 'Verma', 'Yadav',
+)
+BRANDS = ('Herbalife', 'Formula', 'ProFit', 'NutriMax', 'GreenLeaf', 'Optimum', 'MuscleCore', 'VitaPlus')
+PRODUCTS = ('Shake Mix', 'Protein Powder', 'Afresh Drink', 'Multivitamin', 'Fiber Blend', 'Cell Activator',
+            'Energy Bar', 'Herbal Tea', 'Aloe Concentrate', 'Omega Caps')
+FLAVOURS = ('Chocolate', 'Vanilla', 'Strawberry', 'Mango', 'Lemon', 'Kulfi', 'Cookies Cream', 'Unflavoured')
+SIZES = ('250g', '500g', '750g', '1kg', '30 tabs', '60 caps', '12 pack')
+
+SCHEMA = """
+CREATE TABLE users (
+    user_id INTEGER PRIMARY KEY,
+    telegram_username TEXT,
+    username TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    full_name TEXT NOT NULL,
+    normalized_name TEXT,
+    phone TEXT,
+    age INTEGER,
+    gender TEXT,
+    role TEXT DEFAULT 'user',
+    fee_status TEXT DEFAULT 'unpaid',
+    fee_paid_date DATE,
+    fee_expiry_date DATE,
+    total_points INTEGER DEFAULT 0,
+    status TEXT DEFAULT 'active',
+    is_active INTEGER DEFAULT 1,
+    is_approved INTEGER DEFAULT 0,
+    approval_status TEXT DEFAULT 'pending',
+    is_banned INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_users_username ON users(telegram_username);
+
+CREATE TABLE subscriptions (
+    subscription_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    plan_id TEXT,
+    amount REAL,
+    start_date TIMESTAMP,
+    end_date TIMESTAMP,
+    grace_period_end TIMESTAMP,
+    status TEXT DEFAULT 'active',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_subscriptions_user ON subscriptions(user_id);
+
+CREATE TABLE daily_logs (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    log_date DATE NOT NULL,
+    weight REAL,
+    water_cups INTEGER DEFAULT 0,
+    meals_logged INTEGER DEFAULT 0,
+    habits_completed INTEGER DEFAULT 0,
+    attendance INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(user_id, log_date)
+);
+CREATE INDEX idx_daily_logs_date ON daily_logs(log_date);
+
+CREATE TABLE attendance_queue (
+    attendance_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    queue_date DATE NOT NULL,
+    status TEXT DEFAULT 'pending',
+    requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    approved_at TIMESTAMP,
+    approved_by INTEGER,
+    UNIQUE(user_id, queue_date)
+);
+CREATE INDEX idx_attendance_queue_date ON attendance_queue(queue_date);
+
+CREATE TABLE points_transactions (
+    transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    activity TEXT,
+    transaction_type TEXT,
+    description TEXT,
+    challenge_id INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_points_transactions_user ON points_transactions(user_id);
+CREATE INDEX idx_points_transactions_created ON points_transactions(created_at);
+
+CREATE TABLE shake_requests (
+    request_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    flavor TEXT,
+    status TEXT DEFAULT 'pending',
+    requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP
+);
+CREATE INDEX idx_shake_requests_user ON shake_requests(user_id);
+CREATE INDEX idx_shake_requests_requested ON shake_requests(requested_at);
+
+CREATE TABLE shake_purchases (
+    purchase_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    quantity INTEGER,
+    status TEXT DEFAULT 'pending',
+    purchase_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE store_items (
+    item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    serial_no INTEGER UNIQUE,
+    item_name TEXT NOT NULL,
+    normalized_item_name TEXT,
+    hsn_code TEXT,
+    mrp REAL NOT NULL,
+    gst_percent REAL DEFAULT 18.0,
+    is_active INTEGER DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_store_items_normalized ON store_items(normalized_item_name);
+
+CREATE TABLE invoices (
+    invoice_id TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    items_subtotal REAL,
+    gst_total REAL,
+    shipping REAL DEFAULT 0,
+    final_total REAL,
+    status TEXT DEFAULT 'pending',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    paid_at TIMESTAMP
+);
+CREATE INDEX idx_invoices_user ON invoices(user_id);
+CREATE INDEX idx_invoices_created ON invoices(created_at);
+
+CREATE TABLE invoice_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    invoice_id TEXT NOT NULL,
+    item_id INTEGER,
+    item_name TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    rate REAL NOT NULL,
+    discount_percent REAL DEFAULT 0,
+    gst_percent REAL DEFAULT 18.0,
+    line_total REAL NOT NULL
+);
+CREATE INDEX idx_invoice_items_invoice ON invoice_items(invoice_id);
+
+CREATE TABLE challenges (
+    challenge_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    challenge_type TEXT,
+    status TEXT DEFAULT 'scheduled',
+    start_date DATE,
+    end_date DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE challenge_participants (
+    participant_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    challenge_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    status TEXT DEFAULT 'active',
+    total_points INTEGER DEFAULT 0,
+    daily_progress TEXT,
+    joined_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(challenge_id, user_id)
+);
+"""
+
+
+def parse_scale(value: str) -> int:
+    """'10k' -> 10000; plain integers pass through"""
+    if value in SCALES:
+        return SCALES[value]
+    members = int(value.lower().rstrip('k')) * (1000 if value.lower().endswith('k') else 1)
+    if members < 10:
+        raise ValueError(f"scale too small: {value}")
+    return members
+
+
+def dataset_path(data_dir, members: int, days: int, seed: int, today: date = None) -> Path:
+    today = today or date.today()
+    return Path(data_dir) / f"bench_{members}m_{days}d_s{seed}_{today:%Y%m%d}.db"
+
+
+def _ts(day: date, rng: random.Random, start_hour: int = 6, end_hour: int = 21) -> str:
+    moment = datetime.combine(day, datetime.min.time()) + timedelta(
+        hours=rng.randint(start_hour, end_hour - 1), minutes=rng.randint(0, 59), seconds=rng.randint(0, 59))
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+class _Writer:
+    """Buffered executemany per table"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.pending: Dict[str, List[tuple]] = {}
+        self.sql: Dict[str, str] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, table: str, columns: tuple, row: tuple) -> None:
+        if table not in self.sql:
+            self.sql[table] = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+            self.pending[table] = []
+        rows = self.pending[table]
+        rows.append(row)
+        if len(rows) >= BATCH_ROWS:
+            self.flush(table)
+
+    def flush(self, table: str = None) -> None:
+        for name in ([table] if table else list(self.pending)):
+            rows = self.pending[name]
+            if rows:
+                self.conn.executemany(self.sql[name], rows)
+                self.counts[name] = self.counts.get(name, 0) + len(rows)
+                rows.clear()
+
+
+_USER_COLUMNS = ('user_id', 'telegram_username', 'username', 'first_name', 'last_name', 'full_name',
+                 'normalized_name', 'phone', 'age', 'gender', 'role', 'fee_status', 'fee_paid_date',
+                 'fee_expiry_date', 'total_points', 'status', 'is_active', 'is_approved', 'approval_status',
+                 'created_at')
+_LOG_COLUMNS = ('user_id', 'log_date', 'weight', 'water_cups', 'meals_logged', 'habits_completed', 'attendance')
+_ATTENDANCE_COLUMNS = ('user_id', 'queue_date', 'status', 'requested_at', 'approved_at')
+_POINTS_COLUMNS = ('user_id', 'points', 'activity', 'transaction_type', 'description', 'created_at')
+_SHAKE_COLUMNS = ('user_id', 'flavor', 'status', 'requested_at')
+_ITEM_COLUMNS = ('serial_no', 'item_name', 'normalized_item_name', 'hsn_code', 'mrp', 'gst_percent', 'is_active')
+_INVOICE_COLUMNS = ('invoice_id', 'user_id', 'items_subtotal', 'gst_total', 'shipping', 'final_total', 'status',
+                    'created_at', 'paid_at')
+_INVOICE_ITEM_COLUMNS = ('invoice_id', 'item_id', 'item_name', 'quantity', 'rate', 'discount_percent',
+                         'gst_percent', 'line_total')
+
+
+def _members(writer: _Writer, rng: random.Random, members: int, days: int, today: date) -> List[tuple]:
+    """Users and subscriptions; returns (user_id, created day offset, activity rate) per member"""
+    staff = max(1, members // 200)
+    profiles = []
+    for i in range(members):
+        user_id = USER_ID_BASE + i * 7
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        full_name = f"{first} {last}"
+        username = f"{first.lower()}_{last.lower()[:4]}{i}"
+        age_days = rng.randint(0, days)
+        created = today - timedelta(days=age_days)
+        fee_status = rng.choices(('paid', 'unpaid', 'expired'), (0.7, 0.2, 0.1))[0]
+        expiry = paid = None
+        if fee_status != 'unpaid':
+            expiry = today + timedelta(days=rng.randint(-10, 90) if fee_status == 'paid' else -rng.randint(11, 200))
+            paid = max(created, expiry - timedelta(days=rng.choice((30, 90, 365))))
+            writer.add('subscriptions', ('user_id', 'plan_id', 'amount', 'start_date', 'end_date', 'grace_period_end',
+                                         'status', 'created_at'),
+                       (user_id, rng.choice(('plan_30', 'plan_90', 'plan_365')), rng.choice((500, 1200, 4000)),
+                        f"{paid} 00:00:00", f"{expiry} 23:59:59", f"{expiry + timedelta(days=7)} 23:59:59",
+                        'active', _ts(paid, rng)))
+        approved = rng.random() < 0.95
+        role = 'admin' if i == 0 else 'staff' if i <= staff else 'user'
+        writer.add('users', _USER_COLUMNS, (
+            user_id, username, username, first, last, full_name, full_name.lower(),
+            f"9{rng.randint(100000000, 999999999)}", rng.randint(18, 65), rng.choice(('male', 'female')), role,
+            fee_status, paid, expiry, 0, 'active' if rng.random() < 0.9 else 'inactive', 1, int(approved),
+            'approved' if approved else 'pending', _ts(created, rng),
+        ))
+        profiles.append((user_id, age_days, ACTIVITY * 2 * rng.random()))
+    return profiles
+
+
+def _activity(writer: _Writer, rng: random.Random, profiles: List[tuple], today: date) -> Dict[int, int]:
+    """daily_logs, attendance, points and shake orders; returns points per user"""
+    points: Dict[int, int] = {}
+    for user_id, age_days, rate in profiles:
+        span = age_days + 1
+        for offset in rng.sample(range(span), min(span, int(rate * span + rng.random()))):
+            day = today - timedelta(days=offset)
+            attended = rng.random() < 0.6
+            writer.add('daily_logs', _LOG_COLUMNS, (
+                user_id, day.isoformat(), round(rng.uniform(48, 110), 1) if rng.random() < 0.4 else None,
+                rng.randint(0, 10), rng.randint(0, 4), int(rng.random() < 0.5), int(attended),
+            ))
+            if attended:
+                approved_at = _ts(day, rng)
+                writer.add('attendance_queue', _ATTENDANCE_COLUMNS,
+                           (user_id, day.isoformat(), 'approved', approved_at, approved_at))
+                writer.add('points_transactions', _POINTS_COLUMNS,
+                           (user_id, 10, 'attendance', 'attendance', 'Gym check-in', approved_at))
+                points[user_id] = points.get(user_id, 0) + 10
+            if rng.random() < 0.1:
+                writer.add('shake_requests', _SHAKE_COLUMNS,
+                           (user_id, rng.choice(FLAVOURS), 'completed', _ts(day, rng)))
+    return points
+
+
+def _catalogue(writer: _Writer, rng: random.Random, members: int) -> List[tuple]:
+    """store_items; returns (item_id, name, mrp, gst) per item"""
+    items = []
+    for serial in range(1, min(2000, max(200, members // 10)) + 1):
+        name = f"{rng.choice(BRANDS)} {rng.choice(PRODUCTS)} {rng.choice(FLAVOURS)} {rng.choice(SIZES)}"
+        mrp = float(rng.randrange(199, 4999, 10))
+        gst = rng.choice((5.0, 12.0, 18.0))
+        writer.add('store_items', _ITEM_COLUMNS,
+                   (serial, name, name.lower(), f"{rng.randint(2100, 3400)}{rng.randint(10, 99)}", mrp, gst,
+                    int(rng.random() < 0.95)))
+        items.append((serial, name, mrp, gst))
+    return items
+
+
+def _invoices(writer: _Writer, rng: random.Random, profiles: List[tuple], items: List[tuple],
+              days: int, today: date) -> None:
+    count = int(len(profiles) * 1.5 * days / 365) + 1
+    for n in range(count):
+        user_id, age_days, _ = rng.choice(profiles)
+        day = today - timedelta(days=rng.randint(0, age_days))
+        invoice_id = f"INV{n + 1:07d}"
+        subtotal = gst_total = 0.0
+        for item_id, name, mrp, gst in rng.sample(items, rng.randint(1, 5)):
+            quantity = rng.randint(1, 3)
+            discount = rng.choice((0.0, 0.0, 5.0, 10.0))
+            taxable = round(mrp * quantity * (1 - discount / 100), 2)
+            tax = round(taxable * gst / 100, 2)
+            subtotal += taxable
+            gst_total += tax
+            writer.add('invoice_items', _INVOICE_ITEM_COLUMNS,
+                       (invoice_id, item_id, name, quantity, mrp, discount, gst, round(taxable + tax, 2)))
+        shipping = rng.choice((0.0, 0.0, 50.0))
+        paid = rng.random() < 0.8
+        created_at = _ts(day, rng)
+        writer.add('invoices', _INVOICE_COLUMNS, (
+            invoice_id, user_id, round(subtotal, 2), round(gst_total, 2), shipping,
+            round(subtotal + gst_total + shipping, 2), 'paid' if paid else 'pending', created_at,
+            created_at if paid else None,
+        ))
+
+
+def _challenges(conn: sqlite3.Connection, writer: _Writer, rng: random.Random, profiles: List[tuple],
+                today: date) -> None:
+    conn.execute("INSERT INTO challenges (challenge_id, name, challenge_type, status, start_date, end_date) "
+                 "VALUES (1, '30 Day Transformation', 'points', 'active', ?, ?)",
+                 ((today - timedelta(days=20)).isoformat(), (today + timedelta(days=10)).isoformat()))
+    conn.execute("INSERT INTO challenges (challenge_id, name, challenge_type, status, start_date, end_date) "
+                 "VALUES (2, 'Summer Shred', 'points', 'completed', ?, ?)",
+                 ((today - timedelta(days=120)).isoformat(), (today - timedelta(days=90)).isoformat()))
+    for user_id, _, _ in profiles:
+        if rng.random() < 0.2:
+            writer.add('challenge_participants', ('challenge_id', 'user_id', 'status', 'total_points'),
+                       (1, user_id, 'active', rng.randint(0, 3000)))
+
+
+def generate_dataset(path, members: int, days: int = 730, seed: int = 7) -> Dict[str, int]:
+    """Write a fresh dataset to `path`; returns row counts per table"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.unlink(missing_ok=True)
+    rng = random.Random(seed)
+    today = date.today()
+
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+        writer = _Writer(conn)
+        profiles = _members(writer, rng, members, days, today)
+        writer.flush()
+        points = _activity(writer, rng, profiles, today)
+        items = _catalogue(writer, rng, members)
+        writer.flush()
+        _invoices(writer, rng, profiles, items, days, today)
+        _challenges(conn, writer, rng, profiles, today)
+        writer.flush()
+        conn.executemany("UPDATE users SET total_points = ? WHERE user_id = ?",
+                         [(total, user_id) for user_id, total in points.items()])
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    tmp.replace(path)
+    counts = dict(writer.counts, challenges=2)
+    logger.info(f"[BENCH] dataset {path.name} rows={sum(counts.values())}")
+    return counts
+
+
+def table_counts(path) -> Dict[str, int]:
+    conn = sqlite3.connect(path)
+    try:
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+    finally:
+        conn.close()
@@ -0,0 +1,234 @@
+"""
+Times benchmark cases and compares runs.
+"""
+
+import asyncio
+import logging
+import platform
+import subprocess
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.utils import metrics
+from tools.bench.cases import CASES, BenchContext, Case
+
+logger = logging.getLogger(__name__)
+
+
+class ErrorCounter(logging.Handler):
+    """Counts ERROR records: most of the bot logs a failure and carries on"""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+def swap(stack: ExitStack, module, attr: str, value) -> None:
+    original = getattr(module, attr)
+    setattr(module, attr, value)
+    stack.callback(setattr, module, attr, original)
+
+
+@contextmanager
+def bench_database(path):
+    """Point execute_query at the SQLite file `path` (migrated) with every module cache cold; restored on exit"""
+    from src.database import connection
+    from src.database.migrations import run_migrations
+    from src.utils import access_gate, eligibility_snapshot, product_search
+
+    with ExitStack() as stack:
+        swap(stack, connection, 'LOCAL_DB_PATH', Path(path))
+        swap(stack, connection, 'USE_LOCAL_DB', True)
+        swap(stack, connection, 'USE_REMOTE_DB', False)
+        # The gate skips subscription checks in local mode; time the production path
+        swap(stack, access_gate, 'USE_LOCAL_DB', False)
+        swap(stack, eligibility_snapshot, '_entries', {})
+        swap(stack, eligibility_snapshot, '_loaded', False)
+        swap(stack, product_search, '_indexes', {})
+        swap(stack, product_search, '_dirty', {})
+        run_migrations()
+        yield
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+async def _loop_async(op, iterations: int, warmup: int, started):
+    for i in range(warmup):
+        try:
+            await op(i)
+        except Exception:
+            pass
+    started()
+    samples, failures = [], []
+    for i in range(warmup, warmup + iterations):
+        start = time.perf_counter()
+        try:
+            await op(i)
+        except Exception as e:
+            failures.append(e)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, failures
+
+
+def _loop(op, iterations: int, warmup: int, started):
+    for i in range(warmup):
+        try:
+            op(i)
+        except Exception:
+            pass
+    started()
+    samples, failures = [], []
+    for i in range(warmup, warmup + iterations):
+        start = time.perf_counter()
+        try:
+            op(i)
+        except Exception as e:
+            failures.append(e)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, failures
+
+
+def run_case(case: Case, ctx: BenchContext, iterations: Optional[int] = None, warmup: int = 1) -> Dict:
+    """Set up and time one case; warmup iterations are not counted"""
+    iterations = iterations or case.iterations
+    op = case.setup(ctx)
+    counter = ErrorCounter()
+    sent = []
+
+    def started():
+        metrics.reset_metrics()
+        counter.count = 0
+        sent.append(ctx.bot.sent)
+
+    root = logging.getLogger()
+    root.addHandler(counter)
+    wall = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(op):
+            samples, failures = asyncio.run(_loop_async(op, iterations, warmup, started))
+        else:
+            samples, failures = _loop(op, iterations, warmup, started)
+    finally:
+        root.removeHandler(counter)
+    wall = time.perf_counter() - wall
+
+    queries = metrics.metrics_snapshot('query')
+    ordered = sorted(samples)
+    total_ms = sum(samples)
+    result = {
+        'description': case.description,
+        'iterations': iterations,
+        'errors': len(failures),
+        'logged_errors': counter.count,
+        'queries_per_op': round(sum(row['count'] for row in queries) / iterations, 2),
+        'query_ms_per_op': round(sum(row['count'] * row['avg_ms'] for row in queries) / iterations, 3),
+        'query_errors': sum(row['errors'] for row in queries),
+        'min_ms': round(ordered[0], 3),
+        'mean_ms': round(total_ms / iterations, 3),
+        'p50_ms': round(percentile(ordered, 50), 3),
+        'p95_ms': round(percentile(ordered, 95), 3),
+        'p99_ms': round(percentile(ordered, 99), 3),
+        'max_ms': round(ordered[-1], 3),
+        'ops_per_sec': round(iterations / (total_ms / 1000), 2) if total_ms else 0.0,
+    }
+    if ctx.bot.sent > sent[0]:
+        result['messages_per_op'] = round((ctx.bot.sent - sent[0]) / iterations, 2)
+    if failures:
+        result['first_error'] = f"{type(failures[0]).__name__}: {failures[0]}"
+    logger.info(f"[BENCH] {case.name} n={iterations} p50={result['p50_ms']}ms wall={wall:.1f}s")
+    return result
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              timeout=5, cwd=Path(__file__).resolve().parent).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(db_path, names: Iterable[str] = None, iterations: Optional[int] = None, warmup: int = 1,
+              seed: int = 7, bot_latency: float = 0.0, progress=None) -> Dict:
+    """Run the named cases (default: all, in registration order) against `db_path`"""
+    names = list(names or CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError(f"unknown benchmark case(s): {', '.join(unknown)}")
+
+    results = {
+        'meta': {
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'commit': _commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'warmup': warmup,
+            'bot_latency_ms': bot_latency * 1000,
+        },
+        'cases': {},
+    }
+    with bench_database(db_path):
+        for name in names:
+            if progress:
+                progress(name)
+            ctx = BenchContext(seed, bot_latency)
+            results['cases'][name] = run_case(CASES[name], ctx, iterations, warmup)
+    metrics.reset_metrics()
+    return results
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.2) -> List[Dict]:
+    """Per-case p50 and queries/op change; `regression` when either grew by more than `threshold`"""
+    rows = []
+    for name, now in current['cases'].items():
+        before = baseline.get('cases', {}).get(name)
+        if before is None:
+            continue
+        p50 = now['p50_ms'] / before['p50_ms'] - 1 if before['p50_ms'] else 0.0
+        queries = now['queries_per_op'] / before['queries_per_op'] - 1 if before['queries_per_op'] else 0.0
+        rows.append({
+            'case': name,
+            'base_p50_ms': before['p50_ms'],
+            'p50_ms': now['p50_ms'],
+            'p50_change': round(p50, 4),
+            'base_queries_per_op': before['queries_per_op'],
+            'queries_per_op': now['queries_per_op'],
+            'queries_change': round(queries, 4),
+            'regression': p50 > threshold or queries > threshold or now['errors'] > before['errors'],
+        })
+    return rows
+
+
+def format_results(results: Dict) -> str:
+    lines = [f"{'case':<18} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'ops/s':>9} {'q/op':>7}  errors"]
+    for name, row in results['cases'].items():
+        errors = f"{row['errors']} raised, {row['logged_errors']} logged" \
+            if row['errors'] or row['logged_errors'] else '-'
+        lines.append(
+            f"{name:<18} {row['iterations']:>5} {row['p50_ms']:>7.2f}ms {row['p95_ms']:>7.2f}ms "
+            f"{row['p99_ms']:>7.2f}ms {row['ops_per_sec']:>9.1f} {row['queries_per_op']:>7.1f}  {errors}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict], threshold: float) -> str:
+    lines = [f"{'case':<18} {'p50 before':>11} {'after':>9} {'change':>8} {'q/op':>11}"]
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        lines.append(
+            f"{row['case']:<18} {row['base_p50_ms']:>9.2f}ms {row['p50_ms']:>7.2f}ms {row['p50_change']:>+8.1%} "
+            f"{row['base_queries_per_op']:>5.1f}>{row['queries_per_op']:<5.1f}{flag}"
+        )
+    regressions = sum(row['regression'] for row in rows)
+    lines.append(f"{regressions} regression(s) over {threshold:.0%}")
+    return "\n".join(lines)
@@ -0,0 +1,21 @@
+"""
+End-to-end load test against a fake Telegram Bot API.
+
+Usage:
+    python -m tools.loadtest [--scenarios a,b] [--users 50] [--concurrency 50] [--out results.json]
+    python -m tools.loadtest --flood-rate 0.05 --retry-after 1 --api-latency-ms 40
+    python -m tools.loadtest --external --port 8081
+
+By default the bot is built from src.bot in this process, with the Bot API
+pointed at a local stand-in (fake_api.FakeBotAPI) and the database at a
+copy of the tools.bench dataset (or --db). Scenarios feed it synthetic
+users: registrations, check-ins, menu commands and callback storms. Each
+update is timed from the moment it is queued for getUpdates to the bot's
+first reply, so the figures cover polling, the access gate, the handler
+and its queries.
+
+--external only runs the fake API and the scenarios; start the bot
+separately with TELEGRAM_API_BASE_URL and TELEGRAM_BOT_TOKEN as printed.
+Member scenarios then read users from the database the bot is configured
+with.
+"""
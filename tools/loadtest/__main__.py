@@ -0,0 +1,113 @@
+"""
+python -m tools.loadtest --help (run from the project root)
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# In-process runs use a local SQLite copy, no web tier and no migrations against it
+os.environ.setdefault('USE_LOCAL_DB', 'true')
+os.environ.setdefault('USE_REMOTE_DB', 'false')
+os.environ['SKIP_FLASK'] = '1'
+os.environ['SKIP_DB_MIGRATIONS'] = '1'
+
+import logging  # noqa: E402
+
+from tools.loadtest import __doc__ as USAGE  # noqa: E402
+from tools.loadtest.fake_api import FakeBotAPI  # noqa: E402
+from tools.loadtest.runner import build_scripts, drive, format_results, run_in_process  # noqa: E402
+from tools.loadtest.scenarios import SCENARIOS  # noqa: E402
+
+
+def _dataset(args, data_dir: Path) -> Path:
+    """Working copy of --db, or of the tools.bench dataset for --scale/--years"""
+    from tools.bench.dataset import dataset_path, generate_dataset, parse_scale
+
+    source = Path(args.db) if args.db else None
+    if source is None:
+        members, days = parse_scale(args.scale), max(1, int(args.years * 365))
+        source = dataset_path(data_dir, members, days, args.seed)
+        if not source.exists():
+            print(f"Generating {source.name} ...", file=sys.stderr)
+            generate_dataset(source, members, days, args.seed)
+    work = data_dir / 'loadtest.db'
+    shutil.copyfile(source, work)
+    return work
+
+
+async def _external(api: FakeBotAPI, args, names) -> dict:
+    scripts = build_scripts(names, args.users, args.seed)
+    print(f"Start the bot with TELEGRAM_API_BASE_URL={api.base_url} TELEGRAM_BOT_TOKEN={api.token}",
+          file=sys.stderr)
+    while not api.polling.is_set():
+        await asyncio.sleep(0.2)
+    return await drive(api, scripts, args.concurrency, args.ramp, args.think_ms / 1000, args.reply_timeout)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m tools.loadtest', description=USAGE.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter, epilog=USAGE)
+    parser.add_argument('--scenarios', help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument('--users', type=int, default=50, help='simulated users per scenario (default 50)')
+    parser.add_argument('--concurrency', type=int, default=50, help='users active at once (default 50)')
+    parser.add_argument('--ramp', type=float, default=0.0, help='seconds over which users start (default 0)')
+    parser.add_argument('--think-ms', type=float, default=0.0, help='pause between a reply and the next update')
+    parser.add_argument('--reply-timeout', type=float, default=10.0, help='seconds before an update counts as unanswered')
+    parser.add_argument('--flood-rate', type=float, default=0.0, help='share of sends answered with 429 RetryAfter')
+    parser.add_argument('--retry-after', type=int, default=1, help='retry_after seconds in those 429s (default 1)')
+    parser.add_argument('--api-latency-ms', type=float, default=0.0, help='added to every Bot API call')
+    parser.add_argument('--scale', default='1k', help='bench dataset members when --db is not given (default 1k)')
+    parser.add_argument('--years', type=float, default=2.0, help='bench dataset history (default 2)')
+    parser.add_argument('--db', help='SQLite database to copy instead of the bench dataset')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'fitness_club_bench'),
+                        help='where datasets, the working copy and loadtest.log live')
+    parser.add_argument('--port', type=int, default=0, help='fake API port (default: any free port)')
+    parser.add_argument('--external', action='store_true', help='serve the fake API for a separately started bot')
+    parser.add_argument('--out', help='write results JSON here (default: stdout)')
+    parser.add_argument('--log-level', default='WARNING', help='bot log level written to loadtest.log')
+    parser.add_argument('--list', action='store_true', help='list scenarios and exit')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for scenario in SCENARIOS.values():
+            print(f"{scenario.name:<16} {scenario.description}")
+        return 0
+
+    names = args.scenarios.split(',') if args.scenarios else list(SCENARIOS)
+    data_dir = Path(args.data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(filename=data_dir / 'loadtest.log', level=args.log_level.upper(),
+                        format='%(asctime)s %(name)s %(levelname)s %(message)s')
+
+    api = FakeBotAPI(port=args.port, flood_rate=args.flood_rate, retry_after=args.retry_after,
+                     latency=args.api_latency_ms / 1000, seed=args.seed)
+    with api:
+        if args.external:
+            results = asyncio.run(_external(api, args, names))
+        else:
+            results = run_in_process(_dataset(args, data_dir), api, names, args.users, args.seed,
+                                     concurrency=args.concurrency, ramp=args.ramp, think=args.think_ms / 1000,
+                                     reply_timeout=args.reply_timeout)
+        results['server'] = api.stats()
+    results['meta'] = {'scenarios': names, 'users': args.users, 'concurrency': args.concurrency,
+                       'flood_rate': args.flood_rate, 'api_latency_ms': args.api_latency_ms, 'seed': args.seed,
+                       'database': args.db or f"bench {args.scale} x {args.years}y", 'external': args.external}
+    print(format_results(results), file=sys.stderr)
+
+    payload = json.dumps(results, indent=2, default=str)
+    if args.out:
+        Path(args.out).write_text(payload + "\n", encoding='utf-8')
+        print(f"Results written to {args.out}", file=sys.stderr)
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
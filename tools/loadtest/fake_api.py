@@ -0,0 +1,327 @@
+"""
+Local stand-in for the Telegram Bot API.
+
+FakeBotAPI serves /bot<token>/<method> from a background thread, so an
+Application built with TELEGRAM_API_BASE_URL=<api.base_url> talks to it
+instead of Telegram. Updates queued with push() are handed out by
+getUpdates; replies (send*, edit*, answerCallbackQuery) are recorded and
+matched back to the update that caused them, which gives the latency
+from update to first reply.
+
+flood_rate makes that share of outgoing calls fail with 429 RetryAfter;
+latency adds a fixed delay to every call, as a real network would.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, Optional
+
+from flask import Flask, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+logger = logging.getLogger(__name__)
+
+LOADTEST_TOKEN = '123456:LOADTEST-fake-bot-api-token'
+BOT_USER = {'id': 123456, 'is_bot': True, 'first_name': 'Fitness Club', 'username': 'fitness_club_loadtest_bot'}
+
+# Calls that answer an update; everything else (setup, getUpdates) is bookkeeping
+REPLY_METHODS = frozenset((
+    'sendMessage', 'sendPhoto', 'sendDocument', 'sendMediaGroup', 'sendLocation', 'copyMessage',
+    'forwardMessage', 'editMessageText', 'editMessageCaption', 'editMessageReplyMarkup', 'answerCallbackQuery',
+))
+# Calls Telegram never rate limits in practice
+UNLIMITED_METHODS = frozenset((
+    'getMe', 'getUpdates', 'deleteWebhook', 'setMyCommands', 'setChatMenuButton', 'getFile', 'close', 'logOut',
+))
+
+
+# --- Update builders ---
+
+def make_user(user_id: int, first_name: str = 'Member', last_name: str = '', username: str = None) -> Dict:
+    user = {'id': user_id, 'is_bot': False, 'first_name': first_name, 'language_code': 'en'}
+    if last_name:
+        user['last_name'] = last_name
+    if username:
+        user['username'] = username
+    return user
+
+
+def _chat(user: Dict) -> Dict:
+    return {'id': user['id'], 'type': 'private', 'first_name': user['first_name']}
+
+
+def text_message(user: Dict, text: str) -> Dict:
+    """A private-chat text message; a leading /command gets its bot_command entity"""
+    message = {'date': int(time.time()), 'chat': _chat(user), 'from': user, 'text': text}
+    if text.startswith('/'):
+        message['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+    return {'message': message}
+
+
+def photo_message(user: Dict, caption: str = None) -> Dict:
+    file_id = f"AgACAgUAAxk-{user['id']}-{random.getrandbits(32):08x}"
+    message = {'date': int(time.time()), 'chat': _chat(user), 'from': user, 'photo': [
+        {'file_id': f"{file_id}-s", 'file_unique_id': f"{file_id[-8:]}s", 'width': 90, 'height': 90},
+        {'file_id': file_id, 'file_unique_id': file_id[-8:], 'width': 800, 'height': 800, 'file_size': 65536},
+    ]}
+    if caption:
+        message['caption'] = caption
+    return {'message': message}
+
+
+def callback_query(user: Dict, data: str) -> Dict:
+    """A button tap on an earlier bot message"""
+    return {'callback_query': {
+        'from': user, 'chat_instance': str(user['id']), 'data': data,
+        'message': {'message_id': 1, 'date': int(time.time()), 'chat': _chat(user), 'from': BOT_USER,
+                    'text': 'Menu'},
+    }}
+
+
+def _update_chat_id(update: Dict) -> Optional[int]:
+    if 'message' in update:
+        return update['message']['chat']['id']
+    if 'callback_query' in update:
+        return update['callback_query']['from']['id']
+    return None
+
+
+class _QuietHandler(WSGIRequestHandler):
+    # httpx keeps connections open; HTTP/1.0 would reconnect on every call
+    protocol_version = 'HTTP/1.1'
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class FakeBotAPI:
+    """The Bot API endpoints PTB uses, served from memory on a daemon thread"""
+
+    def __init__(self, token: str = LOADTEST_TOKEN, host: str = '127.0.0.1', port: int = 0,
+                 flood_rate: float = 0.0, retry_after: int = 1, latency: float = 0.0, seed: int = 7):
+        self.token = token
+        self.flood_rate = flood_rate
+        # PTB only raises RetryAfter for a positive retry_after
+        self.retry_after = max(1, int(retry_after))
+        self.latency = latency
+        self.calls = Counter()
+        self.polling = threading.Event()
+        self._rng = random.Random(seed)
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1000)
+        self._waiting: Dict[int, deque] = {}
+        self._callbacks: Dict[str, Dict] = {}
+        self._stats = Counter()
+        self._closing = False
+        self._delivered_to = 0
+        self._server = make_server(host, port, self._create_app(), threaded=True, request_handler=_QuietHandler)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self._server.host}:{self._server.port}"
+
+    def start(self) -> 'FakeBotAPI':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-bot-api', daemon=True)
+        self._thread.start()
+        logger.info(f"[LOADTEST] fake Bot API listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Driving updates ---
+
+    def push(self, update: Dict) -> asyncio.Future:
+        """Queue `update` for getUpdates; the future resolves to seconds until its first reply"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def done(seconds):
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(seconds))
+
+        with self._cond:
+            update = dict(update, update_id=next(self._update_ids))
+            if 'message' in update:
+                update['message'] = dict(update['message'], message_id=next(self._message_ids))
+            chat_id = _update_chat_id(update)
+            pending = {'update_id': update['update_id'], 'chat_id': chat_id, 'started': time.perf_counter(),
+                       'done': done}
+            if chat_id is not None:
+                self._waiting.setdefault(chat_id, deque()).append(pending)
+            if 'callback_query' in update:
+                query_id = str(update['update_id'])
+                update['callback_query'] = dict(update['callback_query'], id=query_id)
+                self._callbacks[query_id] = pending
+            self._queue.append(update)
+            self._stats['updates'] += 1
+            self._cond.notify_all()
+        future.add_done_callback(lambda _: self._forget(pending))
+        return future
+
+    async def send(self, update: Dict, timeout: float = 10.0) -> Optional[float]:
+        """push() and wait; None when nothing answered within `timeout` seconds"""
+        future = self.push(update)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            with self._cond:
+                self._stats['unanswered'] += 1
+            return None
+
+    def _discard(self, pending: Dict) -> None:
+        waiting = self._waiting.get(pending['chat_id'])
+        if waiting and pending in waiting:
+            waiting.remove(pending)
+            if not waiting:
+                del self._waiting[pending['chat_id']]
+        self._callbacks.pop(str(pending['update_id']), None)
+
+    def _forget(self, pending: Dict) -> None:
+        with self._cond:
+            self._discard(pending)
+
+    def _answered(self, method: str, params: Dict) -> None:
+        """Match a reply to the oldest unanswered update of its chat (or its callback query)"""
+        with self._cond:
+            if method == 'answerCallbackQuery':
+                pending = self._callbacks.get(params.get('callback_query_id', ''))
+            else:
+                waiting = self._waiting.get(_int(params.get('chat_id')))
+                pending = waiting[0] if waiting else None
+            if pending is None:
+                # Follow-up messages, notifications to admins, broadcasts
+                self._stats['extra_replies'] += 1
+                return
+            self._discard(pending)
+            self._stats['replied'] += 1
+        pending['done'](time.perf_counter() - pending['started'])
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {**{key: self._stats[key] for key in
+                       ('updates', 'delivered', 'replied', 'unanswered', 'extra_replies', 'retry_after')},
+                    'calls': dict(self.calls.most_common())}
+
+    # --- HTTP side ---
+
+    def _create_app(self) -> Flask:
+        app = Flask(__name__)
+
+        @app.route('/bot<token>/<method>', methods=['GET', 'POST'])
+        def bot_method(token, method):
+            if self.latency:
+                time.sleep(self.latency)
+            if token != self.token:
+                return _error(401, 'Unauthorized')
+            params = {key: value for key, value in request.values.items()}
+            with self._cond:
+                self.calls[method] += 1
+                flooded = method not in UNLIMITED_METHODS and self.flood_rate and self._rng.random() < self.flood_rate
+                if flooded:
+                    self._stats['retry_after'] += 1
+            if flooded:
+                return _error(429, f"Too Many Requests: retry after {self.retry_after}",
+                              {'retry_after': self.retry_after})
+            if method == 'getUpdates':
+                return _ok(self._get_updates(params))
+            result = self._result(method, params)
+            if method in REPLY_METHODS:
+                self._answered(method, params)
+            return _ok(result)
+
+        @app.route('/file/bot<token>/<path:file_path>')
+        def file_download(token, file_path):
+            return b'\xff\xd8\xff\xe0loadtest\xff\xd9', 200, {'Content-Type': 'image/jpeg'}
+
+        return app
+
+    def _get_updates(self, params: Dict) -> list:
+        self.polling.set()
+        offset = _int(params.get('offset')) or 0
+        limit = _int(params.get('limit')) or 100
+        deadline = time.monotonic() + float(params.get('timeout') or 0)
+        with self._cond:
+            while self._queue and self._queue[0]['update_id'] < offset:
+                self._queue.popleft()
+            while not self._queue and not self._closing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            # Delivered updates stay queued until a later offset acknowledges them, as on Telegram
+            batch = list(itertools.islice(self._queue, limit))
+            if batch and batch[-1]['update_id'] > self._delivered_to:
+                self._stats['delivered'] += sum(1 for update in batch if update['update_id'] > self._delivered_to)
+                self._delivered_to = batch[-1]['update_id']
+            return batch
+
+    def _result(self, method: str, params: Dict):
+        chat_id = _int(params.get('chat_id'))
+        if method == 'getMe':
+            return dict(BOT_USER, can_join_groups=False, can_read_all_group_messages=False,
+                        supports_inline_queries=False)
+        if method == 'deleteWebhook':
+            if params.get('drop_pending_updates') == 'true':
+                with self._cond:
+                    self._queue.clear()
+            return True
+        if method == 'getFile':
+            file_id = params.get('file_id', '')
+            return {'file_id': file_id, 'file_unique_id': file_id[-8:], 'file_size': 65536,
+                    'file_path': f"photos/{file_id[-8:]}.jpg"}
+        if method == 'getChat':
+            return {'id': chat_id, 'type': 'private', 'first_name': 'Member'}
+        if method == 'getChatMember':
+            return {'status': 'member', 'user': make_user(_int(params.get('user_id')) or 0)}
+        if method.startswith(('send', 'edit', 'copy', 'forward')) and chat_id is not None:
+            message = {'message_id': _int(params.get('message_id')) or next(self._message_ids),
+                       'date': int(time.time()), 'chat': {'id': chat_id, 'type': 'private'}, 'from': BOT_USER}
+            if method == 'copyMessage':
+                return {'message_id': message['message_id']}
+            if 'text' in params:
+                message['text'] = params['text']
+            if method == 'sendPhoto':
+                message['photo'] = [{'file_id': f"sent-{message['message_id']}", 'file_unique_id':
+                                     f"u{message['message_id']}", 'width': 800, 'height': 800}]
+            elif method == 'sendDocument':
+                message['document'] = {'file_id': f"sent-{message['message_id']}",
+                                       'file_unique_id': f"u{message['message_id']}"}
+            return [message] if method == 'sendMediaGroup' else message
+        return True
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _ok(result):
+    return json.dumps({'ok': True, 'result': result}), 200, {'Content-Type': 'application/json'}
+
+
+def _error(code: int, description: str, parameters: Dict = None):
+    body = {'ok': False, 'error_code': code, 'description': description}
+    if parameters:
+        body['parameters'] = parameters
+    return json.dumps(body), code, {'Content-Type': 'application/json'}
@@ -0,0 +1,130 @@
+"""
+Drives scenario scripts through the fake Bot API and summarises latency.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import ExitStack
+from typing import Dict, Iterable, List, Optional
+
+from src.utils import metrics
+from tools.bench.runner import ErrorCounter, bench_database, percentile, swap
+from tools.loadtest.fake_api import FakeBotAPI
+from tools.loadtest.scenarios import SCENARIOS, Script
+
+logger = logging.getLogger(__name__)
+
+
+def build_scripts(names: Iterable[str], users: int, seed: int = 7) -> Dict[str, List[Script]]:
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"unknown scenario(s): {', '.join(unknown)}")
+    rng = random.Random(seed)
+    return {name: SCENARIOS[name].scripts(rng, users) for name in names}
+
+
+async def drive(api: FakeBotAPI, scripts: Dict[str, List[Script]], concurrency: int = 50, ramp: float = 0.0,
+                think: float = 0.0, reply_timeout: float = 10.0) -> Dict:
+    """Run every script (at most `concurrency` users at once); latencies per scenario"""
+    latencies: Dict[str, List[Optional[float]]] = {name: [] for name in scripts}
+    gate = asyncio.Semaphore(concurrency)
+    jobs = [(name, steps) for name, group in scripts.items() for _, steps in group]
+    random.Random(len(jobs)).shuffle(jobs)
+
+    async def user(n, name, steps):
+        if ramp:
+            await asyncio.sleep(ramp * n / len(jobs))
+        async with gate:
+            for update in steps:
+                latencies[name].append(await api.send(update, reply_timeout))
+                if think:
+                    await asyncio.sleep(think)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(n, name, steps) for n, (name, steps) in enumerate(jobs)))
+    wall = time.perf_counter() - started
+    return {'wall_seconds': round(wall, 3), 'scenarios': {name: summarise(samples, wall)
+                                                          for name, samples in latencies.items()}}
+
+
+def summarise(samples: List[Optional[float]], wall: float) -> Dict:
+    answered = sorted(seconds * 1000 for seconds in samples if seconds is not None)
+    return {
+        'updates': len(samples),
+        'answered': len(answered),
+        'unanswered': len(samples) - len(answered),
+        'p50_ms': round(percentile(answered, 50), 2),
+        'p95_ms': round(percentile(answered, 95), 2),
+        'p99_ms': round(percentile(answered, 99), 2),
+        'max_ms': round(answered[-1], 2) if answered else 0.0,
+        'updates_per_sec': round(len(answered) / wall, 2) if wall else 0.0,
+    }
+
+
+async def _serve(application, coroutine):
+    """Initialise and poll like Application.run_polling, but inside the caller's event loop"""
+    await application.initialize()
+    if application.post_init:
+        await application.post_init(application)
+    await application.updater.start_polling(poll_interval=0, timeout=1, allowed_updates=['message', 'callback_query'])
+    await application.start()
+    try:
+        return await coroutine
+    finally:
+        await application.updater.stop()
+        await application.stop()
+        await application.shutdown()
+
+
+def run_application(application, api: FakeBotAPI, scripts: Dict[str, List[Script]], settle: float = 1.0,
+                    **options) -> Dict:
+    """Poll `api` with `application` and drive `scripts` through it; handler and Bot API metrics included"""
+    counter = ErrorCounter()
+    root = logging.getLogger()
+
+    async def load():
+        # Let the deferred startup stages run before the clock starts
+        await asyncio.sleep(settle)
+        metrics.reset_metrics()
+        root.addHandler(counter)
+        try:
+            return await drive(api, scripts, **options)
+        finally:
+            root.removeHandler(counter)
+
+    results = asyncio.run(_serve(application, load()))
+    results['logged_errors'] = counter.count
+    results['handlers'] = metrics.metrics_snapshot('handler')
+    results['telegram'] = metrics.metrics_snapshot('telegram')
+    metrics.reset_metrics()
+    return results
+
+
+def run_in_process(db_path, api: FakeBotAPI, names: Iterable[str], users: int, seed: int = 7, **options) -> Dict:
+    """Build the bot from src.bot against `api` and `db_path` and drive the named scenarios through it"""
+    import src.bot
+    import src.config
+
+    with ExitStack() as stack:
+        stack.enter_context(bench_database(db_path))
+        swap(stack, src.bot, 'TELEGRAM_BOT_TOKEN', api.token)
+        swap(stack, src.config, 'TELEGRAM_API_BASE_URL', api.base_url)
+        scripts = build_scripts(names, users, seed)
+        return run_application(src.bot.main(start=False), api, scripts, **options)
+
+
+def format_results(results: Dict) -> str:
+    lines = [f"{'scenario':<16} {'updates':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'upd/s':>8}  unanswered"]
+    for name, row in results['scenarios'].items():
+        lines.append(
+            f"{name:<16} {row['updates']:>7} {row['p50_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms "
+            f"{row['p99_ms']:>7.1f}ms {row['updates_per_sec']:>8.1f}  {row['unanswered'] or '-'}"
+        )
+    server = results.get('server', {})
+    lines.append(f"wall {results['wall_seconds']:.1f}s, {server.get('retry_after', 0)} x 429, "
+                 f"{server.get('extra_replies', 0)} follow-up sends, {results.get('logged_errors', 0)} logged errors")
+    for row in results.get('handlers', [])[:8]:
+        lines.append(f"  p95 {row['p95_ms']:8.1f}ms n={row['count']:<5} {row['name'][:60]}")
+    return "\n".join(lines)
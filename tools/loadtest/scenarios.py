@@ -0,0 +1,95 @@
+"""
+Synthetic update streams.
+
+A scenario is registered with @scenario and returns one script per
+simulated user: (user, [update, ...]). The driver sends a user's updates
+one at a time, each after the bot answered the previous one (or the
+reply timeout passed), the way a person taps through a conversation.
+Scripts of different users run concurrently.
+"""
+
+import random
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from src.database.connection import execute_query
+from tools.loadtest.fake_api import callback_query, make_user, photo_message, text_message
+
+Script = Tuple[Dict, List[Dict]]
+
+# Telegram ids for people who are not members yet; clear of the bench dataset's range
+NEW_USER_ID_BASE = 910_000_000
+
+
+class Scenario(NamedTuple):
+    name: str
+    scripts: Callable
+    description: str
+
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str):
+    def decorator(scripts):
+        SCENARIOS[name] = Scenario(name, scripts, (scripts.__doc__ or '').strip())
+        return scripts
+    return decorator
+
+
+def members(rng: random.Random, count: int) -> List[Dict]:
+    """`count` approved, active members as Telegram users (repeats when the table is smaller)"""
+    rows = execute_query(
+        "SELECT user_id, first_name, last_name, username FROM users "
+        "WHERE is_approved = 1 AND status = 'active' AND role = 'user' ORDER BY user_id"
+    ) or []
+    if not rows:
+        raise ValueError("no approved members in the database; the member scenarios need some")
+    picked = rng.sample(rows, count) if count <= len(rows) else [rng.choice(rows) for _ in range(count)]
+    return [make_user(row['user_id'], row['first_name'] or 'Member', row['last_name'] or '', row['username'])
+            for row in picked]
+
+
+@scenario('registrations')
+def registrations(rng: random.Random, users: int) -> List[Script]:
+    """New people: /start, then the full /register conversation ending with a photo"""
+    scripts = []
+    for n in range(users):
+        user = make_user(NEW_USER_ID_BASE + n, rng.choice(('Asha', 'Ravi', 'Meera', 'Karan', 'Nisha')),
+                         rng.choice(('Rao', 'Shah', 'Iyer', 'Khan', 'Das')))
+        scripts.append((user, [
+            text_message(user, '/start'),
+            text_message(user, '/register'),
+            text_message(user, f"{user['first_name']} {user['last_name']}"),
+            text_message(user, f"9{rng.randint(100000000, 999999999)}"),
+            text_message(user, str(rng.randint(18, 60))),
+            text_message(user, f"{rng.uniform(50, 95):.1f}"),
+            text_message(user, rng.choice(('Male', 'Female'))),
+            photo_message(user),
+        ]))
+    return scripts
+
+
+@scenario('checkins')
+def checkins(rng: random.Random, users: int) -> List[Script]:
+    """Members checking in: /checkin, then the text check-in option"""
+    return [(user, [text_message(user, '/checkin'), text_message(user, '📝 Text Check-in')])
+            for user in members(rng, users)]
+
+
+@scenario('commands')
+def commands(rng: random.Random, users: int) -> List[Script]:
+    """Members opening menus: greeting, /menu and two everyday commands"""
+    everyday = ('/whoami', '/my_subscription', '/challenges', '/my_challenges', '/notifications', '/qrcode')
+    return [(user, [text_message(user, 'Hi'), text_message(user, '/menu')] +
+             [text_message(user, command) for command in rng.sample(everyday, 2)])
+            for user in members(rng, users)]
+
+
+@scenario('callback_storm')
+def callback_storm(rng: random.Random, users: int) -> List[Script]:
+    """Members tapping ten menu buttons each (every exact callback route the bot registers)"""
+    from src.handlers.callback_handlers import callback_router
+
+    buttons = sorted(route.key for route in callback_router.routes() if not route.prefix)
+    return [(user, [callback_query(user, rng.choice(buttons)) for _ in range(10)])
+            for user in members(rng, users)]
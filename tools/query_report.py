@@ -0,0 +1,49 @@
+"""
+Rank query fingerprints from the query profiler's JSON-lines log.
+
+Usage:
+    python tools/query_report.py [--top 20] [--n-plus-one 5] [--slow 10] [LOG ...]
+
+Defaults to QUERY_PROFILE_LOG and its rotated backups (.1 … .5). Enable
+collection with QUERY_PROFILE=1 or `/perf profile on` in the bot.
+"""
+import argparse
+import glob
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import QUERY_PROFILE_LOG  # noqa: E402
+from src.utils.query_profiler import N_PLUS_ONE_CALLS, format_summary, load_records, summarise  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('logs', nargs='*', help='profile logs (default: QUERY_PROFILE_LOG and backups)')
+    parser.add_argument('--top', type=int, default=20, help='fingerprints to show')
+    parser.add_argument('--n-plus-one', type=int, default=N_PLUS_ONE_CALLS,
+                        help='flag fingerprints run this many times in one handler/job invocation')
+    parser.add_argument('--slow', type=int, default=0, help='also list the N slowest individual queries')
+    args = parser.parse_args(argv)
+
+    paths = args.logs or sorted(glob.glob(QUERY_PROFILE_LOG + '*'))
+    if not paths:
+        print(f"No profile logs found at {QUERY_PROFILE_LOG}")
+        return 1
+
+    records = list(load_records(paths))
+    print(f"Read {len(records)} queries from {len(paths)} file(s)\n")
+    print(format_summary(summarise(records, args.n_plus_one), args.top))
+
+    if args.slow:
+        print(f"Slowest {args.slow} queries:")
+        for rec in sorted(records, key=lambda r: r['ms'], reverse=True)[:args.slow]:
+            print(f"  {rec['ms']:8.1f}ms rows={rec.get('rows', 0)} {rec.get('caller', '-')}  {rec['fp'][:80]}")
+            print(f"           params: {json.dumps(rec.get('params', []))}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())